@@ -0,0 +1,79 @@
+"""Constraints, proving and verification time per epoch of the batch circuit.
+
+Builds SatelliteTimeCheckBatch for each size through the artifact cache
+(circom and snarkjs required; the first run compiles and sets up), then
+proves and verifies satisfying inputs with the same warm backends the
+prover and validator use.
+
+Run from the repository root:
+
+    python3 -m benchmarks.bench_batch_circuit --sizes 1 8 32 128 --rounds 5
+"""
+import argparse
+import time
+
+from src.secure_enclave.artifacts import ArtifactManager, r1cs_constraints
+from src.secure_enclave.zk_prover import ZKTimeProver
+from src.validation.time_validator import TimeValidator
+
+SPEED_OF_LIGHT = "299792458"
+DELTA = "5000000"
+
+
+def satisfying_inputs(size: int, base: int = 1677649200) -> dict:
+    """Inputs with zero offset in every slot."""
+    t_sat = [str(base + i) for i in range(size)]
+    return {"T_sat": t_sat, "c": SPEED_OF_LIGHT, "Delta": DELTA,
+            "T_local": list(t_sat), "D": ["0"] * size}
+
+
+def measure(size: int, rounds: int, ptau_power: int, witness_backend: str) -> dict:
+    artifacts = ArtifactManager.for_batch(size, ptau_power=ptau_power).ensure()
+    prover = ZKTimeProver(batch_artifacts={size: artifacts}, witness_backend=witness_backend)
+    validator = TimeValidator(batch_artifacts={size: artifacts})
+    inputs = satisfying_inputs(size)
+    signals = inputs["T_sat"] + [SPEED_OF_LIGHT, DELTA]
+    try:
+        backend = prover._get_backend(size)
+        proof = backend.prove(inputs)  # warm up the workers
+        verifier = validator._get_verifier(size)
+        if not verifier.verify(proof, signals):
+            raise RuntimeError(f"Batch proof for N={size} did not verify")
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            backend.prove(inputs)
+        prove_time = (time.perf_counter() - start) / rounds
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            verifier.verify(proof, signals)
+        verify_time = (time.perf_counter() - start) / rounds
+    finally:
+        prover.shutdown()
+        validator.close()
+
+    return {"constraints": r1cs_constraints(artifacts.r1cs),
+            "prove_per_epoch": prove_time / size, "verify_per_epoch": verify_time / size}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 8, 32, 128])
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--ptau-power", type=int, default=15, help="must cover the largest circuit")
+    parser.add_argument("--witness-backend", default="wasm", choices=["wasm", "native"])
+    args = parser.parse_args()
+
+    single = ArtifactManager(ptau_power=args.ptau_power).ensure()
+    print(f"SatelliteTimeCheck (single epoch): {r1cs_constraints(single.r1cs)} constraints")
+    for size in args.sizes:
+        result = measure(size, args.rounds, args.ptau_power, args.witness_backend)
+        print(f"N={size:>4}: {result['constraints']:>7} constraints "
+              f"({result['constraints'] / size:.0f}/epoch)  "
+              f"prove {result['prove_per_epoch'] * 1e3:>8.2f} ms/epoch  "
+              f"verify {result['verify_per_epoch'] * 1e3:>7.3f} ms/epoch")
+
+
+if __name__ == "__main__":
+    main()
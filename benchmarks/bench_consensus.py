@@ -0,0 +1,73 @@
+"""Vote ingestion cost of the BFT time-consensus engine by validator set size.
+
+Each epoch receives one vote per validator in random order, a third of them
+from Byzantine validators voting anywhere within half a second. The naive
+baseline recomputes the median and window from scratch on every arrival.
+
+Run from the repository root:
+
+    python3 -m benchmarks.bench_consensus --validators 1000 4000 10000
+"""
+import argparse
+import random
+import statistics
+import time
+
+from src.consensus.engine import TimeConsensus
+
+BASE_TIME = 1677649200.0
+
+
+def make_votes(rng: random.Random, validators: int):
+    byzantine = validators // 3
+    votes = [BASE_TIME + rng.gauss(0, 0.002) for _ in range(validators - byzantine)]
+    votes += [BASE_TIME + rng.uniform(-0.5, 0.5) for _ in range(byzantine)]
+    rng.shuffle(votes)
+    return votes
+
+
+def engine_run(validators: int, votes):
+    """Seconds to ingest every vote and the arrival count at agreement."""
+    consensus = TimeConsensus(validators)
+    decided_at = None
+    start = time.perf_counter()
+    for i, timestamp in enumerate(votes):
+        if consensus.submit_time(i, timestamp) is not None:
+            decided_at = i + 1
+    return time.perf_counter() - start, decided_at
+
+
+def naive_run(validators: int, votes, tolerance: float = 0.05):
+    """Recompute median and consistent count from the full vote list per arrival."""
+    quorum = 2 * validators // 3 + 1
+    seen = []
+    start = time.perf_counter()
+    for timestamp in votes:
+        seen.append(timestamp)
+        median = statistics.median(seen)
+        consistent = sum(1 for t in seen if abs(t - median) <= tolerance)
+        if consistent >= quorum:
+            break
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--validators", type=int, nargs="+", default=[1_000, 2_500, 5_000, 10_000])
+    parser.add_argument("--naive-limit", type=int, default=2_500,
+                        help="skip the quadratic baseline above this many validators")
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    for validators in args.validators:
+        votes = make_votes(rng, validators)
+        elapsed, decided_at = engine_run(validators, votes)
+        line = (f"{validators:>6} validators: {elapsed / validators * 1e6:>6.2f} us/vote  "
+                f"epoch {elapsed * 1e3:>7.2f} ms  agreed after {decided_at} votes")
+        if validators <= args.naive_limit:
+            line += f"  naive {naive_run(validators, votes) * 1e3:>9.1f} ms"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
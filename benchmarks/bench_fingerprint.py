@@ -0,0 +1,62 @@
+"""Satellite fingerprints per second: canonical binary packing vs the old string join.
+
+Run from the repository root:
+
+    python3 -m benchmarks.bench_fingerprint --epochs 10000 --satellites 12
+"""
+import argparse
+import hashlib
+import random
+import time
+
+from src.gps_module.satellite_batch import SatelliteBatch
+from src.secure_enclave.fingerprint import proof_fingerprint, satellite_fingerprint, satellite_fingerprints
+from src.secure_enclave.zk_prover import TimeProof
+from benchmarks.bench_satellite_batch import make_epoch
+
+
+def string_join(satellites) -> str:
+    """The previous fingerprint: str() of five almanac fields, joined and hashed."""
+    unreleased_data = []
+    for sat in satellites:
+        unreleased_data.extend([
+            str(sat.almanac_data["clock_correction"]),
+            str(sat.almanac_data["ionospheric_data"]),
+            str(sat.almanac_data["atmospheric_corrections"]),
+            str(sat.almanac_data["satellite_health"]),
+            str(sat.almanac_data["doppler_shift"]),
+        ])
+    return hashlib.sha256(''.join(unreleased_data).encode()).hexdigest()
+
+
+def rate(fn, items) -> float:
+    start = time.perf_counter()
+    fn(items)
+    return len(items) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--epochs", type=int, default=10_000)
+    parser.add_argument("--satellites", type=int, default=12)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    lists = [make_epoch(rng, args.satellites) for _ in range(args.epochs)]
+    batches = [SatelliteBatch.from_satellites(sats) for sats in lists]
+    wire = [TimeProof.from_buffer(TimeProof(0.0, "00" * 32, b"raw", {
+        "T_sat": "1", "timestamp": 1, "satellite_data": batch.to_metadata()}).to_bytes()) for batch in batches]
+
+    results = [
+        ("string join (SatelliteData)", rate(lambda xs: [string_join(x) for x in xs], lists)),
+        ("binary (SatelliteData)", rate(lambda xs: [satellite_fingerprint(x) for x in xs], lists)),
+        ("binary (SatelliteBatch)", rate(lambda xs: [satellite_fingerprint(x) for x in xs], batches)),
+        ("binary batch mode", rate(satellite_fingerprints, batches)),
+        ("binary from wire records", rate(lambda xs: [proof_fingerprint(x) for x in xs], wire)),
+    ]
+    for name, per_second in results:
+        print(f"{name:>28}: {per_second:>10,.0f} epochs/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Append, range-scan and point-lookup throughput of the on-disk proof store.
+
+Run from the repository root:
+
+    python3 -m benchmarks.bench_proof_store --proofs 200000 --segment-age 60
+"""
+import argparse
+import random
+import tempfile
+import time
+
+from src.data_availability.proof_store import ProofStore
+from src.network.simulator import simulated_proof
+from src.secure_enclave.zk_prover import TimeProof
+
+BASE_TIME = 1677649200.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--proofs", type=int, default=100_000)
+    parser.add_argument("--rate", type=float, default=1000.0, help="simulated proofs per second")
+    parser.add_argument("--segment-age", type=float, default=60.0)
+    parser.add_argument("--lookups", type=int, default=10_000)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    template = [simulated_proof(rng) for _ in range(64)]
+    payloads = []
+    for i in range(args.proofs):
+        proof = template[i % len(template)]
+        fingerprint = rng.getrandbits(256).to_bytes(32, "big").hex()
+        payloads.append(TimeProof(BASE_TIME + i / args.rate + rng.uniform(-0.2, 0.2),
+                                  fingerprint, proof.zk_proof, proof.metadata).to_bytes())
+    proofs = [TimeProof.from_buffer(payload) for payload in payloads]
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = ProofStore(directory, segment_age=args.segment_age)
+        start = time.perf_counter()
+        for proof in proofs:
+            store.append_proof(proof)
+        store.flush(fsync=True)
+        elapsed = time.perf_counter() - start
+        size = sum(segment.size for segment in store.segments)
+        print(f"append : {args.proofs / elapsed:>12,.0f} proofs/s  "
+              f"{size / elapsed / 1e6:>7.1f} MB/s  {len(store.segments)} segments")
+
+        span = args.proofs / args.rate
+        windows = [BASE_TIME + rng.uniform(0, span - 1.0) for _ in range(200)]
+        start = time.perf_counter()
+        found = sum(1 for t in windows for _ in store.proofs(t, t + 1.0))
+        elapsed = time.perf_counter() - start
+        print(f"scan   : {len(windows) / elapsed:>12,.0f} 1-second windows/s  ({found / len(windows):.0f} proofs each)")
+
+        sample = [rng.choice(proofs).satellite_fingerprint for _ in range(args.lookups)]
+        start = time.perf_counter()
+        hits = sum(store.get(fp) is not None for fp in sample)
+        elapsed = time.perf_counter() - start
+        print(f"lookup : {args.lookups / elapsed:>12,.0f} lookups/s  ({hits}/{args.lookups} hits)")
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Sustained throughput of a recorded GPS log through receiver, prover and validator.
+
+Run from the repository root. Without ``--log`` a synthetic NMEA log is
+generated; ``--prove`` also needs the compiled circuit and keys:
+
+    python3 -m benchmarks.bench_replay --epochs 3600
+    python3 -m benchmarks.bench_replay --log capture.ubx --prove --workers 4
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from src.gps_module.replay_receiver import ReplayReceiver
+
+
+def nmea_sentence(body: str) -> str:
+    checksum = 0
+    for char in body:
+        checksum ^= ord(char)
+    return f"${body}*{checksum:02X}\r\n"
+
+
+def synthetic_nmea_log(path: str, epochs: int, satellites: int = 12, seed: int = 1) -> None:
+    """One GGA, a full GPGSV cycle and one RMC per epoch."""
+    rng = random.Random(seed)
+    pages = (satellites + 3) // 4
+    with open(path, "w") as f:
+        for _ in range(epochs):
+            f.write(nmea_sentence("GPGGA,123519,4807.038,N,01131.000,E,1,08,0.9,545.4,M,46.9,M,,"))
+            for page in range(pages):
+                svs = range(page * 4 + 1, min(satellites, page * 4 + 4) + 1)
+                fields = ",".join(f"{sv:02d},{rng.randint(5, 85):02d},{rng.randint(0, 359):03d},"
+                                  f"{rng.randint(20, 50):02d}" for sv in svs)
+                f.write(nmea_sentence(f"GPGSV,{pages},{page + 1},{satellites:02d},{fields}"))
+            f.write(nmea_sentence("GPRMC,123519,A,4807.038,N,01131.000,E,022.4,084.4,230394,003.1,W"))
+
+
+def replay_only(receiver: ReplayReceiver) -> dict:
+    start = time.perf_counter()
+    epochs = satellites = 0
+    for sats in receiver.stream():
+        epochs += 1
+        satellites += len(sats)
+    elapsed = time.perf_counter() - start
+    return {"epochs": epochs, "epochs_per_s": epochs / elapsed, "satellites_per_s": satellites / elapsed}
+
+
+def replay_and_prove(receiver: ReplayReceiver, args) -> dict:
+    from src.secure_enclave.zk_prover import ZKTimeProver
+    from src.validation.time_validator import TimeValidator
+
+    prover = ZKTimeProver(args.wasm, args.zkey, max_workers=args.workers, max_pending=4 * args.workers)
+    validator = TimeValidator(args.vkey)
+    try:
+        start = time.perf_counter()
+        futures = [prover.submit_time_proof(sats) for sats in receiver.stream() if len(sats) >= 4]
+        proofs = [f.result() for f in futures]
+        proved = time.perf_counter()
+        valid = sum(validator.verify_time_proofs(proofs))
+        verified = time.perf_counter()
+    finally:
+        prover.shutdown()
+        validator.close()
+    return {
+        "epochs": len(proofs),
+        "proofs_per_s": len(proofs) / (proved - start),
+        "verifications_per_s": len(proofs) / (verified - proved),
+        "valid": valid,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--log", help="NMEA or UBX capture (default: synthetic NMEA)")
+    parser.add_argument("--epochs", type=int, default=3600, help="synthetic log length")
+    parser.add_argument("--speed", type=float, default=None, help="playback speed (default: unpaced)")
+    parser.add_argument("--prove", action="store_true", help="push epochs through prover and validator")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--wasm", default="SatelliteTimeCheck_js/SatelliteTimeCheck.wasm")
+    parser.add_argument("--zkey", default="SatelliteTimeCheck.zkey")
+    parser.add_argument("--vkey", default="verification_key.json")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.log
+        if path is None:
+            path = os.path.join(tmp, "synthetic.nmea")
+            synthetic_nmea_log(path, args.epochs)
+        receiver = ReplayReceiver(path, speed=args.speed, start_ns=time.time_ns())
+        try:
+            result = replay_and_prove(receiver, args) if args.prove else replay_only(receiver)
+        finally:
+            receiver.close()
+
+    print(f"log: {path} ({receiver.protocol})")
+    for key, value in result.items():
+        print(f"{key:>20}: {value:,.1f}" if isinstance(value, float) else f"{key:>20}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Membership lookups per second of the seen-fingerprint index by size.
+
+Run from the repository root:
+
+    python3 -m benchmarks.bench_replay_index --sizes 1000 100000 1000000
+"""
+import argparse
+import hashlib
+import os
+import random
+import time
+import tracemalloc
+
+from src.validation.replay_index import SeenFingerprintIndex
+
+
+def measure(size: int, lookups: int) -> dict:
+    """Fill an index with ``size`` fingerprints and time mixed hit/miss lookups."""
+    now = 1_000_000.0
+    index = SeenFingerprintIndex(window=3600.0, bucket_width=1.0, max_entries=size)
+
+    tracemalloc.start()
+    present = []
+    for i in range(size):
+        fp = hashlib.sha256(i.to_bytes(8, "big")).hexdigest()
+        index.add(fp, now=now + i / size)
+        present.append(fp)
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    absent = [os.urandom(32).hex() for _ in range(1000)]
+    queries = [random.choice(present) if i % 2 else random.choice(absent) for i in range(lookups)]
+
+    start = time.perf_counter()
+    for fp in queries:
+        index.contains(fp, now=now + 1)
+    elapsed = time.perf_counter() - start
+
+    return {"lookups_per_s": lookups / elapsed, "bytes_per_entry": memory / size}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--lookups", type=int, default=200_000)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        result = measure(size, args.lookups)
+        print(f"{size:>9} entries: {result['lookups_per_s']:>12,.0f} lookups/s  "
+              f"{result['bytes_per_entry']:.0f} B/entry")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Memory and preparation time of buffered epochs: SatelliteData lists vs SatelliteBatch.
+
+Run from the repository root:
+
+    python3 -m benchmarks.bench_satellite_batch --epochs 10000 --satellites 12
+"""
+import argparse
+import random
+import time
+import tracemalloc
+
+from src.gps_module.gps_receiver import SatelliteData
+from src.gps_module.satellite_batch import SatelliteBatch
+from src.secure_enclave.zk_prover import ZKTimeProver
+
+
+def make_epoch(rng: random.Random, satellites: int):
+    return [
+        SatelliteData(
+            prn_code=f"G{i:02d}",
+            position=(rng.uniform(-2.6e7, 2.6e7), rng.uniform(-2.6e7, 2.6e7), rng.uniform(-2.6e7, 2.6e7)),
+            atomic_timestamp=1677649200.0 + rng.random(),
+            transmission_time=1677649199.93 + rng.random(),
+            ephemeris_data={"semi_major_axis": 26559.7, "eccentricity": rng.random() * 0.02,
+                            "inclination": 55.0, "right_ascension": rng.uniform(0, 360),
+                            "argument_of_perigee": 0.0, "mean_anomaly": rng.uniform(0, 360)},
+            almanac_data={"clock_correction": rng.random() * 1e-6, "ionospheric_data": rng.random(),
+                          "atmospheric_corrections": rng.random(), "satellite_health": 0,
+                          "doppler_shift": rng.uniform(-4000, 4000)},
+        )
+        for i in range(satellites)
+    ]
+
+
+def buffered_bytes(build, epochs: int) -> float:
+    """Traced bytes per epoch for ``epochs`` buffered results of ``build``."""
+    tracemalloc.start()
+    buffer = [build(i) for i in range(epochs)]
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del buffer
+    return memory / epochs
+
+
+def prepare_time(prover: ZKTimeProver, epochs) -> float:
+    """Seconds per epoch for fingerprint, circuit inputs and metadata."""
+    start = time.perf_counter()
+    for sats in epochs:
+        batch = SatelliteBatch.coerce(sats)
+        prover._generate_satellite_fingerprint(batch)
+        prover._collect_verification_metadata(batch, prover._prepare_circuit_inputs(batch))
+    return (time.perf_counter() - start) / len(epochs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--epochs", type=int, default=10_000)
+    parser.add_argument("--satellites", type=int, default=12)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    lists = [make_epoch(rng, args.satellites) for _ in range(args.epochs)]
+    batches = [SatelliteBatch.from_satellites(sats) for sats in lists]
+
+    list_bytes = buffered_bytes(lambda i: make_epoch(random.Random(i), args.satellites), args.epochs)
+    batch_bytes = buffered_bytes(
+        lambda i: SatelliteBatch.from_satellites(make_epoch(random.Random(i), args.satellites)), args.epochs)
+    print(f"buffered epoch, list : {list_bytes:>10,.0f} B")
+    print(f"buffered epoch, batch: {batch_bytes:>10,.0f} B")
+
+    prover = ZKTimeProver()
+    print(f"prepare, from list   : {prepare_time(prover, lists) * 1e6:>10.1f} us/epoch")
+    print(f"prepare, from batch  : {prepare_time(prover, batches) * 1e6:>10.1f} us/epoch")
+
+
+if __name__ == "__main__":
+    main()
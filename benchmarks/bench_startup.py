@@ -0,0 +1,132 @@
+"""Cold-start time of a validator-only node.
+
+Times, each in a fresh interpreter, importing the validator, the full
+validator node and the prover for comparison, and lists any receiver or
+prover module the validator pulled in. Then compares parsing the
+verification key JSON with mapping its cached binary form and, with
+``--verifier``, how long the Groth16 verifier process takes to answer its
+first request from either form (needs Node and ffjavascript).
+
+Run from the repository root:
+
+    python3 -m benchmarks.bench_startup --runs 10
+    python3 -m benchmarks.bench_startup --verification-key verification_key.json --verifier
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from src.validation.verification_key import VerificationKey
+from src.validation.verifier_service import Groth16VerifierService
+
+MODULES = {
+    "validator": "src.validation.time_validator",
+    "validator node": "src.node.validator",
+    "prover": "src.secure_enclave.zk_prover",
+}
+HEAVY = ("serial", "pynmea2", "src.gps_module.gps_receiver", "src.gps_module.nmea_stream",
+         "src.secure_enclave.zk_prover", "src.secure_enclave.witness_backends")
+BN128_P = 21888242871839275222246405745257275088696311157297823662689037894645226208583
+PROBE = (
+    "import sys, time\n"
+    "start = time.perf_counter()\n"
+    "import {module}\n"
+    "elapsed = time.perf_counter() - start\n"
+    "print(elapsed, ' '.join(m for m in {heavy!r} if m in sys.modules))\n"
+)
+
+
+def import_time(module: str, runs: int):
+    """Median import seconds of ``module`` and the heavy modules it loaded."""
+    samples, loaded = [], ""
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "-c", PROBE.format(module=module, heavy=HEAVY)],
+                                check=True, capture_output=True, text=True).stdout.split(" ", 1)
+        samples.append(float(output[0]))
+        loaded = output[1].strip()
+    return statistics.median(samples), loaded
+
+
+def synthetic_key(path: str, public: int) -> None:
+    """A verification key JSON shaped like snarkjs output with random points."""
+    field = lambda: str(random.randrange(BN128_P))
+    g2 = lambda: [[field(), field()], [field(), field()], ["1", "0"]]
+    with open(path, "w") as f:
+        json.dump({
+            "protocol": "groth16",
+            "curve": "bn128",
+            "nPublic": public,
+            "vk_alpha_1": [field(), field(), "1"],
+            "vk_beta_2": g2(),
+            "vk_gamma_2": g2(),
+            "vk_delta_2": g2(),
+            "vk_alphabeta_12": [g2(), g2()],
+            "IC": [[field(), field(), "1"] for _ in range(public + 1)],
+        }, f, indent=1)
+
+
+def best_of(fn, runs: int) -> float:
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def first_response(verifier: Groth16VerifierService) -> float:
+    """Seconds from launching the verifier process to its first answer."""
+    start = time.perf_counter()
+    try:
+        verifier.request("ping")
+        return time.perf_counter() - start
+    finally:
+        verifier.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--verification-key", help="key JSON to load (default: synthetic)")
+    parser.add_argument("--public", type=int, default=3, help="public inputs of the synthetic key")
+    parser.add_argument("--verifier", action="store_true", help="also time the verifier process start")
+    args = parser.parse_args()
+
+    for name, module in MODULES.items():
+        seconds, loaded = import_time(module, args.runs)
+        print(f"import {name:<15} {seconds * 1e3:8.1f} ms  heavy modules: {loaded or 'none'}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        key = args.verification_key or os.path.join(tmp, "verification_key.json")
+        if args.verification_key is None:
+            synthetic_key(key, args.public)
+        cache = os.path.join(tmp, "keys")
+
+        def parse_json():
+            with open(key) as f:
+                json.load(f)
+
+        cold = best_of(lambda: VerificationKey.load(key, tempfile.mkdtemp(dir=tmp)).close(), args.runs)
+        VerificationKey.load(key, cache).close()
+        warm = best_of(lambda: VerificationKey.load(key, cache).close(), args.runs)
+        print(f"key json parse       {best_of(parse_json, args.runs) * 1e6:8.1f} us")
+        print(f"key convert + cache  {cold * 1e6:8.1f} us")
+        print(f"key cached load      {warm * 1e6:8.1f} us")
+
+        if args.verifier:
+            # A cache directory that cannot be created makes the service fall back to JSON
+            from_json = first_response(Groth16VerifierService(key, os.path.join(key, "missing")))
+            from_cache = first_response(Groth16VerifierService(key, cache))
+            print(f"verifier ready json  {from_json * 1e3:8.1f} ms")
+            print(f"verifier ready cache {from_cache * 1e3:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""UBX parse throughput in MB/s: frame sync, message decoding, SatelliteData.
+
+Run from the repository root:
+
+    python3 -m benchmarks.bench_ubx_parser --epochs 2000 --satellites 32
+"""
+import argparse
+import random
+import time
+
+from src.gps_module.ubx_parser import (
+    NAV_SAT, NAV_SAT_HEADER, NAV_SAT_RECORD, RAWX_HEADER, RAWX_MEASUREMENT, RXM_RAWX,
+    RXM_SFRBX, SFRBX_HEADER, UBXDecoder, UBXParser, decode_nav_sat, decode_rawx,
+    decode_sfrbx, encode_frame,
+)
+
+
+def synthetic_capture(epochs: int, satellites: int, seed: int = 1) -> bytes:
+    """One RAWX, NAV-SAT and a few SFRBX frames per epoch, like a 1 Hz log."""
+    rng = random.Random(seed)
+    frames = []
+    for epoch in range(epochs):
+        tow = 302400.0 + epoch
+        rawx = RAWX_HEADER.pack(tow, 2300, 18, satellites, 1, 1) + b"".join(
+            RAWX_MEASUREMENT.pack(rng.uniform(2.0e7, 2.6e7), rng.uniform(-1e8, 1e8),
+                                  rng.uniform(-4000, 4000), 0, sv + 1, 0, 0, 1000, 45, 2, 2, 2, 0x07)
+            for sv in range(satellites)
+        )
+        nav_sat = NAV_SAT_HEADER.pack(int(tow * 1000), 1, satellites) + b"".join(
+            NAV_SAT_RECORD.pack(0, sv + 1, 45, 40, 180, 0, 1 << 4) for sv in range(satellites)
+        )
+        frames += [encode_frame(*RXM_RAWX, rawx), encode_frame(*NAV_SAT, nav_sat)]
+        for sv in range(satellites // 8):
+            words = [rng.getrandbits(30) for _ in range(10)]
+            sfrbx = SFRBX_HEADER.pack(0, sv + 1, 0, 0, 10, 0, 2) + b"".join(w.to_bytes(4, "little") for w in words)
+            frames.append(encode_frame(*RXM_SFRBX, sfrbx))
+    return b"".join(frames)
+
+
+def frames_only(capture: bytes) -> int:
+    return sum(1 for _ in UBXParser().iter_frames(capture))
+
+
+def decode_messages(capture: bytes) -> int:
+    decoders = {RXM_RAWX: decode_rawx, RXM_SFRBX: decode_sfrbx, NAV_SAT: decode_nav_sat}
+    count = 0
+    for msg_class, msg_id, payload in UBXParser().iter_frames(capture):
+        decoders[(msg_class, msg_id)](payload)
+        count += 1
+    return count
+
+
+def satellite_data(capture: bytes) -> int:
+    decoder = UBXDecoder(require_ephemeris=False)
+    return sum(len(epoch.satellites) for epoch in decoder.decode_capture(capture))
+
+
+def streamed(capture: bytes, chunk: int = 4096) -> int:
+    parser = UBXParser()
+    return sum(len(parser.feed(capture[i:i + chunk])) for i in range(0, len(capture), chunk))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--epochs", type=int, default=2000)
+    parser.add_argument("--satellites", type=int, default=32)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    capture = synthetic_capture(args.epochs, args.satellites)
+    megabytes = len(capture) / 1e6
+    print(f"capture: {megabytes:.2f} MB, {args.epochs} epochs x {args.satellites} satellites")
+    for name, fn in [("frame sync", frames_only), ("streamed 4 KiB reads", streamed),
+                     ("message decode", decode_messages), ("SatelliteData", satellite_data)]:
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            fn(capture)
+            best = min(best, time.perf_counter() - start)
+        print(f"{name:>22}: {megabytes / best:>8.1f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Size and throughput of the binary TimeProof format versus JSON.
+
+Run from the repository root:
+
+    python3 -m benchmarks.bench_wire_format --satellites 12 --iterations 20000
+"""
+import argparse
+import json
+import os
+import time
+
+from src.secure_enclave.zk_prover import TimeProof
+
+
+def sample_proof(satellites: int) -> TimeProof:
+    """A TimeProof shaped like the prover's output with random proof points."""
+    field = lambda: str(int.from_bytes(os.urandom(31), "big"))
+    zk_proof = json.dumps({
+        "pi_a": [field(), field(), "1"],
+        "pi_b": [[field(), field()], [field(), field()], ["1", "0"]],
+        "pi_c": [field(), field(), "1"],
+        "protocol": "groth16",
+        "curve": "bn128",
+    }).encode()
+    return TimeProof(
+        timestamp=time.time(),
+        satellite_fingerprint=os.urandom(32).hex(),
+        zk_proof=zk_proof,
+        metadata={
+            "T_sat": str(time.time_ns()),
+            "timestamp": time.time_ns(),
+            "satellite_data": [
+                {
+                    "prn": f"G{i:02d}",
+                    "position": [15600e3 + i, 7540e3 - i, 20140e3 + 2 * i],
+                    "atomic_timestamp": 1677649200.0 + i * 1e-9,
+                    "transmission_time": 1677649199.933 + i * 1e-9,
+                    "almanac": {
+                        "clock_correction": 1e-6 * i,
+                        "ionospheric_data": 0.5 + i * 0.1,
+                        "atmospheric_corrections": 0.2 + i * 0.05,
+                        "satellite_health": 0,
+                        "doppler_shift": 1000.0 + i * 10,
+                    },
+                }
+                for i in range(satellites)
+            ],
+        },
+    )
+
+
+def to_json(proof: TimeProof) -> bytes:
+    return json.dumps({
+        "timestamp": proof.timestamp,
+        "satellite_fingerprint": proof.satellite_fingerprint,
+        "zk_proof": proof.zk_proof.decode(),
+        "metadata": proof.metadata,
+    }).encode()
+
+
+def from_json(data: bytes) -> TimeProof:
+    obj = json.loads(data)
+    return TimeProof(obj["timestamp"], obj["satellite_fingerprint"],
+                     obj["zk_proof"].encode(), obj["metadata"])
+
+
+def rate(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return iterations / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--satellites", type=int, default=12)
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    proof = sample_proof(args.satellites)
+    json_bytes = to_json(proof)
+    binary = proof.to_bytes()
+
+    # A typical validator hot path: reject on time, else read the fingerprint
+    # and one deeply nested almanac field
+    def json_hot_path():
+        p = from_json(json_bytes)
+        return p.timestamp, p.satellite_fingerprint, p.metadata["satellite_data"][3]["almanac"]["doppler_shift"]
+
+    def binary_hot_path():
+        p = TimeProof.from_buffer(binary)
+        return p.timestamp, p.satellite_fingerprint, p.satellite_record(3)[9]
+
+    n = args.iterations
+    print(f"size: json {len(json_bytes)} B, binary {len(binary)} B "
+          f"({len(binary) / len(json_bytes):.0%})")
+    print(f"encode/s:        json {rate(lambda: to_json(proof), n):>10,.0f}  "
+          f"binary {rate(proof.to_bytes, n):>10,.0f}")
+    print(f"full decode/s:   json {rate(lambda: from_json(json_bytes), n):>10,.0f}  "
+          f"binary {rate(lambda: TimeProof.from_buffer(binary).metadata, n):>10,.0f}")
+    print(f"hot-path read/s: json {rate(json_hot_path, n):>10,.0f}  "
+          f"binary {rate(binary_hot_path, n):>10,.0f}")
+
+
+if __name__ == "__main__":
+    main()
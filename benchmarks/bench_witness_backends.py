@@ -0,0 +1,68 @@
+"""Per-witness latency of the WASM and native C++ witness backends.
+
+Run from the repository root after compiling the circuit:
+
+    python3 -m benchmarks.bench_witness_backends --iterations 200
+"""
+import argparse
+import statistics
+import time
+
+from src.secure_enclave.witness_backends import NativeWitnessBackend, WasmWitnessBackend
+
+SAMPLE_INPUTS = {
+    "T_sat": "1677649200000000000",
+    "c": "299792458",
+    "Delta": "5000000",
+    "T_local": "1677649200000000000",
+    "D": "0",
+}
+
+
+def measure(backend, iterations: int, warmup: int) -> dict:
+    """Time ``calculate_witness`` calls after a short warm-up."""
+    for _ in range(warmup):
+        backend.calculate_witness(SAMPLE_INPUTS)
+
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        backend.calculate_witness(SAMPLE_INPUTS)
+        samples.append((time.perf_counter() - start) * 1e3)
+
+    samples.sort()
+    return {
+        "mean_ms": statistics.fmean(samples),
+        "p50_ms": samples[len(samples) // 2],
+        "p95_ms": samples[int(len(samples) * 0.95) - 1],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--wasm", default="SatelliteTimeCheck_js/SatelliteTimeCheck.wasm")
+    parser.add_argument("--zkey", default="SatelliteTimeCheck.zkey")
+    parser.add_argument("--cpp-dir", default="SatelliteTimeCheck_cpp")
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--warmup", type=int, default=5)
+    args = parser.parse_args()
+
+    backends = [WasmWitnessBackend(args.wasm, args.zkey, max_workers=1)]
+    native = NativeWitnessBackend(args.cpp_dir, args.wasm, args.zkey, max_workers=1)
+    try:
+        native.build()
+        backends.append(native)
+    except RuntimeError as e:
+        print(f"Skipping native backend: {e}")
+
+    for backend in backends:
+        try:
+            result = measure(backend, args.iterations, args.warmup)
+        finally:
+            backend.close()
+        print(f"{backend.name:>6}: mean {result['mean_ms']:.3f} ms  "
+              f"p50 {result['p50_ms']:.3f} ms  p95 {result['p95_ms']:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
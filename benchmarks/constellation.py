@@ -0,0 +1,209 @@
+"""Seeded synthetic GPS constellation for benchmarks.
+
+Satellites fly broadcast-ephemeris orbits in the six GPS planes and are
+seen from a fixed receiver. Each epoch carries pseudoranges consistent with
+the geometry plus ionospheric and tropospheric delays and Gaussian noise,
+almanac fields derived from the same geometry (Doppler from the range rate,
+delays from the elevation) and a receiver clock that drifts. The same seed
+and start time always give the same epochs, in any order of queries.
+
+    constellation = SyntheticConstellation(seed=7)
+    batch = constellation.epoch(constellation.start)
+    lines = constellation.nmea_epoch(constellation.start)
+"""
+from typing import List, Optional, Sequence, Tuple
+import time
+import numpy as np
+
+from src.gps_module.clock_solver import SPEED_OF_LIGHT
+from src.gps_module.ephemeris import ELEMENT_FIELDS, EphemerisEngine
+from src.gps_module.satellite_batch import SatelliteBatch
+
+from .bench_replay import nmea_sentence
+
+WGS84_A = 6378137.0
+WGS84_E2 = 6.69437999014e-3
+GPS_SEMI_MAJOR_AXIS = 26559.7   # km
+GPS_INCLINATION = 55.0          # degrees
+L1_FREQUENCY = 1575.42e6        # Hz
+PLANES = 6
+
+
+def geodetic_to_ecef(latitude: float, longitude: float, height: float) -> np.ndarray:
+    """WGS-84 geodetic coordinates in degrees and metres to ECEF metres."""
+    lat, lon = np.radians(latitude), np.radians(longitude)
+    n = WGS84_A / np.sqrt(1.0 - WGS84_E2 * np.sin(lat) ** 2)
+    return np.array([
+        (n + height) * np.cos(lat) * np.cos(lon),
+        (n + height) * np.cos(lat) * np.sin(lon),
+        (n * (1.0 - WGS84_E2) + height) * np.sin(lat),
+    ])
+
+
+def nmea_coordinate(value: float, positive: str, negative: str, degree_digits: int) -> str:
+    minutes = abs(value) % 1.0 * 60.0
+    return f"{int(abs(value)):0{degree_digits}d}{minutes:06.3f},{positive if value >= 0 else negative}"
+
+
+class SyntheticConstellation:
+    """Deterministic constellation and receiver for end-to-end benchmarks.
+
+    ``satellites`` are spread over the six orbital planes with slightly
+    perturbed elements; a fraction ``unhealthy`` is flagged unhealthy for
+    the whole run. Epochs only contain satellites above ``elevation_mask``
+    degrees. ``noise`` is the pseudorange noise in metres, ``clock_bias``
+    and ``clock_drift`` describe the receiver clock in seconds and seconds
+    per second.
+
+    Positions ignore Earth rotation during signal flight, matching what
+    ``ClockSolver`` models, so a solve recovers the receiver clock to within
+    the noise and atmospheric delays.
+    """
+
+    def __init__(self, seed: int = 1, satellites: int = 31, start: Optional[float] = None,
+                 latitude: float = 48.1173, longitude: float = 11.5167, height: float = 545.4,
+                 clock_bias: float = 1e-4, clock_drift: float = 1e-8, noise: float = 3.0,
+                 elevation_mask: float = 10.0, unhealthy: float = 0.02):
+        """Draw the orbits and satellite health from ``seed``."""
+        self.seed = seed
+        self.start = time.time() if start is None else start
+        self.latitude = latitude
+        self.longitude = longitude
+        self.height = height
+        self.receiver = geodetic_to_ecef(latitude, longitude, height)
+        self.clock_bias = clock_bias
+        self.clock_drift = clock_drift
+        self.noise = noise
+        self.elevation_mask = elevation_mask
+        self.engine = EphemerisEngine()
+
+        rng = np.random.default_rng(seed)
+        plane = np.arange(satellites) % PLANES
+        slot = np.arange(satellites) // PLANES
+        per_plane = -(-satellites // PLANES)
+        # Slots are evenly spaced in argument of latitude within each plane,
+        # whatever the perigee
+        perigee = rng.uniform(0.0, 360.0, satellites)
+        latitude_argument = 360.0 * slot / per_plane + 360.0 / PLANES / per_plane * plane
+        columns = {
+            "semi_major_axis": GPS_SEMI_MAJOR_AXIS + rng.normal(0.0, 0.5, satellites),
+            "eccentricity": rng.uniform(0.0, 0.02, satellites),
+            "inclination": GPS_INCLINATION + rng.normal(0.0, 0.5, satellites),
+            "right_ascension": (60.0 * plane + rng.normal(0.0, 0.2, satellites)) % 360.0,
+            "argument_of_perigee": perigee,
+            "mean_anomaly": (latitude_argument - perigee + rng.normal(0.0, 2.0, satellites)) % 360.0,
+            "reference_time": np.full(satellites, self.start),
+            "mean_motion_delta": rng.normal(0.0, 2.5e-7, satellites),
+            "right_ascension_rate": rng.normal(-4.6e-7, 1e-8, satellites),
+            "inclination_rate": rng.normal(0.0, 1e-9, satellites),
+            "cuc": rng.normal(0.0, 5e-6, satellites),
+            "cus": rng.normal(0.0, 5e-6, satellites),
+            "crc": rng.normal(200.0, 50.0, satellites),
+            "crs": rng.normal(0.0, 50.0, satellites),
+            "cic": rng.normal(0.0, 1e-7, satellites),
+            "cis": rng.normal(0.0, 1e-7, satellites),
+        }
+        self.elements = np.stack([columns[field] for field in ELEMENT_FIELDS], axis=1)
+        self.prn_codes = np.array([f"G{i + 1:02d}" for i in range(satellites)], dtype="S8")
+        self.health = (rng.random(satellites) < unhealthy).astype(np.int32)
+        self.clock_corrections = rng.normal(0.0, 2e-4, satellites)
+
+        up = self.receiver / np.linalg.norm(self.receiver)
+        east = np.cross([0.0, 0.0, 1.0], up)
+        east /= np.linalg.norm(east)
+        self._enu = np.stack([east, np.cross(up, east), up])
+
+    def receiver_clock(self, t: float) -> float:
+        """Receiver clock bias in seconds at true time ``t``."""
+        return self.clock_bias + self.clock_drift * (t - self.start)
+
+    def look_angles(self, positions: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Elevation and azimuth in degrees of ECEF ``positions`` from the receiver."""
+        east, north, up = self._enu @ (positions - self.receiver).T
+        elevation = np.degrees(np.arctan2(up, np.hypot(east, north)))
+        azimuth = np.degrees(np.arctan2(east, north)) % 360.0
+        return elevation, azimuth
+
+    def visible(self, t: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Indices, elevations and azimuths of satellites above the mask at ``t``."""
+        positions = self.engine.positions(self.elements, t)[0]
+        elevation, azimuth = self.look_angles(positions)
+        index = np.flatnonzero(elevation > self.elevation_mask)
+        return index, elevation[index], azimuth[index]
+
+    def epoch(self, t: float) -> SatelliteBatch:
+        """Satellites visible at true receive time ``t`` with their measurements."""
+        rng = np.random.default_rng([self.seed, int(round(t * 1e6)) & 0xFFFFFFFFFFFF])
+        index, elevation, _ = self.visible(t)
+        elements = self.elements[index]
+
+        # Iterate the light time once; millimetre-level after two passes
+        travel = np.full(len(index), 0.075)
+        for _ in range(2):
+            positions = self.engine.positions_at(elements, t - travel)
+            ranges = np.linalg.norm(positions - self.receiver, axis=1)
+            travel = ranges / SPEED_OF_LIGHT
+
+        # Klobuchar-like vertical delay scaled by the ionospheric obliquity,
+        # Saastamoinen-like zenith delay by the elevation
+        sin_el = np.sin(np.radians(elevation))
+        iono = rng.uniform(2.0, 8.0) / np.sqrt(1.0 - (0.94 * np.cos(np.radians(elevation))) ** 2)
+        tropo = 2.3 / np.maximum(sin_el, 0.05)
+
+        later = self.engine.positions_at(elements, t - travel + 1.0)
+        range_rate = np.linalg.norm(later - self.receiver, axis=1) - ranges
+        doppler = -range_rate * L1_FREQUENCY / SPEED_OF_LIGHT + rng.normal(0.0, 0.5, len(index))
+
+        pseudorange = ranges + iono + tropo + rng.normal(0.0, self.noise, len(index))
+        almanac = np.stack([
+            self.clock_corrections[index],
+            iono,
+            tropo,
+            doppler,
+        ], axis=1)
+        clock = self.receiver_clock(t)
+        return SatelliteBatch(
+            prn_codes=self.prn_codes[index],
+            positions=positions,
+            atomic_timestamps=np.full(len(index), t + clock),
+            transmission_times=t - pseudorange / SPEED_OF_LIGHT,
+            almanac=almanac,
+            satellite_health=self.health[index],
+            ephemeris=elements,
+            travel_times=clock + pseudorange / SPEED_OF_LIGHT,
+        )
+
+    def epochs(self, count: int, interval: float = 1.0, start: Optional[float] = None) -> List[SatelliteBatch]:
+        """``count`` consecutive epochs ``interval`` seconds apart."""
+        start = self.start if start is None else start
+        return [self.epoch(start + i * interval) for i in range(count)]
+
+    def nmea_epoch(self, t: float) -> List[str]:
+        """GGA, a full GPGSV cycle and RMC as a receiver would emit them at ``t``."""
+        index, elevation, azimuth = self.visible(t)
+        rng = np.random.default_rng([self.seed, int(round(t * 1e6)) & 0xFFFFFFFFFFFF, 1])
+        snr = np.clip(25.0 + 25.0 * np.sin(np.radians(elevation)) + rng.normal(0.0, 2.0, len(index)), 0, 99)
+
+        clock = time.gmtime(t)
+        hhmmss = time.strftime("%H%M%S", clock)
+        position = (f"{nmea_coordinate(self.latitude, 'N', 'S', 2)},"
+                    f"{nmea_coordinate(self.longitude, 'E', 'W', 3)}")
+        lines = [nmea_sentence(f"GPGGA,{hhmmss},{position},1,{min(len(index), 12):02d},0.9,"
+                               f"{self.height:.1f},M,46.9,M,,")]
+        pages = max(1, -(-len(index) // 4))
+        for page in range(pages):
+            fields = ",".join(
+                f"{i + 1:02d},{int(round(elevation[k])):02d},{int(round(azimuth[k])) % 360:03d},"
+                f"{int(snr[k]):02d}"
+                for k, i in list(enumerate(index))[page * 4:page * 4 + 4]
+            )
+            lines.append(nmea_sentence(f"GPGSV,{pages},{page + 1},{len(index):02d},{fields}"))
+        lines.append(nmea_sentence(f"GPRMC,{hhmmss},A,{position},000.0,000.0,"
+                                   f"{time.strftime('%d%m%y', clock)},,"))
+        return lines
+
+    def nmea_log(self, count: int, interval: float = 1.0, start: Optional[float] = None) -> List[str]:
+        """NMEA lines for ``count`` consecutive epochs."""
+        start = self.start if start is None else start
+        return [line for i in range(count) for line in self.nmea_epoch(start + i * interval)]
+
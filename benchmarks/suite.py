@@ -0,0 +1,293 @@
+"""End-to-end per-stage throughput on a seeded synthetic constellation.
+
+Times NMEA parsing in ``GPSReceiver``, fingerprinting, the clock solve,
+witness generation and proving in ``ZKTimeProver``, every ``TimeValidator``
+stage and enclave processing, batch and streaming, each on its own. Proving
+and verification use stub backends unless ``--backend`` selects the real
+circuit, which is built through the artifact cache on first use.
+
+Run from the repository root; results go to JSON and can be checked
+against a stored baseline, exiting non-zero on a throughput regression:
+
+    python3 -m benchmarks.suite --output baseline.json
+    python3 -m benchmarks.suite --baseline baseline.json --tolerance 0.2
+    python3 -m benchmarks.suite --backend wasm --epochs 50 --output wasm.json
+"""
+from typing import Callable, Dict, List, Optional, Sequence
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+import numpy as np
+
+from src.gps_module.gps_receiver import GPSReceiver
+from src.gps_module.nmea_stream import GSVAssembler
+from src.secure_enclave.fingerprint import satellite_fingerprint
+from src.secure_enclave.processor import SecureEnclaveProcessor
+from src.secure_enclave.zk_prover import TimeProof, ZKTimeProver
+from src.validation.time_validator import TimeValidator
+
+from .constellation import SyntheticConstellation
+
+FORMAT_VERSION = 1
+STUB_PROOF = json.dumps({
+    "pi_a": ["1", "2", "1"],
+    "pi_b": [["1", "2"], ["3", "4"], ["1", "0"]],
+    "pi_c": ["1", "2", "1"],
+    "protocol": "groth16",
+    "curve": "bn128",
+}).encode()
+
+
+class StubWitnessBackend:
+    """Witness backend returning a fixed proof, so only Python-side cost is timed."""
+
+    name = "stub"
+
+    def calculate_witness(self, inputs: Dict) -> bytes:
+        return b""
+
+    def prove(self, inputs: Dict) -> bytes:
+        return STUB_PROOF
+
+    def close(self) -> None:
+        pass
+
+
+class StubVerifier:
+    """Groth16 verifier service stand-in that accepts every proof."""
+
+    def verify(self, proof, public_signals) -> bool:
+        return True
+
+    def verify_many(self, proofs, batch=True) -> List[bool]:
+        return [True] * len(proofs)
+
+    def close(self) -> None:
+        pass
+
+
+def summarize(samples: Sequence[float], items: int, seconds: float) -> Dict[str, float]:
+    """Throughput and latency percentiles of one stage."""
+    result = {"items": items, "seconds": seconds, "per_s": items / seconds if seconds > 0 else 0.0}
+    if samples:
+        ordered = sorted(samples)
+        result["mean_us"] = statistics.fmean(ordered) * 1e6
+        result["p50_us"] = ordered[len(ordered) // 2] * 1e6
+        result["p95_us"] = ordered[max(0, int(len(ordered) * 0.95) - 1)] * 1e6
+    return result
+
+
+def time_calls(fn: Callable, items: Sequence, repeat: int) -> Dict[str, float]:
+    """Call ``fn`` on every item; the fastest of ``repeat`` passes counts."""
+    best = None
+    for _ in range(repeat):
+        samples = []
+        for item in items:
+            start = time.perf_counter()
+            fn(item)
+            samples.append(time.perf_counter() - start)
+        if best is None or sum(samples) < sum(best):
+            best = samples
+    return summarize(best, len(items), sum(best))
+
+
+def parse_nmea(receiver: GPSReceiver, lines: Sequence[str]) -> int:
+    """Assemble GSV cycles and convert them the way ``GPSReceiver`` does."""
+    assembler = GSVAssembler()
+    epochs = 0
+    for line in lines:
+        epoch = assembler.feed(line)
+        if epoch is not None:
+            receiver._process_epoch(epoch)
+            epochs += 1
+    return epochs
+
+
+def restamp(proofs: Sequence[TimeProof]) -> List[TimeProof]:
+    """Copies stamped now, so freshness and range checks see live proofs.
+
+    Proving may take far longer than the validator's one-second window.
+    """
+    now, now_ns = time.time(), time.time_ns()
+    return [TimeProof(now, p.satellite_fingerprint, p.zk_proof, {**p.metadata, "timestamp": now_ns})
+            for p in proofs]
+
+
+def time_validator_stages(make_validator: Callable[[], TimeValidator], proofs: Sequence[TimeProof],
+                          repeat: int) -> Dict[str, Dict[str, float]]:
+    """Seconds spent in each pipeline stage over the whole batch.
+
+    Runs the stages like ``VerificationPipeline.run_many`` so every stage
+    sees only the survivors of the previous one; each pass starts from a
+    fresh validator so the replay index is empty.
+    """
+    best: Dict[str, Dict[str, float]] = {}
+    for _ in range(repeat):
+        validator = make_validator()
+        try:
+            batch = restamp(proofs)
+            alive = list(batch)
+            timings = {}
+            total = time.perf_counter()
+            for stage in validator.pipeline.stages:
+                start = time.perf_counter()
+                outcomes = stage.check_many(validator, alive) if alive else []
+                timings[f"validator.{stage.name}"] = summarize([], len(alive), time.perf_counter() - start)
+                alive = [proof for proof, ok in zip(alive, outcomes) if ok]
+            timings["validator.total"] = summarize([], len(batch), time.perf_counter() - total)
+            timings["validator.total"]["accepted"] = len(alive)
+        finally:
+            validator.close()
+        for name, result in timings.items():
+            if name not in best or result["seconds"] < best[name]["seconds"]:
+                best[name] = result
+    return best
+
+
+def build(args):
+    """Prover and validator factory for the selected backend."""
+    if args.backend == "stub":
+        prover = ZKTimeProver()
+        prover._backend = StubWitnessBackend()
+        return prover, lambda: TimeValidator(verifier=StubVerifier())
+
+    from src.secure_enclave.artifacts import ArtifactManager
+
+    artifacts = ArtifactManager(cache_dir=args.cache_dir).ensure()
+    prover = ZKTimeProver(artifacts=artifacts, witness_backend=args.backend, max_workers=1)
+    return prover, lambda: TimeValidator(artifacts=artifacts)
+
+
+def run(args) -> Dict:
+    constellation = SyntheticConstellation(seed=args.seed, satellites=args.satellites, start=args.start)
+    epochs = constellation.epochs(args.epochs, args.interval)
+    lines = constellation.nmea_log(args.epochs, args.interval)
+    stages: Dict[str, Dict[str, float]] = {}
+
+    receiver = GPSReceiver()
+    best = None
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        parsed = parse_nmea(receiver, lines)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    stages["receiver.nmea_parse"] = summarize([], parsed, best)
+    stages["receiver.nmea_parse"]["sentences_per_s"] = len(lines) / best
+
+    stages["fingerprint"] = time_calls(satellite_fingerprint, epochs, args.repeat)
+
+    prover, make_validator = build(args)
+    try:
+        stages["prover.time_solution"] = time_calls(prover._calculate_consensus_time, epochs, args.repeat)
+        stages["prover.circuit_inputs"] = time_calls(prover._prepare_circuit_inputs, epochs, args.repeat)
+        if args.backend != "stub":
+            # The stub backend does no work worth timing
+            inputs = [prover._prepare_circuit_inputs(epoch) for epoch in epochs]
+            backend = prover._get_backend()
+            stages["prover.witness"] = time_calls(backend.calculate_witness, inputs, args.repeat)
+            stages["prover.prove"] = time_calls(backend.prove, inputs, args.repeat)
+        proofs = []
+        stages["prover.generate_time_proof"] = time_calls(
+            lambda epoch: proofs.append(prover.generate_time_proof(epoch)), epochs, 1)
+    finally:
+        prover.shutdown()
+
+    stages.update(time_validator_stages(make_validator, proofs, args.repeat))
+
+    enclave = SecureEnclaveProcessor()
+    stages["enclave.process_gps_data"] = time_calls(enclave.process_gps_data, epochs, args.repeat)
+    # Each pass streams from a cold start, so one full solve is included
+    stages["enclave.process_stream"] = min(
+        (time_calls(SecureEnclaveProcessor().process_epoch, epochs, 1) for _ in range(args.repeat)),
+        key=lambda result: result["seconds"])
+
+    return {
+        "version": FORMAT_VERSION,
+        "config": {
+            "seed": args.seed,
+            "epochs": args.epochs,
+            "satellites": args.satellites,
+            "visible_mean": float(np.mean([len(epoch) for epoch in epochs])),
+            "interval": args.interval,
+            "backend": args.backend,
+            "repeat": args.repeat,
+        },
+        "environment": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count(),
+        },
+        "stages": stages,
+    }
+
+
+def compare(result: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """Stages whose throughput fell more than ``tolerance`` below the baseline."""
+    if baseline.get("config", {}).get("backend") != result["config"]["backend"]:
+        print(f"warning: baseline used backend {baseline.get('config', {}).get('backend')!r}, "
+              f"this run {result['config']['backend']!r}")
+    if baseline.get("environment", {}).get("machine") != result["environment"]["machine"]:
+        print("warning: baseline was recorded on a different machine type")
+
+    regressions = []
+    print(f"{'stage':>34} {'baseline/s':>14} {'current/s':>14} {'change':>8}")
+    for name, current in result["stages"].items():
+        reference = baseline.get("stages", {}).get(name)
+        if not reference or not reference.get("per_s"):
+            print(f"{name:>34} {'-':>14} {current['per_s']:>14,.0f} {'new':>8}")
+            continue
+        change = current["per_s"] / reference["per_s"] - 1.0
+        regressed = change < -tolerance
+        if regressed:
+            regressions.append(name)
+        print(f"{name:>34} {reference['per_s']:>14,.0f} {current['per_s']:>14,.0f} "
+              f"{change:>+7.0%}{'  REGRESSION' if regressed else ''}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--epochs", type=int, default=500)
+    parser.add_argument("--satellites", type=int, default=31, help="constellation size")
+    parser.add_argument("--interval", type=float, default=1.0, help="seconds between epochs")
+    parser.add_argument("--start", type=float, default=1677649200.0,
+                        help="constellation reference time (fixed so runs are comparable)")
+    parser.add_argument("--backend", choices=("stub", "wasm", "native"), default="stub")
+    parser.add_argument("--cache-dir", default=os.path.join(os.path.expanduser("~"), ".cache",
+                                                            "continuum", "artifacts"))
+    parser.add_argument("--repeat", type=int, default=3, help="passes per stage; the fastest counts")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--baseline", help="compare against results stored by an earlier run")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="allowed throughput drop against the baseline (fraction)")
+    args = parser.parse_args(argv)
+
+    result = run(args)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2, sort_keys=True)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(result, json.load(f), args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} stage(s) regressed: {', '.join(regressions)}")
+            return 1
+        return 0
+
+    for name, stage in result["stages"].items():
+        latency = f"  p50 {stage['p50_us']:>9,.1f} us" if "p50_us" in stage else ""
+        print(f"{name:>34}: {stage['per_s']:>12,.0f} items/s{latency}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,234 @@
+from bisect import bisect_left, bisect_right, insort
+from typing import Callable, Dict, Hashable, List, NamedTuple, Optional, Set, Tuple
+import math
+import threading
+
+
+class Agreement(NamedTuple):
+    """Time agreed on by a quorum of validators for one epoch."""
+    epoch: int
+    time: float      # trimmed mean of the consistent votes
+    median: float
+    votes: int       # votes within tolerance of the median
+    quorum: int
+
+
+class EpochTally:
+    """Votes of one epoch, kept sorted so order statistics are a lookup away.
+
+    Insertion is a binary search plus a memmove of the tail, which for a few
+    thousand floats is cheaper than any pointer-based tree in Python. The
+    median and the size of the window around it both come from index
+    arithmetic and two bisections per arrival.
+
+    ``borrowed`` holds the validators whose time here is a copy of a vote
+    for a neighbouring epoch; their own vote for this epoch replaces it.
+    """
+    __slots__ = ("times", "voters", "borrowed", "agreement")
+
+    def __init__(self):
+        self.times: List[float] = []
+        self.voters: Dict[Hashable, float] = {}
+        self.borrowed: Set[Hashable] = set()
+        self.agreement: Optional[Agreement] = None
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def add(self, validator_id: Hashable, timestamp: float) -> None:
+        self.voters[validator_id] = timestamp
+        insort(self.times, timestamp)
+
+    def replace(self, validator_id: Hashable, timestamp: float) -> None:
+        previous = self.voters[validator_id]
+        del self.times[bisect_left(self.times, previous)]
+        self.add(validator_id, timestamp)
+
+    def median(self) -> float:
+        times = self.times
+        mid = len(times) // 2
+        if len(times) % 2:
+            return times[mid]
+        return (times[mid - 1] + times[mid]) / 2
+
+    def window(self, center: float, tolerance: float) -> Tuple[int, int]:
+        """Index range of the votes within ``tolerance`` of ``center``."""
+        return (bisect_left(self.times, center - tolerance),
+                bisect_right(self.times, center + tolerance))
+
+    def trimmed_mean(self, lo: int, hi: int, trim: float) -> float:
+        """Mean of ``times[lo:hi]`` with ``trim`` of each tail discarded."""
+        cut = int((hi - lo) * trim)
+        kept = self.times[lo + cut:hi - cut]
+        return math.fsum(kept) / len(kept)
+
+
+class TimeConsensus:
+    """Byzantine fault tolerant agreement on time from verified proofs.
+
+    Each verified ``TimeProof`` is one validator's vote for the epoch its
+    timestamp falls in, epoch ``k`` covering ``[origin + k * epoch_length,
+    origin + (k + 1) * epoch_length)``. Votes are consistent when they lie
+    within ``tolerance`` seconds of the epoch's running median; as soon as
+    2/3 + 1 of ``validator_count`` votes are consistent, the epoch is
+    decided on their trimmed mean and ``on_agreement`` is called. With at
+    most a third of validators faulty, the honest votes hold the median and
+    so always fall inside the window.
+
+    A vote within ``tolerance`` of an epoch boundary also counts for the
+    epoch on the other side, so consistent votes straddling a boundary all
+    land in one tally. The agreement is filed under the epoch its time falls
+    in, and a time a neighbouring epoch already agreed on is not decided
+    again.
+
+    A validator's first vote per epoch counts, though a boundary copy gives
+    way to the validator's own vote for that epoch. Validators voting again
+    with a different time are recorded in ``equivocators``. Only the most recent
+    ``max_epochs`` epochs are kept; votes for older ones are dropped.
+    """
+
+    def __init__(self, validator_count: int, tolerance: float = 0.05,
+                 epoch_length: float = 1.0, trim: float = 0.1,
+                 on_agreement: Optional[Callable[[Agreement], None]] = None,
+                 max_epochs: int = 64, origin: float = 0.0):
+        """Initialize an engine for a validator set of ``validator_count``."""
+        if validator_count < 1:
+            raise ValueError("validator_count must be positive")
+        self.validator_count = validator_count
+        self.quorum = 2 * validator_count // 3 + 1
+        self.tolerance = tolerance
+        self.epoch_length = epoch_length
+        self.origin = origin
+        self.trim = trim
+        self.on_agreement = on_agreement
+        self.max_epochs = max_epochs
+        self.equivocators: Set[Tuple[int, Hashable]] = set()
+        self._epochs: Dict[int, EpochTally] = {}
+        self._evicted_before: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def epoch_of(self, timestamp: float) -> int:
+        """Epoch a timestamp falls in."""
+        return math.floor((timestamp - self.origin) / self.epoch_length)
+
+    def submit(self, validator_id: Hashable, proof, epoch: Optional[int] = None) -> Optional[Agreement]:
+        """Count a verified proof as ``validator_id``'s vote.
+
+        Returns the agreement if this vote completed a quorum.
+        """
+        return self.submit_time(validator_id, proof.timestamp, epoch)
+
+    def submit_time(self, validator_id: Hashable, timestamp: float,
+                    epoch: Optional[int] = None) -> Optional[Agreement]:
+        """Count ``timestamp`` as ``validator_id``'s vote.
+
+        An explicit ``epoch`` counts the vote for that epoch only.
+        """
+        if epoch is None:
+            # Its own epoch and any whose boundary is within tolerance
+            first = self.epoch_of(timestamp - self.tolerance)
+            last = self.epoch_of(timestamp + self.tolerance)
+        else:
+            first = last = epoch
+        own = self.epoch_of(timestamp) if epoch is None else epoch
+        agreements = []
+        with self._lock:
+            for e in range(first, last + 1):
+                agreement = self._add_vote(e, validator_id, timestamp, borrowed=e != own)
+                if agreement is not None:
+                    agreements.append(agreement)
+
+        if self.on_agreement is not None:
+            for agreement in agreements:
+                try:
+                    self.on_agreement(agreement)
+                except Exception as e:
+                    print(f"Error in agreement callback: {e}")
+        return agreements[0] if agreements else None
+
+    def agreement(self, epoch: int) -> Optional[Agreement]:
+        """Decided time of ``epoch``, if any."""
+        tally = self._epochs.get(epoch)
+        return tally.agreement if tally is not None else None
+
+    def estimate(self, epoch: int) -> Optional[Tuple[float, float]]:
+        """Current median and trimmed mean of ``epoch``'s votes.
+
+        None until the epoch has a vote within tolerance of its median.
+        """
+        with self._lock:
+            tally = self._epochs.get(epoch)
+            if tally is None or not len(tally):
+                return None
+            median = tally.median()
+            lo, hi = tally.window(median, self.tolerance)
+            if hi == lo:
+                return None
+            return median, tally.trimmed_mean(lo, hi, self.trim)
+
+    def votes(self, epoch: int) -> int:
+        """Number of distinct validators that voted in ``epoch``."""
+        tally = self._epochs.get(epoch)
+        return len(tally) if tally is not None else 0
+
+    def _add_vote(self, epoch: int, validator_id: Hashable, timestamp: float,
+                  borrowed: bool = False) -> Optional[Agreement]:
+        tally = self._tally(epoch)
+        if tally is None or tally.agreement is not None:
+            return None
+
+        previous = tally.voters.get(validator_id)
+        if previous is not None:
+            if borrowed:
+                # Boundary copies never count against a validator
+                return None
+            if validator_id not in tally.borrowed:
+                if previous != timestamp:
+                    self.equivocators.add((epoch, validator_id))
+                return None
+            tally.borrowed.discard(validator_id)
+            tally.replace(validator_id, timestamp)
+        else:
+            tally.add(validator_id, timestamp)
+            if borrowed:
+                tally.borrowed.add(validator_id)
+        if len(tally) < self.quorum:
+            return None
+
+        median = tally.median()
+        lo, hi = tally.window(median, self.tolerance)
+        if hi - lo < self.quorum or self._agreed_near(epoch, median):
+            return None
+
+        agreed = tally.trimmed_mean(lo, hi, self.trim)
+        target = self.epoch_of(agreed)
+        owner = tally if target == epoch else self._tally(target)
+        if owner is None or owner.agreement is not None or self._agreed_near(target, agreed):
+            return None
+        owner.agreement = Agreement(target, agreed, median, hi - lo, self.quorum)
+        return owner.agreement
+
+    def _agreed_near(self, epoch: int, time: float) -> bool:
+        """Whether a neighbour of ``epoch`` already agreed within tolerance of ``time``."""
+        for neighbour in (epoch - 1, epoch + 1):
+            tally = self._epochs.get(neighbour)
+            agreement = tally.agreement if tally is not None else None
+            if agreement is not None and abs(agreement.time - time) <= self.tolerance:
+                return True
+        return False
+
+    def _tally(self, epoch: int) -> Optional[EpochTally]:
+        """Tally for ``epoch``, created on first vote; None if already evicted."""
+        tally = self._epochs.get(epoch)
+        if tally is not None:
+            return tally
+        if self._evicted_before is not None and epoch <= self._evicted_before:
+            return None
+
+        tally = self._epochs[epoch] = EpochTally()
+        while len(self._epochs) > self.max_epochs:
+            oldest = min(self._epochs)
+            del self._epochs[oldest]
+            if self._evicted_before is None or oldest > self._evicted_before:
+                self._evicted_before = oldest
+        return self._epochs.get(epoch)
@@ -0,0 +1,375 @@
+"""Append-only, segmented on-disk log of accepted proofs and agreements.
+
+Each segment ``NNNNNNNN.seg`` is a sequence of records::
+
+    length u32, kind u8, timestamp f64, crc32 u32, payload
+
+where the payload is a ``TimeProof`` in the binary wire format (kind
+PROOF) or a packed consensus ``Agreement`` (kind AGREEMENT). Appends go
+through a buffered file; reads go through ``mmap`` and hand out views into
+the mapping, so an audit over months of history touches only the pages it
+scans.
+
+Every segment keeps two indexes:
+
+- a sparse time index with one ``(running max timestamp, offset)`` entry
+  every ``index_every`` records. Records arrive roughly in time order but
+  not exactly, so the store requires every timestamp to be within
+  ``max_skew`` of the newest one, which bounds how far a range scan has to
+  read past its end;
+- a fingerprint index: a dict for the active segment, and for sealed ones
+  a sorted array of ``(fingerprint prefix, offset)`` pairs searched in
+  place.
+
+A segment is sealed, and its indexes written to ``NNNNNNNN.idx``, once it
+spans ``segment_age`` seconds or grows past ``segment_bytes``. ``compact``
+deletes sealed segments older than the retention horizon. When the store
+is reopened the active segment is rescanned and a torn tail is truncated.
+"""
+from bisect import bisect_left
+from typing import Dict, Iterator, List, Optional, Tuple
+import mmap
+import os
+import struct
+import threading
+import zlib
+import numpy as np
+from ..consensus.engine import Agreement
+from ..secure_enclave.proof_codec import FIELD_BYTES, HEADER as PROOF_HEADER, TimeProofView
+
+PROOF = 1
+AGREEMENT = 2
+
+RECORD_HEADER = struct.Struct("<IBdI")
+AGREEMENT_RECORD = struct.Struct("<qddII")
+# Offset of the raw fingerprint within a binary proof
+FINGERPRINT_OFFSET = PROOF_HEADER.size + FIELD_BYTES
+
+INDEX_MAGIC = b"SIDX"
+INDEX_VERSION = 1
+INDEX_HEADER = struct.Struct("<4sBQQQdd")
+TIME_ENTRY = np.dtype([("max_timestamp", "<f8"), ("offset", "<u8")])
+FINGERPRINT_ENTRY = np.dtype([("key", "<u8"), ("offset", "<u8")])
+
+
+def fingerprint_key(fingerprint: bytes) -> int:
+    """Sort key of a raw fingerprint in sealed indexes: its first eight bytes."""
+    return int.from_bytes(fingerprint[:8], "little")
+
+
+class Segment:
+    """One segment file with its sparse time and fingerprint indexes."""
+
+    def __init__(self, directory: str, seq: int, index_every: int):
+        """Describe segment ``seq``; call ``load``/``recover`` or start appending."""
+        self.seq = seq
+        self.path = os.path.join(directory, f"{seq:08d}.seg")
+        self.index_path = os.path.join(directory, f"{seq:08d}.idx")
+        self.index_every = index_every
+        self.size = 0
+        self.count = 0
+        self.min_timestamp = float("inf")
+        self.max_timestamp = float("-inf")
+        self.sealed = False
+        self._time_max: List[float] = []
+        self._time_offsets: List[int] = []
+        self._fingerprints: Dict[bytes, int] = {}
+        self._fp_index: Optional[np.ndarray] = None
+        self._file = None
+        self._map: Optional[mmap.mmap] = None
+        self._mapped_size = 0
+
+    # Writing
+
+    def open_for_append(self) -> None:
+        self._file = open(self.path, "ab")
+
+    def append(self, kind: int, timestamp: float, payload: bytes) -> None:
+        offset = self.size
+        header = RECORD_HEADER.pack(len(payload), kind, timestamp, zlib.crc32(payload))
+        self._file.write(header)
+        self._file.write(payload)
+        self.size += len(header) + len(payload)
+        self._index(kind, timestamp, offset, payload)
+
+    def flush(self, fsync: bool = False) -> None:
+        if self._file is not None:
+            self._file.flush()
+            if fsync:
+                os.fsync(self._file.fileno())
+
+    def seal(self) -> None:
+        """Close for appends and persist the indexes next to the segment."""
+        self.flush(fsync=True)
+        self._file.close()
+        self._file = None
+
+        time_index = np.empty(len(self._time_max), dtype=TIME_ENTRY)
+        time_index["max_timestamp"] = self._time_max
+        time_index["offset"] = self._time_offsets
+        fp_index = np.empty(len(self._fingerprints), dtype=FINGERPRINT_ENTRY)
+        fp_index["key"] = [fingerprint_key(fp) for fp in self._fingerprints]
+        fp_index["offset"] = list(self._fingerprints.values())
+        fp_index.sort(order="key", kind="stable")
+
+        tmp = self.index_path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, self.count, len(time_index),
+                                      len(fp_index), self.min_timestamp, self.max_timestamp))
+            f.write(time_index.tobytes())
+            f.write(fp_index.tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.index_path)
+
+        self._fp_index = fp_index
+        self._fingerprints = {}
+        self.sealed = True
+
+    # Loading
+
+    def load(self) -> bool:
+        """Load a sealed segment's indexes; False if there are none."""
+        try:
+            with open(self.index_path, "rb") as f:
+                data = f.read()
+            (magic, version, self.count, n_time, n_fp,
+             self.min_timestamp, self.max_timestamp) = INDEX_HEADER.unpack_from(data)
+        except (OSError, struct.error):
+            return False
+        if magic != INDEX_MAGIC or version != INDEX_VERSION:
+            return False
+
+        offset = INDEX_HEADER.size
+        time_index = np.frombuffer(data, dtype=TIME_ENTRY, count=n_time, offset=offset)
+        offset += time_index.nbytes
+        self._fp_index = np.frombuffer(data, dtype=FINGERPRINT_ENTRY, count=n_fp, offset=offset)
+        self._time_max = time_index["max_timestamp"].tolist()
+        self._time_offsets = time_index["offset"].tolist()
+        self.size = os.path.getsize(self.path)
+        self.sealed = True
+        return True
+
+    def recover(self) -> None:
+        """Rebuild the indexes by scanning, truncating any torn or corrupt tail."""
+        self.size = os.path.getsize(self.path)
+        valid_end = 0
+        for kind, timestamp, offset, payload in self.records(0, verify=True):
+            self._index(kind, timestamp, offset, payload)
+            valid_end = offset + RECORD_HEADER.size + len(payload)
+        if valid_end < self.size:
+            print(f"Truncating {self.size - valid_end} bytes of torn records in {self.path}")
+            self.close_map()
+            with open(self.path, "r+b") as f:
+                f.truncate(valid_end)
+            self.size = valid_end
+
+    # Reading
+
+    def records(self, start: int = 0, verify: bool = False
+                ) -> Iterator[Tuple[int, float, int, memoryview]]:
+        """Yield ``(kind, timestamp, offset, payload)`` from byte ``start`` on."""
+        buf = self._view()
+        offset = start
+        end = len(buf)
+        while offset + RECORD_HEADER.size <= end:
+            length, kind, timestamp, crc = RECORD_HEADER.unpack_from(buf, offset)
+            body = offset + RECORD_HEADER.size
+            if body + length > end:
+                return
+            payload = buf[body:body + length]
+            if verify and zlib.crc32(payload) != crc:
+                return
+            yield kind, timestamp, offset, payload
+            offset = body + length
+
+    def scan_start(self, start: float) -> int:
+        """Offset from which every record with timestamp >= ``start`` follows."""
+        i = bisect_left(self._time_max, start)
+        return self._time_offsets[i] if i < len(self._time_offsets) else self.size
+
+    def find(self, fingerprint: bytes) -> Optional[memoryview]:
+        """Payload of the proof with this raw fingerprint, if stored here."""
+        if not self.sealed:
+            offset = self._fingerprints.get(fingerprint)
+            return self._payload_at(offset) if offset is not None else None
+
+        key = fingerprint_key(fingerprint)
+        keys = self._fp_index["key"]
+        lo = int(np.searchsorted(keys, key, side="left"))
+        hi = int(np.searchsorted(keys, key, side="right"))
+        for offset in self._fp_index["offset"][lo:hi]:
+            payload = self._payload_at(int(offset))
+            if payload[FINGERPRINT_OFFSET:FINGERPRINT_OFFSET + 32] == fingerprint:
+                return payload
+        return None
+
+    def close_map(self) -> None:
+        if self._map is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                # Views handed out are still alive; the mapping goes with them
+                pass
+            self._map = None
+            self._mapped_size = 0
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self.close_map()
+
+    def _view(self) -> memoryview:
+        if self._map is None or self._mapped_size != self.size:
+            self.close_map()
+            if self.size == 0:
+                return memoryview(b"")
+            with open(self.path, "rb") as f:
+                self._map = mmap.mmap(f.fileno(), self.size, access=mmap.ACCESS_READ)
+            self._mapped_size = self.size
+        return memoryview(self._map)
+
+    def _payload_at(self, offset: int) -> memoryview:
+        buf = self._view()
+        length = RECORD_HEADER.unpack_from(buf, offset)[0]
+        body = offset + RECORD_HEADER.size
+        return buf[body:body + length]
+
+    def _index(self, kind: int, timestamp: float, offset: int, payload) -> None:
+        if self.count % self.index_every == 0:
+            self._time_max.append(max(timestamp, self.max_timestamp))
+            self._time_offsets.append(offset)
+        elif timestamp > self._time_max[-1]:
+            self._time_max[-1] = timestamp
+        self.count += 1
+        self.min_timestamp = min(self.min_timestamp, timestamp)
+        self.max_timestamp = max(self.max_timestamp, timestamp)
+        if kind == PROOF:
+            fingerprint = bytes(payload[FINGERPRINT_OFFSET:FINGERPRINT_OFFSET + 32])
+            self._fingerprints.setdefault(fingerprint, offset)
+
+
+class ProofStore:
+    """Durable history of accepted proofs and consensus results."""
+
+    def __init__(self, directory: str, segment_age: float = 3600.0,
+                 segment_bytes: int = 256 * 1024 * 1024, index_every: int = 64,
+                 max_skew: float = 2.0):
+        """Open (or create) the store in ``directory``."""
+        self.directory = directory
+        self.segment_age = segment_age
+        self.segment_bytes = segment_bytes
+        self.index_every = index_every
+        self.max_skew = max_skew
+        self.segments: List[Segment] = []
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._open()
+
+    def __len__(self) -> int:
+        return sum(segment.count for segment in self.segments)
+
+    def append_proof(self, proof) -> None:
+        """Store an accepted ``TimeProof`` (or view)."""
+        self._append(PROOF, float(proof.timestamp), proof.to_bytes())
+
+    def append_agreement(self, agreement: Agreement) -> None:
+        """Store a consensus result."""
+        self._append(AGREEMENT, agreement.time, AGREEMENT_RECORD.pack(*agreement))
+
+    def flush(self, fsync: bool = False) -> None:
+        """Push buffered appends to the OS (and to disk with ``fsync``)."""
+        with self._lock:
+            self.segments[-1].flush(fsync)
+
+    def get(self, fingerprint: str) -> Optional[TimeProofView]:
+        """Look up a stored proof by satellite fingerprint."""
+        raw = bytes.fromhex(fingerprint)
+        with self._lock:
+            self.segments[-1].flush()
+            for segment in reversed(self.segments):
+                payload = segment.find(raw)
+                if payload is not None:
+                    return TimeProofView(payload)
+        return None
+
+    def proofs(self, start: float, end: float) -> Iterator[TimeProofView]:
+        """Stored proofs with ``start <= timestamp <= end``, in append order."""
+        for kind, payload in self._scan(start, end):
+            if kind == PROOF:
+                yield TimeProofView(payload)
+
+    def agreements(self, start: float, end: float) -> Iterator[Agreement]:
+        """Stored consensus results with ``start <= time <= end``."""
+        for kind, payload in self._scan(start, end):
+            if kind == AGREEMENT:
+                yield Agreement(*AGREEMENT_RECORD.unpack(payload))
+
+    def roll(self) -> None:
+        """Seal the active segment and start a new one."""
+        with self._lock:
+            self._roll()
+
+    def compact(self, before: float) -> int:
+        """Delete sealed segments whose newest record is older than ``before``."""
+        with self._lock:
+            expired = [s for s in self.segments if s.sealed and s.max_timestamp < before]
+            for segment in expired:
+                segment.close()
+                os.remove(segment.path)
+                os.remove(segment.index_path)
+                self.segments.remove(segment)
+            return len(expired)
+
+    def close(self) -> None:
+        with self._lock:
+            for segment in self.segments:
+                segment.flush()
+                segment.close()
+
+    def _open(self) -> None:
+        seqs = sorted(int(name[:-4]) for name in os.listdir(self.directory) if name.endswith(".seg"))
+        for seq in seqs:
+            segment = Segment(self.directory, seq, self.index_every)
+            if not segment.load():
+                segment.recover()
+            self.segments.append(segment)
+
+        if not self.segments or self.segments[-1].sealed:
+            self.segments.append(Segment(self.directory, seqs[-1] + 1 if seqs else 0, self.index_every))
+        self.segments[-1].open_for_append()
+
+    def _append(self, kind: int, timestamp: float, payload: bytes) -> None:
+        with self._lock:
+            active = self.segments[-1]
+            newest = max((s.max_timestamp for s in self.segments[-2:]), default=timestamp)
+            if timestamp < newest - self.max_skew:
+                raise ValueError(f"Record at {timestamp} is more than {self.max_skew}s "
+                                 f"older than the newest stored record")
+            if active.count and (timestamp - active.min_timestamp >= self.segment_age
+                                 or active.size >= self.segment_bytes):
+                active = self._roll()
+            active.append(kind, timestamp, payload)
+
+    def _roll(self) -> Segment:
+        active = self.segments[-1]
+        if not active.count:
+            return active
+        active.seal()
+        segment = Segment(self.directory, active.seq + 1, self.index_every)
+        segment.open_for_append()
+        self.segments.append(segment)
+        return segment
+
+    def _scan(self, start: float, end: float) -> Iterator[Tuple[int, memoryview]]:
+        with self._lock:
+            self.segments[-1].flush()
+            segments = [s for s in self.segments
+                        if s.count and s.max_timestamp >= start and s.min_timestamp <= end]
+        for segment in segments:
+            for kind, timestamp, _, payload in segment.records(segment.scan_start(start)):
+                if timestamp > end + self.max_skew:
+                    break
+                if start <= timestamp <= end:
+                    yield kind, payload
@@ -0,0 +1,82 @@
+from typing import Optional, Tuple
+import math
+
+
+class ClockFilter:
+    """Two-state Kalman filter tracking receiver clock bias and drift.
+
+    The clock follows the standard random-walk model: the bias integrates
+    the drift, white frequency noise (``bias_noise``, s^2/s) perturbs the
+    bias and random-walk frequency noise (``drift_noise``, s^2/s^3) the
+    drift. The defaults suit a TCXO. Each step is a handful of scalar
+    operations on the 2x2 covariance, so the cost does not depend on how
+    long the filter has been running.
+
+    Measurements whose normalized innovation exceeds ``gate`` standard
+    deviations are rejected without touching the state, which is how clock
+    jumps and corrupted epochs are caught before they are accepted.
+    """
+
+    def __init__(self, bias_noise: float = 1e-19, drift_noise: float = 4e-19,
+                 gate: float = 5.0, initial_drift_sigma: float = 1e-6):
+        """Initialize an empty filter; ``initialize`` sets the first state."""
+        self.bias_noise = bias_noise
+        self.drift_noise = drift_noise
+        self.gate = gate
+        self.initial_drift_sigma = initial_drift_sigma
+        self.time: Optional[float] = None
+        self.bias = 0.0
+        self.drift = 0.0
+        # Upper triangle of the covariance: var(bias), cov(bias, drift), var(drift)
+        self.p00 = self.p01 = self.p11 = 0.0
+        self.last_innovation: Optional[float] = None
+
+    @property
+    def initialized(self) -> bool:
+        return self.time is not None
+
+    def initialize(self, t: float, bias: float, bias_variance: float, drift: float = 0.0) -> None:
+        """Start from a bias measured at time ``t`` (seconds) and unknown drift."""
+        self.time = t
+        self.bias = bias
+        self.drift = drift
+        self.p00 = bias_variance
+        self.p01 = 0.0
+        self.p11 = self.initial_drift_sigma ** 2
+        self.last_innovation = None
+
+    def reset(self) -> None:
+        self.time = None
+        self.last_innovation = None
+
+    def predict(self, t: float) -> Tuple[float, float, float, float, float]:
+        """Predicted bias, drift and covariance (p00, p01, p11) at ``t``; state is unchanged."""
+        dt = t - self.time
+        q1, q2 = self.bias_noise, self.drift_noise
+        gap = abs(dt)
+        p00 = self.p00 + 2.0 * dt * self.p01 + dt * dt * self.p11 + q1 * gap + q2 * gap ** 3 / 3.0
+        p01 = self.p01 + dt * self.p11 + q2 * dt * gap / 2.0
+        p11 = self.p11 + q2 * gap
+        return self.bias + self.drift * dt, self.drift, p00, p01, p11
+
+    def update(self, t: float, measurement: float, variance: float) -> bool:
+        """Fuse a bias measurement taken at ``t``; False if it fails the gate."""
+        bias, drift, p00, p01, p11 = self.predict(t)
+        innovation = measurement - bias
+        s = p00 + variance
+        self.last_innovation = innovation
+        if innovation * innovation > self.gate * self.gate * s:
+            return False
+
+        k0, k1 = p00 / s, p01 / s
+        self.time = t
+        self.bias = bias + k0 * innovation
+        self.drift = drift + k1 * innovation
+        self.p00 = (1.0 - k0) * p00
+        self.p01 = (1.0 - k0) * p01
+        self.p11 = p11 - k1 * p01
+        return True
+
+    @property
+    def bias_sigma(self) -> float:
+        return math.sqrt(max(self.p00, 0.0))
@@ -0,0 +1,174 @@
+from dataclasses import dataclass
+from typing import Optional, Sequence, Tuple
+import time
+import numpy as np
+from .satellite_batch import SatelliteBatch
+
+SPEED_OF_LIGHT = 299792458.0  # m/s
+
+
+@dataclass
+class ClockSolution:
+    positions: np.ndarray    # (M, 3) receiver ECEF positions in metres
+    clock_bias: np.ndarray   # (M,) receiver clock bias in seconds
+    residuals: np.ndarray    # (M, N) post-fit pseudorange residuals in metres
+    used: np.ndarray         # (M, N) satellites kept after outlier rejection
+    converged: np.ndarray    # (M,) whether each epoch met the tolerance
+    iterations: int          # Gauss-Newton iterations over the whole batch
+    latency: float           # Wall time of the solve in seconds
+
+
+class ClockSolver:
+    """Weighted least-squares position and clock-bias solver.
+
+    Solves many epochs at once: each Gauss-Newton step builds and solves
+    the (M, 4, 4) normal equations for all epochs in a handful of array
+    operations. Each batch starts from the last solution of the previous
+    one, which is usually a few metres and nanoseconds away, so steady-state
+    solves need far fewer iterations than a cold start from Earth's centre.
+
+    After convergence, a RAIM-style residual test drops the worst satellite
+    of any epoch whose largest residual exceeds ``residual_threshold`` (as
+    long as more than four satellites remain) and the epoch is re-solved.
+    """
+
+    def __init__(self, max_iterations: int = 10, tolerance: float = 1e-4,
+                 residual_threshold: float = 100.0, max_exclusions: int = 2):
+        """Initialize the solver; tolerance and threshold are in metres."""
+        self.max_iterations = max_iterations
+        self.tolerance = tolerance
+        self.residual_threshold = residual_threshold
+        self.max_exclusions = max_exclusions
+        self.last_state: Optional[np.ndarray] = None
+        self.last_solution: Optional[ClockSolution] = None
+
+    def solve(self, satellite_positions: np.ndarray, pseudoranges: np.ndarray,
+              weights: Optional[np.ndarray] = None,
+              initial: Optional[np.ndarray] = None) -> ClockSolution:
+        """Solve receiver position and clock bias for a batch of epochs.
+
+        ``satellite_positions`` has shape (M, N, 3) in metres and
+        ``pseudoranges`` shape (M, N) in metres; a single epoch may be given
+        as (N, 3) and (N,). Zero weights mark padding or unusable
+        satellites. ``initial`` is a (4,) or (M, 4) state of position and
+        clock bias in metres; by default the previous solution is used.
+        """
+        start = time.perf_counter()
+        count = np.shape(pseudoranges)[-1]
+        sats = np.asarray(satellite_positions, dtype=np.float64).reshape(-1, count, 3)
+        rho_obs = np.asarray(pseudoranges, dtype=np.float64).reshape(sats.shape[:2])
+        if weights is None:
+            w = np.ones(rho_obs.shape)
+        else:
+            w = np.broadcast_to(weights, rho_obs.shape).astype(np.float64)
+        used = w > 0
+
+        if initial is None:
+            initial = self.last_state if self.last_state is not None else np.zeros(4)
+        state = np.broadcast_to(np.asarray(initial, dtype=np.float64), (sats.shape[0], 4)).copy()
+
+        iterations = 0
+        for _ in range(self.max_exclusions + 1):
+            state, residuals, converged, steps = self._gauss_newton(sats, rho_obs, w * used, state)
+            iterations += steps
+            if not self._exclude_outliers(residuals, used):
+                break
+
+        solution = ClockSolution(
+            positions=state[:, :3],
+            clock_bias=state[:, 3] / SPEED_OF_LIGHT,
+            residuals=residuals,
+            used=used,
+            converged=converged,
+            iterations=iterations,
+            latency=time.perf_counter() - start,
+        )
+        if np.all(np.isfinite(state[-1])):
+            self.last_state = state[-1].copy()
+        self.last_solution = solution
+        return solution
+
+    def solve_epochs(self, epochs: Sequence[Sequence]) -> Tuple[np.ndarray, ClockSolution]:
+        """Solve receiver time for many epochs of satellites.
+
+        Each epoch is a list of ``SatelliteData`` or a ``SatelliteBatch``.
+        Epochs may have different satellite counts; shorter ones are padded
+        with zero-weight entries. Returns the corrected receiver time of
+        each epoch in seconds along with the full solution.
+        """
+        count = max(len(sats) for sats in epochs)
+        positions = np.zeros((len(epochs), count, 3))
+        received = np.zeros((len(epochs), count))
+        travel = np.zeros((len(epochs), count))
+        weights = np.zeros((len(epochs), count))
+        for m, sats in enumerate(epochs):
+            n = len(sats)
+            if isinstance(sats, SatelliteBatch):
+                positions[m, :n] = sats.positions
+                received[m, :n] = sats.atomic_timestamps
+                travel[m, :n] = sats.travel_times
+            else:
+                positions[m, :n] = [sat.position for sat in sats]
+                received[m, :n] = [sat.atomic_timestamp for sat in sats]
+                travel[m, :n] = [sat.travel_time for sat in sats]
+            weights[m, :n] = 1.0
+
+        # From the travel times, not the difference of absolute timestamps,
+        # which would round the pseudoranges to tens of metres
+        pseudoranges = SPEED_OF_LIGHT * travel
+        # Satellites without signal timing (NMEA) carry a NaN travel time
+        measured = np.isfinite(pseudoranges) & (weights > 0)
+        weights = measured.astype(np.float64)
+        solution = self.solve(positions, np.where(measured, pseudoranges, 0.0), weights)
+
+        # Local receive time corrected by the solved clock bias; epochs with
+        # fewer than four measured satellites have no solution
+        count = weights.sum(axis=1)
+        receive_time = np.where(measured, received, 0.0).sum(axis=1) / np.maximum(count, 1.0)
+        return np.where(count >= 4, receive_time - solution.clock_bias, np.nan), solution
+
+    def solve_time(self, satellites: Sequence) -> Optional[float]:
+        """Corrected receiver time in seconds for one epoch, or None."""
+        times, _ = self.solve_epochs([satellites])
+        return float(times[0]) if np.isfinite(times[0]) else None
+
+    def _gauss_newton(self, sats: np.ndarray, rho_obs: np.ndarray, w: np.ndarray,
+                      state: np.ndarray):
+        """Iterate weighted normal-equation updates until every epoch converges."""
+        converged = np.zeros(state.shape[0], dtype=bool)
+        steps = 0
+        for steps in range(1, self.max_iterations + 1):
+            line_of_sight = sats - state[:, None, :3]
+            ranges = np.linalg.norm(line_of_sight, axis=-1)
+            ranges = np.where(ranges > 0, ranges, 1.0)
+            residuals = rho_obs - (ranges + state[:, None, 3])
+
+            H = np.empty(sats.shape[:2] + (4,))
+            H[..., :3] = -line_of_sight / ranges[..., None]
+            H[..., 3] = 1.0
+
+            HtW = H.transpose(0, 2, 1) * w[:, None, :]
+            normal = HtW @ H
+            # Light damping keeps degenerate geometries from being singular
+            normal += np.eye(4) * (1e-9 * np.trace(normal, axis1=1, axis2=2)[:, None, None] + 1e-12)
+            delta = np.linalg.solve(normal, (HtW @ residuals[..., None]))[..., 0]
+
+            state += delta
+            converged = np.max(np.abs(delta), axis=1) < self.tolerance
+            if np.all(converged):
+                break
+
+        line_of_sight = sats - state[:, None, :3]
+        residuals = rho_obs - (np.linalg.norm(line_of_sight, axis=-1) + state[:, None, 3])
+        return state, np.where(w > 0, residuals, 0.0), converged, steps
+
+    def _exclude_outliers(self, residuals: np.ndarray, used: np.ndarray) -> bool:
+        """Drop the worst satellite of each failing epoch; True if any dropped."""
+        magnitude = np.where(used, np.abs(residuals), -np.inf)
+        worst = np.argmax(magnitude, axis=1)
+        worst_value = magnitude[np.arange(len(worst)), worst]
+        failing = (worst_value > self.residual_threshold) & (used.sum(axis=1) > 4)
+        if not np.any(failing):
+            return False
+        used[np.nonzero(failing)[0], worst[failing]] = False
+        return True
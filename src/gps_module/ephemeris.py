@@ -0,0 +1,168 @@
+from collections import OrderedDict
+from typing import Dict, Sequence, Tuple
+import numpy as np
+
+MU_EARTH = 3.986005e14          # WGS-84 gravitational parameter (m^3/s^2)
+OMEGA_EARTH = 7.2921151467e-5   # WGS-84 Earth rotation rate (rad/s)
+
+# Column order of the element array built from ephemeris dicts. Units follow
+# the receiver's ephemeris_data: semi-major axis in km, angles in degrees,
+# reference time in seconds on the same scale as the query epochs. The
+# broadcast perturbation terms are optional and default to zero: rates in
+# degrees per second, harmonic angle corrections in radians and harmonic
+# radius corrections in metres.
+ELEMENT_FIELDS = (
+    "semi_major_axis",
+    "eccentricity",
+    "inclination",
+    "right_ascension",
+    "argument_of_perigee",
+    "mean_anomaly",
+    "reference_time",
+    "mean_motion_delta",
+    "right_ascension_rate",
+    "inclination_rate",
+    "cuc",
+    "cus",
+    "crc",
+    "crs",
+    "cic",
+    "cis",
+)
+
+
+class EphemerisEngine:
+    """Batched broadcast-ephemeris orbit propagation to ECEF positions.
+
+    ``positions`` propagates every satellite to every epoch in one set of
+    array operations. Terms that depend only on the ephemeris (mean motion,
+    trigonometry of the orbital angles, ...) are cached per ephemeris set,
+    so repeated queries within its validity window only pay for the
+    time-dependent part.
+    """
+
+    def __init__(self, max_cached: int = 64, kepler_tolerance: float = 1e-12,
+                 max_iterations: int = 10):
+        """Initialize the engine with an empty term cache."""
+        self.max_cached = max_cached
+        self.kepler_tolerance = kepler_tolerance
+        self.max_iterations = max_iterations
+        self._cache: "OrderedDict[bytes, Dict[str, np.ndarray]]" = OrderedDict()
+
+    @staticmethod
+    def elements_array(ephemerides: Sequence[Dict[str, float]]) -> np.ndarray:
+        """Stack per-satellite ephemeris dicts into an (N, 16) element array."""
+        return np.array(
+            [[eph.get(field, 0.0) for field in ELEMENT_FIELDS] for eph in ephemerides],
+            dtype=np.float64,
+        ).reshape(-1, len(ELEMENT_FIELDS))
+
+    def positions(self, ephemerides, epochs) -> np.ndarray:
+        """ECEF positions in metres with shape (epochs, satellites, 3).
+
+        ``ephemerides`` is either a list of ephemeris dicts or an element
+        array from ``elements_array``; ``epochs`` is a scalar or 1-D array.
+        """
+        terms = self._terms(self._elements(ephemerides))
+        t = np.atleast_1d(np.asarray(epochs, dtype=np.float64))
+        return self._propagate(terms, t[:, None])
+
+    def positions_at(self, ephemerides, epochs) -> np.ndarray:
+        """ECEF positions with shape (satellites, 3), each at its own epoch.
+
+        Used for signal transmission times, which differ per satellite.
+        """
+        terms = self._terms(self._elements(ephemerides))
+        return self._propagate(terms, np.asarray(epochs, dtype=np.float64))
+
+    def position(self, ephemeris: Dict[str, float], epoch: float) -> Tuple[float, float, float]:
+        """ECEF position of one satellite at one epoch."""
+        x, y, z = self.positions([ephemeris], epoch)[0, 0]
+        return float(x), float(y), float(z)
+
+    def _elements(self, ephemerides) -> np.ndarray:
+        if isinstance(ephemerides, np.ndarray):
+            return ephemerides
+        return self.elements_array(ephemerides)
+
+    def _propagate(self, terms: Dict[str, np.ndarray], t: np.ndarray) -> np.ndarray:
+        """Broadcast orbit model (IS-GPS-200) at times ``t`` broadcastable to (..., N)."""
+        # Time since the reference epoch
+        tk = t - terms["toe"]
+        mean_anomaly = terms["M0"] + terms["n"] * tk
+        ecc_anomaly = self._solve_kepler(mean_anomaly, terms["e"])
+
+        sin_E = np.sin(ecc_anomaly)
+        cos_E = np.cos(ecc_anomaly)
+        true_anomaly = np.arctan2(terms["sqrt_1_e2"] * sin_E, cos_E - terms["e"])
+        phi = true_anomaly + terms["omega"]
+
+        # Second-harmonic perturbations
+        sin_2phi = np.sin(2.0 * phi)
+        cos_2phi = np.cos(2.0 * phi)
+        arg_latitude = phi + terms["cus"] * sin_2phi + terms["cuc"] * cos_2phi
+        radius = (terms["a"] * (1.0 - terms["e"] * cos_E)
+                  + terms["crs"] * sin_2phi + terms["crc"] * cos_2phi)
+        inclination = (terms["i0"] + terms["cis"] * sin_2phi + terms["cic"] * cos_2phi
+                       + terms["idot"] * tk)
+
+        x_orb = radius * np.cos(arg_latitude)
+        y_orb = radius * np.sin(arg_latitude)
+
+        # Longitude of the ascending node in the rotating Earth frame
+        node = terms["Omega0"] + terms["Omega_dot"] * tk - OMEGA_EARTH * t
+        sin_node = np.sin(node)
+        cos_node = np.cos(node)
+        cos_i = np.cos(inclination)
+
+        out = np.empty(np.shape(tk) + (3,))
+        out[..., 0] = x_orb * cos_node - y_orb * cos_i * sin_node
+        out[..., 1] = x_orb * sin_node + y_orb * cos_i * cos_node
+        out[..., 2] = y_orb * np.sin(inclination)
+        return out
+
+    def _solve_kepler(self, mean_anomaly: np.ndarray, e: np.ndarray) -> np.ndarray:
+        """Solve M = E - e sin(E) for E with vectorized Newton iterations."""
+        E = mean_anomaly.copy()
+        for _ in range(self.max_iterations):
+            delta = (E - e * np.sin(E) - mean_anomaly) / (1.0 - e * np.cos(E))
+            E -= delta
+            if not delta.size or np.max(np.abs(delta)) < self.kepler_tolerance:
+                break
+        return E
+
+    def _terms(self, elements: np.ndarray) -> Dict[str, np.ndarray]:
+        """Ephemeris-only terms, cached by the element values."""
+        key = elements.tobytes()
+        terms = self._cache.get(key)
+        if terms is not None:
+            self._cache.move_to_end(key)
+            return terms
+
+        a = elements[:, 0] * 1e3
+        e = elements[:, 1]
+        n0 = np.where(a > 0, np.sqrt(MU_EARTH / np.maximum(a, 1.0) ** 3), 0.0)
+        terms = {
+            "a": a,
+            "e": e,
+            "n": n0 + np.radians(elements[:, 7]),
+            "sqrt_1_e2": np.sqrt(1.0 - e * e),
+            "i0": np.radians(elements[:, 2]),
+            "Omega0": np.radians(elements[:, 3]),
+            "omega": np.radians(elements[:, 4]),
+            "M0": np.radians(elements[:, 5]),
+            "toe": elements[:, 6],
+            "Omega_dot": np.radians(elements[:, 8]),
+            "idot": np.radians(elements[:, 9]),
+            "cuc": elements[:, 10],
+            "cus": elements[:, 11],
+            "crc": elements[:, 12],
+            "crs": elements[:, 13],
+            "cic": elements[:, 14],
+            "cis": elements[:, 15],
+        }
+
+        self._cache[key] = terms
+        if len(self._cache) > self.max_cached:
+            self._cache.popitem(last=False)
+        return terms
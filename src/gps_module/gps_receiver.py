@@ -1,86 +1,202 @@
-from dataclasses import dataclass
-from typing import List, Optional, Dict, Tuple
-import serial
-import pynmea2
+from typing import Iterator, List, Optional, Dict, Tuple
 import time
+import numpy as np
 from datetime import datetime
+from ..telemetry.metrics import ERRORS, REGISTRY
+from ..telemetry.tracing import TRACER
+from .ephemeris import EphemerisEngine
+from .clock_solver import ClockSolver
+from .nmea_stream import READ_SECONDS, GSVAssembler, GSVSatellite, NMEAStreamReader, SatelliteEpoch
+from .satellite_batch import SatelliteBatch
+from .satellite_data import SatelliteData
+from .ubx_parser import UBXDecoder, UBXStreamReader
+
+EPOCH_SECONDS = REGISTRY.histogram(
+    "continuum_receiver_epoch_seconds",
+    "Time to convert one received epoch into satellite data",
+    ("protocol",),
+)
 
-@dataclass
-class SatelliteData:
-    prn_code: str                    # Unique Satellite Identifier
-    position: Tuple[float, float, float]  # X, Y, Z coordinates
-    atomic_timestamp: float          # Nanosecond precision
-    transmission_time: float         # Signal send time
-    ephemeris_data: Dict[str, float] # Orbital parameters
-    almanac_data: Dict[str, any]     # Additional satellite data including:
-                                    # - Clock correction
-                                    # - Ionospheric data
-                                    # - Atmospheric corrections
-                                    # - Satellite health
-                                    # - Doppler shift
 
 class GPSReceiver:
-    def __init__(self, port: str = "/dev/ttyUSB0", baud_rate: int = 9600):
-        """Initialize GPS receiver connection."""
+    def __init__(self, port: str = "/dev/ttyUSB0", baud_rate: int = 9600,
+                 protocol: str = "nmea"):
+        """Initialize GPS receiver connection.
+
+        ``protocol`` is "nmea" for GSV sentences or "ubx" for u-blox binary
+        raw measurements (RXM-RAWX/SFRBX, NAV-SAT), which carry the
+        pseudoranges and clock data the time solution needs.
+        """
+        if protocol not in ("nmea", "ubx"):
+            raise ValueError(f"Unknown GPS protocol: {protocol}")
         self.port = port
         self.baud_rate = baud_rate
+        self.protocol = protocol
         self.connection = None
         self.satellites: List[SatelliteData] = []
         self.min_satellites = 4
+        self.ephemeris_engine = EphemerisEngine()
+        self.clock_solver = ClockSolver()
+        self.reader: Optional[NMEAStreamReader] = None
         
     def connect(self) -> bool:
         """Establish connection with GPS module."""
         try:
+            # Only receivers with hardware attached need pyserial
+            import serial
+
             self.connection = serial.Serial(self.port, self.baud_rate, timeout=5)
             return True
         except Exception as e:
+            ERRORS.inc("receiver", "connect")
             print(f"Failed to connect to GPS module: {e}")
             return False
             
+    def start(self, capacity: int = 64) -> bool:
+        """Start continuous background ingestion into a ring buffer."""
+        if not self.connection and not self.connect():
+            return False
+        if self.reader is None:
+            if self.protocol == "ubx":
+                self.reader = UBXStreamReader(self.connection, capacity, UBXDecoder(self.ephemeris_engine))
+            else:
+                self.reader = NMEAStreamReader(self.connection, capacity)
+        self.reader.start()
+        return True
+
+    def stop(self) -> None:
+        """Stop background ingestion."""
+        if self.reader is not None:
+            self.reader.stop()
+
+    def latest_epoch(self) -> Optional[List[SatelliteData]]:
+        """Satellites of the most recent complete epoch; never blocks."""
+        if self.reader is None:
+            return None
+        epoch = self.reader.latest_epoch()
+        return self._process_epoch(epoch) if epoch is not None else None
+
+    def stream(self, timeout: Optional[float] = None) -> Iterator[List[SatelliteData]]:
+        """Yield the satellites of each complete epoch as it arrives."""
+        if self.reader is None:
+            raise ConnectionError("GPS stream not started")
+        for epoch in self.reader.stream(timeout):
+            yield self._process_epoch(epoch)
+
     def get_satellite_data(self) -> List[SatelliteData]:
-        """Collect raw data from visible satellites."""
+        """Collect raw data from visible satellites.
+
+        Blocks until a complete epoch with at least ``min_satellites``
+        satellites is available. With the background reader running this
+        is the newest buffered epoch, never an older one.
+        """
         if not self.connection:
             raise ConnectionError("GPS module not connected")
-            
-        satellites = []
-        while len(satellites) < self.min_satellites:
+
+        if self.reader is not None and self.reader.running:
+            epochs = self.reader.stream(latest=True)
+        else:
+            epochs = self._read_epochs()
+
+        for epoch in epochs:
+            satellites = self._process_epoch(epoch)
+            if len(satellites) >= self.min_satellites:
+                self.satellites = satellites
+                return satellites
+        raise ConnectionError("GPS stream ended before a complete epoch")
+
+    def _read_epochs(self) -> Iterator[SatelliteEpoch]:
+        """Read epochs synchronously from the connection."""
+        if self.protocol == "ubx":
+            yield from self._read_ubx_epochs()
+            return
+        assembler = GSVAssembler()
+        while True:
+            try:
+                with READ_SECONDS.time(self.protocol):
+                    raw_data = self.connection.readline().decode('ascii', errors='replace')
+                epoch = assembler.feed(raw_data)
+                if epoch is not None:
+                    yield epoch
+            except Exception as e:
+                ERRORS.inc("receiver", "read")
+                print(f"Error reading satellite data: {e}")
+
+    def _read_ubx_epochs(self) -> Iterator[SatelliteEpoch]:
+        decoder = UBXDecoder(self.ephemeris_engine)
+        while True:
             try:
-                raw_data = self.connection.readline().decode('ascii')
-                if raw_data.startswith('$GPGSV'):  # Satellites in view
-                    msg = pynmea2.parse(raw_data)
-                    sat_data = self._process_satellite_message(msg)
-                    if sat_data:
-                        satellites.append(sat_data)
+                with READ_SECONDS.time(self.protocol):
+                    data = self.connection.read(self.connection.in_waiting or 1)
+                yield from decoder.feed(data)
             except Exception as e:
+                ERRORS.inc("receiver", "read")
                 print(f"Error reading satellite data: {e}")
-                
-        self.satellites = satellites
+
+    def _process_epoch(self, epoch: SatelliteEpoch) -> List[SatelliteData]:
+        """Convert every satellite of an epoch into SatelliteData.
+
+        With tracing enabled this starts the epoch's trace, current in the
+        caller's context, with an ``ingest`` span from the epoch's first
+        message to now.
+        """
+        with EPOCH_SECONDS.time(self.protocol):
+            satellites = self._convert_epoch(epoch)
+        if TRACER.enabled:
+            trace = TRACER.start(epoch.timestamp)
+            trace.add("ingest", epoch.timestamp, (time.time_ns() - epoch.timestamp) / 1e9)
         return satellites
-        
-    def _process_satellite_message(self, msg) -> Optional[SatelliteData]:
-        """Process NMEA message into SatelliteData."""
+
+    def _convert_epoch(self, epoch: SatelliteEpoch) -> List[SatelliteData]:
+        if isinstance(epoch.satellites, SatelliteBatch):
+            # Binary sources decode straight to columns
+            return epoch.satellites
+        satellites = []
+        for sat in epoch.satellites:
+            sat_data = self._process_satellite_message(sat, epoch.timestamp)
+            if sat_data:
+                satellites.append(sat_data)
+        return satellites
+
+    def _process_satellite_message(self, msg: GSVSatellite,
+                                   timestamp: Optional[int] = None) -> Optional[SatelliteData]:
+        """Process one satellite of a GSV cycle into SatelliteData."""
         try:
             return SatelliteData(
-                prn_code=msg.sv_prn_num_1,
+                prn_code=msg.prn_code,
                 position=self._calculate_satellite_position(msg),
-                atomic_timestamp=time.time_ns(),  # Nanosecond precision
+                # Epochs are stamped in nanoseconds; SatelliteData holds seconds
+                atomic_timestamp=(timestamp or time.time_ns()) / 1e9,
                 transmission_time=self._get_transmission_time(msg),
                 ephemeris_data=self._get_ephemeris_data(msg),
                 almanac_data=self._get_almanac_data(msg)
             )
         except Exception as e:
+            ERRORS.inc("receiver", "process_satellite")
             print(f"Error processing satellite message: {e}")
             return None
 
     def _calculate_satellite_position(self, msg) -> Tuple[float, float, float]:
         """Calculate precise satellite position using ephemeris data."""
-        # Implementation using orbital parameters
-        pass
+        return self.ephemeris_engine.position(self._get_ephemeris_data(msg), time.time())
+
+    def calculate_satellite_positions(self, satellites: List[SatelliteData],
+                                      epochs) -> np.ndarray:
+        """Propagate all satellites to many epochs in one batched call.
+
+        Returns ECEF positions in metres with shape (epochs, satellites, 3).
+        """
+        return self.ephemeris_engine.positions(
+            [sat.ephemeris_data for sat in satellites], epochs
+        )
 
     def _get_transmission_time(self, msg) -> float:
-        """Extract precise transmission time from satellite signal."""
-        # Implementation for transmission time calculation
-        pass
+        """Extract precise transmission time from satellite signal.
+
+        GSV sentences carry no signal timing, so NMEA satellites have no
+        pseudorange; NaN keeps them out of the clock solution.
+        """
+        return float("nan")
 
     def _get_ephemeris_data(self, msg) -> Dict[str, float]:
         """Extract orbital parameters from satellite message."""
@@ -103,6 +219,24 @@ class GPSReceiver:
             "doppler_shift": self._get_doppler_shift(msg)
         }
 
+    # NMEA GSV sentences carry only PRN, elevation, azimuth and SNR; the
+    # fields below are filled by binary raw-measurement sources.
+
+    def _get_clock_correction(self, msg) -> float:
+        return 0.0
+
+    def _get_ionospheric_data(self, msg) -> float:
+        return 0.0
+
+    def _get_atmospheric_corrections(self, msg) -> float:
+        return 0.0
+
+    def _get_satellite_health(self, msg) -> int:
+        return 0
+
+    def _get_doppler_shift(self, msg) -> float:
+        return 0.0
+
     def validate_signal_integrity(self, data: SatelliteData) -> bool:
         """Verify GPS signal hasn't been tampered with."""
         # Implementation for signal validation
@@ -113,5 +247,5 @@ class GPSReceiver:
         if len(self.satellites) < 4:
             return None
             
-        # Implementation for time calculation using multiple satellites
-        pass 
\ No newline at end of file
+        # Solve receiver position and clock bias from the pseudoranges
+        return self.clock_solver.solve_time(self.satellites) 
\ No newline at end of file
@@ -0,0 +1,261 @@
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Dict, Iterator, List, Optional
+import threading
+import time
+import pynmea2
+from ..telemetry.metrics import ERRORS, REGISTRY
+
+READ_SECONDS = REGISTRY.histogram(
+    "continuum_receiver_read_seconds",
+    "Time per read from the receiver connection, including waiting for data",
+    ("protocol",),
+)
+EPOCHS_DROPPED = REGISTRY.counter(
+    "continuum_receiver_epochs_dropped_total",
+    "Epochs dropped from a full ring buffer before any consumer saw them",
+    ("protocol",),
+)
+
+# RINEX constellation letter for each NMEA talker
+CONSTELLATIONS = {
+    "GP": "G",  # GPS
+    "GL": "R",  # GLONASS
+    "GA": "E",  # Galileo
+    "GB": "C",  # BeiDou
+    "BD": "C",  # BeiDou (older receivers)
+    "GQ": "J",  # QZSS
+}
+
+
+@dataclass
+class GSVSatellite:
+    talker: str
+    prn: str
+    elevation: Optional[float]
+    azimuth: Optional[float]
+    snr: Optional[float]
+
+    @property
+    def prn_code(self) -> str:
+        """Constellation-qualified PRN such as ``G12`` or ``E05``."""
+        return CONSTELLATIONS.get(self.talker, self.talker) + self.prn
+
+
+@dataclass
+class SatelliteEpoch:
+    sequence: int
+    timestamp: int                  # Local receive time in nanoseconds
+    satellites: List = field(default_factory=list)  # GSVSatellite, or a SatelliteBatch from UBX
+
+
+def _optional_float(value: str) -> Optional[float]:
+    return float(value) if value else None
+
+
+def parse_gsv(msg) -> List[GSVSatellite]:
+    """Extract all (up to four) satellites carried by one GSV sentence."""
+    satellites = []
+    for i in range(1, 5):
+        prn = getattr(msg, f"sv_prn_num_{i}", "")
+        if not prn:
+            continue
+        satellites.append(GSVSatellite(
+            talker=msg.talker,
+            prn=prn,
+            elevation=_optional_float(getattr(msg, f"elevation_deg_{i}")),
+            azimuth=_optional_float(getattr(msg, f"azimuth_{i}")),
+            snr=_optional_float(getattr(msg, f"snr_{i}")),
+        ))
+    return satellites
+
+
+class GSVAssembler:
+    """Assemble multi-sentence GSV cycles from all talkers into epochs.
+
+    A talker's cycle is complete once its last numbered GSV sentence
+    arrives. An epoch holds the completed cycles of every talker and closes
+    when the receiver moves on to a non-GSV sentence, or when a talker
+    starts a second cycle before that happened.
+    """
+
+    def __init__(self, clock: Callable[[], int] = time.time_ns):
+        """Initialize with a nanosecond clock used to stamp epochs."""
+        self.clock = clock
+        self._sequence = 0
+        self._cycles: Dict[str, List[GSVSatellite]] = {}
+        self._expected: Dict[str, int] = {}
+        self._completed: Dict[str, List[GSVSatellite]] = {}
+        self._started_at: Optional[int] = None
+
+    def feed(self, line: str) -> Optional[SatelliteEpoch]:
+        """Consume one NMEA line; returns an epoch when one closes."""
+        line = line.strip()
+        if not line.startswith("$") or len(line) < 7:
+            return None
+
+        if line[3:6] != "GSV":
+            return self._close() if self._completed else None
+
+        try:
+            msg = pynmea2.parse(line, check=True)
+            total = int(msg.num_messages)
+            number = int(msg.msg_num)
+        except (pynmea2.ParseError, ValueError, AttributeError):
+            return None
+
+        talker = msg.talker
+        epoch = None
+        if number == 1:
+            if talker in self._completed:
+                epoch = self._close()
+            self._cycles[talker] = []
+            self._expected[talker] = 1
+            if self._started_at is None:
+                self._started_at = self.clock()
+        if self._expected.get(talker) != number:
+            # Missed a sentence of this cycle; drop it and wait for the next
+            self._cycles.pop(talker, None)
+            self._expected.pop(talker, None)
+            return epoch
+
+        self._cycles[talker].extend(parse_gsv(msg))
+        self._expected[talker] = number + 1
+        if number == total:
+            self._completed[talker] = self._cycles.pop(talker)
+            del self._expected[talker]
+        return epoch
+
+    def _close(self) -> SatelliteEpoch:
+        self._sequence += 1
+        satellites = [sat for cycle in self._completed.values() for sat in cycle]
+        epoch = SatelliteEpoch(self._sequence, self._started_at or self.clock(), satellites)
+        self._completed = {}
+        self._started_at = None
+        return epoch
+
+
+class NMEAStreamReader:
+    """Background thread parsing an NMEA byte stream into a ring buffer.
+
+    Consumers read epochs with ``latest_epoch`` (never blocks) or iterate
+    ``stream`` (blocks only the consumer's thread), so serial I/O never
+    stalls the proving path. When the buffer is full the oldest epochs are
+    dropped.
+    """
+
+    protocol = "nmea"
+    # Seconds to wait after a failed read, doubling up to the maximum
+    retry_delay = 0.1
+    max_retry_delay = 5.0
+
+    def __init__(self, connection, capacity: int = 64,
+                 assembler: Optional[GSVAssembler] = None, stop_on_eof: bool = False):
+        """Initialize with a readable connection exposing ``readline``.
+
+        Serial reads return empty on timeout and are retried, as are reads
+        that raise (after a short backoff); set ``stop_on_eof`` for finite
+        sources such as files.
+        """
+        self.connection = connection
+        self.stop_on_eof = stop_on_eof
+        self.assembler = assembler or GSVAssembler()
+        self.buffer: Deque[SatelliteEpoch] = deque(maxlen=capacity)
+        self.dropped = 0
+        self._condition = threading.Condition()
+        self._running = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start the reader thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._running.set()
+        self._thread = threading.Thread(target=self._run, name="nmea-reader", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Ask the reader thread to exit and wait for it."""
+        self._running.clear()
+        with self._condition:
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._running.is_set()
+
+    def latest_epoch(self) -> Optional[SatelliteEpoch]:
+        """Most recent complete epoch, without waiting."""
+        with self._condition:
+            return self.buffer[-1] if self.buffer else None
+
+    def stream(self, timeout: Optional[float] = None, latest: bool = False) -> Iterator[SatelliteEpoch]:
+        """Yield epochs in order as they complete.
+
+        Starts from the oldest buffered epoch, or with ``latest`` from the
+        newest one. Stops when the reader stops, or when no epoch arrives
+        within ``timeout`` seconds.
+        """
+        last_sequence = 0
+        if latest:
+            with self._condition:
+                if self.buffer:
+                    last_sequence = self.buffer[-1].sequence - 1
+        while True:
+            with self._condition:
+                pending = [e for e in self.buffer if e.sequence > last_sequence]
+                if not pending:
+                    if not self.running:
+                        return
+                    if not self._condition.wait(timeout) and timeout is not None:
+                        return
+                    continue
+            for epoch in pending:
+                last_sequence = epoch.sequence
+                yield epoch
+
+    def publish(self, epoch: SatelliteEpoch) -> None:
+        """Append an epoch to the ring buffer and wake consumers."""
+        with self._condition:
+            if len(self.buffer) == self.buffer.maxlen:
+                self.dropped += 1
+                EPOCHS_DROPPED.inc(self.protocol)
+            self.buffer.append(epoch)
+            self._condition.notify_all()
+
+    def _run(self) -> None:
+        delay = self.retry_delay
+        while self._running.is_set():
+            try:
+                with READ_SECONDS.time(self.protocol):
+                    epochs = self._read_epochs()
+            except Exception as e:
+                ERRORS.inc("receiver", "read")
+                print(f"Error reading {self.protocol.upper()} stream: {e}")
+                # Transient port errors must not end ingestion; stop() cuts the wait short
+                with self._condition:
+                    if self._running.is_set():
+                        self._condition.wait(delay)
+                delay = min(delay * 2, self.max_retry_delay)
+                continue
+            delay = self.retry_delay
+            if epochs is None:
+                if self.stop_on_eof:
+                    break
+                continue
+            for epoch in epochs:
+                self.publish(epoch)
+        self._running.clear()
+        with self._condition:
+            self._condition.notify_all()
+
+    def _read_epochs(self) -> Optional[List[SatelliteEpoch]]:
+        """Read from the connection once; None when nothing was read."""
+        raw = self.connection.readline()
+        if not raw:
+            return None
+        epoch = self.assembler.feed(raw.decode("ascii", errors="replace"))
+        return [epoch] if epoch is not None else []
@@ -0,0 +1,157 @@
+from typing import Iterator, List, Optional
+import mmap
+import time
+from .gps_receiver import GPSReceiver
+from .nmea_stream import GSVAssembler, NMEAStreamReader, SatelliteEpoch
+from .satellite_data import SatelliteData
+from .ubx_parser import SYNC, UBXDecoder, UBXStreamReader
+
+
+class Playback:
+    """Deterministic epoch clock that optionally paces replay in wall time.
+
+    Each call stamps the next epoch ``start_ns + k * interval``. With a
+    ``speed`` set, the call also sleeps until that epoch is due (1.0 is real
+    time, 10.0 ten times faster); with ``speed=None`` replay runs as fast as
+    the consumer reads. Parsers call the clock as an epoch arrives, so the
+    pacing applies to the background reader and the synchronous path alike.
+    """
+
+    def __init__(self, speed: Optional[float] = None, start_ns: Optional[int] = None,
+                 interval: float = 1.0):
+        """Initialize the clock; ``start_ns`` defaults to the current time."""
+        if speed is not None and speed <= 0:
+            raise ValueError("Playback speed must be positive")
+        self.speed = speed
+        self.start_ns = time.time_ns() if start_ns is None else start_ns
+        self.interval_ns = int(interval * 1e9)
+        self.ticks = 0
+        self._wall_start: Optional[float] = None
+
+    def __call__(self) -> int:
+        timestamp = self.start_ns + self.ticks * self.interval_ns
+        if self.speed is not None:
+            now = time.perf_counter()
+            if self._wall_start is None:
+                self._wall_start = now
+            delay = self._wall_start + self.ticks * self.interval_ns / 1e9 / self.speed - now
+            if delay > 0:
+                time.sleep(delay)
+        self.ticks += 1
+        return timestamp
+
+
+class ReplayReceiver(GPSReceiver):
+    """GPSReceiver that replays a recorded NMEA or UBX log.
+
+    The log is memory-mapped, so multi-gigabyte captures are paged in on
+    demand. Epoch timestamps come from a ``Playback`` clock rather than the
+    wall clock, which makes every run over the same log produce the same
+    satellite data. For UBX logs the recorded GNSS times are shifted by one
+    constant offset onto that clock (``rebase_time``), so proofs built from
+    hours-old captures still fall inside a validator's acceptance window.
+
+    ``stream`` without ``start`` reads every epoch in order at the
+    consumer's pace; ``start`` runs the usual background reader, which drops
+    the oldest epochs when the consumer falls behind.
+    """
+
+    def __init__(self, path: str, protocol: Optional[str] = None,
+                 speed: Optional[float] = None, start_ns: Optional[int] = None,
+                 epoch_interval: float = 1.0, rebase_time: bool = True):
+        """Initialize a replay of ``path``; the protocol is detected if not given."""
+        super().__init__(port=path, baud_rate=0, protocol=protocol or "nmea")
+        self.path = path
+        self.detect_protocol = protocol is None
+        self.playback = Playback(speed, start_ns, epoch_interval)
+        self.rebase_time = rebase_time
+        self._file = None
+        self._epochs: Optional[Iterator[SatelliteEpoch]] = None
+        self._time_offset: Optional[float] = None
+
+    def connect(self) -> bool:
+        """Memory-map the log file."""
+        try:
+            self._file = open(self.path, "rb")
+            self.connection = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            print(f"Failed to open GPS log: {e}")
+            self.close()
+            return False
+        if self.detect_protocol:
+            self.protocol = self._detect_protocol(self.connection)
+        return True
+
+    def close(self) -> None:
+        """Stop replay and release the mapping.
+
+        A ``stream`` still being iterated ends at its next epoch.
+        """
+        self.stop()
+        self.reader = None
+        if self._epochs is not None:
+            # The parser holds views of the mapping until its generator is closed
+            self._epochs.close()
+            self._epochs = None
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def start(self, capacity: int = 64) -> bool:
+        """Replay in a background thread into a ring buffer."""
+        if not self.connection and not self.connect():
+            return False
+        if self.reader is None:
+            if self.protocol == "ubx":
+                decoder = UBXDecoder(self.ephemeris_engine, clock=self.playback)
+                self.reader = UBXStreamReader(self.connection, capacity, decoder, stop_on_eof=True)
+            else:
+                self.reader = NMEAStreamReader(self.connection, capacity,
+                                               GSVAssembler(clock=self.playback), stop_on_eof=True)
+        self.reader.start()
+        return True
+
+    def stream(self, timeout: Optional[float] = None) -> Iterator[List[SatelliteData]]:
+        """Yield the satellites of each epoch until the log ends."""
+        if self.reader is not None:
+            yield from super().stream(timeout)
+            return
+        if not self.connection and not self.connect():
+            return
+        for epoch in self._read_epochs():
+            yield self._process_epoch(epoch)
+
+    def _read_epochs(self) -> Iterator[SatelliteEpoch]:
+        """Epochs of the log in order, resuming where the last call stopped."""
+        if self._epochs is None:
+            if self.protocol == "ubx":
+                decoder = UBXDecoder(self.ephemeris_engine, clock=self.playback)
+                self._epochs = decoder.decode_capture(self.connection)
+            else:
+                self._epochs = self._read_nmea_epochs()
+        return self._epochs
+
+    def _read_nmea_epochs(self) -> Iterator[SatelliteEpoch]:
+        assembler = GSVAssembler(clock=self.playback)
+        for line in iter(self.connection.readline, b""):
+            epoch = assembler.feed(line.decode("ascii", errors="replace"))
+            if epoch is not None:
+                yield epoch
+
+    def _process_epoch(self, epoch: SatelliteEpoch) -> List[SatelliteData]:
+        satellites = super()._process_epoch(epoch)
+        if self.protocol != "ubx" or not self.rebase_time or not satellites:
+            return satellites
+        if self._time_offset is None:
+            self._time_offset = epoch.timestamp / 1e9 - float(satellites.atomic_timestamps[0])
+        return satellites.shift_time(self._time_offset)
+
+    @staticmethod
+    def _detect_protocol(log, window: int = 4096) -> str:
+        """"ubx" if a UBX sync pattern precedes any NMEA sentence start."""
+        ubx = log.find(SYNC, 0, window)
+        nmea = log.find(b"$", 0, window)
+        return "ubx" if ubx >= 0 and (nmea < 0 or ubx < nmea) else "nmea"
@@ -0,0 +1,183 @@
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Union
+import numpy as np
+from .ephemeris import ELEMENT_FIELDS
+from .satellite_data import SatelliteData
+
+# Almanac fields stored as float64 columns, in column order; satellite health
+# is kept separately as an int32 column
+ALMANAC_FLOAT_FIELDS = (
+    "clock_correction",
+    "ionospheric_data",
+    "atmospheric_corrections",
+    "doppler_shift",
+)
+
+# One packed satellite record, identical to the binary TimeProof layout
+RECORD_DTYPE = np.dtype([
+    ("prn", "S8"),
+    ("position", "<f8", (3,)),
+    ("atomic_timestamp", "<f8"),
+    ("transmission_time", "<f8"),
+    ("almanac", "<f8", (len(ALMANAC_FLOAT_FIELDS),)),
+    ("satellite_health", "<i4"),
+])
+
+
+class SatelliteBatch:
+    """Struct-of-arrays view of one epoch's satellites.
+
+    Holds every per-satellite field as a NumPy column instead of a
+    ``SatelliteData`` with two nested dicts per satellite, which keeps
+    buffered epochs small and lets the solver, fingerprinting and proof
+    metadata work on whole columns. Iterating or indexing yields
+    ``SatelliteData`` for code that still expects the list form.
+
+    Signal travel times are a column of their own: the difference of two
+    float64 Unix timestamps only resolves about 0.2 us (some 70 m of
+    range), while the travel time itself is held to far below a millimetre.
+    Sources that measure pseudoranges pass it directly; otherwise it is
+    derived from the timestamps, as it is for the wire format, which does
+    not carry it.
+    """
+
+    __slots__ = ("prn_codes", "positions", "atomic_timestamps", "transmission_times",
+                 "travel_times", "ephemeris", "almanac", "satellite_health")
+
+    def __init__(self, prn_codes, positions, atomic_timestamps, transmission_times,
+                 almanac, satellite_health, ephemeris: Optional[np.ndarray] = None,
+                 travel_times: Optional[np.ndarray] = None):
+        """Wrap columns of equal length; arrays are used as given, not copied."""
+        self.prn_codes = np.asarray(prn_codes, dtype="S8")
+        count = len(self.prn_codes)
+        self.positions = np.asarray(positions, dtype=np.float64).reshape(count, 3)
+        self.atomic_timestamps = np.asarray(atomic_timestamps, dtype=np.float64)
+        self.transmission_times = np.asarray(transmission_times, dtype=np.float64)
+        self.almanac = np.asarray(almanac, dtype=np.float64).reshape(count, len(ALMANAC_FLOAT_FIELDS))
+        self.satellite_health = np.asarray(satellite_health, dtype=np.int32)
+        if ephemeris is None:
+            ephemeris = np.zeros((count, len(ELEMENT_FIELDS)))
+        self.ephemeris = np.asarray(ephemeris, dtype=np.float64).reshape(count, len(ELEMENT_FIELDS))
+        if travel_times is None:
+            travel_times = self.atomic_timestamps - self.transmission_times
+        self.travel_times = np.asarray(travel_times, dtype=np.float64).reshape(count)
+
+    @classmethod
+    def coerce(cls, satellites: Union["SatelliteBatch", Sequence[SatelliteData]]) -> "SatelliteBatch":
+        """Return ``satellites`` as a batch, converting a list if needed."""
+        if isinstance(satellites, cls):
+            return satellites
+        return cls.from_satellites(satellites)
+
+    @classmethod
+    def from_satellites(cls, satellites: Sequence[SatelliteData]) -> "SatelliteBatch":
+        """Build a batch from ``SatelliteData`` objects."""
+        return cls(
+            prn_codes=[sat.prn_code.encode("ascii") for sat in satellites],
+            positions=[sat.position for sat in satellites],
+            atomic_timestamps=[sat.atomic_timestamp for sat in satellites],
+            transmission_times=[sat.transmission_time for sat in satellites],
+            almanac=[[sat.almanac_data[f] for f in ALMANAC_FLOAT_FIELDS] for sat in satellites],
+            satellite_health=[sat.almanac_data["satellite_health"] for sat in satellites],
+            ephemeris=[[sat.ephemeris_data.get(f, 0.0) for f in ELEMENT_FIELDS] for sat in satellites],
+            travel_times=[sat.travel_time for sat in satellites],
+        )
+
+    @classmethod
+    def from_metadata(cls, satellite_data: Sequence[Dict[str, Any]]) -> "SatelliteBatch":
+        """Build a batch from the ``satellite_data`` list of proof metadata.
+
+        Only the almanac is required; missing public fields default to zero
+        as in the binary encoder.
+        """
+        return cls(
+            prn_codes=[str(sat.get("prn", "")).encode("ascii") for sat in satellite_data],
+            positions=[sat.get("position", (0.0, 0.0, 0.0)) for sat in satellite_data],
+            atomic_timestamps=[sat.get("atomic_timestamp", 0.0) for sat in satellite_data],
+            transmission_times=[sat.get("transmission_time", 0.0) for sat in satellite_data],
+            almanac=[[sat["almanac"][f] for f in ALMANAC_FLOAT_FIELDS] for sat in satellite_data],
+            satellite_health=[sat["almanac"]["satellite_health"] for sat in satellite_data],
+        )
+
+    @classmethod
+    def from_records(cls, records: np.ndarray) -> "SatelliteBatch":
+        """Wrap an array of ``RECORD_DTYPE`` without copying its columns."""
+        return cls(records["prn"], records["position"], records["atomic_timestamp"],
+                   records["transmission_time"], records["almanac"], records["satellite_health"])
+
+    def to_satellites(self) -> List[SatelliteData]:
+        """Expand into ``SatelliteData`` objects."""
+        return list(self)
+
+    def to_metadata(self) -> List[Dict[str, Any]]:
+        """The ``satellite_data`` list of proof metadata."""
+        almanac = self.almanac.tolist()
+        health = self.satellite_health.tolist()
+        return [
+            {
+                "prn": prn.decode("ascii"),
+                "position": position,
+                "atomic_timestamp": atomic,
+                "transmission_time": transmitted,
+                "almanac": self._almanac_dict(almanac[i], health[i]),
+            }
+            for i, (prn, position, atomic, transmitted) in enumerate(zip(
+                self.prn_codes.tolist(), self.positions.tolist(),
+                self.atomic_timestamps.tolist(), self.transmission_times.tolist()))
+        ]
+
+    def to_records(self) -> np.ndarray:
+        """Pack into one contiguous ``RECORD_DTYPE`` array."""
+        records = np.empty(len(self), dtype=RECORD_DTYPE)
+        records["prn"] = self.prn_codes
+        records["position"] = self.positions
+        records["atomic_timestamp"] = self.atomic_timestamps
+        records["transmission_time"] = self.transmission_times
+        records["almanac"] = self.almanac
+        records["satellite_health"] = self.satellite_health
+        return records
+
+    def select(self, mask) -> "SatelliteBatch":
+        """Batch of the satellites where ``mask`` is true (or at given indices)."""
+        return SatelliteBatch(self.prn_codes[mask], self.positions[mask],
+                              self.atomic_timestamps[mask], self.transmission_times[mask],
+                              self.almanac[mask], self.satellite_health[mask], self.ephemeris[mask],
+                              self.travel_times[mask])
+
+    def shift_time(self, offset: float) -> "SatelliteBatch":
+        """Copy with receive and transmission times moved by ``offset`` seconds."""
+        return SatelliteBatch(self.prn_codes, self.positions, self.atomic_timestamps + offset,
+                              self.transmission_times + offset, self.almanac,
+                              self.satellite_health, self.ephemeris, self.travel_times)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, name).nbytes for name in self.__slots__)
+
+    def __len__(self) -> int:
+        return len(self.prn_codes)
+
+    def __getitem__(self, index: int) -> SatelliteData:
+        almanac = self.almanac[index].tolist()
+        return SatelliteData(
+            prn_code=self.prn_codes[index].decode("ascii"),
+            position=tuple(self.positions[index].tolist()),
+            atomic_timestamp=float(self.atomic_timestamps[index]),
+            transmission_time=float(self.transmission_times[index]),
+            ephemeris_data=dict(zip(ELEMENT_FIELDS, self.ephemeris[index].tolist())),
+            almanac_data=self._almanac_dict(almanac, int(self.satellite_health[index])),
+            travel_time=float(self.travel_times[index]),
+        )
+
+    def __iter__(self) -> Iterator[SatelliteData]:
+        return (self[i] for i in range(len(self)))
+
+    @staticmethod
+    def _almanac_dict(values: List[float], health: int) -> Dict[str, Any]:
+        clock, iono, atmo, doppler = values
+        return {
+            "clock_correction": clock,
+            "ionospheric_data": iono,
+            "atmospheric_corrections": atmo,
+            "satellite_health": health,
+            "doppler_shift": doppler,
+        }
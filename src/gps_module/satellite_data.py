@@ -0,0 +1,24 @@
+import math
+from dataclasses import dataclass
+from typing import Dict, Tuple
+
+@dataclass
+class SatelliteData:
+    prn_code: str                    # Unique Satellite Identifier
+    position: Tuple[float, float, float]  # X, Y, Z coordinates
+    atomic_timestamp: float          # Local receive time, seconds since the Unix epoch
+    transmission_time: float         # Signal send time in seconds; NaN if not measured
+    ephemeris_data: Dict[str, float] # Orbital parameters
+    almanac_data: Dict[str, any]     # Additional satellite data including:
+                                    # - Clock correction
+                                    # - Ionospheric data
+                                    # - Atmospheric corrections
+                                    # - Satellite health
+                                    # - Doppler shift
+    travel_time: float = math.nan    # Receive minus send time in seconds, kept apart from the
+                                    # absolute times whose float64 rounding is ~0.2 us; derived
+                                    # from them when not given
+
+    def __post_init__(self):
+        if math.isnan(self.travel_time):
+            self.travel_time = self.atomic_timestamp - self.transmission_time
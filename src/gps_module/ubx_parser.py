@@ -0,0 +1,457 @@
+"""u-blox UBX binary protocol: frame sync, checksums and raw measurements.
+
+Frame layout::
+
+    0xB5 0x62 | class u8 | id u8 | length u16 | payload | CK_A u8 | CK_B u8
+
+The 8-bit Fletcher checksum covers class, id, length and payload. Frames
+are located with ``bytes.find`` and decoded with precompiled ``struct``
+formats over ``memoryview`` slices, so a capture is parsed without copying
+payloads or building intermediate strings.
+
+Decoded messages:
+
+* RXM-RAWX  (0x02 0x15) pseudorange, carrier phase and Doppler per signal
+* RXM-SFRBX (0x02 0x13) raw navigation subframes; GPS LNAV subframes 1-3
+  are turned into broadcast ephemeris and satellite clock parameters
+* NAV-SAT   (0x01 0x35) elevation, azimuth, C/N0 and health per satellite
+"""
+from itertools import accumulate
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+import struct
+import time
+import numpy as np
+from ..telemetry.metrics import ERRORS
+from .clock_solver import SPEED_OF_LIGHT
+from .ephemeris import EphemerisEngine, OMEGA_EARTH
+from .nmea_stream import NMEAStreamReader, SatelliteEpoch
+from .satellite_batch import ALMANAC_FLOAT_FIELDS, SatelliteBatch
+
+SYNC = b"\xb5\x62"
+FRAME_OVERHEAD = 8
+# Larger (valid) messages exist, but none that is decoded here; a length
+# above this is treated as a false sync so corrupt input cannot stall parsing
+MAX_PAYLOAD = 8192
+
+NAV_SAT = (0x01, 0x35)
+RXM_SFRBX = (0x02, 0x13)
+RXM_RAWX = (0x02, 0x15)
+
+RAWX_HEADER = struct.Struct("<dHbBBB2x")
+RAWX_MEASUREMENT = struct.Struct("<ddfBBBBHBBBBBx")
+SFRBX_HEADER = struct.Struct("<BBBBBBBx")
+NAV_SAT_HEADER = struct.Struct("<IBB2x")
+NAV_SAT_RECORD = struct.Struct("<BBBbhhI")
+
+# RINEX constellation letter for each UBX gnssId
+GNSS_LETTERS = {0: "G", 1: "S", 2: "E", 3: "C", 5: "J", 6: "R"}
+
+GPS_UNIX_OFFSET = 315964800     # 1980-01-06T00:00:00Z in Unix seconds
+SECONDS_PER_WEEK = 604800
+HALF_WEEK = SECONDS_PER_WEEK / 2
+SEMICIRCLE_DEG = 180.0          # Broadcast angles are in semicircles
+
+
+class UBXFrame(NamedTuple):
+    msg_class: int
+    msg_id: int
+    payload: memoryview
+
+
+class RawMeasurement(NamedTuple):
+    pseudorange: float      # m
+    carrier_phase: float    # cycles
+    doppler: float          # Hz
+    gnss_id: int
+    sv_id: int
+    sig_id: int
+    freq_id: int
+    locktime: int           # ms
+    cno: int                # dBHz
+    pr_stdev: int
+    cp_stdev: int
+    do_stdev: int
+    trk_stat: int           # bit 0: pseudorange valid
+
+
+class RawxEpoch(NamedTuple):
+    rcv_tow: float          # Receiver time of week in seconds
+    week: int
+    leap_s: int             # GPS - UTC leap seconds
+    rec_stat: int
+    version: int
+    measurements: List[RawMeasurement]
+
+
+class NavSatSV(NamedTuple):
+    gnss_id: int
+    sv_id: int
+    cno: int                # dBHz
+    elevation: int          # deg
+    azimuth: int            # deg
+    pr_residual: int        # 0.1 m
+    flags: int
+
+    @property
+    def health(self) -> int:
+        """0 unknown, 1 healthy, 2 unhealthy."""
+        return (self.flags >> 4) & 0x3
+
+
+class NavSatEpoch(NamedTuple):
+    itow: int               # GPS time of week in ms
+    version: int
+    satellites: List[NavSatSV]
+
+
+class Subframe(NamedTuple):
+    gnss_id: int
+    sv_id: int
+    sig_id: int
+    freq_id: int
+    words: Tuple[int, ...]
+
+
+def checksum(body) -> Tuple[int, int]:
+    """8-bit Fletcher checksum (CK_A, CK_B) of class, id, length and payload."""
+    return sum(body) & 0xFF, sum(accumulate(body)) & 0xFF
+
+
+def encode_frame(msg_class: int, msg_id: int, payload: bytes) -> bytes:
+    """Build a complete UBX frame around ``payload``."""
+    body = bytes((msg_class, msg_id)) + struct.pack("<H", len(payload)) + payload
+    return SYNC + body + bytes(checksum(body))
+
+
+def prn_code(gnss_id: int, sv_id: int) -> Optional[str]:
+    """Constellation-qualified PRN such as ``G12``, matching the NMEA path."""
+    letter = GNSS_LETTERS.get(gnss_id)
+    return f"{letter}{sv_id:02d}" if letter else None
+
+
+def decode_rawx(payload) -> RawxEpoch:
+    """Decode an RXM-RAWX payload."""
+    rcv_tow, week, leap_s, count, rec_stat, version = RAWX_HEADER.unpack_from(payload)
+    end = RAWX_HEADER.size + count * RAWX_MEASUREMENT.size
+    if len(payload) < end:
+        raise ValueError("Truncated RXM-RAWX payload")
+    measurements = list(map(RawMeasurement._make,
+                            RAWX_MEASUREMENT.iter_unpack(payload[RAWX_HEADER.size:end])))
+    return RawxEpoch(rcv_tow, week, leap_s, rec_stat, version, measurements)
+
+
+def decode_sfrbx(payload) -> Subframe:
+    """Decode an RXM-SFRBX payload into its raw 32-bit data words."""
+    gnss_id, sv_id, sig_id, freq_id, count, _, _ = SFRBX_HEADER.unpack_from(payload)
+    end = SFRBX_HEADER.size + 4 * count
+    if len(payload) < end:
+        raise ValueError("Truncated RXM-SFRBX payload")
+    words = struct.unpack_from(f"<{count}I", payload, SFRBX_HEADER.size)
+    return Subframe(gnss_id, sv_id, sig_id, freq_id, words)
+
+
+def decode_nav_sat(payload) -> NavSatEpoch:
+    """Decode a NAV-SAT payload."""
+    itow, version, count = NAV_SAT_HEADER.unpack_from(payload)
+    end = NAV_SAT_HEADER.size + count * NAV_SAT_RECORD.size
+    if len(payload) < end:
+        raise ValueError("Truncated NAV-SAT payload")
+    satellites = list(map(NavSatSV._make,
+                          NAV_SAT_RECORD.iter_unpack(payload[NAV_SAT_HEADER.size:end])))
+    return NavSatEpoch(itow, version, satellites)
+
+
+def _signed(value: int, bits: int) -> int:
+    return value - (1 << bits) if value & (1 << (bits - 1)) else value
+
+
+def _lnav_data(words: Tuple[int, ...]) -> List[int]:
+    """The 24 data bits of each 30-bit LNAV word (UBX keeps parity in bits 0-5)."""
+    return [(word >> 6) & 0xFFFFFF for word in words[:10]]
+
+
+def lnav_subframe_id(words: Tuple[int, ...]) -> int:
+    """Subframe ID from the hand-over word."""
+    return (_lnav_data(words)[1] >> 2) & 0x7
+
+
+def decode_lnav_ephemeris(sf1: Tuple[int, ...], sf2: Tuple[int, ...],
+                          sf3: Tuple[int, ...]) -> Optional[Tuple[Dict[str, float], Dict[str, float]]]:
+    """Ephemeris and clock parameters from GPS LNAV subframes 1-3.
+
+    Returns ``(ephemeris, clock)`` with the ephemeris in the units of
+    ``ELEMENT_FIELDS``, or None if the subframes belong to different
+    issues of data.
+    """
+    d1, d2, d3 = _lnav_data(sf1), _lnav_data(sf2), _lnav_data(sf3)
+    iodc = ((d1[2] & 0x3) << 8) | (d1[7] >> 16)
+    iode2 = d2[2] >> 16
+    iode3 = d3[9] >> 16
+    if not iode2 == iode3 == (iodc & 0xFF):
+        return None
+
+    def joined(high: int, low: int) -> int:
+        return ((high & 0xFF) << 24) | low
+
+    sqrt_a = joined(d2[7], d2[8]) * 2.0 ** -19
+    ephemeris = {
+        "semi_major_axis": sqrt_a * sqrt_a / 1e3,
+        "eccentricity": joined(d2[5], d2[6]) * 2.0 ** -33,
+        "inclination": _signed(joined(d3[4], d3[5]), 32) * 2.0 ** -31 * SEMICIRCLE_DEG,
+        "right_ascension": _signed(joined(d3[2], d3[3]), 32) * 2.0 ** -31 * SEMICIRCLE_DEG,
+        "argument_of_perigee": _signed(joined(d3[6], d3[7]), 32) * 2.0 ** -31 * SEMICIRCLE_DEG,
+        "mean_anomaly": _signed(joined(d2[3], d2[4]), 32) * 2.0 ** -31 * SEMICIRCLE_DEG,
+        "reference_time": float((d2[9] >> 8) * 16),
+        "mean_motion_delta": _signed(d2[3] >> 8, 16) * 2.0 ** -43 * SEMICIRCLE_DEG,
+        "right_ascension_rate": _signed(d3[8], 24) * 2.0 ** -43 * SEMICIRCLE_DEG,
+        "inclination_rate": _signed((d3[9] >> 2) & 0x3FFF, 14) * 2.0 ** -43 * SEMICIRCLE_DEG,
+        "cuc": _signed(d2[5] >> 8, 16) * 2.0 ** -29,
+        "cus": _signed(d2[7] >> 8, 16) * 2.0 ** -29,
+        "crc": _signed(d3[6] >> 8, 16) * 2.0 ** -5,
+        "crs": _signed(d2[2] & 0xFFFF, 16) * 2.0 ** -5,
+        "cic": _signed(d3[2] >> 8, 16) * 2.0 ** -29,
+        "cis": _signed(d3[4] >> 8, 16) * 2.0 ** -29,
+    }
+    clock = {
+        "week": float(d1[2] >> 14),
+        "health": float((d1[2] >> 2) & 0x3F),
+        "tgd": _signed(d1[6] & 0xFF, 8) * 2.0 ** -31,
+        "toc": float((d1[7] & 0xFFFF) * 16),
+        "af2": _signed(d1[8] >> 16, 8) * 2.0 ** -55,
+        "af1": _signed(d1[8] & 0xFFFF, 16) * 2.0 ** -43,
+        "af0": _signed(d1[9] >> 2, 22) * 2.0 ** -31,
+    }
+    return ephemeris, clock
+
+
+def _wrap_week(seconds):
+    """Fold a time-of-week difference into [-half week, half week)."""
+    return (seconds + HALF_WEEK) % SECONDS_PER_WEEK - HALF_WEEK
+
+
+class UBXParser:
+    """Incremental UBX frame synchronizer.
+
+    ``feed`` accepts arbitrary chunks (frames may straddle reads) and keeps
+    any incomplete tail for the next call. ``iter_frames`` walks a complete
+    capture such as a memory-mapped log without copying payloads.
+    Frames with a bad checksum are counted and skipped by resyncing on the
+    next sync pattern.
+    """
+
+    def __init__(self):
+        """Initialize with an empty buffer and zeroed counters."""
+        self.frames = 0
+        self.checksum_errors = 0
+        self.skipped_bytes = 0
+        self._pending = b""
+        self._consumed = 0
+
+    def feed(self, data) -> List[UBXFrame]:
+        """Consume a chunk of the byte stream; returns the frames it completed."""
+        buffer = self._pending + bytes(data) if self._pending else bytes(data)
+        frames = list(self._scan(buffer))
+        self._pending = buffer[self._consumed:]
+        return frames
+
+    def iter_frames(self, buffer) -> Iterator[UBXFrame]:
+        """Yield every valid frame of a complete buffer (bytes or mmap)."""
+        return self._scan(buffer)
+
+    def _scan(self, buffer) -> Iterator[UBXFrame]:
+        view = memoryview(buffer)
+        size = len(view)
+        pos = 0
+        while True:
+            start = buffer.find(SYNC, pos)
+            if start < 0:
+                # A trailing first sync byte may begin a frame in the next chunk
+                keep = size - 1 if size > pos and view[size - 1] == SYNC[0] else size
+                self.skipped_bytes += keep - pos
+                pos = keep
+                break
+            self.skipped_bytes += start - pos
+            if start + 6 > size:
+                pos = start
+                break
+            length = view[start + 4] | (view[start + 5] << 8)
+            if length > MAX_PAYLOAD:
+                pos = start + 1
+                continue
+            end = start + FRAME_OVERHEAD + length
+            if end > size:
+                pos = start
+                break
+            if checksum(view[start + 2:end - 2]) != (view[end - 2], view[end - 1]):
+                self.checksum_errors += 1
+                pos = start + 1
+                continue
+            self.frames += 1
+            yield UBXFrame(view[start + 2], view[start + 3], view[start + 6:end - 2])
+            pos = end
+        self._consumed = pos
+
+
+class UBXDecoder:
+    """Turn UBX frames into epochs held as a ``SatelliteBatch``.
+
+    SFRBX and NAV-SAT messages update per-satellite ephemeris, clock and
+    health state; every RAWX message closes an epoch. Each satellite's
+    position is propagated to its own signal transmission time and rotated
+    into the ECEF frame at reception. ``travel_time`` is the pseudorange in
+    seconds corrected by the broadcast satellite clock offset, and
+    ``transmission_time`` the receive time less it.
+
+    Only GPS LNAV ephemerides are decoded; with ``require_ephemeris``
+    (the default) other satellites are left out of the epochs since they
+    cannot contribute to a time solution.
+    """
+
+    def __init__(self, ephemeris_engine: Optional[EphemerisEngine] = None,
+                 clock=time.time_ns, require_ephemeris: bool = True):
+        """Initialize with a nanosecond clock used to stamp epochs."""
+        self.parser = UBXParser()
+        self.ephemeris_engine = ephemeris_engine or EphemerisEngine()
+        self.clock = clock
+        self.require_ephemeris = require_ephemeris
+        self.ephemerides: Dict[str, Dict[str, float]] = {}
+        self.clocks: Dict[str, Dict[str, float]] = {}
+        self.sky: Dict[str, NavSatSV] = {}
+        self._subframes: Dict[str, Dict[int, Tuple[int, ...]]] = {}
+        self._sequence = 0
+
+    def feed(self, data) -> List[SatelliteEpoch]:
+        """Consume a chunk of the byte stream; returns the epochs it closed."""
+        return self.decode_frames(self.parser.feed(data))
+
+    def decode_capture(self, buffer) -> Iterator[SatelliteEpoch]:
+        """Yield the epochs of a complete capture (bytes or mmap)."""
+        for frame in self.parser.iter_frames(buffer):
+            yield from self.decode_frames((frame,))
+
+    def decode_frames(self, frames) -> List[SatelliteEpoch]:
+        """Apply frames in order; returns an epoch per RAWX message."""
+        epochs = []
+        for msg_class, msg_id, payload in frames:
+            key = (msg_class, msg_id)
+            try:
+                if key == RXM_RAWX:
+                    epochs.append(self._process_rawx(decode_rawx(payload)))
+                elif key == RXM_SFRBX:
+                    self._process_subframe(decode_sfrbx(payload))
+                elif key == NAV_SAT:
+                    self._process_nav_sat(decode_nav_sat(payload))
+            except (ValueError, struct.error) as e:
+                ERRORS.inc("receiver", "ubx_decode")
+                print(f"Error decoding UBX message {msg_class:#04x} {msg_id:#04x}: {e}")
+        return epochs
+
+    def _process_subframe(self, subframe: Subframe) -> None:
+        if subframe.gnss_id != 0 or len(subframe.words) < 10:
+            return
+        subframe_id = lnav_subframe_id(subframe.words)
+        if not 1 <= subframe_id <= 3:
+            return
+        prn = prn_code(subframe.gnss_id, subframe.sv_id)
+        pages = self._subframes.setdefault(prn, {})
+        pages[subframe_id] = subframe.words
+        if len(pages) == 3:
+            decoded = decode_lnav_ephemeris(pages[1], pages[2], pages[3])
+            if decoded is not None:
+                self.ephemerides[prn], self.clocks[prn] = decoded
+
+    def _process_nav_sat(self, nav_sat: NavSatEpoch) -> None:
+        for sv in nav_sat.satellites:
+            prn = prn_code(sv.gnss_id, sv.sv_id)
+            if prn:
+                self.sky[prn] = sv
+
+    def _process_rawx(self, rawx: RawxEpoch) -> SatelliteEpoch:
+        self._sequence += 1
+        measurements = {}
+        for m in rawx.measurements:
+            prn = prn_code(m.gnss_id, m.sv_id)
+            # One signal per satellite; the first is the primary (L1) signal
+            if prn and m.trk_stat & 0x01 and prn not in measurements:
+                if prn in self.ephemerides or not self.require_ephemeris:
+                    measurements[prn] = m
+        timestamp = self.clock()
+        prns = list(measurements)
+        travel = np.array([measurements[p].pseudorange for p in prns]) / SPEED_OF_LIGHT
+        sv_clock = np.array([self._satellite_clock(p, rawx.rcv_tow - t) for p, t in zip(prns, travel)])
+        positions = self._positions(prns, rawx.rcv_tow - travel - sv_clock, travel)
+
+        health = []
+        for prn in prns:
+            clock = self.clocks.get(prn)
+            sky = self.sky.get(prn)
+            if clock is not None:
+                health.append(int(clock["health"]))
+            else:
+                health.append(1 if sky is not None and sky.health == 2 else 0)
+
+        receive_time = GPS_UNIX_OFFSET + rawx.week * SECONDS_PER_WEEK + rawx.rcv_tow - rawx.leap_s
+        corrected = travel + sv_clock
+        almanac = np.zeros((len(prns), len(ALMANAC_FLOAT_FIELDS)))
+        almanac[:, 0] = sv_clock
+        almanac[:, 3] = [measurements[p].doppler for p in prns]
+        satellites = SatelliteBatch(
+            prn_codes=[p.encode("ascii") for p in prns],
+            positions=positions,
+            atomic_timestamps=np.full(len(prns), receive_time),
+            transmission_times=receive_time - corrected,
+            almanac=almanac,
+            satellite_health=health,
+            ephemeris=EphemerisEngine.elements_array([self.ephemerides.get(p, {}) for p in prns]),
+            travel_times=corrected,
+        )
+        return SatelliteEpoch(self._sequence, timestamp, satellites)
+
+    def _satellite_clock(self, prn: str, tow: float) -> float:
+        """Broadcast satellite clock offset in seconds at time of week ``tow``."""
+        clock = self.clocks.get(prn)
+        if clock is None:
+            return 0.0
+        dt = _wrap_week(tow - clock["toc"])
+        return clock["af0"] + clock["af1"] * dt + clock["af2"] * dt * dt - clock["tgd"]
+
+    def _positions(self, prns: List[str], transmit_tow: np.ndarray, travel: np.ndarray) -> np.ndarray:
+        """ECEF positions at transmission, expressed in the frame at reception."""
+        positions = np.zeros((len(prns), 3))
+        known = [i for i, prn in enumerate(prns) if prn in self.ephemerides]
+        if not known:
+            return positions
+        elements = self.ephemeris_engine.elements_array([self.ephemerides[prns[i]] for i in known])
+        toe = elements[:, 6]
+        epochs = toe + _wrap_week(transmit_tow[known] - toe)
+        at_transmit = self.ephemeris_engine.positions_at(elements, epochs)
+
+        # Earth rotates during the signal's flight
+        angle = OMEGA_EARTH * travel[known]
+        cos_a, sin_a = np.cos(angle), np.sin(angle)
+        positions[known, 0] = cos_a * at_transmit[:, 0] + sin_a * at_transmit[:, 1]
+        positions[known, 1] = -sin_a * at_transmit[:, 0] + cos_a * at_transmit[:, 1]
+        positions[known, 2] = at_transmit[:, 2]
+        return positions
+
+
+class UBXStreamReader(NMEAStreamReader):
+    """Background reader for a UBX byte stream, publishing ``SatelliteBatch`` epochs."""
+
+    protocol = "ubx"
+
+    def __init__(self, connection, capacity: int = 64,
+                 decoder: Optional[UBXDecoder] = None, stop_on_eof: bool = False,
+                 chunk_size: int = 4096):
+        """Initialize with a readable connection exposing ``read``."""
+        super().__init__(connection, capacity, stop_on_eof=stop_on_eof)
+        self.decoder = decoder or UBXDecoder()
+        self.chunk_size = chunk_size
+
+    def _read_epochs(self) -> Optional[List[SatelliteEpoch]]:
+        # Serial ports report what is already buffered; files read in chunks
+        size = getattr(self.connection, "in_waiting", self.chunk_size) or 1
+        data = self.connection.read(min(size, self.chunk_size))
+        if not data:
+            return None
+        return self.decoder.feed(data)
@@ -0,0 +1,265 @@
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+import asyncio
+import hashlib
+import inspect
+import struct
+from ..secure_enclave.time_proof import TimeProof
+from ..validation.replay_index import SeenFingerprintIndex
+from ..validation.time_validator import TimeValidator
+from .protocol import HELLO, PROOFS, FRAME_HEADER, decode_batch, encode_batch, encode_frame, read_frame
+
+
+class PeerLink:
+    """Pooled outbound connection to one peer with a coalescing send queue.
+
+    Proofs queued within ``batch_interval`` of the first go out together in
+    one PROOFS frame, and a full batch is sent straight away. The connection
+    is opened on first use and kept; after a failure the queue is retained
+    and the link reconnects with exponential backoff.
+    """
+
+    def __init__(self, address: str, node_id: str, batch_interval: float = 0.005,
+                 max_batch: int = 256, max_queue: int = 10_000):
+        """Initialize a link to ``address`` ("host:port"); nothing connects yet."""
+        self.address = address
+        host, port = address.rsplit(":", 1)
+        self.host = host
+        self.port = int(port)
+        self.node_id = node_id
+        self.batch_interval = batch_interval
+        self.max_batch = max_batch
+        self.max_queue = max_queue
+        self.frames_sent = 0
+        self.bytes_sent = 0
+        self.dropped = 0
+        self._queue: List[bytes] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._task: Optional[asyncio.Task] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._failures = 0
+
+    def send(self, payload: bytes) -> None:
+        """Queue an encoded proof for the next batch to this peer."""
+        if len(self._queue) >= self.max_queue:
+            self.dropped += 1
+            return
+        self._queue.append(payload)
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.ensure_future(self._run())
+        if len(self._queue) >= self.max_batch:
+            self._wakeup.set()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.batch_interval, self._wakeup.set)
+
+    async def close(self) -> None:
+        """Stop sending and close the connection; queued proofs are dropped."""
+        if self._timer is not None:
+            self._timer.cancel()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._close_writer()
+
+    async def _run(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+            while self._queue:
+                batch = self._queue[:self.max_batch]
+                if not await self._write(batch):
+                    await asyncio.sleep(min(0.05 * 2 ** self._failures, 2.0))
+                    self._wakeup.set()
+                    break
+                del self._queue[:len(batch)]
+
+    async def _write(self, batch: List[bytes]) -> bool:
+        """Send one batch, connecting first if needed."""
+        try:
+            if self._writer is None:
+                _, self._writer = await asyncio.open_connection(self.host, self.port)
+                self._writer.write(encode_frame(HELLO, self.node_id.encode()))
+            frame = encode_frame(PROOFS, encode_batch(batch))
+            self._writer.write(frame)
+            await self._writer.drain()
+        except OSError as e:
+            if self._failures == 0:
+                print(f"Error sending to peer {self.address}: {e}")
+            self._failures += 1
+            self._close_writer()
+            return False
+
+        self._failures = 0
+        self.frames_sent += 1
+        self.bytes_sent += len(frame)
+        return True
+
+    def _close_writer(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+class GossipNode:
+    """Gossips ``TimeProof``s with peers over TCP.
+
+    Proofs arriving from peers are handed to ``TimeValidator`` on the event
+    loop (its async path batches the ZK checks off-loop). Accepted proofs
+    are relayed, as the bytes received, to every peer except the one they
+    came from, and passed to ``on_proof(proof, peer)``.
+
+    Duplicates are suppressed by fingerprint before anything is decoded
+    beyond the header. A fingerprint is only marked seen once its proof has
+    been accepted; while it is being verified, further copies with the same
+    bytes are dropped, but a different proof claiming the same fingerprint
+    is still verified, so junk cannot shadow the genuine proof.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8000,
+                 peers: Iterable[str] = (), validator: Optional[TimeValidator] = None,
+                 on_proof: Optional[Callable[[Any, Optional[str]], Any]] = None,
+                 batch_interval: float = 0.005, max_batch: int = 256,
+                 max_inflight: int = 4096, dedup_window: float = 10.0):
+        """Initialize a node that will listen on ``host:port`` and send to ``peers``."""
+        self.host = host
+        self.port = port
+        self.validator = validator if validator is not None else TimeValidator()
+        self.on_proof = on_proof
+        self.batch_interval = batch_interval
+        self.max_batch = max_batch
+        self.max_inflight = max_inflight
+        self.seen = SeenFingerprintIndex(window=dedup_window)
+        self.links: Dict[str, PeerLink] = {}
+        self.stats = {"bytes_received": 0, "proofs_received": 0, "duplicates": 0,
+                      "malformed": 0, "rejected": 0, "accepted": 0, "dropped": 0}
+        self._pending: Dict[str, Set[bytes]] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self._connections: Set[asyncio.StreamWriter] = set()
+        self._server: Optional[asyncio.AbstractServer] = None
+        for address in peers:
+            self.add_peer(address)
+
+    @property
+    def node_id(self) -> str:
+        return f"{self.host}:{self.port}"
+
+    def add_peer(self, address: str) -> None:
+        """Start gossiping to ``address`` ("host:port")."""
+        if address not in self.links:
+            self.links[address] = PeerLink(address, self.node_id, self.batch_interval, self.max_batch)
+
+    async def start(self) -> None:
+        """Listen for peers; with port 0 the bound port is filled in."""
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        if self.port == 0:
+            self.port = self._server.sockets[0].getsockname()[1]
+            for link in self.links.values():
+                link.node_id = self.node_id
+
+    async def close(self) -> None:
+        """Stop listening, drop connections and cancel pending verifications."""
+        if self._server is not None:
+            self._server.close()
+        for writer in list(self._connections):
+            writer.close()
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*(link.close() for link in self.links.values()))
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._server is not None:
+            await self._server.wait_closed()
+
+    def publish(self, proof: TimeProof) -> bool:
+        """Gossip a locally generated proof to every peer; False if already known."""
+        if not self.seen.add(proof.satellite_fingerprint):
+            return False
+        self._forward(proof.to_bytes(), None)
+        return True
+
+    def bytes_sent(self) -> int:
+        return sum(link.bytes_sent for link in self.links.values())
+
+    async def _handle_connection(self, reader: asyncio.StreamReader,
+                                 writer: asyncio.StreamWriter) -> None:
+        peer = None
+        self._connections.add(writer)
+        try:
+            while True:
+                kind, body = await read_frame(reader)
+                self.stats["bytes_received"] += FRAME_HEADER.size + len(body)
+                if kind == HELLO:
+                    peer = body.decode(errors="replace")
+                elif kind == PROOFS:
+                    for payload in decode_batch(body):
+                        self._receive(payload, peer)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except (ValueError, struct.error) as e:
+            print(f"Error reading from peer {peer}: {e}")
+        finally:
+            self._connections.discard(writer)
+            writer.close()
+
+    def _receive(self, payload: memoryview, peer: Optional[str]) -> None:
+        self.stats["proofs_received"] += 1
+        try:
+            proof = TimeProof.from_buffer(payload)
+            fingerprint = proof.satellite_fingerprint
+        except (ValueError, struct.error):
+            self.stats["malformed"] += 1
+            return
+
+        digest = hashlib.blake2b(payload, digest_size=16).digest()
+        in_flight = self._pending.get(fingerprint)
+        if (in_flight is not None and digest in in_flight) or fingerprint in self.seen:
+            self.stats["duplicates"] += 1
+            return
+        if len(self._tasks) >= self.max_inflight:
+            self.stats["dropped"] += 1
+            return
+
+        self._pending.setdefault(fingerprint, set()).add(digest)
+        task = asyncio.ensure_future(self._verify(proof, payload, fingerprint, digest, peer))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _verify(self, proof, payload: memoryview, fingerprint: str,
+                      digest: bytes, peer: Optional[str]) -> None:
+        try:
+            valid = await self.validator.verify_time_proof_async(proof)
+        finally:
+            in_flight = self._pending[fingerprint]
+            in_flight.discard(digest)
+            if not in_flight:
+                del self._pending[fingerprint]
+
+        if not valid:
+            self.stats["rejected"] += 1
+            return
+        if not self.seen.add(fingerprint):
+            # Another copy was accepted while this one was being verified
+            self.stats["duplicates"] += 1
+            return
+
+        self.stats["accepted"] += 1
+        self._forward(payload, peer)
+        if self.on_proof is not None:
+            try:
+                result = self.on_proof(proof, peer)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                print(f"Error handling accepted proof: {e}")
+
+    def _forward(self, payload, exclude: Optional[str]) -> None:
+        for address, link in self.links.items():
+            if address != exclude:
+                link.send(payload)
@@ -0,0 +1,65 @@
+"""Length-prefixed frames exchanged between gossip peers.
+
+Every frame is ``length u32 | kind u8 | body`` (little-endian, ``length``
+counting kind and body)::
+
+    HELLO   body is the sender's node id (UTF-8), sent once per connection
+    PROOFS  body is a batch: count u16, then per proof length u32 and the
+            proof in the binary ``TimeProof`` wire format
+
+Proof bytes are relayed exactly as received, so forwarding never re-encodes.
+"""
+from typing import List, Sequence, Tuple
+import asyncio
+import struct
+
+HELLO = 1
+PROOFS = 2
+
+FRAME_HEADER = struct.Struct("<IB")
+BATCH_COUNT = struct.Struct("<H")
+ITEM_LENGTH = struct.Struct("<I")
+MAX_FRAME = 4 * 1024 * 1024
+MAX_BATCH = 0xFFFF
+
+
+def encode_frame(kind: int, body: bytes) -> bytes:
+    """One frame carrying ``body``."""
+    if len(body) + 1 > MAX_FRAME:
+        raise ValueError("Frame too large")
+    return FRAME_HEADER.pack(len(body) + 1, kind) + body
+
+
+def encode_batch(payloads: Sequence[bytes]) -> bytes:
+    """PROOFS frame body for up to ``MAX_BATCH`` encoded proofs."""
+    if len(payloads) > MAX_BATCH:
+        raise ValueError("Too many proofs in one batch")
+    parts = [BATCH_COUNT.pack(len(payloads))]
+    for payload in payloads:
+        parts.append(ITEM_LENGTH.pack(len(payload)))
+        parts.append(payload)
+    return b"".join(parts)
+
+
+def decode_batch(body) -> List[memoryview]:
+    """Split a PROOFS body into views of the individual proofs."""
+    view = memoryview(body)
+    (count,) = BATCH_COUNT.unpack_from(view)
+    offset = BATCH_COUNT.size
+    payloads = []
+    for _ in range(count):
+        (length,) = ITEM_LENGTH.unpack_from(view, offset)
+        offset += ITEM_LENGTH.size
+        if offset + length > len(view):
+            raise ValueError("Truncated proof batch")
+        payloads.append(view[offset:offset + length])
+        offset += length
+    return payloads
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Tuple[int, bytes]:
+    """Read one frame; raises ``asyncio.IncompleteReadError`` at EOF."""
+    length, kind = FRAME_HEADER.unpack(await reader.readexactly(FRAME_HEADER.size))
+    if length < 1 or length > MAX_FRAME:
+        raise ValueError(f"Bad frame length {length}")
+    return kind, await reader.readexactly(length - 1)
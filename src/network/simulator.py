@@ -0,0 +1,142 @@
+"""Loopback gossip simulator: many nodes in one process, real TCP between them.
+
+Each node listens on 127.0.0.1 and gossips to ``degree`` random peers plus
+its successor on a ring, so every proof can reach every node. Nodes verify
+with the real validation pipeline minus the Groth16 stage, since simulated
+proofs carry no circuit proof, and minus the freshness and range checks:
+one event loop runs every node, so with hundreds of nodes the CPU queue
+alone can exceed the one-second acceptance window.
+
+    python3 -m src.network.simulator --nodes 200 --degree 6 --proofs 50
+"""
+from typing import Dict, List
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from ..gps_module.satellite_batch import SatelliteBatch
+from ..gps_module.satellite_data import SatelliteData
+from ..secure_enclave.fingerprint import satellite_fingerprint
+from ..secure_enclave.time_proof import TimeProof
+from ..validation.stages import FingerprintStage, ReplayStage, StructuralStage
+from ..validation.time_validator import TimeValidator
+from .gossip import GossipNode
+
+
+def simulated_proof(rng: random.Random, satellites: int = 8) -> TimeProof:
+    """A fresh proof with random satellite data and a correct fingerprint."""
+    now = time.time()
+    batch = SatelliteBatch.from_satellites([
+        SatelliteData(
+            prn_code=f"G{i + 1:02d}",
+            position=(rng.uniform(-2.6e7, 2.6e7), rng.uniform(-2.6e7, 2.6e7), rng.uniform(-2.6e7, 2.6e7)),
+            atomic_timestamp=now,
+            transmission_time=now - 0.07,
+            ephemeris_data={},
+            almanac_data={"clock_correction": rng.random() * 1e-6, "ionospheric_data": rng.random(),
+                          "atmospheric_corrections": rng.random(), "satellite_health": 0,
+                          "doppler_shift": rng.uniform(-4000, 4000)},
+        )
+        for i in range(satellites)
+    ])
+    return TimeProof(
+        timestamp=now,
+        satellite_fingerprint=satellite_fingerprint(batch),
+        zk_proof=bytes(rng.getrandbits(8) for _ in range(256)),
+        metadata={"T_sat": str(int(now * 1e9)), "timestamp": time.time_ns(),
+                  "satellite_data": batch.to_metadata()},
+    )
+
+
+def simulation_validator() -> TimeValidator:
+    return TimeValidator(stages=[StructuralStage(), ReplayStage(), FingerprintStage()])
+
+
+async def simulate(nodes: int = 100, degree: int = 4, proofs: int = 20, interval: float = 0.01,
+                   batch_interval: float = 0.005, seed: int = 1, timeout: float = 30.0) -> Dict:
+    """Publish ``proofs`` from random nodes and measure how they spread.
+
+    Returns propagation latency percentiles (publish to arrival at each
+    node, in seconds), the share of (proof, node) deliveries that
+    completed, and the bytes sent per proof per node.
+    """
+    rng = random.Random(seed)
+    published: Dict[str, float] = {}
+    arrivals: Dict[str, List[float]] = {}
+    delivered = asyncio.Event()
+    expected = proofs * (nodes - 1)
+    received = [0]
+
+    def on_proof(proof, peer):
+        arrivals.setdefault(proof.satellite_fingerprint, []).append(time.perf_counter())
+        received[0] += 1
+        if received[0] >= expected:
+            delivered.set()
+
+    network = [GossipNode("127.0.0.1", 0, validator=simulation_validator(), on_proof=on_proof,
+                          batch_interval=batch_interval) for _ in range(nodes)]
+    for node in network:
+        await node.start()
+    for i, node in enumerate(network):
+        others = [n for n in network if n is not node]
+        for peer in rng.sample(others, min(degree, len(others))) + [network[(i + 1) % nodes]]:
+            if peer is not node:
+                node.add_peer(peer.node_id)
+
+    try:
+        for _ in range(proofs):
+            proof = simulated_proof(rng)
+            published[proof.satellite_fingerprint] = time.perf_counter()
+            rng.choice(network).publish(proof)
+            await asyncio.sleep(interval)
+        try:
+            await asyncio.wait_for(delivered.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+    finally:
+        bytes_sent = sum(node.bytes_sent() for node in network)
+        frames_sent = sum(link.frames_sent for node in network for link in node.links.values())
+        duplicates = sum(node.stats["duplicates"] for node in network)
+        for node in network:
+            await node.close()
+
+    latencies = sorted(t - published[fp] for fp, times in arrivals.items() for t in times)
+    full = [max(times) - published[fp] for fp, times in arrivals.items() if len(times) == nodes - 1]
+    return {
+        "nodes": nodes,
+        "proofs": proofs,
+        "delivered": received[0] / expected if expected else 1.0,
+        "latency_p50": statistics.median(latencies) if latencies else None,
+        "latency_p99": latencies[int(0.99 * (len(latencies) - 1))] if latencies else None,
+        "full_propagation_max": max(full) if full else None,
+        "bytes_per_proof_per_node": bytes_sent / max(proofs * nodes, 1),
+        "frames_sent": frames_sent,
+        "duplicates": duplicates,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=100)
+    parser.add_argument("--degree", type=int, default=4)
+    parser.add_argument("--proofs", type=int, default=20)
+    parser.add_argument("--interval", type=float, default=0.01, help="seconds between publishes")
+    parser.add_argument("--batch-interval", type=float, default=0.005)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    result = asyncio.run(simulate(args.nodes, args.degree, args.proofs, args.interval,
+                                  args.batch_interval, args.seed))
+    ms = {key: f"{result[key] * 1e3:.1f} ms" if result[key] is not None else "n/a"
+          for key in ("latency_p50", "latency_p99", "full_propagation_max")}
+    print(f"{result['nodes']} nodes, {result['proofs']} proofs: "
+          f"{result['delivered']:.1%} delivered, "
+          f"p50 {ms['latency_p50']}, p99 {ms['latency_p99']}, "
+          f"full propagation {ms['full_propagation_max']}, "
+          f"{result['bytes_per_proof_per_node']:,.0f} B/proof/node, "
+          f"{result['frames_sent']} frames, {result['duplicates']} duplicates suppressed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Validator node: verifies gossiped time proofs and relays the valid ones.
+
+    python3 -m src.node.validator --port 8000 --peers peer1:8001,peer2:8002
+
+The node does not run ``TimeConsensus`` yet. A BFT vote must come from an
+authenticated validator, and neither proofs nor the gossip HELLO carry a
+verifiable identity: satellite fingerprints are chosen by the sender, so
+one peer could cast any number of votes with a single ZK proof.
+"""
+from typing import List, Optional
+import argparse
+import asyncio
+from ..data_availability.proof_store import ProofStore
+from ..network.gossip import GossipNode
+from ..telemetry.metrics import REGISTRY
+from ..telemetry.tracing import TRACER
+from ..validation.time_validator import TimeValidator
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--peers", default="", help="comma-separated host:port list")
+    parser.add_argument("--verification-key", default="verification_key.json")
+    parser.add_argument("--data-dir", help="keep accepted proofs in this directory")
+    parser.add_argument("--metrics-port", type=int, help="serve Prometheus metrics on this port")
+    parser.add_argument("--metrics-file", help="periodically write Prometheus metrics to this file")
+    parser.add_argument("--metrics-interval", type=float, default=15.0,
+                        help="seconds between metrics file updates")
+    parser.add_argument("--trace-file", help="append finished epoch traces to this JSON-lines file")
+    return parser.parse_args(argv)
+
+
+async def write_metrics(path: str, interval: float) -> None:
+    while True:
+        REGISTRY.write_textfile(path)
+        await asyncio.sleep(interval)
+
+
+async def run(args: argparse.Namespace) -> None:
+    metrics_server = None
+    if args.metrics_port is not None or args.metrics_file:
+        REGISTRY.enable()
+    if args.metrics_port is not None:
+        metrics_server = REGISTRY.serve(args.metrics_port, args.host)
+    if args.trace_file:
+        TRACER.enable(args.trace_file)
+
+    validator = TimeValidator(args.verification_key)
+    store = ProofStore(args.data_dir) if args.data_dir else None
+
+    def on_proof(proof, peer) -> None:
+        store.append_proof(proof)
+
+    node = GossipNode(
+        args.host, args.port,
+        peers=[peer.strip() for peer in args.peers.split(",") if peer.strip()],
+        validator=validator,
+        on_proof=on_proof if store is not None else None,
+    )
+    await node.start()
+    print(f"Validator node listening on {node.node_id} with {len(node.links)} peers")
+    writer = None
+    if args.metrics_file:
+        writer = asyncio.ensure_future(write_metrics(args.metrics_file, args.metrics_interval))
+    try:
+        await asyncio.Event().wait()
+    finally:
+        if writer is not None:
+            writer.cancel()
+            REGISTRY.write_textfile(args.metrics_file)
+        if metrics_server is not None:
+            metrics_server.shutdown()
+        await node.close()
+        validator.close()
+        if store is not None:
+            store.close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    try:
+        asyncio.run(run(parse_args(argv)))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+from typing import List, NamedTuple, Optional
+import hashlib
+import json
+import os
+import shutil
+import struct
+import subprocess
+import tempfile
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "continuum", "artifacts")
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+CIRCUITS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "circuits")
+DEFAULT_CIRCUIT = os.path.join(CIRCUITS_DIR, "SatelliteTimeCheck.circom")
+BATCH_TEMPLATE = os.path.join(CIRCUITS_DIR, "SatelliteTimeCheckBatch.circom")
+# Comparator width of the batch circuit; must cover 2 * Delta
+DEFAULT_BATCH_BITS = 32
+DEFAULT_CIRCOMLIB = os.path.join(ROOT_DIR, "node_modules", "circomlib")
+LOCAL_SNARKJS = os.path.join(ROOT_DIR, "node_modules", "snarkjs")
+# Cargo installs circom outside PATH by default
+DEFAULT_CIRCOM = shutil.which("circom") or os.path.expanduser("~/.cargo/bin/circom")
+MANIFEST = "manifest.json"
+
+
+class CircuitArtifacts(NamedTuple):
+    """Paths of one compiled circuit and its Groth16 keys."""
+    key: str
+    directory: str
+    r1cs: str
+    wasm: str
+    cpp_dir: str
+    zkey: str
+    verification_key: str
+
+
+def batch_circuit(size: int, bits: int = DEFAULT_BATCH_BITS, cache_dir: str = DEFAULT_CACHE_DIR) -> str:
+    """Path of a main circuit checking ``size`` epochs with the batch template.
+
+    The generated file records the template's hash, so the artifact key
+    changes whenever the template does.
+    """
+    with open(BATCH_TEMPLATE, "rb") as f:
+        template_hash = hashlib.sha256(f.read()).hexdigest()
+    source = (
+        "pragma circom 2.0.0;\n"
+        f"// SatelliteTimeCheckBatch.circom sha256 {template_hash}\n"
+        f"include \"{BATCH_TEMPLATE}\";\n\n"
+        f"component main {{public [T_sat, c, Delta]}} = SatelliteTimeCheckBatch({size}, {bits});\n"
+    )
+    directory = os.path.join(cache_dir, "circuits")
+    path = os.path.join(directory, f"SatelliteTimeCheckBatch_{size}.circom")
+    try:
+        with open(path) as f:
+            if f.read() == source:
+                return path
+    except OSError:
+        pass
+
+    os.makedirs(directory, exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        f.write(source)
+    os.replace(tmp, path)
+    return path
+
+
+def r1cs_constraints(path: str) -> int:
+    """Number of constraints recorded in the header section of an ``.r1cs`` file."""
+    with open(path, "rb") as f:
+        magic, _, sections = struct.unpack("<4sII", f.read(12))
+        if magic != b"r1cs":
+            raise ValueError(f"Not an r1cs file: {path}")
+        for _ in range(sections):
+            section_type, size = struct.unpack("<IQ", f.read(12))
+            if section_type != 1:
+                f.seek(size, os.SEEK_CUR)
+                continue
+            (field_bytes,) = struct.unpack("<I", f.read(4))
+            f.seek(field_bytes + 4 * 4 + 8, os.SEEK_CUR)
+            return struct.unpack("<I", f.read(4))[0]
+    raise ValueError(f"No header section in {path}")
+
+
+def package_version(directory: str) -> str:
+    """``version`` from the package.json of a Node package, or ``unknown``."""
+    try:
+        with open(os.path.join(directory, "package.json")) as f:
+            return json.load(f)["version"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return "unknown"
+
+
+def file_digest(path: str) -> str:
+    """SHA-256 of a large file, hashed once per version of it.
+
+    The digest is kept next to the file in ``<path>.sha256`` together with
+    the size and modification time it was computed for; a file that
+    changes in either is hashed again. Where the sidecar cannot be written
+    the file is simply hashed every time.
+    """
+    stat = os.stat(path)
+    stamp = {"path": os.path.abspath(path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    sidecar = f"{path}.sha256"
+    try:
+        with open(sidecar) as f:
+            cached = json.load(f)
+        if {k: cached.get(k) for k in stamp} == stamp:
+            return cached["sha256"]
+    except (OSError, ValueError, KeyError, AttributeError):
+        pass
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    stamp["sha256"] = digest.hexdigest()
+    try:
+        tmp = f"{sidecar}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(stamp, f)
+        os.replace(tmp, sidecar)
+    except OSError:
+        pass
+    return stamp["sha256"]
+
+
+class ArtifactManager:
+    """Content-addressed cache of circuit builds and trusted-setup outputs.
+
+    Artifacts live in ``cache_dir/<key>`` where the key hashes the circuit
+    source, the circomlib, circom and snarkjs versions and the powers-of-tau
+    parameters, so a change to any of them yields a fresh build and an
+    unchanged circuit is compiled and set up exactly once. ``resolve`` only checks the manifest
+    and never builds; ``ensure`` builds on a miss.
+
+    Without ``ptau_path`` a local powers-of-tau of size ``2**ptau_power`` is
+    generated with a single random contribution, which is fine for tests
+    only. Production deployments pass the prepared output of a public
+    ceremony instead.
+    """
+
+    def __init__(self, circuit_path: str = DEFAULT_CIRCUIT, cache_dir: str = DEFAULT_CACHE_DIR,
+                 circomlib_dir: str = DEFAULT_CIRCOMLIB, ptau_power: int = 12,
+                 ptau_path: Optional[str] = None, circom: str = DEFAULT_CIRCOM, snarkjs: str = "snarkjs"):
+        """Initialize the manager; nothing is hashed or built yet."""
+        self.circuit_path = os.path.abspath(circuit_path)
+        self.circuit_name = os.path.splitext(os.path.basename(self.circuit_path))[0]
+        self.cache_dir = cache_dir
+        self.circomlib_dir = circomlib_dir
+        self.ptau_power = ptau_power
+        self.ptau_path = os.path.abspath(ptau_path) if ptau_path else None
+        self.circom = circom
+        self.snarkjs = snarkjs
+        self._key: Optional[str] = None
+
+    @classmethod
+    def for_batch(cls, size: int, bits: int = DEFAULT_BATCH_BITS,
+                  cache_dir: str = DEFAULT_CACHE_DIR, **kwargs) -> "ArtifactManager":
+        """Manager for the batch circuit checking ``size`` epochs per proof."""
+        return cls(batch_circuit(size, bits, cache_dir), cache_dir=cache_dir, **kwargs)
+
+    def key(self) -> str:
+        """Hash of everything that determines the artifacts."""
+        if self._key is None:
+            digest = hashlib.sha256()
+            with open(self.circuit_path, "rb") as f:
+                digest.update(f.read())
+            digest.update(b"\0circomlib " + self.circomlib_version().encode())
+            digest.update(b"\0circom " + self.circom_version().encode())
+            digest.update(b"\0snarkjs " + self.snarkjs_version().encode())
+            if self.ptau_path is not None:
+                # Every ptau of a given power has the same size; only the
+                # contents tell two ceremonies apart
+                digest.update(f"\0ptau sha256 {file_digest(self.ptau_path)}".encode())
+            else:
+                digest.update(f"\0ptau bn128 {self.ptau_power}".encode())
+            self._key = digest.hexdigest()[:16]
+        return self._key
+
+    def circomlib_version(self) -> str:
+        return package_version(self.circomlib_dir)
+
+    def circom_version(self) -> str:
+        """What ``circom --version`` prints, e.g. ``circom compiler 2.1.8``."""
+        try:
+            result = subprocess.run([self.circom, "--version"], capture_output=True, check=True, timeout=30)
+        except (OSError, subprocess.SubprocessError):
+            return "unknown"
+        return result.stdout.decode(errors="replace").strip() or "unknown"
+
+    def snarkjs_version(self) -> str:
+        """Version of the snarkjs package behind the ``snarkjs`` command.
+
+        The command is a script inside the package, so its package.json is
+        found by walking up from the resolved script; without one the
+        project's own node_modules copy is used.
+        """
+        command = shutil.which(self.snarkjs)
+        directory = os.path.dirname(os.path.realpath(command)) if command else None
+        while directory and os.path.dirname(directory) != directory:
+            if os.path.basename(directory) == "snarkjs" and os.path.exists(
+                    os.path.join(directory, "package.json")):
+                return package_version(directory)
+            directory = os.path.dirname(directory)
+        return package_version(LOCAL_SNARKJS)
+
+    def paths(self) -> CircuitArtifacts:
+        """Where the artifacts for the current key live (built or not)."""
+        directory = os.path.join(self.cache_dir, self.key())
+        name = self.circuit_name
+        return CircuitArtifacts(
+            key=self.key(),
+            directory=directory,
+            r1cs=os.path.join(directory, f"{name}.r1cs"),
+            wasm=os.path.join(directory, f"{name}_js", f"{name}.wasm"),
+            cpp_dir=os.path.join(directory, f"{name}_cpp"),
+            zkey=os.path.join(directory, f"{name}.zkey"),
+            verification_key=os.path.join(directory, "verification_key.json"),
+        )
+
+    def resolve(self) -> Optional[CircuitArtifacts]:
+        """Cached artifacts for the current key, or None on a miss."""
+        artifacts = self.paths()
+        if not os.path.exists(os.path.join(artifacts.directory, MANIFEST)):
+            return None
+        if not all(os.path.exists(path) for path in
+                   (artifacts.r1cs, artifacts.wasm, artifacts.zkey, artifacts.verification_key)):
+            return None
+        return artifacts
+
+    def ensure(self) -> CircuitArtifacts:
+        """Return cached artifacts, building them first on a miss.
+
+        Raises ``RuntimeError`` if a build step fails.
+        """
+        artifacts = self.resolve()
+        if artifacts is None:
+            self._build(self.paths())
+            artifacts = self.paths()
+        return artifacts
+
+    def _build(self, artifacts: CircuitArtifacts) -> None:
+        """Compile and set up in a scratch directory, then move it into place."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with tempfile.TemporaryDirectory(prefix="zkartifacts-", dir=self.cache_dir) as workspace:
+            staged = os.path.join(workspace, "staged")
+            os.makedirs(staged)
+            name = self.circuit_name
+
+            print(f"Compiling {name} into the artifact cache...")
+            self._run([self.circom, "--r1cs", "--wasm", "--sym", "--c", "-o", staged, self.circuit_path])
+
+            ptau = self.ptau_path or self._local_ptau(workspace)
+            zkey = os.path.join(staged, f"{name}.zkey")
+            self._run([self.snarkjs, "groth16", "setup", os.path.join(staged, f"{name}.r1cs"), ptau, zkey])
+            self._run([self.snarkjs, "zkey", "export", "verificationkey", zkey,
+                       os.path.join(staged, "verification_key.json")])
+
+            with open(os.path.join(staged, MANIFEST), "w") as f:
+                json.dump({
+                    "key": artifacts.key,
+                    "circuit": self.circuit_path,
+                    "circomlib": self.circomlib_version(),
+                    "circom": self.circom_version(),
+                    "snarkjs": self.snarkjs_version(),
+                    "ptau": self.ptau_path or f"bn128 {self.ptau_power}",
+                }, f, indent=2)
+
+            try:
+                os.rename(staged, artifacts.directory)
+            except OSError:
+                # Another process finished the same build first
+                if not os.path.exists(os.path.join(artifacts.directory, MANIFEST)):
+                    raise
+
+    def _local_ptau(self, workspace: str) -> str:
+        """Generate and prepare a throwaway powers-of-tau for testing."""
+        print(f"Generating powers of tau (2^{self.ptau_power})...")
+        initial = os.path.join(workspace, "pot_0000.ptau")
+        contributed = os.path.join(workspace, "pot_0001.ptau")
+        prepared = os.path.join(workspace, "pot_final.ptau")
+        self._run([self.snarkjs, "powersoftau", "new", "bn128", str(self.ptau_power), initial])
+        self._run([self.snarkjs, "powersoftau", "contribute", initial, contributed,
+                   "--name=artifact cache", f"-e={os.urandom(32).hex()}"])
+        self._run([self.snarkjs, "powersoftau", "prepare", "phase2", contributed, prepared])
+        return prepared
+
+    @staticmethod
+    def _run(command: List[str]) -> None:
+        try:
+            subprocess.run(command, check=True, capture_output=True)
+        except (OSError, subprocess.CalledProcessError) as e:
+            stderr = getattr(e, "stderr", b"") or b""
+            raise RuntimeError(f"Artifact build step failed: {' '.join(command)}: {e} "
+                               f"{stderr.decode(errors='replace')}")
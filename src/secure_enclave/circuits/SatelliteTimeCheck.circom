@@ -21,11 +21,11 @@ template SatelliteTimeCheck() {
     
     // Check if offset is within acceptable range
     component lt = LessThan(252);
-    lt.in[0] <== offset + Delta;  // offset + Delta > 0
+    lt.in[0] <== offset - Delta;  // offset - Delta < 0
     lt.in[1] <== 0;
     
     component gt = GreaterThan(252);
-    gt.in[0] <== offset - Delta;  // offset - Delta < 0
+    gt.in[0] <== offset + Delta;  // offset + Delta > 0
     gt.in[1] <== 0;
     
     // Both conditions must be true
@@ -34,4 +34,4 @@ template SatelliteTimeCheck() {
     valid === 1;  // Must be valid
 }
 
-component main = SatelliteTimeCheck();
+component main {public [T_sat, c, Delta]} = SatelliteTimeCheck();
@@ -0,0 +1,39 @@
+pragma circom 2.0.0;
+
+include "../../../node_modules/circomlib/circuits/bitify.circom";
+include "../../../node_modules/circomlib/circuits/comparators.circom";
+
+// Checks N (T_sat, T_local, D) tuples in one proof.
+//
+// |offset| < Delta is shown as 0 <= offset + Delta < 2 * Delta: Num2Bits
+// range-checks the shifted offset to BITS bits, so a negative offset
+// (which wraps to a huge field element) cannot satisfy it, and one
+// LessThan(BITS) bounds it from above. BITS only needs to cover
+// 2 * Delta, far below the 252 bits the single-epoch circuit spends on
+// each of its two comparators.
+template SatelliteTimeCheckBatch(N, BITS) {
+    // Public inputs
+    signal input T_sat[N];  // Satellite broadcast time per epoch
+    signal input c;         // Speed of light constant
+    signal input Delta;     // Allowed error margin
+
+    // Private inputs
+    signal input T_local[N];  // Device's local time per epoch
+    signal input D[N];        // Distance/time-of-flight factor per epoch
+
+    signal offset[N];
+    component range[N];
+    component below[N];
+
+    for (var i = 0; i < N; i++) {
+        offset[i] <== (T_local[i] - T_sat[i]) * c - D[i];
+
+        range[i] = Num2Bits(BITS);
+        range[i].in <== offset[i] + Delta;
+
+        below[i] = LessThan(BITS);
+        below[i].in[0] <== offset[i] + Delta;
+        below[i].in[1] <== 2 * Delta;
+        below[i].out === 1;
+    }
+}
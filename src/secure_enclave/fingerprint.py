@@ -0,0 +1,114 @@
+"""Canonical satellite fingerprint shared by prover, validator and enclave.
+
+The fingerprint is SHA-256 over a fixed-width binary encoding of the
+unreleased almanac data rather than over ``str()`` renderings of it::
+
+    header     magic "SATF", version u8, satellite count u32
+    satellite  clock correction, ionospheric data, atmospheric corrections,
+               doppler shift (f64 each) and satellite health (i32), repeated
+
+All values are little-endian. The per-satellite part is byte-for-byte the
+tail of a binary ``TimeProof`` satellite record, so a validator holding a
+wire proof hashes straight from the buffer.
+"""
+from typing import Any, Iterable, List, Sequence, Union
+import hashlib
+import struct
+import numpy as np
+from ..gps_module.satellite_batch import ALMANAC_FLOAT_FIELDS, RECORD_DTYPE, SatelliteBatch
+from ..gps_module.satellite_data import SatelliteData
+
+MAGIC = b"SATF"
+VERSION = 1
+HEADER = struct.Struct("<4sBI")
+
+ALMANAC_DTYPE = np.dtype([
+    ("almanac", "<f8", (len(ALMANAC_FLOAT_FIELDS),)),
+    ("satellite_health", "<i4"),
+])
+# Offset of the almanac fields within a packed satellite record
+RECORD_ALMANAC_OFFSET = RECORD_DTYPE.fields["almanac"][1]
+
+Satellites = Union[SatelliteBatch, Sequence[SatelliteData], Sequence[dict]]
+
+
+class FingerprintHasher:
+    """Incremental fingerprint of one epoch, fed satellite by satellite or in chunks."""
+
+    def __init__(self, count: int):
+        """Start a fingerprint over ``count`` satellites."""
+        self.count = count
+        self._hash = hashlib.sha256(HEADER.pack(MAGIC, VERSION, count))
+
+    def update(self, packed) -> None:
+        """Add already packed satellite entries (any buffer)."""
+        self._hash.update(packed)
+
+    def update_batch(self, satellites: SatelliteBatch) -> None:
+        """Add the satellites of a batch."""
+        self._hash.update(pack_almanac(satellites))
+
+    def hexdigest(self) -> str:
+        return self._hash.hexdigest()
+
+
+def as_batch(satellites: Satellites) -> SatelliteBatch:
+    """Batch form of satellites given as a batch, ``SatelliteData`` or metadata dicts."""
+    if isinstance(satellites, SatelliteBatch):
+        return satellites
+    if satellites and isinstance(satellites[0], dict):
+        return SatelliteBatch.from_metadata(satellites)
+    return SatelliteBatch.from_satellites(satellites)
+
+
+def pack_almanac(satellites: SatelliteBatch) -> bytes:
+    """Canonical per-satellite encoding of a batch."""
+    packed = np.empty(len(satellites), dtype=ALMANAC_DTYPE)
+    packed["almanac"] = satellites.almanac
+    packed["satellite_health"] = satellites.satellite_health
+    return packed.tobytes()
+
+
+def satellite_fingerprint(satellites: Satellites) -> str:
+    """Fingerprint of one epoch's satellites."""
+    batch = as_batch(satellites)
+    hasher = FingerprintHasher(len(batch))
+    hasher.update_batch(batch)
+    return hasher.hexdigest()
+
+
+def satellite_fingerprints(epochs: Iterable[Satellites]) -> List[str]:
+    """Fingerprints of many epochs, packed in one pass."""
+    batches = [as_batch(epoch) for epoch in epochs]
+    if not batches:
+        return []
+    packed = np.empty(sum(len(batch) for batch in batches), dtype=ALMANAC_DTYPE)
+    packed["almanac"] = np.concatenate([batch.almanac for batch in batches])
+    packed["satellite_health"] = np.concatenate([batch.satellite_health for batch in batches])
+    view = memoryview(packed.tobytes())
+
+    fingerprints = []
+    start = 0
+    for batch in batches:
+        end = start + len(batch) * ALMANAC_DTYPE.itemsize
+        h = hashlib.sha256(HEADER.pack(MAGIC, VERSION, len(batch)))
+        h.update(view[start:end])
+        fingerprints.append(h.hexdigest())
+        start = end
+    return fingerprints
+
+
+def records_fingerprint(records, count: int) -> str:
+    """Fingerprint straight from ``count`` packed satellite records (wire layout)."""
+    raw = np.frombuffer(records, dtype=np.uint8, count=count * RECORD_DTYPE.itemsize)
+    hasher = FingerprintHasher(count)
+    hasher.update(raw.reshape(count, RECORD_DTYPE.itemsize)[:, RECORD_ALMANAC_OFFSET:].tobytes())
+    return hasher.hexdigest()
+
+
+def proof_fingerprint(proof: Any) -> str:
+    """Recompute the fingerprint of a ``TimeProof`` or ``TimeProofView``."""
+    record_bytes = getattr(proof, "satellite_record_bytes", None)
+    if record_bytes is not None:
+        return records_fingerprint(record_bytes(), proof.satellite_count)
+    return satellite_fingerprint(proof.metadata["satellite_data"])
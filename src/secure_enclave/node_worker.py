@@ -0,0 +1,144 @@
+from typing import Dict, List, Optional
+import itertools
+import json
+import os
+import select
+import subprocess
+import threading
+import time
+from ..telemetry.metrics import REGISTRY
+
+SUBPROCESS_WALL = REGISTRY.histogram(
+    "continuum_subprocess_wall_seconds",
+    "Wall time of requests to helper processes, including pipe transfer",
+    ("worker", "op"),
+)
+SUBPROCESS_CPU = REGISTRY.histogram(
+    "continuum_subprocess_cpu_seconds",
+    "CPU time helper processes spent serving a request",
+    ("worker", "op"),
+)
+
+
+class NodeWorker:
+    """Long-lived Node.js helper process speaking newline-delimited JSON.
+
+    Each request is written to the helper's stdin as one JSON object with an
+    ``id`` and an ``op``; the helper answers with one JSON line carrying the
+    same ``id``, an ``ok`` flag and either a ``result`` or an ``error``.
+    Keeping the process alive means Node, snarkjs and any keys or WASM
+    modules are loaded once instead of once per proof. Helpers also report
+    the CPU time each request took as ``cpu`` (seconds), which is recorded
+    next to the wall time seen from here when metrics are enabled.
+
+    A helper that does not answer within ``timeout`` seconds is killed, so
+    a wedged process cannot hold the lock forever; the next request starts
+    a fresh one.
+    """
+
+    timeout: Optional[float] = 300.0
+
+    def __init__(self, script: str, args: Optional[List[str]] = None, node: str = "node"):
+        """Describe the helper process; it is started lazily on first use."""
+        self.script = script
+        self.args = list(args or [])
+        self.node = node
+        self.process: Optional[subprocess.Popen] = None
+        self.worker_name = os.path.splitext(os.path.basename(script))[0]
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._pending = b""
+
+    def start(self) -> None:
+        """Launch the helper process if it is not already running."""
+        if self.process is not None and self.process.poll() is None:
+            return
+        self.process = subprocess.Popen(
+            [self.node, self.script, *self.args],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            bufsize=0,
+        )
+        self._pending = b""
+
+    def request(self, op: str, **payload) -> Dict:
+        """Send one request and block until the matching response arrives."""
+        started = time.perf_counter() if REGISTRY.enabled else 0.0
+        with self._lock:
+            self.start()
+            request_id = next(self._ids)
+            message = dict(payload, id=request_id, op=op)
+            try:
+                self.process.stdin.write(json.dumps(message).encode() + b"\n")
+                self.process.stdin.flush()
+                line = self._readline()
+            except TimeoutError:
+                self._kill()
+                raise RuntimeError(f"{op}: worker did not answer within {self.timeout}s")
+            except (BrokenPipeError, OSError) as e:
+                self._terminate()
+                raise RuntimeError(f"{op}: worker pipe failed: {e}")
+
+            if not line:
+                self._terminate()
+                raise RuntimeError(f"{op}: worker exited unexpectedly")
+
+        response = json.loads(line)
+        if REGISTRY.enabled:
+            SUBPROCESS_WALL.observe(time.perf_counter() - started, self.worker_name, op)
+            if "cpu" in response:
+                SUBPROCESS_CPU.observe(response["cpu"], self.worker_name, op)
+        if response.get("id") != request_id:
+            raise RuntimeError(f"{op}: out-of-order worker response")
+        if not response.get("ok"):
+            raise RuntimeError(f"{op}: {response.get('error')}")
+        return response
+
+    def close(self) -> None:
+        """Stop the helper process."""
+        with self._lock:
+            self._terminate()
+
+    def _readline(self) -> bytes:
+        """Next line from the helper, or b"" once it has exited."""
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        stdout = self.process.stdout.fileno()
+        while b"\n" not in self._pending:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                raise TimeoutError
+            ready, _, _ = select.select([stdout], [], [], remaining)
+            if not ready:
+                raise TimeoutError
+            chunk = os.read(stdout, 65536)
+            if not chunk:
+                return b""
+            self._pending += chunk
+        line, _, self._pending = self._pending.partition(b"\n")
+        return line + b"\n"
+
+    def _kill(self) -> None:
+        self.process.kill()
+        self.process.wait()
+        self.process.stdin.close()
+        self.process.stdout.close()
+        self.process = None
+
+    def _terminate(self) -> None:
+        if self.process is None:
+            return
+        try:
+            self.process.stdin.close()
+            self.process.wait(timeout=5)
+        except Exception:
+            self.process.kill()
+            self.process.wait()
+        self.process.stdout.close()
+        self.process = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
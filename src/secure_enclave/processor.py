@@ -1,14 +1,36 @@
-from typing import Dict, Optional, List
-import hashlib
-from ..gps_module.gps_receiver import SatelliteData
+from typing import Dict, Iterable, Iterator, Optional, List, Union
+import numpy as np
+from ..gps_module.satellite_data import SatelliteData
+from ..gps_module.satellite_batch import SatelliteBatch
+from ..gps_module.clock_filter import ClockFilter
+from ..gps_module.clock_solver import ClockSolver, SPEED_OF_LIGHT
+from .fingerprint import satellite_fingerprint
 
 class SecureEnclaveProcessor:
-    def __init__(self):
-        """Initialize secure enclave for GPS data processing."""
+    def __init__(self, clock_filter: Optional[ClockFilter] = None, range_sigma: float = 5.0,
+                 residual_threshold: float = 100.0, max_rejects: int = 5):
+        """Initialize secure enclave for GPS data processing.
+
+        The continuous mode (``process_epoch``/``process_stream``) tracks the
+        receiver clock with ``clock_filter``. ``range_sigma`` is the
+        pseudorange noise in metres, ``residual_threshold`` how far in
+        metres a satellite may stray from the predicted clock before it is
+        dropped, and after ``max_rejects`` consecutive rejected epochs the
+        position and clock are solved afresh.
+        """
         self.current_time = None
         self.last_proof = None
+        self.min_satellites = 4
+        self.clock_solver = ClockSolver()
+        self.clock_filter = clock_filter if clock_filter is not None else ClockFilter()
+        self.range_sigma = range_sigma
+        self.residual_threshold = residual_threshold
+        self.max_rejects = max_rejects
+        self.receiver_position: Optional[np.ndarray] = None
+        self.stats = {"epochs": 0, "accepted": 0, "rejected": 0, "excluded_satellites": 0, "resets": 0}
+        self._consecutive_rejects = 0
         
-    def process_gps_data(self, satellite_data: List[SatelliteData]) -> Dict:
+    def process_gps_data(self, satellite_data: Union[List[SatelliteData], SatelliteBatch]) -> Dict:
         """Process GPS data in secure environment."""
         # Verify minimum satellite requirement
         if len(satellite_data) < 4:
@@ -20,26 +42,141 @@ class SecureEnclaveProcessor:
         # Generate proof
         proof = self._generate_proof(processed_data)
         
+        self.current_time = processed_data["timestamp"]
+        self.last_proof = proof
         return {
             "timestamp": processed_data["timestamp"],
             "proof": proof,
-            "satellite_count": len(satellite_data)
+            "satellite_count": len(processed_data["satellites"])
         }
         
-    def _validate_and_process(self, satellite_data: List[SatelliteData]) -> Dict:
-        """Validate and process satellite data securely."""
-        # Implementation for secure data processing
-        pass
+    def _validate_and_process(self, satellite_data: Union[List[SatelliteData], SatelliteBatch]) -> Dict:
+        """Validate and process satellite data securely.
+
+        Drops unhealthy satellites and those with non-finite or acausal
+        timing (transmitted after they were received), then solves the
+        receiver time from the rest.
+        """
+        satellites = self._usable(SatelliteBatch.coerce(satellite_data))
+        timestamp = self.clock_solver.solve_time(satellites)
+        if timestamp is None:
+            raise ValueError("Satellite data does not yield a time solution")
+        return {"timestamp": timestamp, "satellites": satellites}
+
+    def _usable(self, satellites: SatelliteBatch) -> SatelliteBatch:
+        """Satellites that are healthy with finite, causal timing."""
+        usable = (
+            (satellites.satellite_health == 0)
+            & np.all(np.isfinite(satellites.positions), axis=1)
+            & np.isfinite(satellites.atomic_timestamps)
+            & np.isfinite(satellites.travel_times)
+            & (satellites.travel_times > 0)
+        )
+        if not np.all(usable):
+            satellites = satellites.select(usable)
+        if len(satellites) < self.min_satellites:
+            raise ValueError("Insufficient usable satellites for accurate timing")
+        return satellites
+
+    def process_epoch(self, satellite_data: Union[List[SatelliteData], SatelliteBatch]) -> Dict:
+        """Process the next epoch of a continuous stream.
+
+        The first epoch (and the first after a reset) is solved in full for
+        receiver position and clock bias. The position is then held, so
+        each later epoch only needs one pass over its satellites: their
+        ranges give per-satellite clock measurements, satellites far from
+        the predicted clock are dropped, and the average of the rest
+        updates the clock filter, whose gate accepts or rejects the epoch.
+        No history is kept beyond the filter state.
+
+        Raises ``ValueError`` for a rejected epoch.
+        """
+        self.stats["epochs"] += 1
+        try:
+            satellites = self._usable(SatelliteBatch.coerce(satellite_data))
+        except ValueError:
+            self._reject()
+            raise
+        receive_time = float(satellites.atomic_timestamps.mean())
+
+        if not self.clock_filter.initialized:
+            self._initialize(satellites, receive_time)
+        else:
+            pseudoranges = SPEED_OF_LIGHT * satellites.travel_times
+            ranges = np.linalg.norm(satellites.positions - self.receiver_position, axis=1)
+            biases = (pseudoranges - ranges) / SPEED_OF_LIGHT
+            predicted, _, variance, _, _ = self.clock_filter.predict(receive_time)
+            tolerance = self.residual_threshold / SPEED_OF_LIGHT + self.clock_filter.gate * np.sqrt(variance)
+            keep = np.abs(biases - predicted) <= tolerance
+            count = int(keep.sum())
+            if count < self.min_satellites or not self.clock_filter.update(
+                    receive_time, float(biases[keep].mean()), self._measurement_variance(count)):
+                if self._consecutive_rejects + 1 < self.max_rejects:
+                    self._reject()
+                    raise ValueError("Epoch inconsistent with the predicted receiver clock")
+                # Clock jump or moved receiver: start over from this epoch
+                self.reset()
+                self._initialize(satellites, receive_time)
+            else:
+                self.stats["excluded_satellites"] += len(satellites) - count
+                if count < len(satellites):
+                    satellites = satellites.select(keep)
+
+        self._consecutive_rejects = 0
+        self.stats["accepted"] += 1
+        timestamp = receive_time - self.clock_filter.bias
+        proof = self._generate_proof({"timestamp": timestamp, "satellites": satellites})
+        self.current_time = timestamp
+        self.last_proof = proof
+        return {
+            "timestamp": timestamp,
+            "proof": proof,
+            "satellite_count": len(satellites),
+            "clock_bias": self.clock_filter.bias,
+            "clock_drift": self.clock_filter.drift,
+            "clock_sigma": self.clock_filter.bias_sigma,
+        }
+
+    def process_stream(self, epochs: Iterable[Union[List[SatelliteData], SatelliteBatch]]) -> Iterator[Dict]:
+        """Yield the result of every accepted epoch of a stream, in order.
+
+        Rejected epochs are skipped and counted in ``stats``.
+        """
+        for epoch in epochs:
+            try:
+                yield self.process_epoch(epoch)
+            except ValueError:
+                continue
+
+    def reset(self) -> None:
+        """Forget the held position and clock state."""
+        self.clock_filter.reset()
+        self.receiver_position = None
+        self._consecutive_rejects = 0
+
+    def _initialize(self, satellites: SatelliteBatch, receive_time: float) -> None:
+        """Solve position and clock bias in full and restart the filter from them."""
+        _, solution = self.clock_solver.solve_epochs([satellites])
+        if not (solution.converged[0] and np.all(np.isfinite(solution.positions[0]))):
+            self.reset()
+            self.stats["rejected"] += 1
+            raise ValueError("Satellite data does not yield a time solution")
+        if self.stats["accepted"]:
+            self.stats["resets"] += 1
+        self.receiver_position = solution.positions[0].copy()
+        count = max(int(solution.used[0].sum()), 1)
+        self.clock_filter.initialize(receive_time, float(solution.clock_bias[0]),
+                                     self._measurement_variance(count))
+
+    def _measurement_variance(self, count: int) -> float:
+        """Variance in s^2 of the mean clock bias over ``count`` satellites."""
+        return (self.range_sigma / SPEED_OF_LIGHT) ** 2 / count
+
+    def _reject(self) -> None:
+        self.stats["rejected"] += 1
+        self._consecutive_rejects += 1
         
     def _generate_proof(self, processed_data: Dict) -> str:
         """Generate cryptographic proof of time validity."""
         # Create fingerprint using satellite metadata
-        metadata = self._collect_metadata(processed_data)
-        fingerprint = hashlib.sha256(metadata.encode()).hexdigest()
-        
-        return fingerprint
-        
-    def _collect_metadata(self, processed_data: Dict) -> str:
-        """Collect satellite metadata for fingerprinting."""
-        # Implementation for metadata collection
-        pass 
\ No newline at end of file
+        return satellite_fingerprint(processed_data["satellites"])
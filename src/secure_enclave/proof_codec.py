@@ -0,0 +1,231 @@
+"""Versioned binary wire format for ``TimeProof``.
+
+Layout (little-endian unless noted)::
+
+    header      magic "TPRF", version u8, flags u8, satellite count u16,
+                timestamp f64, data timestamp u64 (ns), extra-metadata length u32,
+                zk-proof length u32
+    T_sat       32-byte big-endian field element
+    fingerprint 32 raw bytes
+    zk proof    8 big-endian 32-byte field elements (A.x, A.y, B.x0, B.x1,
+                B.y0, B.y1, C.x, C.y), or the raw snarkjs JSON when
+                FLAG_RAW_PROOF is set
+    satellites  one fixed 84-byte record per satellite: PRN (8 bytes ASCII),
+                position xyz, atomic timestamp, transmission time, clock
+                correction, ionospheric data, atmospheric corrections,
+                doppler shift (f64 each) and satellite health (i32)
+    extra       remaining metadata keys as JSON (usually empty)
+
+``TimeProofView`` decodes fields on access straight from a ``memoryview``,
+so a validator that rejects a proof on its timestamp never touches the
+proof points or the satellite records. The satellite records share their
+layout with ``RECORD_DTYPE``, so ``satellite_batch`` maps them into a
+``SatelliteBatch`` without copying.
+"""
+from typing import Any, Dict, Optional, Tuple
+import json
+import struct
+import numpy as np
+from ..gps_module.satellite_batch import ALMANAC_FLOAT_FIELDS, RECORD_DTYPE, SatelliteBatch
+
+MAGIC = b"TPRF"
+VERSION = 1
+FLAG_RAW_PROOF = 0x01
+
+HEADER = struct.Struct("<4sBBHdQII")
+FIELD_BYTES = 32
+SATELLITE_RECORD = struct.Struct("<8s9di")
+KNOWN_METADATA = ("T_sat", "timestamp", "satellite_data")
+
+
+def encode_time_proof(proof) -> bytes:
+    """Serialize a ``TimeProof`` (or a view of one) to the binary format."""
+    metadata = proof.metadata
+    satellites = metadata.get("satellite_data", [])
+    extra = {k: v for k, v in metadata.items() if k not in KNOWN_METADATA}
+    extra_bytes = json.dumps(extra).encode() if extra else b""
+
+    flags = 0
+    zk_bytes = _pack_groth16(proof.zk_proof)
+    if zk_bytes is None:
+        flags |= FLAG_RAW_PROOF
+        zk_bytes = bytes(proof.zk_proof)
+
+    parts = [
+        HEADER.pack(MAGIC, VERSION, flags, len(satellites), float(proof.timestamp),
+                    int(metadata["timestamp"]), len(extra_bytes), len(zk_bytes)),
+        int(metadata["T_sat"]).to_bytes(FIELD_BYTES, "big"),
+        bytes.fromhex(proof.satellite_fingerprint),
+        zk_bytes,
+    ]
+    for sat in satellites:
+        almanac = sat["almanac"]
+        x, y, z = sat.get("position", (0.0, 0.0, 0.0))
+        parts.append(SATELLITE_RECORD.pack(
+            str(sat.get("prn", "")).encode("ascii")[:8],
+            x, y, z,
+            sat.get("atomic_timestamp", 0.0),
+            sat.get("transmission_time", 0.0),
+            *(almanac[field] for field in ALMANAC_FLOAT_FIELDS),
+            int(almanac["satellite_health"]),
+        ))
+    parts.append(extra_bytes)
+    return b"".join(parts)
+
+
+def _pack_groth16(zk_proof: bytes) -> Optional[bytes]:
+    """Pack a snarkjs bn128 Groth16 proof as fixed-width points, if it is one."""
+    try:
+        proof = json.loads(zk_proof)
+        if (proof.get("protocol") != "groth16" or proof.get("curve") != "bn128"
+                or proof["pi_a"][2] != "1" or proof["pi_c"][2] != "1"
+                or proof["pi_b"][2] != ["1", "0"]):
+            return None
+        values = [
+            proof["pi_a"][0], proof["pi_a"][1],
+            proof["pi_b"][0][0], proof["pi_b"][0][1],
+            proof["pi_b"][1][0], proof["pi_b"][1][1],
+            proof["pi_c"][0], proof["pi_c"][1],
+        ]
+        return b"".join(int(v).to_bytes(FIELD_BYTES, "big") for v in values)
+    except (ValueError, TypeError, KeyError, IndexError, AttributeError, OverflowError):
+        return None
+
+
+class TimeProofView:
+    """Lazily decoded ``TimeProof`` over a buffer in the binary format.
+
+    Exposes the same attributes as ``TimeProof``; each is decoded on first
+    access. The buffer must stay alive and unmodified while the view is used.
+    """
+
+    __slots__ = ("_buf", "_flags", "_count", "_timestamp", "_data_timestamp",
+                 "_extra_len", "_zk_len", "_zk_offset", "_sat_offset",
+                 "_zk_proof", "_metadata")
+
+    def __init__(self, buffer):
+        """Validate the header; everything else is decoded on demand."""
+        buf = memoryview(buffer).cast("B")
+        if len(buf) < HEADER.size:
+            raise ValueError("Truncated time proof header")
+        (magic, version, self._flags, self._count, self._timestamp,
+         self._data_timestamp, self._extra_len, self._zk_len) = HEADER.unpack_from(buf)
+        if magic != MAGIC:
+            raise ValueError("Not a binary time proof")
+        if version != VERSION:
+            raise ValueError(f"Unsupported time proof version {version}")
+
+        self._zk_offset = HEADER.size + 2 * FIELD_BYTES
+        self._sat_offset = self._zk_offset + self._zk_len
+        expected = self._sat_offset + self._count * SATELLITE_RECORD.size + self._extra_len
+        if len(buf) < expected:
+            raise ValueError("Truncated time proof")
+        self._buf = buf[:expected]
+        self._zk_proof = None
+        self._metadata = None
+
+    @property
+    def timestamp(self) -> float:
+        return self._timestamp
+
+    @property
+    def data_timestamp(self) -> int:
+        """Satellite data timestamp in nanoseconds (``metadata["timestamp"]``)."""
+        return self._data_timestamp
+
+    @property
+    def satellite_count(self) -> int:
+        return self._count
+
+    @property
+    def satellite_fingerprint(self) -> str:
+        start = HEADER.size + FIELD_BYTES
+        return self._buf[start:start + FIELD_BYTES].hex()
+
+    @property
+    def T_sat(self) -> str:
+        return str(int.from_bytes(self._buf[HEADER.size:HEADER.size + FIELD_BYTES], "big"))
+
+    @property
+    def zk_proof(self) -> bytes:
+        """The proof as snarkjs JSON bytes."""
+        if self._zk_proof is None:
+            raw = self._buf[self._zk_offset:self._sat_offset]
+            if self._flags & FLAG_RAW_PROOF:
+                self._zk_proof = bytes(raw)
+            else:
+                self._zk_proof = json.dumps(self.groth16_proof()).encode()
+        return self._zk_proof
+
+    def groth16_proof(self) -> Dict[str, Any]:
+        """The proof as a parsed snarkjs JSON object."""
+        if self._flags & FLAG_RAW_PROOF:
+            return json.loads(self.zk_proof)
+        v = [
+            str(int.from_bytes(self._buf[i:i + FIELD_BYTES], "big"))
+            for i in range(self._zk_offset, self._sat_offset, FIELD_BYTES)
+        ]
+        return {
+            "pi_a": [v[0], v[1], "1"],
+            "pi_b": [[v[2], v[3]], [v[4], v[5]], ["1", "0"]],
+            "pi_c": [v[6], v[7], "1"],
+            "protocol": "groth16",
+            "curve": "bn128",
+        }
+
+    def satellite_record(self, index: int) -> Tuple:
+        """Raw record tuple for one satellite without building any dicts."""
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        return SATELLITE_RECORD.unpack_from(self._buf, self._sat_offset + index * SATELLITE_RECORD.size)
+
+    def satellite_records(self):
+        """Iterate raw record tuples for all satellites."""
+        end = self._sat_offset + self._count * SATELLITE_RECORD.size
+        return SATELLITE_RECORD.iter_unpack(self._buf[self._sat_offset:end])
+
+    def satellite_record_bytes(self) -> memoryview:
+        """The packed satellite records, without decoding them."""
+        return self._buf[self._sat_offset:self._sat_offset + self._count * SATELLITE_RECORD.size]
+
+    def satellite_batch(self) -> SatelliteBatch:
+        """All satellites as columns viewing the buffer directly."""
+        records = np.frombuffer(self._buf, dtype=RECORD_DTYPE, count=self._count,
+                                offset=self._sat_offset)
+        return SatelliteBatch.from_records(records)
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        """Metadata in the same nested-dict shape the prover produces."""
+        if self._metadata is None:
+            metadata = {
+                "T_sat": self.T_sat,
+                "timestamp": self._data_timestamp,
+                "satellite_data": [self._satellite_dict(r) for r in self.satellite_records()],
+            }
+            if self._extra_len:
+                start = len(self._buf) - self._extra_len
+                metadata.update(json.loads(bytes(self._buf[start:])))
+            self._metadata = metadata
+        return self._metadata
+
+    def to_bytes(self) -> bytes:
+        return bytes(self._buf)
+
+    @staticmethod
+    def _satellite_dict(record: Tuple) -> Dict[str, Any]:
+        prn, x, y, z, atomic_timestamp, transmission_time, clock, iono, atmo, doppler, health = record
+        almanac_data = {
+            "clock_correction": clock,
+            "ionospheric_data": iono,
+            "atmospheric_corrections": atmo,
+            "satellite_health": health,
+            "doppler_shift": doppler,
+        }
+        return {
+            "prn": prn.rstrip(b"\0").decode("ascii"),
+            "position": [x, y, z],
+            "atomic_timestamp": atomic_timestamp,
+            "transmission_time": transmission_time,
+            "almanac": almanac_data,
+        }
@@ -0,0 +1,43 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional
+import os
+import queue
+import threading
+
+
+class ProvingPool:
+    """Bounded pool for running proving jobs concurrently.
+
+    Proving work happens in child processes (witness generation and
+    snarkjs), so a thread pool is enough to keep every core busy. The number
+    of jobs that may be queued or running at once is capped: once the cap is
+    reached, ``submit`` blocks until a slot frees up, or raises
+    ``queue.Full`` if the caller asked not to wait.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_pending: Optional[int] = None):
+        """Create a pool sized to the host by default."""
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_pending = max_pending or 2 * self.max_workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="zk-prover",
+        )
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+
+    def submit(self, fn: Callable, *args, block: bool = True,
+               timeout: Optional[float] = None, **kwargs) -> Future:
+        """Queue a job, applying backpressure when the pool is saturated."""
+        if not self._slots.acquire(blocking=block, timeout=timeout if block else None):
+            raise queue.Full("proving queue is full")
+        try:
+            future = self._executor.submit(fn, *args, **kwargs)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting jobs and optionally wait for running ones."""
+        self._executor.shutdown(wait=wait)
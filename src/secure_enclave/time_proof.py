@@ -0,0 +1,20 @@
+from typing import Dict
+from dataclasses import dataclass
+from .proof_codec import TimeProofView, encode_time_proof
+
+
+@dataclass
+class TimeProof:
+    timestamp: float
+    satellite_fingerprint: str
+    zk_proof: bytes
+    metadata: Dict[str, any]
+
+    def to_bytes(self) -> bytes:
+        """Encode in the compact binary wire format."""
+        return encode_time_proof(self)
+
+    @staticmethod
+    def from_buffer(buffer) -> TimeProofView:
+        """Decode lazily from a buffer in the binary wire format."""
+        return TimeProofView(buffer)
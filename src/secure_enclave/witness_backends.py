@@ -0,0 +1,178 @@
+from typing import Dict, Optional
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+from ..telemetry.metrics import ERRORS, REGISTRY
+from .node_worker import SUBPROCESS_CPU, SUBPROCESS_WALL
+from .witness_worker import WitnessWorkerPool
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "continuum", "witness")
+
+
+class WasmWitnessBackend:
+    """Witness generation in warm Node workers running the circuit WASM."""
+
+    name = "wasm"
+
+    def __init__(self, wasm_path: str, zkey_path: str, max_workers: Optional[int] = None):
+        """Initialize the backend for a compiled circuit and its proving key."""
+        self.workers = WitnessWorkerPool(wasm_path, zkey_path, max_workers)
+
+    def calculate_witness(self, inputs: Dict) -> bytes:
+        """Compute the witness in ``.wtns`` binary format."""
+        with self.workers.acquire() as worker:
+            return worker.calculate_witness(inputs)
+
+    def prove(self, inputs: Dict) -> bytes:
+        """Compute witness and proof, returning snarkjs proof JSON bytes."""
+        with self.workers.acquire() as worker:
+            proof, _ = worker.prove(inputs)
+        return proof
+
+    def close(self) -> None:
+        """Stop the worker processes."""
+        self.workers.close()
+
+
+class NativeWitnessBackend:
+    """Witness generation with the circom C++ generator.
+
+    The generator in ``cpp_dir`` is built with its Makefile into a cache
+    directory keyed by a hash of its sources, so it is compiled once per
+    circuit version. Proving still happens in the warm Node workers, which
+    receive the witness from memory.
+    """
+
+    name = "native"
+
+    def __init__(self, cpp_dir: str, wasm_path: str, zkey_path: str,
+                 cache_dir: str = DEFAULT_CACHE_DIR, max_workers: Optional[int] = None):
+        """Initialize the backend; call ``build`` before first use."""
+        self.cpp_dir = os.path.abspath(cpp_dir)
+        self.cache_dir = cache_dir
+        self.circuit_name = os.path.basename(self.cpp_dir.rstrip(os.sep))[:-len("_cpp")]
+        self.binary_path: Optional[str] = None
+        self.workers = WitnessWorkerPool(wasm_path, zkey_path, max_workers)
+
+    def build(self) -> str:
+        """Build the generator if no cached binary exists and return its path.
+
+        Raises ``RuntimeError`` if the sources are missing or the build fails.
+        """
+        if self.binary_path is not None:
+            return self.binary_path
+
+        target_dir = os.path.join(self.cache_dir, self._source_digest())
+        binary_path = os.path.join(target_dir, self.circuit_name)
+        if not os.path.exists(binary_path):
+            self._compile(target_dir)
+
+        self.binary_path = binary_path
+        return binary_path
+
+    def calculate_witness(self, inputs: Dict) -> bytes:
+        """Compute the witness in ``.wtns`` binary format."""
+        binary_path = self.build()
+        with tempfile.TemporaryDirectory(prefix="zkwitness-") as workspace:
+            input_path = os.path.join(workspace, "input.json")
+            witness_path = os.path.join(workspace, "witness.wtns")
+            with open(input_path, "w") as f:
+                json.dump(inputs, f)
+
+            command = [binary_path, input_path, witness_path]
+            if REGISTRY.enabled:
+                self._run_measured(command)
+            else:
+                subprocess.run(command, check=True, capture_output=True)
+
+            with open(witness_path, "rb") as f:
+                return f.read()
+
+    @staticmethod
+    def _run_measured(command) -> None:
+        """Run the generator like ``subprocess.run(check=True)``, recording its wall and CPU time."""
+        started = time.perf_counter()
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        with process.stdout:
+            output = process.stdout.read()
+        # wait4 reaps this child only, so concurrent jobs do not mix their usage
+        _, status, usage = os.wait4(process.pid, 0)
+        process.returncode = os.waitstatus_to_exitcode(status)
+        SUBPROCESS_WALL.observe(time.perf_counter() - started, "witness_native", "witness")
+        SUBPROCESS_CPU.observe(usage.ru_utime + usage.ru_stime, "witness_native", "witness")
+        if process.returncode:
+            raise subprocess.CalledProcessError(process.returncode, command, output)
+
+    def prove(self, inputs: Dict) -> bytes:
+        """Compute witness and proof, returning snarkjs proof JSON bytes."""
+        witness = self.calculate_witness(inputs)
+        with self.workers.acquire() as worker:
+            proof, _ = worker.prove_witness(witness)
+        return proof
+
+    def close(self) -> None:
+        """Stop the worker processes."""
+        self.workers.close()
+
+    def _source_digest(self) -> str:
+        """Hash every input of the build so stale binaries are never reused."""
+        if not os.path.isdir(self.cpp_dir):
+            raise RuntimeError(f"Native witness sources not found: {self.cpp_dir}")
+        digest = hashlib.sha256()
+        for name in sorted(os.listdir(self.cpp_dir)):
+            if name.endswith((".cpp", ".hpp", ".asm", ".dat")) or name == "Makefile":
+                digest.update(name.encode())
+                with open(os.path.join(self.cpp_dir, name), "rb") as f:
+                    digest.update(f.read())
+        return digest.hexdigest()[:16]
+
+    def _compile(self, target_dir: str) -> None:
+        """Run the Makefile in a scratch copy and move the result into the cache."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with tempfile.TemporaryDirectory(prefix="zkbuild-", dir=self.cache_dir) as workspace:
+            build_dir = os.path.join(workspace, "build")
+            shutil.copytree(self.cpp_dir, build_dir)
+            try:
+                subprocess.run(["make", "-j", str(os.cpu_count() or 1), self.circuit_name],
+                               cwd=build_dir, check=True, capture_output=True)
+            except (OSError, subprocess.CalledProcessError) as e:
+                stderr = getattr(e, "stderr", b"") or b""
+                raise RuntimeError(f"Native witness build failed: {e} {stderr.decode(errors='replace')}")
+
+            # The generator loads <binary>.dat from next to itself
+            staged_dir = os.path.join(workspace, "staged")
+            os.makedirs(staged_dir)
+            for name in (self.circuit_name, self.circuit_name + ".dat"):
+                shutil.copy2(os.path.join(build_dir, name), staged_dir)
+            try:
+                os.rename(staged_dir, target_dir)
+            except OSError:
+                # Another process finished the same build first
+                if not os.path.exists(os.path.join(target_dir, self.circuit_name)):
+                    raise
+
+
+def create_witness_backend(name: str, wasm_path: str, zkey_path: str, cpp_dir: str,
+                           cache_dir: str = DEFAULT_CACHE_DIR,
+                           max_workers: Optional[int] = None):
+    """Create the requested witness backend, falling back to WASM.
+
+    The native backend is built eagerly so a missing compiler, ``nasm`` or
+    GMP is detected here rather than on the first proof.
+    """
+    if name == "native":
+        backend = NativeWitnessBackend(cpp_dir, wasm_path, zkey_path, cache_dir, max_workers)
+        try:
+            backend.build()
+            return backend
+        except RuntimeError as e:
+            ERRORS.inc("witness_backend", "native_build")
+            print(f"Native witness backend unavailable, falling back to WASM: {e}")
+    elif name != "wasm":
+        raise ValueError(f"Unknown witness backend: {name}")
+
+    return WasmWitnessBackend(wasm_path, zkey_path, max_workers)
@@ -0,0 +1,74 @@
+// Warm witness-generation and proving worker.
+//
+// Usage: node witness_worker.js <circuit.wasm> <circuit.zkey>
+//
+// The WASM witness calculator is instantiated once and the proving key is
+// held in memory, so each request costs only the witness computation and
+// the Groth16 prover. Requests arrive on stdin as one JSON object per line:
+//   {"id": 1, "op": "witness", "input": {...}}  -> {"result": "<base64 .wtns>"}
+//   {"id": 2, "op": "prove", "input": {...}}    -> {"result": {"proof": ..., "publicSignals": [...]}}
+//   {"id": 3, "op": "prove_witness", "witness": "<base64 .wtns>"} -> same as "prove"
+// and each gets exactly one JSON line back on stdout, with the CPU seconds
+// the request took as "cpu".
+
+const path = require("path");
+const { readFileSync } = require("fs");
+const readline = require("readline");
+const snarkjs = require("snarkjs");
+
+async function handle(ctx, msg) {
+    switch (msg.op) {
+    case "witness": {
+        const wtns = await ctx.calculator.calculateWTNSBin(msg.input, 0);
+        return Buffer.from(wtns).toString("base64");
+    }
+    case "prove": {
+        const wtns = await ctx.calculator.calculateWTNSBin(msg.input, 0);
+        return snarkjs.groth16.prove(ctx.zkey, { type: "mem", data: wtns });
+    }
+    case "prove_witness": {
+        // Witness computed elsewhere (e.g. the native C++ generator)
+        const wtns = new Uint8Array(Buffer.from(msg.witness, "base64"));
+        return snarkjs.groth16.prove(ctx.zkey, { type: "mem", data: wtns });
+    }
+    case "ping":
+        return true;
+    default:
+        throw new Error(`unknown op ${msg.op}`);
+    }
+}
+
+async function main() {
+    if (process.argv.length !== 4) {
+        console.error("Usage: node witness_worker.js <circuit.wasm> <circuit.zkey>");
+        process.exit(1);
+    }
+    // circom emits witness_calculator.js next to the compiled WASM
+    const wc = require(path.join(path.dirname(path.resolve(process.argv[2])), "witness_calculator.js"));
+    const ctx = {
+        calculator: await wc(readFileSync(process.argv[2])),
+        zkey: { type: "mem", data: new Uint8Array(readFileSync(process.argv[3])) },
+    };
+
+    const rl = readline.createInterface({ input: process.stdin, terminal: false });
+    // Requests are answered strictly in arrival order.
+    let queue = Promise.resolve();
+    rl.on("line", line => {
+        queue = queue.then(async () => {
+            let msg = {};
+            try {
+                msg = JSON.parse(line);
+                const started = process.cpuUsage();
+                const result = await handle(ctx, msg);
+                const used = process.cpuUsage(started);
+                const cpu = (used.user + used.system) / 1e6;
+                process.stdout.write(JSON.stringify({ id: msg.id, ok: true, result, cpu }) + "\n");
+            } catch (err) {
+                process.stdout.write(JSON.stringify({ id: msg.id, ok: false, error: String(err) }) + "\n");
+            }
+        });
+    });
+    rl.on("close", () => queue.then(() => process.exit(0)));
+}
+
+main();
@@ -0,0 +1,99 @@
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+import base64
+import json
+import os
+import threading
+from .node_worker import NodeWorker
+
+WITNESS_WORKER_SCRIPT = os.path.join(os.path.dirname(__file__), 'witness_worker.js')
+
+
+class WitnessWorker(NodeWorker):
+    """Persistent witness calculator and prover for one compiled circuit.
+
+    The circuit WASM is instantiated once and the proving key stays in
+    memory, so a proof costs neither a Node start-up nor a ``.wtns`` file
+    round trip between the witness generator and snarkjs.
+    """
+
+    def __init__(self, wasm_path: str, zkey_path: str):
+        """Initialize the worker for a compiled circuit and its proving key."""
+        self.wasm_path = os.path.abspath(wasm_path)
+        self.zkey_path = os.path.abspath(zkey_path)
+        super().__init__(WITNESS_WORKER_SCRIPT, [self.wasm_path, self.zkey_path])
+
+    def calculate_witness(self, inputs: Dict) -> bytes:
+        """Compute the witness in ``.wtns`` binary format."""
+        response = self.request("witness", input=inputs)
+        return base64.b64decode(response["result"])
+
+    def prove(self, inputs: Dict) -> Tuple[bytes, List[str]]:
+        """Compute the witness and Groth16 proof for the given inputs.
+
+        Returns the proof as snarkjs ``proof.json`` bytes and the public
+        signals.
+        """
+        result = self.request("prove", input=inputs)["result"]
+        return json.dumps(result["proof"]).encode(), result["publicSignals"]
+
+    def prove_witness(self, witness: bytes) -> Tuple[bytes, List[str]]:
+        """Compute the Groth16 proof for an already calculated witness."""
+        result = self.request(
+            "prove_witness",
+            witness=base64.b64encode(witness).decode(),
+        )["result"]
+        return json.dumps(result["proof"]).encode(), result["publicSignals"]
+
+
+class WitnessWorkerPool:
+    """Lazily grown set of warm workers, one per concurrent proving job.
+
+    Closing the pool stops its workers; a job still holding one finishes
+    its request first, and the worker is dropped rather than handed out
+    again when the job returns it. The pool grows anew on the next use.
+    """
+
+    def __init__(self, wasm_path: str, zkey_path: str, max_workers: Optional[int] = None):
+        """Initialize an empty pool; workers start on first use."""
+        self.wasm_path = wasm_path
+        self.zkey_path = zkey_path
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._idle: List[WitnessWorker] = []
+        self._workers: List[WitnessWorker] = []
+        self._lock = threading.Lock()
+        self._returned = threading.Condition(self._lock)
+
+    @contextmanager
+    def acquire(self):
+        """Check out a worker for the duration of one job."""
+        worker = self._checkout()
+        try:
+            yield worker
+        finally:
+            self._checkin(worker)
+
+    def close(self) -> None:
+        """Stop every worker process."""
+        with self._lock:
+            workers, self._workers, self._idle = self._workers, [], []
+            self._returned.notify_all()
+        for worker in workers:
+            worker.close()
+
+    def _checkout(self) -> WitnessWorker:
+        with self._lock:
+            while not self._idle and len(self._workers) >= self.max_workers:
+                self._returned.wait()
+            if self._idle:
+                return self._idle.pop()
+            worker = WitnessWorker(self.wasm_path, self.zkey_path)
+            self._workers.append(worker)
+            return worker
+
+    def _checkin(self, worker: WitnessWorker) -> None:
+        with self._lock:
+            # Workers of a closed pool are not handed out again
+            if any(w is worker for w in self._workers):
+                self._idle.append(worker)
+                self._returned.notify()
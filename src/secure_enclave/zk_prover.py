@@ -1,49 +1,194 @@
-from typing import Dict, List, Optional
-import hashlib
-from dataclasses import dataclass
-import subprocess
+from typing import Dict, List, Optional, Sequence, Union
+from concurrent.futures import Future
+import contextvars
 import json
 import os
+import threading
 import time
-from ..gps_module.gps_receiver import SatelliteData
+import numpy as np
+from ..gps_module.satellite_data import SatelliteData
+from ..gps_module.satellite_batch import SatelliteBatch
+from ..gps_module.clock_solver import ClockSolver
+from ..telemetry.metrics import REGISTRY
+from ..telemetry.tracing import TRACER, timed
+from .artifacts import CircuitArtifacts
+from .proving_pool import ProvingPool
+from .fingerprint import satellite_fingerprint
+from .time_proof import TimeProof
+from .witness_backends import create_witness_backend
 
-@dataclass
-class TimeProof:
-    timestamp: float
-    satellite_fingerprint: str
-    zk_proof: bytes
-    metadata: Dict[str, any]
+PROVER_SECONDS = REGISTRY.histogram(
+    "continuum_prover_stage_seconds",
+    "Time spent in each step of proof generation",
+    ("stage",),
+)
 
 class ZKTimeProver:
-    def __init__(self):
-        """Initialize the ZK proving system for time validation."""
+    def __init__(self,
+                 wasm_path: str = "SatelliteTimeCheck_js/SatelliteTimeCheck.wasm",
+                 zkey_path: str = "SatelliteTimeCheck.zkey",
+                 max_workers: Optional[int] = None,
+                 max_pending: Optional[int] = None,
+                 witness_backend: str = "wasm",
+                 cpp_dir: str = "SatelliteTimeCheck_cpp",
+                 artifacts: Optional[CircuitArtifacts] = None,
+                 batch_artifacts: Optional[Dict[int, CircuitArtifacts]] = None):
+        """Initialize the ZK proving system for time validation.
+
+        ``artifacts`` from ``ArtifactManager`` take precedence over the
+        individual paths. ``batch_artifacts`` maps batch sizes to builds of
+        the batch circuit used by ``generate_time_proofs``.
+        """
+        if artifacts is not None:
+            wasm_path, zkey_path, cpp_dir = artifacts.wasm, artifacts.zkey, artifacts.cpp_dir
         self.last_proof = None
-        self.proving_key = None
+        self.proving_key = os.path.abspath(zkey_path)
+        self.wasm_path = os.path.abspath(wasm_path)
+        self.cpp_dir = os.path.abspath(cpp_dir)
+        self.witness_backend = witness_backend
         self.circuit_path = os.path.join(os.path.dirname(__file__), 'circuits/SatelliteTimeCheck.circom')
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._pool: Optional[ProvingPool] = None
+        self._solvers = threading.local()
+        self._backend = None
+        self._backend_lock = threading.Lock()
+        self.batch_artifacts = dict(batch_artifacts or {})
+        self._batch_backends: Dict[int, object] = {}
+
+    @property
+    def clock_solver(self) -> ClockSolver:
+        """This thread's clock solver.
+
+        Solvers keep their last solution and warm-start state, so each
+        proving thread gets its own rather than sharing one.
+        """
+        solver = getattr(self._solvers, "solver", None)
+        if solver is None:
+            solver = self._solvers.solver = ClockSolver()
+        return solver
         
-    def generate_time_proof(self, satellite_data: List[SatelliteData]) -> TimeProof:
-        """Generate a ZK proof of valid time from satellite data."""
+    def generate_time_proof(self, satellite_data: Union[List[SatelliteData], SatelliteBatch]) -> TimeProof:
+        """Generate a ZK proof of valid time from satellite data.
+
+        When a trace is current, its id is recorded in ``metadata["trace"]``.
+        """
         # Verify minimum satellite requirement
         if len(satellite_data) < 4:
             raise ValueError("Insufficient satellites for accurate timing")
+
+        # Work on columns from here on
+        satellite_data = SatelliteBatch.coerce(satellite_data)
             
         # Create satellite fingerprint
-        fingerprint = self._generate_satellite_fingerprint(satellite_data)
+        with timed(PROVER_SECONDS, "fingerprint"):
+            fingerprint = self._generate_satellite_fingerprint(satellite_data)
         
+        # Circuit inputs
+        with timed(PROVER_SECONDS, "circuit_inputs"):
+            inputs = self._prepare_circuit_inputs(satellite_data)
+
         # Generate ZK proof
-        proof = self._create_zk_proof(satellite_data, fingerprint)
+        proof = self._create_zk_proof(inputs)
         
         # Collect metadata for verification
-        metadata = self._collect_verification_metadata(satellite_data)
+        with timed(PROVER_SECONDS, "metadata"):
+            metadata = self._collect_verification_metadata(satellite_data, inputs)
+        trace = TRACER.current()
+        if trace is not None:
+            metadata["trace"] = trace.trace_id
+
+        with timed(PROVER_SECONDS, "time_solution"):
+            timestamp = self._calculate_consensus_time(satellite_data)
         
         return TimeProof(
-            timestamp=self._calculate_consensus_time(satellite_data),
+            timestamp=timestamp,
             satellite_fingerprint=fingerprint,
             zk_proof=proof,
             metadata=metadata
         )
+
+    def generate_time_proofs(self, epochs: Sequence[Union[List[SatelliteData], SatelliteBatch]]
+                             ) -> List[TimeProof]:
+        """Prove many epochs with the batch circuit, one Groth16 proof per batch.
+
+        Epochs are split into chunks of the configured batch sizes (the
+        smallest size that fits the remainder, else the largest); a chunk
+        shorter than its size is padded by repeating its last epoch. Each
+        epoch still gets its own ``TimeProof``, sharing the chunk's proof
+        and recording the chunk's public ``T_sat`` values and its slot in
+        ``metadata["batch"]``.
+        """
+        if not self.batch_artifacts:
+            raise ValueError("No batch circuit artifacts configured")
+        batches = [SatelliteBatch.coerce(epoch) for epoch in epochs]
+        if any(len(batch) < 4 for batch in batches):
+            raise ValueError("Insufficient satellites for accurate timing")
+
+        proofs = []
+        start = 0
+        while start < len(batches):
+            size = self._batch_size_for(len(batches) - start)
+            chunk = batches[start:start + size]
+            inputs = [self._prepare_circuit_inputs(batch) for batch in chunk]
+            inputs += [inputs[-1]] * (size - len(chunk))
+            with timed(PROVER_SECONDS, "prove_batch"):
+                zk_proof = self._get_backend(size).prove({
+                    "T_sat": [i["T_sat"] for i in inputs],
+                    "c": inputs[0]["c"],
+                    "Delta": inputs[0]["Delta"],
+                    "T_local": [i["T_local"] for i in inputs],
+                    "D": [i["D"] for i in inputs],
+                })
+
+            public_t_sat = [i["T_sat"] for i in inputs]
+            for index, batch in enumerate(chunk):
+                metadata = self._collect_verification_metadata(batch, inputs[index])
+                metadata["batch"] = {"index": index, "T_sat": public_t_sat}
+                proofs.append(TimeProof(
+                    timestamp=self._calculate_consensus_time(batch),
+                    satellite_fingerprint=self._generate_satellite_fingerprint(batch),
+                    zk_proof=zk_proof,
+                    metadata=metadata,
+                ))
+            start += len(chunk)
+        return proofs
+
+    def _batch_size_for(self, remaining: int) -> int:
+        sizes = sorted(self.batch_artifacts)
+        fitting = [size for size in sizes if size >= remaining]
+        return fitting[0] if fitting else sizes[-1]
+
+    def submit_time_proof(self, satellite_data: Union[List[SatelliteData], SatelliteBatch],
+                          block: bool = True, timeout: Optional[float] = None) -> Future:
+        """Queue proof generation on the proving pool.
+
+        Returns a future resolving to the ``TimeProof``. Blocks while the
+        pool is saturated, or raises ``queue.Full`` when ``block`` is False
+        or ``timeout`` expires.
+        """
+        if self._pool is None:
+            self._pool = ProvingPool(self.max_workers, self.max_pending)
+        if TRACER.enabled:
+            # Carry the caller's current trace over to the pool thread
+            return self._pool.submit(contextvars.copy_context().run, self.generate_time_proof,
+                                     satellite_data, block=block, timeout=timeout)
+        return self._pool.submit(self.generate_time_proof, satellite_data,
+                                 block=block, timeout=timeout)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the proving pool and its warm workers."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait)
+            self._pool = None
+        if self._backend is not None:
+            self._backend.close()
+            self._backend = None
+        for backend in self._batch_backends.values():
+            backend.close()
+        self._batch_backends = {}
         
-    def _generate_satellite_fingerprint(self, satellites: List[SatelliteData]) -> str:
+    def _generate_satellite_fingerprint(self, satellites: SatelliteBatch) -> str:
         """Generate unique fingerprint from satellite metadata.
         
         Following Step 3 from the architecture:
@@ -51,20 +196,8 @@ class ZKTimeProver:
         - Creates a hash that proves authenticity and freshness
         - Only published alongside visible metadata
         """
-        # Collect the unreleased data that proves freshness
-        unreleased_data = []
-        for sat in satellites:
-            unreleased_data.extend([
-                # Almanac data (unreleased)
-                str(sat.almanac_data["clock_correction"]),
-                str(sat.almanac_data["ionospheric_data"]),
-                str(sat.almanac_data["atmospheric_corrections"]),
-                str(sat.almanac_data["satellite_health"]),
-                str(sat.almanac_data["doppler_shift"]),
-            ])
-        
-        # Create fingerprint from unreleased data
-        fingerprint = hashlib.sha256(''.join(unreleased_data).encode()).hexdigest()
+        # Hash the unreleased almanac data that proves freshness
+        fingerprint = satellite_fingerprint(satellites)
         
         # This fingerprint will be published alongside the visible metadata:
         # - PRN Code
@@ -74,62 +207,61 @@ class ZKTimeProver:
         
         return fingerprint
         
-    def _create_zk_proof(self, satellites: List[SatelliteData], fingerprint: str) -> bytes:
+    def _create_zk_proof(self, inputs: Dict) -> bytes:
         """Create zero-knowledge proof of valid time."""
-        # Circuit inputs
-        inputs = {
-            "satellite_count": len(satellites),
-            "timestamps": [sat.atomic_timestamp for sat in satellites],
-            "transmission_times": [sat.transmission_time for sat in satellites],
-            "positions": [sat.position for sat in satellites],
-            "fingerprint": fingerprint
-        }
-        
         # Generate proof using ZK circuit
-        proof = self._run_zk_circuit(inputs)
+        with timed(PROVER_SECONDS, "prove"):
+            proof = self._run_zk_circuit(inputs)
         
         return proof
         
     def _run_zk_circuit(self, inputs: Dict) -> bytes:
         """Execute the ZK circuit for time validation."""
-        # Write inputs to file
-        with open("input.json", "w") as f:
-            json.dump(inputs, f)
-            
-        # Generate witness
-        subprocess.run([
-            "node",
-            "SatelliteTimeCheck_js/generate_witness.js",
-            "SatelliteTimeCheck_js/SatelliteTimeCheck.wasm",
-            "input.json",
-            "witness.wtns"
-        ])
-        
-        # Generate proof
-        subprocess.run([
-            "snarkjs",
-            "groth16",
-            "prove",
-            "SatelliteTimeCheck.zkey",
-            "witness.wtns",
-            "proof.json",
-            "public.json"
-        ])
-        
-        # Read and return proof
-        with open("proof.json", "rb") as f:
-            return f.read()
-        
-    def _prepare_circuit_inputs(self, satellites: List[SatelliteData]) -> Dict:
+        return self._get_backend().prove(inputs)
+
+    def _get_backend(self, batch_size: Optional[int] = None):
+        """Return the witness backend for a circuit, creating it on first use."""
+        with self._backend_lock:
+            if batch_size is not None:
+                backend = self._batch_backends.get(batch_size)
+                if backend is None:
+                    artifacts = self.batch_artifacts[batch_size]
+                    backend = create_witness_backend(self.witness_backend, artifacts.wasm, artifacts.zkey,
+                                                     artifacts.cpp_dir, max_workers=self.max_workers)
+                    self._batch_backends[batch_size] = backend
+                return backend
+            if self._backend is None:
+                self._backend = create_witness_backend(
+                    self.witness_backend,
+                    self.wasm_path,
+                    self.proving_key,
+                    self.cpp_dir,
+                    max_workers=self.max_workers
+                )
+            return self._backend
+
+    def _collect_verification_metadata(self, satellites: SatelliteBatch, inputs: Dict) -> Dict:
+        """Collect the public data a validator needs to check the proof.
+
+        ``inputs`` are the circuit inputs the proof was generated from, so
+        the published ``T_sat`` is the one that was proven.
+        """
+        return {
+            "T_sat": inputs["T_sat"],
+            "timestamp": time.time_ns(),
+            "satellite_data": satellites.to_metadata()
+        }
+        
+    def _prepare_circuit_inputs(self, satellites: SatelliteBatch) -> Dict:
         """Prepare inputs for the ZK circuit."""
-        # Calculate average satellite time
-        T_sat = sum(sat.atomic_timestamp for sat in satellites) / len(satellites)
+        # Calculate average satellite time; the circuit works in nanoseconds
+        T_sat = float(satellites.atomic_timestamps.mean()) * 1e9
         
         # Get local time
         T_local = time.time_ns()
         
         # Calculate average distance (simplified)
-        D = sum(self._calculate_distance(sat) for sat in satellites) / len(satellites)
+        D = float(self._calculate_distance(satellites).mean())
         
         return {
             "T_sat": str(int(T_sat)),
@@ -139,17 +271,15 @@ class ZKTimeProver:
             "D": str(int(D))
         }
         
-    def _calculate_distance(self, satellite: SatelliteData) -> float:
-        """Calculate distance to satellite using position data."""
-        x, y, z = satellite.position
+    def _calculate_distance(self, satellites: SatelliteBatch) -> np.ndarray:
+        """Calculate distance to each satellite using position data."""
         # Simplified distance calculation
-        return (x*x + y*y + z*z)**0.5
-        
-    def _calculate_consensus_time(self, satellites: List[SatelliteData]) -> float:
-        """Calculate precise consensus time from satellite data."""
-        timestamps = [sat.atomic_timestamp for sat in satellites]
-        transmission_times = [sat.transmission_time for sat in satellites]
+        return np.linalg.norm(satellites.positions, axis=1)
         
-        # Implement precise time calculation algorithm
-        # Consider transmission delays, relativistic effects, etc.
-        pass 
\ No newline at end of file
+    def _calculate_consensus_time(self, satellites: SatelliteBatch) -> float:
+        """Calculate precise consensus time from satellite data.
+
+        Solves receiver position and clock bias from the pseudoranges with
+        the calling thread's solver.
+        """
+        return self.clock_solver.solve_time(satellites) 
\ No newline at end of file
@@ -0,0 +1,246 @@
+"""Counters and latency histograms exported in the Prometheus text format.
+
+Instrumentation is off by default. While disabled, ``inc`` and ``observe``
+return after one attribute check, ``Histogram.time`` hands out a shared
+no-op context manager, and the hottest loops test ``REGISTRY.enabled``
+themselves before reading the clock, so an uninstrumented node pays next
+to nothing.
+
+    REGISTRY.enable()
+    REGISTRY.serve(9100)                  # GET /metrics
+    REGISTRY.write_textfile("node.prom")  # node_exporter textfile collector
+"""
+from contextlib import nullcontext
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+import bisect
+import math
+import os
+import threading
+import time
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+# Seconds; spans fingerprinting (microseconds) up to proving (seconds)
+LATENCY_BUCKETS = (
+    1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 2.5e-3, 5e-3,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+NULL_TIMER = nullcontext()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Metric:
+    """A named family of samples, one per combination of label values."""
+
+    kind = "untyped"
+
+    def __init__(self, registry: "Registry", name: str, documentation: str,
+                 labelnames: Sequence[str] = ()):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def _labels(self, labels: Tuple[str, ...], extra: str = "") -> str:
+        pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(self.labelnames, labels)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {_escape(self.documentation)}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._values.items())
+            lines.extend(self._samples(items))
+        return lines
+
+    def _samples(self, items) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    """Monotonic count, e.g. of rejected proofs per verification stage."""
+
+    kind = "counter"
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        """Add ``amount`` to the sample with these label values."""
+        if not self.registry.enabled:
+            return
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0.0)
+
+    def _samples(self, items) -> List[str]:
+        return [f"{self.name}{self._labels(labels)} {_format_value(value)}" for labels, value in items]
+
+
+class _Timer:
+    __slots__ = ("histogram", "labels", "started")
+
+    def __init__(self, histogram: "Histogram", labels: Tuple[str, ...]):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.observe(time.perf_counter() - self.started, *self.labels)
+
+
+class Histogram(Metric):
+    """Distribution of observed values in fixed cumulative buckets."""
+
+    kind = "histogram"
+
+    def __init__(self, registry: "Registry", name: str, documentation: str,
+                 labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(registry, name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels: str, count: int = 1) -> None:
+        """Record ``count`` observations of ``value``.
+
+        Batched code paths pass the per-item share of a batch's time with
+        ``count`` set to the batch size.
+        """
+        if not self.registry.enabled:
+            return
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                state = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += count
+            state[1] += value * count
+            state[2] += count
+
+    def time(self, *labels: str):
+        """Context manager observing the wall time of its block."""
+        if not self.registry.enabled:
+            return NULL_TIMER
+        return _Timer(self, labels)
+
+    def count(self, *labels: str) -> int:
+        state = self._values.get(labels)
+        return state[2] if state is not None else 0
+
+    def sum(self, *labels: str) -> float:
+        state = self._values.get(labels)
+        return state[1] if state is not None else 0.0
+
+    def _samples(self, items) -> List[str]:
+        lines = []
+        for labels, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket in zip(self.buckets + (math.inf,), counts):
+                cumulative += bucket
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{self._labels(labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{self._labels(labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{self._labels(labels)} {count}")
+        return lines
+
+
+class Registry:
+    """Set of metrics rendered together; disabled until ``enable`` is called."""
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def enable(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def _register(self, cls, name: str, documentation: str, labelnames, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(self, name, documentation, labelnames, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {name} already registered as a {metric.kind}")
+            return metric
+
+    def reset(self) -> None:
+        """Clear every sample, keeping the metric definitions."""
+        for metric in list(self._metrics.values()):
+            metric.reset()
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        lines = []
+        for name in sorted(self._metrics):
+            lines.extend(self._metrics[name].render())
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: str) -> None:
+        """Atomically replace ``path`` with the current metrics."""
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            f.write(self.render())
+        os.replace(tmp, path)
+
+    def serve(self, port: int, host: str = "0.0.0.0") -> "ThreadingHTTPServer":
+        """Serve ``/metrics`` from a daemon thread; call ``shutdown`` to stop."""
+        # Imported here: most processes never serve metrics over HTTP
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = registry.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+        return server
+
+
+REGISTRY = Registry()
+
+ERRORS = REGISTRY.counter(
+    "continuum_errors_total",
+    "Errors caught and reported instead of raised",
+    ("component", "operation"),
+)
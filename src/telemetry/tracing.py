@@ -0,0 +1,135 @@
+"""Per-epoch traces from serial ingest to an accepted proof.
+
+The receiver starts a trace when it turns an epoch into satellite data and
+makes it the current trace of the calling context, so the prover call that
+follows records its spans into it without extra arguments. The prover
+stamps the trace id into the proof metadata, where a validator, in this
+process or on a peer, picks it up and closes the trace with the
+verification outcome. Finished traces are kept in a bounded buffer and can
+be appended to a JSON-lines file.
+
+Like the metrics, tracing is off by default and costs one attribute check
+per instrumented call until ``TRACER.enable`` is called.
+"""
+from collections import OrderedDict, deque
+from contextvars import ContextVar
+from typing import Deque, Dict, List, Optional, Tuple
+import json
+import os
+import threading
+import time
+from .metrics import NULL_TIMER, Histogram
+
+CURRENT_TRACE: "ContextVar[Optional[Trace]]" = ContextVar("continuum_trace", default=None)
+
+
+class Trace:
+    """Spans recorded for one epoch, each as (name, start ns, seconds)."""
+
+    __slots__ = ("trace_id", "started_ns", "spans", "outcome")
+
+    def __init__(self, trace_id: str, started_ns: int):
+        self.trace_id = trace_id
+        self.started_ns = started_ns
+        self.spans: List[Tuple[str, int, float]] = []
+        self.outcome: Optional[str] = None
+
+    def add(self, name: str, start_ns: int, seconds: float) -> None:
+        self.spans.append((name, start_ns, seconds))
+
+    def to_dict(self) -> Dict:
+        return {
+            "trace_id": self.trace_id,
+            "started_ns": self.started_ns,
+            "outcome": self.outcome,
+            "spans": [{"name": name, "start_ns": start, "seconds": seconds}
+                      for name, start, seconds in self.spans],
+        }
+
+
+class Tracer:
+    """Open traces by id and a ring buffer of finished ones."""
+
+    def __init__(self, capacity: int = 1024):
+        self.enabled = False
+        self.path: Optional[str] = None
+        self.capacity = capacity
+        self.finished: Deque[Trace] = deque(maxlen=capacity)
+        self._open: "OrderedDict[str, Trace]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def enable(self, path: Optional[str] = None, enabled: bool = True) -> None:
+        """Start tracing; finished traces are also appended to ``path``."""
+        self.enabled = enabled
+        self.path = path
+
+    def start(self, started_ns: Optional[int] = None) -> Optional[Trace]:
+        """Open a trace and make it current in the calling context."""
+        if not self.enabled:
+            return None
+        trace = Trace(os.urandom(8).hex(), started_ns or time.time_ns())
+        self._track(trace)
+        CURRENT_TRACE.set(trace)
+        return trace
+
+    def current(self) -> Optional[Trace]:
+        return CURRENT_TRACE.get() if self.enabled else None
+
+    def resume(self, trace_id: str) -> Trace:
+        """The open trace with this id, or a new one for a proof from a peer."""
+        with self._lock:
+            trace = self._open.get(trace_id)
+        if trace is None:
+            trace = Trace(trace_id, time.time_ns())
+            self._track(trace)
+        return trace
+
+    def finish(self, trace: Trace, outcome: str) -> None:
+        """Close a trace with its outcome and hand it to the sinks."""
+        trace.outcome = outcome
+        with self._lock:
+            self._open.pop(trace.trace_id, None)
+            self.finished.append(trace)
+            if self.path is not None:
+                with open(self.path, "a") as f:
+                    f.write(json.dumps(trace.to_dict()) + "\n")
+
+    def _track(self, trace: Trace) -> None:
+        with self._lock:
+            self._open[trace.trace_id] = trace
+            # Epochs that never produced a proof must not pile up
+            while len(self._open) > self.capacity:
+                self._open.popitem(last=False)
+
+
+TRACER = Tracer()
+
+
+class _Span:
+    __slots__ = ("histogram", "labels", "trace", "started", "started_ns")
+
+    def __init__(self, histogram: Histogram, labels: Tuple[str, ...], trace: Optional[Trace]):
+        self.histogram = histogram
+        self.labels = labels
+        self.trace = trace
+
+    def __enter__(self):
+        self.started_ns = time.time_ns()
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        elapsed = time.perf_counter() - self.started
+        self.histogram.observe(elapsed, *self.labels)
+        if self.trace is not None:
+            self.trace.add(self.labels[-1], self.started_ns, elapsed)
+
+
+def timed(histogram: Histogram, *labels: str):
+    """Time a block into ``histogram`` and, if a trace is current, as a span.
+
+    The span is named after the last label value.
+    """
+    if not (histogram.registry.enabled or TRACER.enabled):
+        return NULL_TIMER
+    return _Span(histogram, labels, TRACER.current())
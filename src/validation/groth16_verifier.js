@@ -0,0 +1,208 @@
+// Long-lived Groth16 verifier.
+//
+// Usage: node groth16_verifier.js <verification_key.json | key.vkey>
+//
+// The verification key is parsed and converted to curve points once at
+// startup, either from snarkjs JSON or from the pre-parsed binary written
+// by verification_key.py. Requests arrive on stdin as one JSON object per line:
+//   {"id": 1, "op": "verify", "proof": {...}, "publicSignals": [...]}
+//   {"id": 2, "op": "verify_many", "items": [{"proof": ..., "publicSignals": ...}], "batch": true}
+// and each gets exactly one JSON line back on stdout, with the CPU seconds
+// the request took as "cpu".
+
+const { readFileSync } = require("fs");
+const { randomBytes } = require("crypto");
+const readline = require("readline");
+const { getCurveFromName, utils, Scalar } = require("ffjavascript");
+
+const { unstringifyBigInts } = utils;
+
+const CACHE_MAGIC = "CVK1";
+const CACHE_HEADER_SIZE = 24;
+
+// Key object in snarkjs form; binary keys hold the same coordinates as
+// n8-byte little-endian integers, so no JSON or decimal parsing is needed.
+function readKey(vkeyPath) {
+    const raw = readFileSync(vkeyPath);
+    if (raw.subarray(0, 4).toString("latin1") !== CACHE_MAGIC) {
+        return unstringifyBigInts(JSON.parse(raw.toString("utf8")));
+    }
+    const curve = raw.subarray(4, 12).toString("latin1").replace(/\0+$/, "");
+    const n8 = raw.readUInt32LE(12);
+    const nIC = raw.readUInt32LE(16);
+    // Aligned copy for the word-wise integer reads
+    const buff = new Uint8Array(raw);
+    let o = CACHE_HEADER_SIZE;
+    const next = () => {
+        const v = Scalar.fromRprLE(buff, o, n8);
+        o += n8;
+        return v;
+    };
+    const g1 = () => [next(), next(), next()];
+    const g2 = () => [[next(), next()], [next(), next()], [next(), next()]];
+    const vk = { curve, vk_alpha_1: g1(), vk_beta_2: g2(), vk_gamma_2: g2(), vk_delta_2: g2(), IC: [] };
+    for (let i = 0; i < nIC; i++) vk.IC.push(g1());
+    return vk;
+}
+
+async function loadVerifier(vkeyPath) {
+    const vk = readKey(vkeyPath);
+    const curve = await getCurveFromName(vk.curve);
+
+    return {
+        curve,
+        nPublic: vk.IC.length - 1,
+        IC: vk.IC.map(p => curve.G1.fromObject(p)),
+        alpha1: curve.G1.fromObject(vk.vk_alpha_1),
+        beta2: curve.G2.fromObject(vk.vk_beta_2),
+        gamma2: curve.G2.fromObject(vk.vk_gamma_2),
+        delta2: curve.G2.fromObject(vk.vk_delta_2),
+    };
+}
+
+// Parse and sanity-check one proof; returns null if it is malformed.
+function parseProof(v, item) {
+    const { curve } = v;
+    const proof = unstringifyBigInts(item.proof);
+    const publicSignals = unstringifyBigInts(item.publicSignals);
+
+    if (publicSignals.length !== v.nPublic) return null;
+    for (const s of publicSignals) {
+        if (!Scalar.lt(s, curve.r)) return null;
+    }
+
+    const piA = curve.G1.fromObject(proof.pi_a);
+    const piB = curve.G2.fromObject(proof.pi_b);
+    const piC = curve.G1.fromObject(proof.pi_c);
+    if (!curve.G1.isValid(piA) || !curve.G2.isValid(piB) || !curve.G1.isValid(piC)) {
+        return null;
+    }
+    return { piA, piB, piC, publicSignals };
+}
+
+// Linear combination of the IC points with the given Fr coefficients.
+async function combineIC(v, coefficients) {
+    const { curve } = v;
+    const n8 = curve.G1.F.n8 * 2;
+    const bases = new Uint8Array(n8 * v.IC.length);
+    const scalars = new Uint8Array(curve.Fr.n8 * v.IC.length);
+    for (let i = 0; i < v.IC.length; i++) {
+        bases.set(v.IC[i], i * n8);
+        Scalar.toRprLE(scalars, curve.Fr.n8 * i, coefficients[i], curve.Fr.n8);
+    }
+    return curve.G1.multiExpAffine(bases, scalars);
+}
+
+async function verifyOne(v, item) {
+    const { curve } = v;
+    const p = parseProof(v, item);
+    if (p === null) return false;
+
+    const cpub = await combineIC(v, [1n, ...p.publicSignals]);
+    return curve.pairingEq(
+        curve.G1.neg(p.piA), p.piB,
+        cpub, v.gamma2,
+        p.piC, v.delta2,
+        v.alpha1, v.beta2
+    );
+}
+
+// Randomized batch check over N proofs:
+//   prod e(r_i A_i, B_i) == e(sum r_i alpha, beta) * e(sum r_i Cpub_i, gamma) * e(sum r_i C_i, delta)
+// costs N + 3 Miller loops and one final exponentiation instead of 4N of each.
+async function verifyBatch(v, parsed) {
+    const { curve } = v;
+    const Fr = curve.Fr;
+
+    const pairs = [];
+    const icCoefficients = new Array(v.IC.length).fill(0n);
+    let rSum = 0n;
+    let cSum = curve.G1.zero;
+
+    for (const p of parsed) {
+        const r = Scalar.fromRprLE(randomBytes(16), 0, 16);
+        const rFr = Fr.e(r);
+        pairs.push(curve.G1.neg(curve.G1.timesFr(p.piA, rFr)), p.piB);
+        cSum = curve.G1.add(cSum, curve.G1.timesFr(p.piC, rFr));
+        rSum = (rSum + r) % curve.r;
+        icCoefficients[0] = (icCoefficients[0] + r) % curve.r;
+        for (let j = 0; j < p.publicSignals.length; j++) {
+            icCoefficients[j + 1] = (icCoefficients[j + 1] + r * p.publicSignals[j]) % curve.r;
+        }
+    }
+
+    const cpub = await combineIC(v, icCoefficients);
+    pairs.push(
+        curve.G1.timesFr(v.alpha1, Fr.e(rSum)), v.beta2,
+        cpub, v.gamma2,
+        cSum, v.delta2
+    );
+    return curve.pairingEq(...pairs);
+}
+
+async function verifyMany(v, items, batch) {
+    const results = new Array(items.length).fill(false);
+    const parsed = [];
+    const indexes = [];
+    items.forEach((item, i) => {
+        const p = parseProof(v, item);
+        if (p !== null) {
+            parsed.push(p);
+            indexes.push(i);
+        }
+    });
+
+    if (batch && parsed.length > 1 && await verifyBatch(v, parsed)) {
+        for (const i of indexes) results[i] = true;
+        return results;
+    }
+
+    // Batch failed (or was not requested): find the bad proofs individually.
+    for (const i of indexes) {
+        results[i] = await verifyOne(v, items[i]);
+    }
+    return results;
+}
+
+async function handle(v, msg) {
+    switch (msg.op) {
+    case "verify":
+        return verifyOne(v, msg);
+    case "verify_many":
+        return verifyMany(v, msg.items, msg.batch !== false);
+    case "ping":
+        return true;
+    default:
+        throw new Error(`unknown op ${msg.op}`);
+    }
+}
+
+async function main() {
+    if (process.argv.length !== 3) {
+        console.error("Usage: node groth16_verifier.js <verification_key.json | key.vkey>");
+        process.exit(1);
+    }
+    const v = await loadVerifier(process.argv[2]);
+
+    const rl = readline.createInterface({ input: process.stdin, terminal: false });
+    // Requests are answered strictly in arrival order.
+    let queue = Promise.resolve();
+    rl.on("line", line => {
+        queue = queue.then(async () => {
+            let msg = {};
+            try {
+                msg = JSON.parse(line);
+                const started = process.cpuUsage();
+                const result = await handle(v, msg);
+                const used = process.cpuUsage(started);
+                const cpu = (used.user + used.system) / 1e6;
+                process.stdout.write(JSON.stringify({ id: msg.id, ok: true, result, cpu }) + "\n");
+            } catch (err) {
+                process.stdout.write(JSON.stringify({ id: msg.id, ok: false, error: String(err) }) + "\n");
+            }
+        });
+    });
+    rl.on("close", () => queue.then(() => v.curve.terminate()));
+}
+
+main();
@@ -0,0 +1,86 @@
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+import threading
+import time
+
+
+class SeenFingerprintIndex:
+    """Bounded index of recently accepted satellite fingerprints.
+
+    Fingerprints are grouped into fixed-width time buckets. Membership is a
+    single dict lookup, and expiring a whole bucket drops every fingerprint
+    that arrived in it, so memory is bounded by the number of proofs seen
+    within ``window`` seconds (and never exceeds ``max_entries``).
+    Fingerprints are stored as raw 32-byte digests rather than hex strings.
+    """
+
+    def __init__(self, window: float = 2.0, bucket_width: float = 0.25,
+                 max_entries: int = 1_000_000):
+        """Initialize an empty index remembering fingerprints for ``window`` seconds."""
+        self.window = window
+        self.bucket_width = bucket_width
+        self.max_entries = max_entries
+        self._index: Dict[bytes, int] = {}
+        self._buckets: Deque[Tuple[int, List[bytes]]] = deque()
+        self._lock = threading.Lock()
+
+    def add(self, fingerprint: str, now: Optional[float] = None) -> bool:
+        """Record a fingerprint; returns False if it was already present."""
+        key = bytes.fromhex(fingerprint)
+        now = time.time() if now is None else now
+        bucket_id = int(now // self.bucket_width)
+
+        with self._lock:
+            self._expire(bucket_id)
+            if key in self._index:
+                return False
+
+            if not self._buckets or self._buckets[-1][0] != bucket_id:
+                self._buckets.append((bucket_id, []))
+            self._buckets[-1][1].append(key)
+            self._index[key] = bucket_id
+
+            while len(self._index) > self.max_entries:
+                self._evict_oldest()
+            return True
+
+    def contains(self, fingerprint: str, now: Optional[float] = None) -> bool:
+        """Return True if the fingerprint was seen within the window."""
+        try:
+            key = bytes.fromhex(fingerprint)
+        except (TypeError, ValueError):
+            return False
+        bucket_id = self._index.get(key)
+        if bucket_id is None:
+            return False
+        now = time.time() if now is None else now
+        return bucket_id > self._oldest_live_bucket(int(now // self.bucket_width))
+
+    def __contains__(self, fingerprint: str) -> bool:
+        return self.contains(fingerprint)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def expire(self, now: Optional[float] = None) -> None:
+        """Drop every bucket that has fallen out of the window."""
+        now = time.time() if now is None else now
+        with self._lock:
+            self._expire(int(now // self.bucket_width))
+
+    def _oldest_live_bucket(self, current_bucket: int) -> int:
+        return current_bucket - int(self.window / self.bucket_width) - 1
+
+    def _expire(self, current_bucket: int) -> None:
+        cutoff = self._oldest_live_bucket(current_bucket)
+        while self._buckets and self._buckets[0][0] <= cutoff:
+            self._evict_oldest()
+
+    def _evict_oldest(self) -> None:
+        bucket_id, keys = self._buckets[0]
+        if keys:
+            key = keys.pop()
+            if self._index.get(key) == bucket_id:
+                del self._index[key]
+        if not keys:
+            self._buckets.popleft()
@@ -0,0 +1,84 @@
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+import hashlib
+import threading
+import time
+from ..secure_enclave.time_proof import TimeProof
+
+
+class VerificationCache:
+    """LRU cache of verification outcomes with per-entry expiry.
+
+    Gossip delivers the same proof many times; caching the outcome by a
+    digest of the proof lets every copy after the first skip the
+    fingerprint and pairing checks. Entries expire at the time given to
+    ``put``, so a cached positive never outlives the proof's freshness.
+    """
+
+    def __init__(self, max_entries: int = 100_000, ttl: float = 1.0):
+        """Initialize an empty cache."""
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[bytes, Tuple[bool, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def digest(proof: TimeProof) -> bytes:
+        """Digest of everything that determines a proof's verification outcome."""
+        h = hashlib.sha256()
+        h.update(bytes(proof.zk_proof))
+        h.update(b"\0")
+        h.update(str(proof.metadata.get("T_sat")).encode())
+        h.update(b"\0")
+        h.update(str(proof.metadata.get("timestamp")).encode())
+        h.update(b"\0")
+        h.update(repr(proof.timestamp).encode())
+        h.update(b"\0")
+        h.update(str(proof.satellite_fingerprint).encode())
+        h.update(b"\0")
+        # Metadata is covered too, so a copy with tampered satellite data
+        # cannot inherit the original's cached outcome
+        h.update(repr(proof.metadata.get("satellite_data")).encode())
+        return h.digest()
+
+    def get(self, key: bytes, now: Optional[float] = None) -> Optional[bool]:
+        """Return the cached outcome, or None on a miss."""
+        now = time.time() if now is None else now
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry[1] <= now:
+                del self._entries[key]
+                self.evictions += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: bytes, result: bool, expires_at: Optional[float] = None) -> None:
+        """Store an outcome until ``expires_at`` (default: now plus the TTL)."""
+        now = time.time()
+        expires_at = now + self.ttl if expires_at is None else min(expires_at, now + self.ttl)
+        if expires_at <= now:
+            return
+        with self._lock:
+            self._entries[key] = (result, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Hit, miss and eviction counters plus the current size."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+        }
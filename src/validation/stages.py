@@ -0,0 +1,242 @@
+from typing import Dict, List, Optional, Sequence
+import asyncio
+import threading
+import time
+from ..secure_enclave.time_proof import TimeProof
+from ..telemetry.metrics import REGISTRY
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "continuum_verification_stage_seconds",
+    "Time each verification stage spends per proof",
+    ("stage",),
+)
+STAGE_RESULTS = REGISTRY.counter(
+    "continuum_verification_checks_total",
+    "Proofs passed or rejected by each verification stage",
+    ("stage", "result"),
+)
+
+
+class VerificationStage:
+    """One reject check in the verification pipeline.
+
+    Stages only ever reject: a proof is accepted when it passes every stage.
+    Each stage counts how many proofs it passed and rejected so operators
+    can see where junk is being filtered out.
+    """
+
+    name = "stage"
+
+    def __init__(self):
+        """Initialize the stage counters."""
+        self.passed = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    def check(self, validator, proof: TimeProof) -> bool:
+        """Return True if the proof passes this stage."""
+        raise NotImplementedError
+
+    def check_many(self, validator, proofs: Sequence[TimeProof]) -> List[bool]:
+        """Check several proofs; stages with a batch backend override this."""
+        return [self.check(validator, proof) for proof in proofs]
+
+    async def check_async(self, validator, proof: TimeProof) -> bool:
+        """Check a proof from a coroutine; cheap stages run inline."""
+        return self.check(validator, proof)
+
+    def record(self, ok: bool) -> bool:
+        """Update the counters with one outcome and return it."""
+        ok = bool(ok)
+        with self._lock:
+            if ok:
+                self.passed += 1
+            else:
+                self.rejected += 1
+        if REGISTRY.enabled:
+            STAGE_RESULTS.inc(self.name, "passed" if ok else "rejected")
+        return ok
+
+
+class StructuralStage(VerificationStage):
+    """Reject proofs with missing or malformed fields."""
+
+    name = "structure"
+
+    def __init__(self, min_satellites: int = 4):
+        super().__init__()
+        self.min_satellites = min_satellites
+
+    def check(self, validator, proof: TimeProof) -> bool:
+        metadata = proof.metadata
+        ok = (
+            isinstance(proof.timestamp, (int, float))
+            and isinstance(proof.satellite_fingerprint, str)
+            and len(proof.satellite_fingerprint) == 64
+            and isinstance(proof.zk_proof, (bytes, bytearray))
+            and len(proof.zk_proof) > 0
+            and isinstance(metadata, dict)
+            and "T_sat" in metadata
+            and isinstance(metadata.get("timestamp"), (int, float))
+            and isinstance(metadata.get("satellite_data"), list)
+            and len(metadata["satellite_data"]) >= self.min_satellites
+        )
+        return self.record(ok)
+
+
+class FreshnessStage(VerificationStage):
+    """Reject proofs whose satellite data is too old."""
+
+    name = "freshness"
+
+    def check(self, validator, proof: TimeProof) -> bool:
+        return self.record(validator._verify_data_freshness(proof.metadata))
+
+
+class TimestampRangeStage(VerificationStage):
+    """Reject proofs claiming a time outside the accepted range."""
+
+    name = "timestamp_range"
+
+    def check(self, validator, proof: TimeProof) -> bool:
+        return self.record(validator._verify_timestamp_range(proof.timestamp))
+
+
+class ReplayStage(VerificationStage):
+    """Reject proofs whose fingerprint was already accepted."""
+
+    name = "replay"
+
+    def check(self, validator, proof: TimeProof) -> bool:
+        return self.record(not validator.seen_fingerprints.contains(proof.satellite_fingerprint))
+
+
+class FingerprintStage(VerificationStage):
+    """Reject proofs whose fingerprint does not match their metadata."""
+
+    name = "fingerprint"
+
+    def check(self, validator, proof: TimeProof) -> bool:
+        return self.record(validator._verify_satellite_fingerprint(proof))
+
+    def check_many(self, validator, proofs: Sequence[TimeProof]) -> List[bool]:
+        return [self.record(ok) for ok in validator._verify_satellite_fingerprints(list(proofs))]
+
+
+class ZKProofStage(VerificationStage):
+    """Verify the Groth16 proof; by far the most expensive stage.
+
+    Concurrent ``check_async`` calls made in the same event-loop turn are
+    coalesced into a single batched verifier request.
+    """
+
+    name = "zk_proof"
+
+    def __init__(self):
+        super().__init__()
+        self._pending: Dict[asyncio.AbstractEventLoop, list] = {}
+
+    def check(self, validator, proof: TimeProof) -> bool:
+        return self.record(validator._verify_zk_proof(proof.zk_proof, proof.metadata))
+
+    def check_many(self, validator, proofs: Sequence[TimeProof]) -> List[bool]:
+        if not proofs:
+            return []
+        results = validator._verify_zk_proofs([
+            (proof.zk_proof, proof.metadata) for proof in proofs
+        ])
+        return [self.record(ok) for ok in results]
+
+    async def check_async(self, validator, proof: TimeProof) -> bool:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        pending = self._pending.get(loop)
+        if pending is None:
+            pending = self._pending[loop] = []
+            loop.call_soon(self._flush, loop, validator)
+        pending.append((proof, future))
+        return await future
+
+    def _flush(self, loop: asyncio.AbstractEventLoop, validator) -> None:
+        batch = self._pending.pop(loop, [])
+        proofs = [proof for proof, _ in batch]
+        task = loop.run_in_executor(None, self.check_many, validator, proofs)
+
+        def resolve(done):
+            error = done.exception()
+            for i, (_, future) in enumerate(batch):
+                if future.done():
+                    continue
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(done.result()[i])
+
+        task.add_done_callback(resolve)
+
+
+def default_stages() -> List[VerificationStage]:
+    """Cheapest and most selective checks first, the ZK proof last."""
+    return [
+        StructuralStage(),
+        FreshnessStage(),
+        TimestampRangeStage(),
+        ReplayStage(),
+        FingerprintStage(),
+        ZKProofStage(),
+    ]
+
+
+class VerificationPipeline:
+    """Ordered list of stages; a proof is rejected by the first that fails."""
+
+    def __init__(self, stages: Optional[List[VerificationStage]] = None):
+        """Initialize with the given stages or the default order."""
+        self.stages = stages if stages is not None else default_stages()
+
+    def run(self, validator, proof: TimeProof) -> bool:
+        """Run the stages in order, stopping at the first reject."""
+        timing = REGISTRY.enabled
+        for stage in self.stages:
+            started = time.perf_counter() if timing else 0.0
+            ok = stage.check(validator, proof)
+            if timing:
+                STAGE_SECONDS.observe(time.perf_counter() - started, stage.name)
+            if not ok:
+                return False
+        return True
+
+    def run_many(self, validator, proofs: Sequence[TimeProof]) -> List[bool]:
+        """Run the stages over a batch; each stage only sees survivors."""
+        results = [True] * len(proofs)
+        for stage in self.stages:
+            alive = [i for i, ok in enumerate(results) if ok]
+            if not alive:
+                break
+            started = time.perf_counter()
+            outcomes = stage.check_many(validator, [proofs[i] for i in alive])
+            if REGISTRY.enabled:
+                STAGE_SECONDS.observe((time.perf_counter() - started) / len(alive), stage.name,
+                                      count=len(alive))
+            for i, ok in zip(alive, outcomes):
+                results[i] = ok
+        return results
+
+    async def run_async(self, validator, proof: TimeProof) -> bool:
+        """Run the stages from a coroutine so many proofs can be in flight."""
+        timing = REGISTRY.enabled
+        for stage in self.stages:
+            started = time.perf_counter() if timing else 0.0
+            ok = await stage.check_async(validator, proof)
+            if timing:
+                STAGE_SECONDS.observe(time.perf_counter() - started, stage.name)
+            if not ok:
+                return False
+        return True
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Per-stage pass and reject counts."""
+        return {
+            stage.name: {"passed": stage.passed, "rejected": stage.rejected}
+            for stage in self.stages
+        }
@@ -1,104 +1,315 @@
-from typing import Dict, Optional, List
-from ..secure_enclave.zk_prover import TimeProof
-import hashlib
+from typing import TYPE_CHECKING, Dict, Optional, List, Set
+from ..secure_enclave.fingerprint import proof_fingerprint, satellite_fingerprints
+from ..secure_enclave.proof_codec import TimeProofView
+from ..secure_enclave.time_proof import TimeProof
+from ..telemetry.metrics import ERRORS, REGISTRY
+from ..telemetry.tracing import TRACER
+from .verifier_service import Groth16VerifierService
+from .stages import VerificationPipeline, VerificationStage
+from .replay_index import SeenFingerprintIndex
+from .result_cache import VerificationCache
+import threading
 import time
-import json
-import subprocess
+
+if TYPE_CHECKING:
+    from ..secure_enclave.artifacts import CircuitArtifacts
+
+VERIFICATIONS = REGISTRY.counter(
+    "continuum_verifications_total",
+    "Time proofs verified, by outcome (cached results counted separately)",
+    ("result",),
+)
 
 class TimeValidator:
-    def __init__(self):
-        """Initialize the time validation system."""
-        self.verification_key = None
+    def __init__(self, verification_key_path: str = "verification_key.json",
+                 verifier: Optional[Groth16VerifierService] = None,
+                 stages: Optional[List[VerificationStage]] = None,
+                 artifacts: Optional["CircuitArtifacts"] = None,
+                 batch_artifacts: Optional[Dict[int, "CircuitArtifacts"]] = None,
+                 batch_verifiers: Optional[Dict[int, Groth16VerifierService]] = None):
+        """Initialize the time validation system.
+
+        ``artifacts`` from ``ArtifactManager`` supply the verification key
+        in place of ``verification_key_path``. ``batch_artifacts`` maps a
+        batch size to the artifacts of the batch circuit for that size, so
+        proofs from ``ZKTimeProver.generate_time_proofs`` can be checked.
+        """
+        if artifacts is not None:
+            verification_key_path = artifacts.verification_key
+        self.verification_key = verification_key_path
+        self.verifier = verifier
+        self.batch_artifacts = dict(batch_artifacts or {})
+        self.batch_verifiers = dict(batch_verifiers or {})
         self.accepted_time_range = 1.0  # Maximum allowed time deviation in seconds
+        # Fingerprints only need remembering while the proof would still
+        # pass the freshness check: its data timestamp may lie up to one
+        # range ahead of acceptance and stays fresh one range after that
+        self.seen_fingerprints = SeenFingerprintIndex(window=2 * self.accepted_time_range)
+        # Gossip delivers the same proof many times; positives are cached
+        # no longer than the proof stays fresh
+        self.result_cache = VerificationCache(ttl=self.accepted_time_range)
+        self._accept_lock = threading.Lock()
+        # ZK proofs whose verifier call failed (timeout, crash) rather than
+        # rejecting them; their outcome says nothing about the proof
+        self._inconclusive: Set[bytes] = set()
+        # Cheap structural, freshness and range checks run before the
+        # fingerprint and the expensive ZK verification
+        self.pipeline = VerificationPipeline(stages)
         
     def verify_time_proof(self, proof: TimeProof) -> bool:
         """Verify a time proof from another node."""
         try:
-            # Verify the ZK proof
-            if not self._verify_zk_proof(proof.zk_proof, proof.metadata):
-                return False
-                
-            # Verify satellite fingerprint
-            if not self._verify_satellite_fingerprint(proof):
-                return False
-                
-            # Verify timestamp is within acceptable range
-            if not self._verify_timestamp_range(proof.timestamp):
-                return False
-                
-            return True
+            started_ns = time.time_ns() if TRACER.enabled else 0
+            digest = self.result_cache.digest(proof)
+            cached = self.result_cache.get(digest)
+            if cached is not None:
+                return self._cached(cached)
+            valid = self._accept(proof, digest, self.pipeline.run(self, proof))
+            return self._finish(proof, started_ns, valid)
             
         except Exception as e:
+            ERRORS.inc("time_validator", "verify")
             print(f"Error verifying time proof: {e}")
             return False
-            
+
+    async def verify_time_proof_async(self, proof: TimeProof) -> bool:
+        """Verify a time proof without blocking the event loop.
+
+        ZK checks of proofs in flight at the same time share one batched
+        verifier request.
+        """
+        try:
+            started_ns = time.time_ns() if TRACER.enabled else 0
+            digest = self.result_cache.digest(proof)
+            cached = self.result_cache.get(digest)
+            if cached is not None:
+                return self._cached(cached)
+            valid = self._accept(proof, digest, await self.pipeline.run_async(self, proof))
+            return self._finish(proof, started_ns, valid)
+
+        except Exception as e:
+            ERRORS.inc("time_validator", "verify")
+            print(f"Error verifying time proof: {e}")
+            return False
+
+    def verify_time_proofs(self, proofs: List[TimeProof]) -> List[bool]:
+        """Verify many time proofs, sharing one batched ZK check."""
+        try:
+            started_ns = time.time_ns() if TRACER.enabled else 0
+            digests = [self.result_cache.digest(proof) for proof in proofs]
+            results = [self.result_cache.get(digest) for digest in digests]
+            pending = [i for i, cached in enumerate(results) if cached is None]
+            if REGISTRY.enabled:
+                VERIFICATIONS.inc("cached", amount=len(proofs) - len(pending))
+
+            outcomes = self.pipeline.run_many(self, [proofs[i] for i in pending])
+            for i, ok in zip(pending, outcomes):
+                results[i] = self._finish(proofs[i], started_ns, self._accept(proofs[i], digests[i], ok))
+            return results
+
+        except Exception as e:
+            ERRORS.inc("time_validator", "verify_many")
+            print(f"Error verifying time proofs: {e}")
+            return [False] * len(proofs)
+
+    def verification_stats(self) -> Dict[str, Dict[str, int]]:
+        """Per-stage pass and reject counts plus result cache counters."""
+        stats = self.pipeline.stats()
+        stats["result_cache"] = self.result_cache.stats()
+        return stats
+
+    def _accept(self, proof: TimeProof, digest: bytes, valid: bool) -> bool:
+        """Record the outcome in the replay index and the result cache.
+
+        Fingerprints are only recorded once every check has passed, so junk
+        carrying someone else's fingerprint cannot block the genuine proof.
+        If the fingerprint was accepted meanwhile, this proof is only valid
+        when it is an identical copy of the accepted one. A rejection caused
+        by a failing verifier is not cached, so the next copy is checked
+        again.
+        """
+        with self._accept_lock:
+            if valid and not self.seen_fingerprints.add(proof.satellite_fingerprint):
+                valid = self.result_cache.get(digest) is True
+            if self._inconclusive and not valid and isinstance(proof.zk_proof, (bytes, bytearray)):
+                key = bytes(proof.zk_proof)
+                if key in self._inconclusive:
+                    self._inconclusive.discard(key)
+                    return valid
+            self.result_cache.put(digest, valid, self._cache_expiry(proof, valid))
+        return valid
+
+    def _mark_inconclusive(self, proofs) -> None:
+        """Keep the rejections of ``proofs`` out of the result cache."""
+        with self._accept_lock:
+            self._inconclusive.update(bytes(proof) for proof in proofs
+                                      if isinstance(proof, (bytes, bytearray)))
+
+    def _cached(self, valid: bool) -> bool:
+        if REGISTRY.enabled:
+            VERIFICATIONS.inc("cached")
+        return valid
+
+    def _finish(self, proof: TimeProof, started_ns: int, valid: bool) -> bool:
+        """Count the outcome and close the proof's trace with a ``verify`` span."""
+        if REGISTRY.enabled:
+            VERIFICATIONS.inc("accepted" if valid else "rejected")
+        if started_ns:
+            metadata = proof.metadata
+            trace_id = metadata.get("trace") if isinstance(metadata, dict) else None
+            if trace_id is not None:
+                trace = TRACER.resume(str(trace_id))
+                trace.add("verify", started_ns, (time.time_ns() - started_ns) / 1e9)
+                TRACER.finish(trace, "accepted" if valid else "rejected")
+        return valid
+
+    def _cache_expiry(self, proof: TimeProof, valid: bool) -> Optional[float]:
+        """Cached positives must expire once the proof's data goes stale."""
+        if not valid:
+            return None
+        return proof.metadata["timestamp"] / 1e9 + self.accepted_time_range
+
+    def close(self) -> None:
+        """Shut down the verifier backends."""
+        if self.verifier is not None:
+            self.verifier.close()
+        for verifier in self.batch_verifiers.values():
+            verifier.close()
+
+    def _get_verifier(self, batch_size: Optional[int] = None) -> Groth16VerifierService:
+        """Return the long-lived verifier for a circuit, starting it on first use."""
+        if batch_size is not None:
+            verifier = self.batch_verifiers.get(batch_size)
+            if verifier is None:
+                if batch_size not in self.batch_artifacts:
+                    raise ValueError(f"No verification key for batches of {batch_size}")
+                verifier = Groth16VerifierService(self.batch_artifacts[batch_size].verification_key)
+                self.batch_verifiers[batch_size] = verifier
+            return verifier
+        if self.verifier is None:
+            self.verifier = Groth16VerifierService(self.verification_key)
+        return self.verifier
+
+    @staticmethod
+    def _batch_size(metadata: Dict) -> Optional[int]:
+        """Number of epochs covered by the proof, or None for single-epoch proofs."""
+        batch = metadata.get("batch")
+        return len(batch["T_sat"]) if batch is not None else None
+
+    def _public_signals(self, metadata: Dict) -> List[str]:
+        """Public inputs of SatelliteTimeCheck (or the batch circuit) in circuit order.
+
+        A batch proof is only good for the epoch whose own ``T_sat`` sits
+        at its index among the batch's public inputs.
+        """
+        batch = metadata.get("batch")
+        if batch is None:
+            return [str(metadata["T_sat"]), "299792458", "5000000"]
+        if str(batch["T_sat"][batch["index"]]) != str(metadata["T_sat"]):
+            raise ValueError("T_sat does not match its slot in the batch")
+        return [str(t) for t in batch["T_sat"]] + ["299792458", "5000000"]
+
     def _verify_zk_proof(self, proof: bytes, metadata: Dict) -> bool:
         """Verify the zero-knowledge proof."""
         try:
-            # Write proof to file
-            with open("proof.json", "wb") as f:
-                f.write(proof)
-            
-            # Write public inputs
-            with open("public.json", "w") as f:
-                json.dump({
-                    "T_sat": metadata["T_sat"],
-                    "c": "299792458",
-                    "Delta": "5000000"
-                }, f)
-            
-            # Verify proof
-            result = subprocess.run([
-                "snarkjs",
-                "groth16",
-                "verify",
-                "verification_key.json",
-                "public.json",
-                "proof.json"
-            ], capture_output=True)
-            
-            return b"OK" in result.stdout
-        
+            batch_size = self._batch_size(metadata)
+            signals = self._public_signals(metadata)
         except Exception as e:
+            ERRORS.inc("time_validator", "zk_proof")
             print(f"Error verifying ZK proof: {e}")
             return False
+
+        try:
+            return self._get_verifier(batch_size).verify(proof, signals)
+
+        except Exception as e:
+            ERRORS.inc("time_validator", "zk_proof")
+            print(f"Error verifying ZK proof: {e}")
+            self._mark_inconclusive([proof])
+            return False
+
+    def _verify_zk_proofs(self, items: List[tuple]) -> List[bool]:
+        """Verify many (proof, metadata) pairs with one batched check per circuit.
+
+        Epochs of one batch proof share the proof and its public inputs, so
+        each distinct batch proof is verified once.
+        """
+        results = [False] * len(items)
+        # batch size -> (unique (proof, signals) pairs, item indices per pair)
+        groups: Dict[Optional[int], tuple] = {}
+        seen: Dict[tuple, int] = {}
+        for i, (proof, metadata) in enumerate(items):
+            try:
+                signals = self._public_signals(metadata)
+                batch_size = self._batch_size(metadata)
+            except Exception as e:
+                ERRORS.inc("time_validator", "zk_proof")
+                print(f"Error verifying ZK proof: {e}")
+                continue
+
+            pairs, indices = groups.setdefault(batch_size, ([], []))
+            key = (batch_size, bytes(proof), tuple(signals)) if batch_size is not None else None
+            if key in seen:
+                indices[seen[key]].append(i)
+                continue
+            if key is not None:
+                seen[key] = len(pairs)
+            pairs.append((proof, signals))
+            indices.append([i])
+
+        for batch_size, (pairs, indices) in groups.items():
+            try:
+                outcomes = self._get_verifier(batch_size).verify_many(pairs)
+            except Exception as e:
+                ERRORS.inc("time_validator", "zk_proof_batch")
+                print(f"Error verifying ZK proof batch: {e}")
+                self._mark_inconclusive(proof for proof, _ in pairs)
+                continue
+            for group, ok in zip(indices, outcomes):
+                for i in group:
+                    results[i] = ok
+        return results
         
     def _verify_satellite_fingerprint(self, proof: TimeProof) -> bool:
         """Verify the satellite fingerprint matches metadata.
         
         Verifies that:
         1. The fingerprint matches the unreleased data
-        2. The data is fresh (not replayed)
-        3. The satellite data is authentic
+        2. The satellite data is authentic
+
+        Freshness is checked separately, before this stage.
         """
         try:
-            # Reconstruct fingerprint from metadata
-            unreleased_data = []
-            for sat_data in proof.metadata["satellite_data"]:
-                unreleased_data.extend([
-                    str(sat_data["almanac"]["clock_correction"]),
-                    str(sat_data["almanac"]["ionospheric_data"]),
-                    str(sat_data["almanac"]["atmospheric_corrections"]),
-                    str(sat_data["almanac"]["satellite_health"]),
-                    str(sat_data["almanac"]["doppler_shift"]),
-                ])
-            
-            # Generate verification fingerprint
-            verification_fingerprint = hashlib.sha256(''.join(unreleased_data).encode()).hexdigest()
-            
-            # Compare with provided fingerprint
-            if verification_fingerprint != proof.satellite_fingerprint:
-                return False
-                
-            # Verify data freshness
-            if not self._verify_data_freshness(proof.metadata):
-                return False
-                
-            return True
-            
+            # Reconstruct fingerprint from metadata (or the wire records)
+            return proof_fingerprint(proof) == proof.satellite_fingerprint
+
         except Exception as e:
+            ERRORS.inc("time_validator", "fingerprint")
             print(f"Error verifying satellite fingerprint: {e}")
             return False
+
+    def _verify_satellite_fingerprints(self, proofs: List[TimeProof]) -> List[bool]:
+        """Verify many fingerprints, packing all dict-metadata proofs in one pass."""
+        results = [False] * len(proofs)
+        pending = []
+        for i, proof in enumerate(proofs):
+            if isinstance(proof, TimeProofView):
+                results[i] = self._verify_satellite_fingerprint(proof)
+            else:
+                pending.append(i)
+        try:
+            fingerprints = satellite_fingerprints(
+                proofs[i].metadata["satellite_data"] for i in pending
+            )
+        except Exception:
+            # A malformed proof spoils the batch; check each on its own
+            fingerprints = None
+        for n, i in enumerate(pending):
+            if fingerprints is None:
+                results[i] = self._verify_satellite_fingerprint(proofs[i])
+            else:
+                results[i] = fingerprints[n] == proofs[i].satellite_fingerprint
+        return results
         
     def _verify_data_freshness(self, metadata: Dict) -> bool:
         """Verify the data is fresh and not replayed."""
@@ -110,14 +321,20 @@ class TimeValidator:
             # Reject if proof is too old (prevent replay attacks)
             if (current_time - proof_time) > self.accepted_time_range * 1e9:  # Convert to nanoseconds
                 return False
+
+            # A future-dated proof would outlive its replay index entry
+            if (proof_time - current_time) > self.accepted_time_range * 1e9:
+                return False
                 
             return True
             
         except Exception as e:
+            ERRORS.inc("time_validator", "freshness")
             print(f"Error verifying data freshness: {e}")
             return False
         
     def _verify_timestamp_range(self, timestamp: float) -> bool:
         """Verify timestamp is within acceptable range."""
-        # Implementation for timestamp validation
-        pass 
\ No newline at end of file
+        if timestamp is None:
+            return False
+        return abs(timestamp - time.time()) <= self.accepted_time_range 
\ No newline at end of file
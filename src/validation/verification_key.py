@@ -0,0 +1,122 @@
+"""Groth16 verification keys pre-parsed into a compact, memory-mapped binary.
+
+A snarkjs ``verification_key.json`` spells every coordinate as a decimal
+string. It is converted once into a fixed layout and stored under the
+SHA-256 of the JSON, so restarts (and every validator on the host) reuse
+the same file and never parse the JSON again.
+
+Layout (little-endian)::
+
+    header  magic "CVK1", curve name (8 bytes ASCII, NUL-padded),
+            field element size n8 u32, IC point count u32, 4 bytes padding
+    points  alpha1 (G1), beta2, gamma2, delta2 (G2), then the IC points
+            (G1), as projective coordinates of n8-byte integers; G1 is
+            x, y, z and G2 is x.c0, x.c1, y.c0, y.c1, z.c0, z.c1
+
+``groth16_verifier.js`` accepts either form of the key.
+"""
+from typing import List, Tuple
+import hashlib
+import json
+import mmap
+import os
+import struct
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "continuum", "keys")
+MAGIC = b"CVK1"
+HEADER = struct.Struct("<4s8sII4x")
+# Bytes per base-field element of the curves snarkjs supports
+CURVE_BYTES = {"bn128": 32, "bls12381": 48}
+G1_ELEMENTS = 3
+G2_ELEMENTS = 6
+
+G1Point = Tuple[int, int, int]
+G2Point = Tuple[Tuple[int, int], Tuple[int, int], Tuple[int, int]]
+
+
+def encode_verification_key(vk: dict) -> bytes:
+    """Pack a parsed snarkjs verification key into the binary layout."""
+    curve = vk["curve"]
+    if curve not in CURVE_BYTES:
+        raise ValueError(f"Unsupported curve: {curve}")
+    n8 = CURVE_BYTES[curve]
+    elements = (
+        list(vk["vk_alpha_1"])
+        + [c for key in ("vk_beta_2", "vk_gamma_2", "vk_delta_2") for pair in vk[key] for c in pair]
+        + [c for point in vk["IC"] for c in point]
+    )
+    parts = [HEADER.pack(MAGIC, curve.encode(), n8, len(vk["IC"]))]
+    parts.extend(int(element).to_bytes(n8, "little") for element in elements)
+    return b"".join(parts)
+
+
+class VerificationKey:
+    """Read-only view of a cached binary key; coordinates decode on access."""
+
+    def __init__(self, path: str):
+        """Map the binary key at ``path``."""
+        self.path = path
+        with open(path, "rb") as f:
+            self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, curve, self.n8, self.ic_count = HEADER.unpack_from(self._buffer)
+        if magic != MAGIC:
+            raise ValueError(f"Not a cached verification key: {path}")
+        self.curve = curve.rstrip(b"\0").decode()
+        expected = HEADER.size + self.n8 * (G1_ELEMENTS * (1 + self.ic_count) + 3 * G2_ELEMENTS)
+        if len(self._buffer) != expected:
+            raise ValueError(f"Truncated verification key cache: {path}")
+
+    @classmethod
+    def load(cls, json_path: str, cache_dir: str = DEFAULT_CACHE_DIR) -> "VerificationKey":
+        """The cached form of ``json_path``, converting it on first use."""
+        with open(json_path, "rb") as f:
+            source = f.read()
+        path = os.path.join(cache_dir, hashlib.sha256(source).hexdigest() + ".vkey")
+        if not os.path.exists(path):
+            encoded = encode_verification_key(json.loads(source))
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(encoded)
+            os.replace(tmp, path)
+        return cls(path)
+
+    @property
+    def n_public(self) -> int:
+        """Number of public inputs the circuit takes."""
+        return self.ic_count - 1
+
+    @property
+    def alpha1(self) -> G1Point:
+        return self._g1(0)
+
+    @property
+    def beta2(self) -> G2Point:
+        return self._g2(G1_ELEMENTS)
+
+    @property
+    def gamma2(self) -> G2Point:
+        return self._g2(G1_ELEMENTS + G2_ELEMENTS)
+
+    @property
+    def delta2(self) -> G2Point:
+        return self._g2(G1_ELEMENTS + 2 * G2_ELEMENTS)
+
+    @property
+    def ic(self) -> List[G1Point]:
+        start = G1_ELEMENTS + 3 * G2_ELEMENTS
+        return [self._g1(start + G1_ELEMENTS * i) for i in range(self.ic_count)]
+
+    def close(self) -> None:
+        self._buffer.close()
+
+    def _element(self, index: int) -> int:
+        offset = HEADER.size + index * self.n8
+        return int.from_bytes(self._buffer[offset:offset + self.n8], "little")
+
+    def _g1(self, index: int) -> G1Point:
+        return tuple(self._element(index + i) for i in range(G1_ELEMENTS))
+
+    def _g2(self, index: int) -> G2Point:
+        return tuple((self._element(index + i), self._element(index + i + 1))
+                     for i in range(0, G2_ELEMENTS, 2))
@@ -0,0 +1,81 @@
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+import json
+import os
+from ..secure_enclave.node_worker import NodeWorker
+from .verification_key import DEFAULT_CACHE_DIR, VerificationKey
+
+VERIFIER_SCRIPT = os.path.join(os.path.dirname(__file__), 'groth16_verifier.js')
+
+ProofInput = Union[bytes, str, Dict]
+
+
+class Groth16VerifierService(NodeWorker):
+    """Persistent Groth16 verifier backed by one long-lived Node process.
+
+    The verification key is read and parsed once when the process starts;
+    proofs are then sent over a pipe instead of being written to disk and
+    checked by a fresh ``snarkjs groth16 verify`` process each time. The
+    process loads the key from its pre-parsed binary form in
+    ``key_cache_dir``, which also lets proofs with the wrong number of
+    public signals be rejected here without a round trip.
+    """
+
+    def __init__(self, verification_key_path: str = "verification_key.json",
+                 key_cache_dir: str = DEFAULT_CACHE_DIR):
+        """Initialize the verifier for the given verification key."""
+        self.verification_key_path = os.path.abspath(verification_key_path)
+        self.verification_key: Optional[VerificationKey] = None
+        try:
+            self.verification_key = VerificationKey.load(self.verification_key_path, key_cache_dir)
+            key_file = self.verification_key.path
+        except (OSError, ValueError) as e:
+            # Let the helper read the JSON itself and report what is wrong
+            print(f"Verification key not cached: {e}")
+            key_file = self.verification_key_path
+        super().__init__(VERIFIER_SCRIPT, [key_file])
+
+    def verify(self, proof: ProofInput, public_signals: Sequence[str]) -> bool:
+        """Verify a single Groth16 proof."""
+        if not self._signal_count_matches(public_signals):
+            return False
+        response = self.request(
+            "verify",
+            proof=self._decode_proof(proof),
+            publicSignals=list(public_signals),
+        )
+        return bool(response["result"])
+
+    def verify_many(self, proofs: Sequence[Tuple[ProofInput, Sequence[str]]],
+                    batch: bool = True) -> List[bool]:
+        """Verify many (proof, public signals) pairs in one round trip.
+
+        With ``batch`` set, all proofs are first checked together with a
+        randomized pairing-product equation; only if that combined check
+        fails are the proofs verified one by one to find the bad ones.
+        """
+        results = [self._signal_count_matches(public_signals) for _, public_signals in proofs]
+        items = [
+            {"proof": self._decode_proof(proof), "publicSignals": list(public_signals)}
+            for (proof, public_signals), ok in zip(proofs, results) if ok
+        ]
+        if not items:
+            return results
+        response = iter(self.request("verify_many", items=items, batch=batch)["result"])
+        return [ok and bool(next(response)) for ok in results]
+
+    def close(self) -> None:
+        """Stop the helper process and unmap the key."""
+        super().close()
+        if self.verification_key is not None:
+            self.verification_key.close()
+
+    def _signal_count_matches(self, public_signals: Sequence[str]) -> bool:
+        return self.verification_key is None or len(public_signals) == self.verification_key.n_public
+
+    def _decode_proof(self, proof: ProofInput) -> Dict:
+        """Accept snarkjs proof JSON as bytes, str or an already parsed dict."""
+        if isinstance(proof, dict):
+            return proof
+        if isinstance(proof, (bytes, bytearray, memoryview)):
+            proof = bytes(proof).decode()
+        return json.loads(proof)
@@ -0,0 +1,174 @@
+import unittest
+import contextlib
+import io
+import json
+import os
+import shutil
+import stat
+import struct
+import sys
+import tempfile
+import textwrap
+import time
+from src.secure_enclave.artifacts import DEFAULT_CIRCUIT, ArtifactManager, file_digest, r1cs_constraints
+from src.secure_enclave.zk_prover import ZKTimeProver
+from src.validation.time_validator import TimeValidator
+
+# Stand-ins for the circom and snarkjs commands that write empty outputs
+FAKE_CIRCOM = textwrap.dedent("""
+    import os, sys
+    if sys.argv[1] == "--version":
+        print("circom compiler {version}")
+        sys.exit()
+    out, circuit = sys.argv[-2], sys.argv[-1]
+    name = os.path.splitext(os.path.basename(circuit))[0]
+    os.makedirs(os.path.join(out, name + "_js"))
+    for path in (name + ".r1cs", os.path.join(name + "_js", name + ".wasm")):
+        open(os.path.join(out, path), "w").close()
+""")
+FAKE_SNARKJS = textwrap.dedent("""
+    import sys
+    open(sys.argv[-1], "w").close()
+""")
+
+
+class TestArtifactManager(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.circuit = os.path.join(self.tmp.name, "SatelliteTimeCheck.circom")
+        shutil.copy(DEFAULT_CIRCUIT, self.circuit)
+        self.circomlib = os.path.join(self.tmp.name, "circomlib")
+        os.makedirs(self.circomlib)
+        self.set_circomlib_version("2.0.5")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def set_circomlib_version(self, version):
+        with open(os.path.join(self.circomlib, "package.json"), "w") as f:
+            json.dump({"version": version}, f)
+
+    def manager(self, **kwargs):
+        return ArtifactManager(self.circuit, cache_dir=os.path.join(self.tmp.name, "cache"),
+                               circomlib_dir=self.circomlib, **kwargs)
+
+    def script(self, path, source):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(f"#!{sys.executable}\n{source}")
+        os.chmod(path, os.stat(path).st_mode | stat.S_IXUSR)
+        return path
+
+    def toolchain(self, circom_version="2.1.8", snarkjs_version="0.7.4"):
+        """Fake circom and snarkjs commands reporting the given versions."""
+        circom = self.script(os.path.join(self.tmp.name, f"circom-{circom_version}", "circom"),
+                             FAKE_CIRCOM.format(version=circom_version))
+        package = os.path.join(self.tmp.name, f"snarkjs-{snarkjs_version}", "node_modules", "snarkjs")
+        snarkjs = self.script(os.path.join(package, "build", "cli.cjs"), FAKE_SNARKJS)
+        with open(os.path.join(package, "package.json"), "w") as f:
+            json.dump({"name": "snarkjs", "version": snarkjs_version}, f)
+        return {"circom": circom, "snarkjs": snarkjs}
+
+    def populate(self, artifacts):
+        """Lay out a finished build the way ``ensure`` leaves it."""
+        for path in (artifacts.r1cs, artifacts.wasm, artifacts.zkey, artifacts.verification_key):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            open(path, "w").close()
+        with open(os.path.join(artifacts.directory, "manifest.json"), "w") as f:
+            json.dump({"key": artifacts.key}, f)
+
+    def test_key_covers_circuit_circomlib_and_ptau(self):
+        key = self.manager().key()
+        self.assertEqual(self.manager().key(), key)
+        self.assertNotEqual(self.manager(ptau_power=14).key(), key)
+
+        self.set_circomlib_version("2.0.6")
+        self.assertNotEqual(self.manager().key(), key)
+        self.set_circomlib_version("2.0.5")
+
+        with open(self.circuit, "a") as f:
+            f.write("\n// changed\n")
+        self.assertNotEqual(self.manager().key(), key)
+
+    def test_key_covers_circom_and_snarkjs_versions(self):
+        key = self.manager(**self.toolchain()).key()
+        self.assertEqual(self.manager(**self.toolchain()).key(), key)
+        self.assertNotEqual(self.manager(**self.toolchain(circom_version="2.1.9")).key(), key)
+        self.assertNotEqual(self.manager(**self.toolchain(snarkjs_version="0.7.5")).key(), key)
+
+    def test_manifest_records_the_toolchain(self):
+        ptau = os.path.join(self.tmp.name, "pot12_final.ptau")
+        open(ptau, "w").close()
+        with contextlib.redirect_stdout(io.StringIO()):
+            artifacts = self.manager(ptau_path=ptau, **self.toolchain()).ensure()
+        with open(os.path.join(artifacts.directory, "manifest.json")) as f:
+            manifest = json.load(f)
+        self.assertEqual(manifest["key"], artifacts.key)
+        self.assertEqual(manifest["circom"], "circom compiler 2.1.8")
+        self.assertEqual(manifest["snarkjs"], "0.7.4")
+        self.assertEqual(manifest["circomlib"], "2.0.5")
+
+    def test_key_hashes_supplied_ptau_contents(self):
+        """Two ceremonies of the same power and file name get different keys."""
+        first, second = (os.path.join(self.tmp.name, name, "pot12_final.ptau") for name in ("a", "b"))
+        for path, fill in ((first, b"a"), (second, b"b")):
+            os.makedirs(os.path.dirname(path))
+            with open(path, "wb") as f:
+                f.write(fill * 4096)
+        key = self.manager(ptau_path=first).key()
+        self.assertNotEqual(self.manager(ptau_path=second).key(), key)
+        self.assertEqual(self.manager(ptau_path=first).key(), key)
+
+        # The digest is reused until the file changes
+        with open(first + ".sha256") as f:
+            self.assertEqual(json.load(f)["sha256"], file_digest(first))
+        with open(first, "r+b") as f:
+            f.write(b"c")
+        os.utime(first, ns=(0, 1))
+        self.assertNotEqual(self.manager(ptau_path=first).key(), key)
+
+    def test_warm_cache_resolves_without_building(self):
+        manager = self.manager(circom="/nonexistent/circom", snarkjs="/nonexistent/snarkjs")
+        self.assertIsNone(manager.resolve())
+        self.populate(manager.paths())
+
+        start = time.perf_counter()
+        artifacts = self.manager(circom="/nonexistent/circom", snarkjs="/nonexistent/snarkjs").ensure()
+        self.assertLess(time.perf_counter() - start, 0.05)
+        self.assertEqual(artifacts, manager.paths())
+
+        prover = ZKTimeProver(artifacts=artifacts)
+        validator = TimeValidator(artifacts=artifacts)
+        self.assertEqual(prover.proving_key, artifacts.zkey)
+        self.assertEqual(prover.wasm_path, artifacts.wasm)
+        self.assertEqual(validator.verification_key, artifacts.verification_key)
+
+    def test_failed_build_raises_and_leaves_no_entry(self):
+        manager = self.manager(circom="/nonexistent/circom")
+        with self.assertRaises(RuntimeError):
+            manager.ensure()
+        self.assertIsNone(manager.resolve())
+        self.assertFalse(os.path.exists(manager.paths().directory))
+
+    def test_batch_circuits_get_their_own_keys(self):
+        cache_dir = os.path.join(self.tmp.name, "cache")
+        eight = ArtifactManager.for_batch(8, cache_dir=cache_dir, circomlib_dir=self.circomlib)
+        again = ArtifactManager.for_batch(8, cache_dir=cache_dir, circomlib_dir=self.circomlib)
+        thirty_two = ArtifactManager.for_batch(32, cache_dir=cache_dir, circomlib_dir=self.circomlib)
+        self.assertEqual(eight.key(), again.key())
+        self.assertNotEqual(eight.key(), thirty_two.key())
+        self.assertTrue(eight.paths().wasm.endswith("SatelliteTimeCheckBatch_8.wasm"))
+
+    def test_reads_constraint_count_from_r1cs_header(self):
+        path = os.path.join(self.tmp.name, "circuit.r1cs")
+        prime = bytes(32)
+        header = struct.pack("<I", 32) + prime + struct.pack("<IIIIQI", 10, 1, 9, 4, 20, 567)
+        with open(path, "wb") as f:
+            f.write(struct.pack("<4sII", b"r1cs", 1, 2))
+            f.write(struct.pack("<IQ", 2, 3) + b"xyz")
+            f.write(struct.pack("<IQ", 1, len(header)) + header)
+        self.assertEqual(r1cs_constraints(path), 567)
+
+
+if __name__ == "__main__":
+    unittest.main()
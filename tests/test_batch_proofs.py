@@ -0,0 +1,73 @@
+import unittest
+import time
+from src.gps_module.satellite_batch import SatelliteBatch
+from src.secure_enclave.zk_prover import TimeProof, ZKTimeProver
+from src.validation.time_validator import TimeValidator
+from tests.test_satellite_batch import BASE_TIME, visible_satellites
+from tests.test_verification_pipeline import CountingVerifier
+
+
+class RecordingBackend:
+    """Stand-in witness backend that records the batch inputs it proves."""
+
+    def __init__(self):
+        self.inputs = []
+
+    def prove(self, inputs):
+        self.inputs.append(inputs)
+        return f'{{"batch": {len(self.inputs)}}}'.encode()
+
+    def close(self):
+        pass
+
+
+def current_epochs(count):
+    """Epochs of consistent satellites moved to the present, 50 ms apart."""
+    now = time.time()
+    epochs = []
+    for i in range(count):
+        satellites = SatelliteBatch.from_satellites(visible_satellites())
+        # Fresh almanac data per epoch keeps the fingerprints distinct
+        satellites.almanac[:, -1] += i
+        epochs.append(satellites.shift_time(now - BASE_TIME - 0.05 * i))
+    return epochs
+
+
+class TestBatchProofs(unittest.TestCase):
+    def setUp(self):
+        self.prover = ZKTimeProver(batch_artifacts={1: None, 8: None})
+        self.backends = {1: RecordingBackend(), 8: RecordingBackend()}
+        self.prover._batch_backends.update(self.backends)
+        self.verifiers = {1: CountingVerifier(), 8: CountingVerifier()}
+        self.validator = TimeValidator(batch_verifiers=self.verifiers)
+
+    def test_epochs_are_chunked_and_padded(self):
+        proofs = self.prover.generate_time_proofs(current_epochs(10))
+        self.assertEqual(len(proofs), 10)
+        # 10 epochs: a full batch of 8, then 2 padded up to 8
+        self.assertEqual([len(i["T_sat"]) for i in self.backends[8].inputs], [8, 8])
+        self.assertEqual(self.backends[8].inputs[1]["T_sat"][2:], [self.backends[8].inputs[1]["T_sat"][1]] * 6)
+        self.assertEqual(proofs[9].metadata["batch"]["index"], 1)
+        self.assertEqual(len({p.zk_proof for p in proofs}), 2)
+
+    def test_validator_verifies_each_batch_proof_once(self):
+        proofs = self.prover.generate_time_proofs(current_epochs(10))
+        wire = [TimeProof.from_buffer(p.to_bytes()) for p in proofs]
+        self.assertEqual(self.validator.verify_time_proofs(wire), [True] * 10)
+        self.assertEqual(self.verifiers[8].calls, [2])
+
+    def test_epoch_must_match_its_slot(self):
+        proof = self.prover.generate_time_proofs(current_epochs(8))[3]
+        self.assertTrue(self.validator._verify_zk_proof(proof.zk_proof, proof.metadata))
+        proof.metadata["T_sat"] = str(int(proof.metadata["T_sat"]) + 1)
+        self.assertFalse(self.validator._verify_zk_proof(proof.zk_proof, proof.metadata))
+
+    def test_single_size_configuration_proves_one_epoch_per_proof(self):
+        prover = ZKTimeProver(batch_artifacts={1: None})
+        prover._batch_backends[1] = backend = RecordingBackend()
+        prover.generate_time_proofs(current_epochs(3))
+        self.assertEqual(len(backend.inputs), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
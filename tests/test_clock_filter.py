@@ -0,0 +1,123 @@
+import unittest
+import numpy as np
+from src.gps_module.clock_filter import ClockFilter
+from src.gps_module.clock_solver import SPEED_OF_LIGHT
+from src.gps_module.gps_receiver import SatelliteData
+from src.secure_enclave.processor import SecureEnclaveProcessor
+from tests.test_clock_solver import RECEIVER, constellation
+
+START = 1000.0
+BIAS = 1e-4
+DRIFT = 2e-8
+INTERVAL = 0.1
+
+
+def stream(count, noise=1.0, jump_at=None, jump=1e-3, corrupt=None, seed=3):
+    """Epochs of SatelliteData from RECEIVER with a drifting clock.
+
+    ``corrupt`` maps epoch indices to a range error in metres added to
+    their first satellite.
+    """
+    rng = np.random.default_rng(seed)
+    times = START + INTERVAL * np.arange(count)
+    positions, visible = constellation(times)
+    epochs = []
+    for m, t in enumerate(times):
+        bias = BIAS + DRIFT * (t - START)
+        if jump_at is not None and m >= jump_at:
+            bias += jump
+        sats = positions[m][visible[m]]
+        travel = (np.linalg.norm(sats - RECEIVER, axis=1) + rng.normal(0.0, noise, len(sats))) / SPEED_OF_LIGHT
+        if corrupt and m in corrupt:
+            travel[0] += corrupt[m] / SPEED_OF_LIGHT
+        epochs.append([
+            SatelliteData(
+                prn_code=f"G{i:02d}",
+                position=tuple(position),
+                atomic_timestamp=t + bias,
+                transmission_time=t - float(travel[i]),
+                ephemeris_data={"semi_major_axis": 26559.7, "eccentricity": 0.01},
+                almanac_data={
+                    "clock_correction": 0.0,
+                    "ionospheric_data": 0.0,
+                    "atmospheric_corrections": 0.0,
+                    "satellite_health": 0,
+                    "doppler_shift": 0.0,
+                },
+            )
+            for i, position in enumerate(sats)
+        ])
+    return times, epochs
+
+
+class TestClockFilter(unittest.TestCase):
+    def test_tracks_bias_and_drift(self):
+        clock = ClockFilter()
+        clock.initialize(0.0, 1e-6, 1e-16)
+        for t in np.arange(1, 200) * 0.5:
+            self.assertTrue(clock.update(t, 1e-6 + 5e-8 * t, 1e-16))
+        self.assertAlmostEqual(clock.drift, 5e-8, delta=1e-10)
+        self.assertAlmostEqual(clock.bias, 1e-6 + 5e-8 * clock.time, delta=1e-9)
+
+    def test_gate_rejects_a_jump_without_changing_state(self):
+        clock = ClockFilter()
+        clock.initialize(0.0, 0.0, 1e-16)
+        for t in range(1, 20):
+            clock.update(float(t), 0.0, 1e-16)
+        state = (clock.time, clock.bias, clock.drift, clock.p00)
+        self.assertFalse(clock.update(20.0, 1e-3, 1e-16))
+        self.assertEqual((clock.time, clock.bias, clock.drift, clock.p00), state)
+        self.assertAlmostEqual(clock.last_innovation, 1e-3)
+
+
+class TestStreamingProcessor(unittest.TestCase):
+    def test_stream_tracks_receiver_time(self):
+        times, epochs = stream(50)
+        processor = SecureEnclaveProcessor()
+        results = list(processor.process_stream(epochs))
+        self.assertEqual(len(results), 50)
+        np.testing.assert_allclose(processor.receiver_position, RECEIVER, atol=20.0)
+        for t, result in zip(times, results):
+            self.assertAlmostEqual(result["timestamp"], t, delta=2e-8)
+        self.assertAlmostEqual(results[-1]["clock_bias"], BIAS + DRIFT * (times[-1] - START), delta=2e-8)
+        self.assertEqual(processor.current_time, results[-1]["timestamp"])
+        self.assertEqual(processor.stats["rejected"], 0)
+
+    def test_corrupted_satellite_is_excluded(self):
+        times, epochs = stream(20, corrupt={10: 5000.0})
+        processor = SecureEnclaveProcessor()
+        results = list(processor.process_stream(epochs))
+        self.assertEqual(len(results), 20)
+        self.assertEqual(results[10]["satellite_count"], len(epochs[10]) - 1)
+        self.assertAlmostEqual(results[10]["timestamp"], times[10], delta=2e-8)
+        self.assertEqual(processor.stats["excluded_satellites"], 1)
+
+    def test_clock_jump_is_rejected_then_reinitialized(self):
+        times, epochs = stream(20, jump_at=10)
+        processor = SecureEnclaveProcessor(max_rejects=3)
+        for epoch in epochs[:10]:
+            processor.process_epoch(epoch)
+        for epoch in epochs[10:12]:
+            with self.assertRaises(ValueError):
+                processor.process_epoch(epoch)
+
+        # The third inconsistent epoch in a row restarts from a full solve
+        result = processor.process_epoch(epochs[12])
+        self.assertAlmostEqual(result["clock_bias"], BIAS + 1e-3 + DRIFT * (times[12] - START), delta=2e-8)
+        self.assertAlmostEqual(result["timestamp"], times[12], delta=2e-8)
+        self.assertEqual(processor.stats["rejected"], 2)
+        self.assertEqual(processor.stats["resets"], 1)
+
+    def test_stream_skips_rejected_epochs(self):
+        times, epochs = stream(10)
+        epochs[5] = stream(10, jump_at=0)[1][5]
+        processor = SecureEnclaveProcessor()
+        results = list(processor.process_stream(epochs))
+        self.assertEqual(len(results), 9)
+        for t, result in zip(np.delete(times, 5), results):
+            self.assertAlmostEqual(result["timestamp"], t, delta=2e-8)
+        self.assertEqual(processor.stats["rejected"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+import unittest
+import math
+import numpy as np
+from src.gps_module.clock_solver import ClockSolver, SPEED_OF_LIGHT
+from src.gps_module.ephemeris import EphemerisEngine
+from src.gps_module.gps_receiver import GPSReceiver
+from src.gps_module.nmea_stream import GSVSatellite, SatelliteEpoch
+from src.gps_module.satellite_batch import SatelliteBatch
+from src.gps_module.satellite_data import SatelliteData
+
+RECEIVER = np.array([6371e3, 0.0, 0.0])
+
+
+def constellation(epochs: np.ndarray):
+    """Satellite positions and a visibility mask seen from RECEIVER."""
+    ephemerides = [
+        {
+            "semi_major_axis": 26559.7,
+            "eccentricity": 0.01,
+            "inclination": 55.0,
+            "right_ascension": 45.0 * i,
+            "argument_of_perigee": 0.0,
+            "mean_anomaly": 40.0 * i + 20.0 * (i % 2)
+        }
+        for i in range(24)
+    ]
+    positions = EphemerisEngine().positions(ephemerides, epochs)
+    line_of_sight = positions - RECEIVER
+    up = RECEIVER / np.linalg.norm(RECEIVER)
+    elevation = (line_of_sight @ up) / np.linalg.norm(line_of_sight, axis=-1)
+    return positions, elevation > 0.17
+
+
+class TestClockSolver(unittest.TestCase):
+    def setUp(self):
+        self.positions, self.visible = constellation(np.arange(20) * 0.1)
+        self.bias = 1e-3
+        self.pseudoranges = (np.linalg.norm(self.positions - RECEIVER, axis=-1)
+                             + self.bias * SPEED_OF_LIGHT)
+
+    def test_recovers_position_and_bias_for_all_epochs(self):
+        """Noise-free pseudoranges give the exact receiver state."""
+        solution = ClockSolver().solve(self.positions, self.pseudoranges, self.visible.astype(float))
+        self.assertTrue(np.all(solution.converged))
+        np.testing.assert_allclose(solution.positions, np.tile(RECEIVER, (20, 1)), atol=1e-3)
+        np.testing.assert_allclose(solution.clock_bias, self.bias, atol=1e-12)
+        self.assertGreater(solution.iterations, 0)
+        self.assertGreaterEqual(solution.latency, 0.0)
+
+    def test_warm_start_needs_fewer_iterations(self):
+        """A second batch starts from the previous solution."""
+        solver = ClockSolver()
+        cold = solver.solve(self.positions, self.pseudoranges, self.visible.astype(float))
+        warm = solver.solve(self.positions, self.pseudoranges, self.visible.astype(float))
+        self.assertLess(warm.iterations, cold.iterations)
+
+    def test_outlier_is_excluded(self):
+        """A satellite with a large range error is dropped by the residual test."""
+        corrupted = self.pseudoranges.copy()
+        bad = int(np.argmax(self.visible[0]))
+        corrupted[0, bad] += 5000.0
+
+        solution = ClockSolver().solve(self.positions, corrupted, self.visible.astype(float))
+        self.assertFalse(solution.used[0, bad])
+        np.testing.assert_allclose(solution.clock_bias[0], self.bias, atol=1e-9)
+
+    def test_nmea_satellites_are_in_seconds_and_left_out_of_the_solution(self):
+        """GSV satellites share the seconds unit but carry no pseudorange."""
+        receive_ns = 1_677_649_200_000_000_000
+        gsv = [GSVSatellite("GP", f"{prn:02d}", 40.0, 83.0, 46.0) for prn in range(1, 6)]
+        nmea = GPSReceiver()._process_epoch(SatelliteEpoch(1, receive_ns, gsv))
+        for sat in nmea:
+            self.assertEqual(sat.atomic_timestamp, receive_ns / 1e9)
+            self.assertTrue(math.isnan(sat.transmission_time))
+        self.assertIsNone(ClockSolver().solve_time(nmea))
+
+        # Mixed with measured satellites, only the measured ones count
+        receive_time = 1000.0
+        positions = self.positions[0][self.visible[0]]
+        travel = np.linalg.norm(positions - RECEIVER, axis=1) / SPEED_OF_LIGHT
+        measured = [
+            SatelliteData(f"G{i + 10:02d}", tuple(position), receive_time + self.bias,
+                          receive_time - float(travel[i]), {}, {})
+            for i, position in enumerate(positions)
+        ]
+        for sat in nmea:
+            sat.atomic_timestamp = receive_time + self.bias
+        self.assertAlmostEqual(ClockSolver().solve_time(nmea + measured), receive_time, delta=1e-9)
+
+    def test_unix_time_epochs_keep_metre_level_ranges(self):
+        """Travel times are used as given, not rebuilt from ~0.2 us Unix seconds."""
+        receive_time = 1677649200.0
+        positions = self.positions[0][self.visible[0]]
+        travel = np.linalg.norm(positions - RECEIVER, axis=1) / SPEED_OF_LIGHT + self.bias
+        batch = SatelliteBatch(
+            prn_codes=[f"G{i:02d}".encode("ascii") for i in range(len(positions))],
+            positions=positions,
+            atomic_timestamps=np.full(len(positions), receive_time + self.bias),
+            transmission_times=receive_time - (travel - self.bias),
+            almanac=np.zeros((len(positions), 4)),
+            satellite_health=np.zeros(len(positions)),
+            travel_times=travel,
+        )
+        for satellites in (batch, batch.to_satellites()):
+            times, solution = ClockSolver().solve_epochs([satellites])
+            np.testing.assert_allclose(solution.positions[0], RECEIVER, atol=1e-3)
+            self.assertLess(np.max(np.abs(solution.residuals)), 1e-3)
+            self.assertAlmostEqual(times[0], receive_time, delta=np.spacing(receive_time))
+
+
+
+if __name__ == '__main__':
+    unittest.main()
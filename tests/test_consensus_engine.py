@@ -0,0 +1,121 @@
+import unittest
+import random
+from src.consensus.engine import TimeConsensus
+from src.secure_enclave.zk_prover import TimeProof
+
+BASE_TIME = 1677649200.0
+# Epochs start on whole seconds; this is the middle of one
+MID_EPOCH = BASE_TIME + 0.5
+
+
+class TestTimeConsensus(unittest.TestCase):
+    def test_quorum_is_two_thirds_plus_one(self):
+        self.assertEqual(TimeConsensus(400).quorum, 267)
+        self.assertEqual(TimeConsensus(4).quorum, 3)
+
+    def test_emits_once_quorum_of_consistent_votes_lands(self):
+        agreements = []
+        consensus = TimeConsensus(4, on_agreement=agreements.append)
+        self.assertIsNone(consensus.submit_time("a", BASE_TIME + 0.001))
+        self.assertIsNone(consensus.submit_time("b", BASE_TIME + 0.002))
+        agreement = consensus.submit(
+            "c", TimeProof(BASE_TIME + 0.003, "ab" * 32, b"raw", {"T_sat": "1", "timestamp": 1}))
+
+        self.assertIsNotNone(agreement)
+        self.assertEqual(agreements, [agreement])
+        self.assertEqual(agreement.votes, 3)
+        self.assertAlmostEqual(agreement.time, BASE_TIME + 0.002, places=6)
+        self.assertEqual(consensus.agreement(agreement.epoch), agreement)
+        # A decided epoch stays decided
+        self.assertIsNone(consensus.submit_time("d", BASE_TIME + 0.004))
+        self.assertEqual(len(agreements), 1)
+
+    def test_byzantine_third_cannot_move_or_block_agreement(self):
+        rng = random.Random(7)
+        consensus = TimeConsensus(301)
+        votes = [("honest", i, BASE_TIME + rng.gauss(0, 0.002)) for i in range(201)]
+        votes += [("byzantine", i, BASE_TIME + rng.uniform(-0.4, 0.4)) for i in range(100)]
+        rng.shuffle(votes)
+
+        agreement = None
+        for kind, i, timestamp in votes:
+            agreement = consensus.submit_time((kind, i), timestamp) or agreement
+        self.assertIsNotNone(agreement)
+        self.assertAlmostEqual(agreement.time, BASE_TIME, delta=0.005)
+
+    def test_no_agreement_without_consistent_quorum(self):
+        consensus = TimeConsensus(6)
+        for i in range(6):
+            consensus.submit_time(i, MID_EPOCH + 0.1 * i - 0.25)
+        self.assertIsNone(consensus.agreement(consensus.epoch_of(MID_EPOCH)))
+        median, _ = consensus.estimate(consensus.epoch_of(MID_EPOCH))
+        self.assertAlmostEqual(median, MID_EPOCH, places=6)
+
+    def test_repeated_votes_count_once_and_flag_equivocation(self):
+        consensus = TimeConsensus(4)
+        consensus.submit_time("a", MID_EPOCH)
+        consensus.submit_time("a", MID_EPOCH)
+        consensus.submit_time("a", MID_EPOCH + 0.01)
+        epoch = consensus.epoch_of(MID_EPOCH)
+        self.assertEqual(consensus.votes(epoch), 1)
+        self.assertEqual(consensus.equivocators, {(epoch, "a")})
+
+    def test_votes_either_side_of_a_boundary_agree_once(self):
+        for origin, boundary in ((0.0, BASE_TIME), (0.5, MID_EPOCH)):
+            agreements = []
+            consensus = TimeConsensus(4, origin=origin, on_agreement=agreements.append)
+            self.assertEqual(consensus.epoch_of(boundary - 0.001) + 1, consensus.epoch_of(boundary))
+            consensus.submit_time("a", boundary - 0.002)
+            consensus.submit_time("b", boundary + 0.001)
+            agreement = consensus.submit_time("c", boundary - 0.001)
+            consensus.submit_time("d", boundary + 0.002)
+
+            self.assertIsNotNone(agreement)
+            self.assertEqual(agreements, [agreement])
+            self.assertAlmostEqual(agreement.time, boundary - 0.000667, places=5)
+            self.assertEqual(agreement.epoch, consensus.epoch_of(agreement.time))
+            self.assertEqual(consensus.agreement(agreement.epoch), agreement)
+
+    def test_byzantine_votes_around_a_boundary_decide_once(self):
+        rng = random.Random(11)
+        agreements = []
+        consensus = TimeConsensus(301, on_agreement=agreements.append)
+        votes = [BASE_TIME + rng.gauss(0, 0.005) for _ in range(201)]
+        votes += [BASE_TIME + rng.uniform(-0.5, 0.5) for _ in range(100)]
+        rng.shuffle(votes)
+        for i, timestamp in enumerate(votes):
+            consensus.submit_time(i, timestamp)
+        self.assertEqual(len(agreements), 1)
+        self.assertAlmostEqual(agreements[0].time, BASE_TIME, delta=0.005)
+
+    def test_boundary_copies_are_not_equivocation(self):
+        """Votes near the end of one second, then mid-way through the next."""
+        agreements = []
+        consensus = TimeConsensus(10, tolerance=0.05, on_agreement=agreements.append)
+        for second in (100.98, 101.98, 102.5):
+            for i in range(10):
+                consensus.submit_time(i, second + 0.001 * i)
+        self.assertEqual(consensus.equivocators, set())
+        # Decided once the quorum of 7 own votes for 102 is in
+        self.assertAlmostEqual(consensus.agreement(102).time, 102.503, places=6)
+        self.assertEqual(consensus.agreement(102).votes, 7)
+
+    def test_estimate_without_consistent_votes(self):
+        consensus = TimeConsensus(4, tolerance=0.05)
+        consensus.submit_time("a", 100.1)
+        consensus.submit_time("b", 100.9)
+        self.assertIsNone(consensus.estimate(100))
+        consensus.submit_time("c", 100.5)
+        self.assertEqual(consensus.estimate(100), (100.5, 100.5))
+
+    def test_keeps_only_recent_epochs(self):
+        consensus = TimeConsensus(4, max_epochs=2)
+        for second in range(3):
+            consensus.submit_time("a", BASE_TIME + second)
+        self.assertEqual(consensus.votes(consensus.epoch_of(BASE_TIME)), 0)
+        self.assertIsNone(consensus.submit_time("b", BASE_TIME))
+        self.assertEqual(consensus.votes(consensus.epoch_of(BASE_TIME)), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
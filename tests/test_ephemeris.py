@@ -0,0 +1,45 @@
+import unittest
+import numpy as np
+from src.gps_module.ephemeris import EphemerisEngine
+
+
+def ephemeris(i: int) -> dict:
+    return {
+        "semi_major_axis": 26559.0,
+        "eccentricity": 0.01,
+        "inclination": 55.0,
+        "right_ascension": 100.0 + i,
+        "argument_of_perigee": 200.0 + i,
+        "mean_anomaly": 300.0 + i
+    }
+
+
+class TestEphemerisEngine(unittest.TestCase):
+    def setUp(self):
+        self.engine = EphemerisEngine()
+
+    def test_radius_stays_within_apsides(self):
+        """Propagated radius stays between perigee and apogee."""
+        positions = self.engine.positions([ephemeris(i) for i in range(8)], np.arange(0, 43200, 60.0))
+        radius = np.linalg.norm(positions, axis=-1)
+        self.assertEqual(positions.shape, (720, 8, 3))
+        self.assertGreaterEqual(radius.min(), 26559e3 * 0.99 - 1)
+        self.assertLessEqual(radius.max(), 26559e3 * 1.01 + 1)
+
+    def test_batch_matches_single_satellite(self):
+        """Batched propagation agrees with one-satellite queries."""
+        batch = self.engine.positions([ephemeris(i) for i in range(4)], [10.0, 20.0])
+        for i in range(4):
+            single = self.engine.position(ephemeris(i), 20.0)
+            np.testing.assert_allclose(batch[1, i], single, rtol=1e-12)
+
+    def test_equatorial_circular_orbit(self):
+        """An equatorial circular orbit has constant radius and z = 0."""
+        eph = dict(ephemeris(0), eccentricity=0.0, inclination=0.0)
+        positions = self.engine.positions([eph], np.linspace(0, 3600, 7))
+        np.testing.assert_allclose(np.linalg.norm(positions, axis=-1), 26559e3)
+        np.testing.assert_allclose(positions[..., 2], 0.0, atol=1e-6)
+
+
+if __name__ == '__main__':
+    unittest.main()
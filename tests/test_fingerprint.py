@@ -0,0 +1,62 @@
+import unittest
+import hashlib
+import struct
+from src.gps_module.satellite_batch import SatelliteBatch
+from src.secure_enclave.fingerprint import (
+    FingerprintHasher, proof_fingerprint, satellite_fingerprint, satellite_fingerprints,
+)
+from src.secure_enclave.zk_prover import TimeProof
+from tests.test_satellite_batch import visible_satellites
+
+
+class TestFingerprint(unittest.TestCase):
+    def setUp(self):
+        self.satellites = visible_satellites()
+        self.batch = SatelliteBatch.from_satellites(self.satellites)
+
+    def test_matches_documented_encoding(self):
+        """SHA-256 over the header and fixed-width little-endian entries."""
+        packed = struct.pack("<4sBI", b"SATF", 1, len(self.satellites))
+        for sat in self.satellites:
+            a = sat.almanac_data
+            packed += struct.pack("<4di", a["clock_correction"], a["ionospheric_data"],
+                                  a["atmospheric_corrections"], a["doppler_shift"], a["satellite_health"])
+        self.assertEqual(satellite_fingerprint(self.batch), hashlib.sha256(packed).hexdigest())
+
+    def test_same_fingerprint_from_every_representation(self):
+        metadata = self.batch.to_metadata()
+        proof = TimeProof(0.0, "ab" * 32, b"raw", {"T_sat": "1", "timestamp": 1, "satellite_data": metadata})
+        expected = satellite_fingerprint(self.satellites)
+        self.assertEqual(satellite_fingerprint(self.batch), expected)
+        self.assertEqual(satellite_fingerprint(metadata), expected)
+        self.assertEqual(proof_fingerprint(proof), expected)
+        self.assertEqual(proof_fingerprint(TimeProof.from_buffer(proof.to_bytes())), expected)
+
+    def test_independent_of_number_formatting(self):
+        """Integer and float spellings of the same value hash alike."""
+        metadata = self.batch.to_metadata()
+        metadata[0]["almanac"]["ionospheric_data"] = 0.5
+        respelled = [dict(sat, almanac=dict(sat["almanac"])) for sat in metadata]
+        respelled[0]["almanac"]["satellite_health"] = 0.0
+        respelled[0]["almanac"]["clock_correction"] = 0
+        self.assertEqual(satellite_fingerprint(respelled), satellite_fingerprint(metadata))
+
+    def test_any_almanac_change_alters_the_fingerprint(self):
+        metadata = self.batch.to_metadata()
+        metadata[-1]["almanac"]["satellite_health"] = 1
+        self.assertNotEqual(satellite_fingerprint(metadata), satellite_fingerprint(self.batch))
+
+    def test_batch_mode_matches_single_epochs(self):
+        epochs = [self.batch, self.batch.select(slice(0, 4)), self.satellites[:5]]
+        self.assertEqual(satellite_fingerprints(epochs), [satellite_fingerprint(e) for e in epochs])
+        self.assertEqual(satellite_fingerprints([]), [])
+
+    def test_incremental_hasher_matches_one_shot(self):
+        hasher = FingerprintHasher(len(self.batch))
+        hasher.update_batch(self.batch.select(slice(0, 2)))
+        hasher.update_batch(self.batch.select(slice(2, None)))
+        self.assertEqual(hasher.hexdigest(), satellite_fingerprint(self.batch))
+
+
+if __name__ == "__main__":
+    unittest.main()
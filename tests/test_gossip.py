@@ -0,0 +1,84 @@
+import unittest
+import asyncio
+import random
+from src.network.gossip import GossipNode
+from src.network.protocol import PROOFS, decode_batch, encode_batch, encode_frame, read_frame
+from src.network.simulator import simulate, simulated_proof, simulation_validator
+from src.secure_enclave.zk_prover import TimeProof
+
+
+class TestFraming(unittest.IsolatedAsyncioTestCase):
+    async def test_batch_round_trips_through_a_stream(self):
+        payloads = [b"first", b"", b"x" * 1000]
+        reader = asyncio.StreamReader()
+        reader.feed_data(encode_frame(PROOFS, encode_batch(payloads)))
+        reader.feed_eof()
+        kind, body = await read_frame(reader)
+        self.assertEqual(kind, PROOFS)
+        self.assertEqual([bytes(p) for p in decode_batch(body)], payloads)
+
+    def test_truncated_batch_is_rejected(self):
+        with self.assertRaises(ValueError):
+            decode_batch(encode_batch([b"abcdef"])[:-2])
+
+
+class TestGossipNode(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.received = {}
+        self.nodes = []
+        for name in ("a", "b", "c"):
+            node = GossipNode("127.0.0.1", 0, validator=simulation_validator(), batch_interval=0.001,
+                              on_proof=lambda proof, peer, name=name:
+                              self.received.setdefault(name, []).append(proof.satellite_fingerprint))
+            await node.start()
+            self.nodes.append(node)
+        a, b, c = self.nodes
+        a.add_peer(b.node_id)
+        b.add_peer(c.node_id)
+        b.add_peer(a.node_id)
+
+    async def asyncTearDown(self):
+        for node in self.nodes:
+            await node.close()
+
+    async def wait_for(self, name, count):
+        for _ in range(200):
+            if len(self.received.get(name, [])) >= count:
+                return
+            await asyncio.sleep(0.01)
+
+    async def test_proof_reaches_every_node_once(self):
+        a, b, c = self.nodes
+        proof = simulated_proof(random.Random(1))
+        self.assertTrue(a.publish(proof))
+        self.assertFalse(a.publish(proof))
+        await self.wait_for("c", 1)
+        await asyncio.sleep(0.05)
+        self.assertEqual(self.received["b"], [proof.satellite_fingerprint])
+        self.assertEqual(self.received["c"], [proof.satellite_fingerprint])
+        # b does not echo the proof back to the peer it came from
+        self.assertNotIn("a", self.received)
+        self.assertEqual(b.links[a.node_id].frames_sent, 0)
+
+    async def test_forged_copy_does_not_shadow_the_genuine_proof(self):
+        a, b, c = self.nodes
+        proof = simulated_proof(random.Random(2))
+        forged = TimeProof(proof.timestamp, proof.satellite_fingerprint, proof.zk_proof,
+                           simulated_proof(random.Random(3)).metadata)
+        a.links[b.node_id].send(forged.to_bytes())
+        a.publish(proof)
+        await self.wait_for("c", 1)
+        self.assertEqual(self.received["b"], [proof.satellite_fingerprint])
+        self.assertEqual(b.stats["rejected"], 1)
+        self.assertEqual(b.stats["accepted"], 1)
+
+
+class TestSimulator(unittest.IsolatedAsyncioTestCase):
+    async def test_small_network_delivers_everything(self):
+        result = await simulate(nodes=12, degree=2, proofs=3, interval=0.0, batch_interval=0.001)
+        self.assertEqual(result["delivered"], 1.0)
+        self.assertGreater(result["bytes_per_proof_per_node"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+import unittest
+import io
+import time
+from src.gps_module.gps_receiver import GPSReceiver
+from src.gps_module.nmea_stream import GSVAssembler, GSVSatellite, NMEAStreamReader, SatelliteEpoch
+
+
+def sentence(body: str) -> str:
+    checksum = 0
+    for char in body:
+        checksum ^= ord(char)
+    return f"${body}*{checksum:02X}\r\n"
+
+
+EPOCH = [
+    sentence("GNGGA,123519,4807.038,N,01131.000,E,1,08,0.9,545.4,M,46.9,M,,"),
+    sentence("GPGSV,2,1,07,01,40,083,46,02,17,308,41,12,07,344,39,14,22,228,45"),
+    sentence("GPGSV,2,2,07,15,10,100,30,16,11,110,31,17,12,120,32"),
+    sentence("GAGSV,1,1,02,05,40,083,46,09,17,308,41"),
+    sentence("GNRMC,123519,A,4807.038,N,01131.000,E,022.4,084.4,230394,003.1,W"),
+]
+
+
+class TestGSVAssembler(unittest.TestCase):
+    def test_assembles_all_satellites_across_talkers(self):
+        """Every satellite of every sentence and talker lands in one epoch."""
+        assembler = GSVAssembler(clock=lambda: 42)
+        epochs = [e for e in map(assembler.feed, EPOCH) if e is not None]
+        self.assertEqual(len(epochs), 1)
+        self.assertEqual(
+            [sat.prn_code for sat in epochs[0].satellites],
+            ["G01", "G02", "G12", "G14", "G15", "G16", "G17", "E05", "E09"]
+        )
+        self.assertEqual(epochs[0].timestamp, 42)
+
+    def test_incomplete_cycle_is_dropped(self):
+        """A cycle with a missing sentence contributes no satellites."""
+        assembler = GSVAssembler()
+        lines = [EPOCH[1], EPOCH[3], EPOCH[4]]
+        epochs = [e for e in map(assembler.feed, lines) if e is not None]
+        self.assertEqual([sat.prn_code for sat in epochs[0].satellites], ["E05", "E09"])
+
+    def test_bad_checksum_is_ignored(self):
+        """Corrupted sentences are skipped."""
+        assembler = GSVAssembler()
+        corrupted = EPOCH[3].replace("*", "0*")
+        self.assertIsNone(assembler.feed(corrupted))
+        self.assertIsNone(assembler.feed(EPOCH[4]))
+
+
+class TestNMEAStreamReader(unittest.TestCase):
+    def test_background_reader_fills_ring_buffer(self):
+        """The reader thread publishes epochs and keeps only the newest."""
+        source = io.BytesIO("".join(EPOCH * 5).encode())
+        reader = NMEAStreamReader(source, capacity=3, stop_on_eof=True)
+        reader.start()
+        epochs = list(reader.stream(timeout=5))
+        reader.stop()
+
+        sequences = [e.sequence for e in epochs]
+        self.assertEqual(sequences, sorted(set(sequences)))
+        self.assertEqual(sequences[-1], 5)
+        self.assertEqual([e.sequence for e in reader.buffer], [3, 4, 5])
+        self.assertEqual(reader.dropped, 2)
+        self.assertEqual(reader.latest_epoch().sequence, 5)
+
+    def test_reader_survives_read_errors(self):
+        """A failing read is retried after a backoff instead of ending ingestion."""
+        lines = iter("".join(EPOCH * 2).encode().splitlines(keepends=True))
+
+        class FlakyPort:
+            failures = 0
+
+            def readline(self):
+                if FlakyPort.failures < 2:
+                    FlakyPort.failures += 1
+                    raise OSError("device reports readiness to read but returned no data")
+                return next(lines, b"")
+
+        reader = NMEAStreamReader(FlakyPort(), stop_on_eof=True)
+        reader.retry_delay = 0.01
+        reader.start()
+        epochs = list(reader.stream(timeout=5))
+        reader.stop()
+        self.assertEqual(FlakyPort.failures, 2)
+        self.assertEqual([e.sequence for e in epochs], [1, 2])
+
+    def test_receiver_returns_the_newest_buffered_epoch(self):
+        """With the reader running, proofs are built from the latest epoch."""
+
+        class IdlePort:
+            def readline(self):
+                time.sleep(0.01)  # A serial read timing out
+                return b""
+
+        receiver = GPSReceiver()
+        receiver.connection = IdlePort()
+        receiver.reader = NMEAStreamReader(receiver.connection)
+        receiver.reader.start()
+        try:
+            satellites = [GSVSatellite("GP", f"{prn:02d}", 40.0, 83.0, 46.0) for prn in range(1, 5)]
+            for sequence in range(1, 4):
+                receiver.reader.publish(SatelliteEpoch(sequence, sequence * 1_000_000_000, satellites))
+            newest = receiver.get_satellite_data()
+        finally:
+            receiver.stop()
+        self.assertEqual([sat.atomic_timestamp for sat in newest], [3.0] * 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import unittest
+import os
+import sys
+import tempfile
+import textwrap
+import time
+from src.secure_enclave.node_worker import NodeWorker
+from src.validation.verifier_service import Groth16VerifierService
+
+# Speaks the helper protocol; run with the Python interpreter in place of Node
+FAKE_HELPER = textwrap.dedent("""
+    import json, os, sys, time
+    for line in sys.stdin:
+        msg = json.loads(line)
+        op = msg["op"]
+        if op == "crash":
+            os._exit(3)
+        if op == "hang":
+            time.sleep(60)
+        if op == "fail":
+            reply = {"ok": False, "error": "bad input"}
+        elif op == "verify":
+            reply = {"ok": True, "result": msg["proof"]["valid"]}
+        elif op == "verify_many":
+            reply = {"ok": True, "result": [item["proof"]["valid"] for item in msg["items"]]}
+        else:
+            reply = {"ok": True, "result": {"pid": os.getpid(), "args": sys.argv[1:], "echo": msg.get("value")}}
+        sys.stdout.write(json.dumps(dict(reply, id=msg["id"], cpu=0.0)) + "\\n")
+        sys.stdout.flush()
+""")
+
+
+class TestNodeWorker(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.script = os.path.join(self.tmp.name, "fake_helper.py")
+        with open(self.script, "w") as f:
+            f.write(FAKE_HELPER)
+        self.worker = NodeWorker(self.script, ["key"], node=sys.executable)
+
+    def tearDown(self):
+        self.worker.close()
+        self.tmp.cleanup()
+
+    def test_request_and_response(self):
+        first = self.worker.request("echo", value=[1, 2])
+        second = self.worker.request("echo", value="again")
+        self.assertEqual(first["result"]["echo"], [1, 2])
+        self.assertEqual(first["result"]["args"], ["key"])
+        self.assertEqual(second["result"]["echo"], "again")
+        self.assertEqual(second["id"], first["id"] + 1)
+        self.assertEqual(second["result"]["pid"], first["result"]["pid"])
+
+    def test_error_reply_keeps_the_worker(self):
+        pid = self.worker.request("echo")["result"]["pid"]
+        with self.assertRaisesRegex(RuntimeError, "fail: bad input"):
+            self.worker.request("fail")
+        self.assertEqual(self.worker.request("echo")["result"]["pid"], pid)
+
+    def test_crashed_worker_is_restarted(self):
+        pid = self.worker.request("echo")["result"]["pid"]
+        with self.assertRaisesRegex(RuntimeError, "exited unexpectedly"):
+            self.worker.request("crash")
+        self.assertIsNone(self.worker.process)
+        self.assertNotEqual(self.worker.request("echo")["result"]["pid"], pid)
+
+    def test_hung_worker_is_killed_and_restarted(self):
+        self.worker.timeout = 0.5
+        pid = self.worker.request("echo")["result"]["pid"]
+        process = self.worker.process
+        started = time.monotonic()
+        with self.assertRaisesRegex(RuntimeError, "did not answer"):
+            self.worker.request("hang")
+        self.assertLess(time.monotonic() - started, 5)
+        self.assertIsNotNone(process.poll())
+        self.assertNotEqual(self.worker.request("echo")["result"]["pid"], pid)
+
+
+class TestVerifierService(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        script = os.path.join(self.tmp.name, "fake_verifier.py")
+        with open(script, "w") as f:
+            f.write(FAKE_HELPER)
+        # An unreadable key leaves the signal-count check to the helper
+        self.verifier = Groth16VerifierService(os.path.join(self.tmp.name, "missing.json"),
+                                               os.path.join(self.tmp.name, "keys"))
+        self.verifier.script = script
+        self.verifier.node = sys.executable
+
+    def tearDown(self):
+        self.verifier.close()
+        self.tmp.cleanup()
+
+    def test_verify_decodes_proofs(self):
+        self.assertTrue(self.verifier.verify(b'{"valid": true}', ["1"]))
+        self.assertFalse(self.verifier.verify('{"valid": false}', ["1"]))
+        self.assertEqual(
+            self.verifier.verify_many([({"valid": True}, ["1"]), ({"valid": False}, ["1"])]),
+            [True, False],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
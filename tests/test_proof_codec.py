@@ -0,0 +1,76 @@
+import unittest
+import json
+from src.secure_enclave.zk_prover import TimeProof
+
+GROTH16_PROOF = json.dumps({
+    "pi_a": ["123", "456", "1"],
+    "pi_b": [["1", "2"], ["3", "4"], ["1", "0"]],
+    "pi_c": ["7", "8", "1"],
+    "protocol": "groth16",
+    "curve": "bn128"
+}).encode()
+
+
+def make_proof(zk_proof: bytes = GROTH16_PROOF, **extra) -> TimeProof:
+    metadata = {
+        "T_sat": "1677649200000000000",
+        "timestamp": 1677649200123456789,
+        "satellite_data": [
+            {
+                "prn": f"PRN{i}",
+                "position": [1000.0 * i, 2000.0 * i, 3000.0 * i],
+                "atomic_timestamp": 1677649200.0 + i,
+                "transmission_time": 1677649200.0 + i - 0.067,
+                "almanac": {
+                    "clock_correction": 0.000001 * i,
+                    "ionospheric_data": 0.5 + i * 0.1,
+                    "atmospheric_corrections": 0.2 + i * 0.05,
+                    "satellite_health": 0,
+                    "doppler_shift": 1000.0 + i * 10
+                }
+            }
+            for i in range(4)
+        ]
+    }
+    metadata.update(extra)
+    return TimeProof(
+        timestamp=1677649200.5,
+        satellite_fingerprint="ab" * 32,
+        zk_proof=zk_proof,
+        metadata=metadata
+    )
+
+
+class TestProofCodec(unittest.TestCase):
+    def test_round_trip(self):
+        """Every TimeProof field survives encoding and lazy decoding."""
+        proof = make_proof()
+        view = TimeProof.from_buffer(proof.to_bytes())
+        self.assertEqual(view.timestamp, proof.timestamp)
+        self.assertEqual(view.satellite_fingerprint, proof.satellite_fingerprint)
+        self.assertEqual(json.loads(view.zk_proof), json.loads(proof.zk_proof))
+        self.assertEqual(view.metadata, proof.metadata)
+
+    def test_records_decode_without_metadata(self):
+        """Individual satellite records are readable straight from the buffer."""
+        view = TimeProof.from_buffer(memoryview(make_proof().to_bytes()))
+        record = view.satellite_record(2)
+        self.assertEqual(record[0].rstrip(b"\0"), b"PRN2")
+        self.assertEqual(record[9], 1020.0)
+
+    def test_non_groth16_proof_and_extra_metadata(self):
+        """Unrecognised proofs and metadata keys are carried verbatim."""
+        proof = make_proof(zk_proof=b"not json", epoch=7)
+        view = TimeProof.from_buffer(proof.to_bytes())
+        self.assertEqual(view.zk_proof, b"not json")
+        self.assertEqual(view.metadata["epoch"], 7)
+
+    def test_rejects_truncated_buffer(self):
+        """A cut-off buffer is rejected up front."""
+        data = make_proof().to_bytes()
+        with self.assertRaises(ValueError):
+            TimeProof.from_buffer(data[:-10])
+
+
+if __name__ == '__main__':
+    unittest.main()
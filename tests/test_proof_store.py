@@ -0,0 +1,96 @@
+import unittest
+import os
+import random
+import tempfile
+from src.consensus.engine import Agreement
+from src.data_availability.proof_store import ProofStore
+from src.network.simulator import simulated_proof
+from src.secure_enclave.zk_prover import TimeProof
+
+BASE_TIME = 1677649200.0
+
+
+def proof_at(rng: random.Random, timestamp: float) -> TimeProof:
+    proof = simulated_proof(rng, satellites=4)
+    return TimeProof(timestamp, proof.satellite_fingerprint, proof.zk_proof, proof.metadata)
+
+
+class TestProofStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.directory = self.tmp.name
+        self.rng = random.Random(1)
+        # Slightly out of order, as gossip delivers them
+        self.proofs = [proof_at(self.rng, BASE_TIME + i * 0.1 + self.rng.uniform(-0.5, 0.5))
+                       for i in range(500)]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def fill(self, store):
+        for proof in self.proofs:
+            store.append_proof(proof)
+
+    def test_range_scan_matches_a_full_filter(self):
+        store = ProofStore(self.directory, segment_age=10.0, index_every=8)
+        self.fill(store)
+        self.assertGreater(len(store.segments), 2)
+        start, end = BASE_TIME + 12.3, BASE_TIME + 31.7
+        expected = [p.satellite_fingerprint for p in self.proofs if start <= p.timestamp <= end]
+        self.assertEqual([p.satellite_fingerprint for p in store.proofs(start, end)], expected)
+        store.close()
+
+    def test_point_lookup_in_sealed_and_active_segments(self):
+        store = ProofStore(self.directory, segment_age=10.0)
+        self.fill(store)
+        for proof in (self.proofs[0], self.proofs[250], self.proofs[-1]):
+            found = store.get(proof.satellite_fingerprint)
+            self.assertEqual(found.to_bytes(), proof.to_bytes())
+        self.assertIsNone(store.get("ab" * 32))
+        store.close()
+
+    def test_reopen_uses_sealed_indexes_and_drops_torn_tail(self):
+        store = ProofStore(self.directory, segment_age=10.0)
+        self.fill(store)
+        store.close()
+        active = store.segments[-1].path
+        with open(active, "ab") as f:
+            f.write(b"\x40\x00\x00\x00\x01partial")
+
+        reopened = ProofStore(self.directory, segment_age=10.0)
+        self.assertEqual(len(reopened), len(self.proofs))
+        self.assertIsNotNone(reopened.get(self.proofs[-1].satellite_fingerprint))
+        reopened.append_proof(proof_at(self.rng, BASE_TIME + 50.0))
+        self.assertEqual(len(list(reopened.proofs(BASE_TIME + 49.9, BASE_TIME + 50.1))), 1)
+        reopened.close()
+
+    def test_agreements_are_stored_alongside_proofs(self):
+        store = ProofStore(self.directory)
+        store.append_proof(self.proofs[0])
+        agreement = Agreement(int(BASE_TIME), BASE_TIME + 0.001, BASE_TIME, 300, 267)
+        store.append_agreement(agreement)
+        self.assertEqual(list(store.agreements(BASE_TIME - 1, BASE_TIME + 1)), [agreement])
+        store.close()
+
+    def test_compact_drops_expired_segments(self):
+        store = ProofStore(self.directory, segment_age=10.0)
+        self.fill(store)
+        before = len(store.segments)
+        removed = store.compact(BASE_TIME + 25.0)
+        self.assertGreater(removed, 0)
+        self.assertEqual(len(store.segments), before - removed)
+        self.assertIsNone(store.get(self.proofs[0].satellite_fingerprint))
+        self.assertEqual(len([n for n in os.listdir(self.directory) if n.endswith(".seg")]),
+                         len(store.segments))
+        store.close()
+
+    def test_rejects_records_far_older_than_the_newest(self):
+        store = ProofStore(self.directory, max_skew=2.0)
+        store.append_proof(proof_at(self.rng, BASE_TIME + 10))
+        with self.assertRaises(ValueError):
+            store.append_proof(proof_at(self.rng, BASE_TIME))
+        store.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
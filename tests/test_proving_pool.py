@@ -0,0 +1,122 @@
+import unittest
+from unittest import mock
+import json
+import os
+import queue
+import stat
+import sys
+import tempfile
+import textwrap
+import threading
+from src.secure_enclave.proving_pool import ProvingPool
+from src.secure_enclave.witness_backends import NativeWitnessBackend
+from src.secure_enclave.zk_prover import ZKTimeProver
+from tests.test_batch_proofs import RecordingBackend, current_epochs
+
+# Stands in for a circom witness generator: <binary> <input.json> <witness.wtns>
+FAKE_GENERATOR = textwrap.dedent("""
+    import json, os, sys, time
+    with open(sys.argv[1]) as f:
+        inputs = json.load(f)
+    time.sleep(0.05)
+    with open(sys.argv[2], "w") as f:
+        json.dump({"inputs": inputs, "workspace": os.path.dirname(sys.argv[1])}, f)
+""")
+
+
+class TestProvingPool(unittest.TestCase):
+    def setUp(self):
+        self.pool = ProvingPool(max_workers=1, max_pending=2)
+        self.release = threading.Event()
+
+    def tearDown(self):
+        self.release.set()
+        self.pool.shutdown()
+
+    def test_submit_applies_backpressure(self):
+        running = [self.pool.submit(self.release.wait) for _ in range(2)]
+        with self.assertRaises(queue.Full):
+            self.pool.submit(self.release.wait, block=False)
+        with self.assertRaises(queue.Full):
+            self.pool.submit(self.release.wait, timeout=0.05)
+
+        # A blocked submit goes through once a running job finishes
+        blocked = []
+        submitter = threading.Thread(target=lambda: blocked.append(self.pool.submit(lambda: "queued")))
+        submitter.start()
+        submitter.join(0.1)
+        self.assertTrue(submitter.is_alive())
+        self.release.set()
+        submitter.join(5)
+        self.assertEqual(blocked[0].result(5), "queued")
+        self.assertEqual([future.result(5) for future in running], [True, True])
+
+    def test_failed_job_frees_its_slot(self):
+        def fail():
+            raise ValueError("bad epoch")
+
+        for _ in range(3):
+            with self.assertRaises(ValueError):
+                self.pool.submit(fail).result(5)
+        self.assertEqual(self.pool.submit(lambda: 1, block=False).result(5), 1)
+
+
+class TestProvingWorkspaces(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.scratch = os.path.join(self.tmp.name, "scratch")
+        os.makedirs(self.scratch)
+        generator = os.path.join(self.tmp.name, "Circuit")
+        with open(generator, "w") as f:
+            f.write(f"#!{sys.executable}\n{FAKE_GENERATOR}")
+        os.chmod(generator, os.stat(generator).st_mode | stat.S_IXUSR)
+        self.backend = NativeWitnessBackend(os.path.join(self.tmp.name, "Circuit_cpp"), "circuit.wasm", "circuit.zkey")
+        self.backend.binary_path = generator
+
+    def tearDown(self):
+        self.backend.close()
+        self.tmp.cleanup()
+
+    def test_concurrent_jobs_use_their_own_workspace(self):
+        pool = ProvingPool(max_workers=4)
+        with mock.patch.object(tempfile, "tempdir", self.scratch):
+            futures = [pool.submit(self.backend.calculate_witness, {"T_sat": str(i)}) for i in range(8)]
+            witnesses = [json.loads(future.result(10)) for future in futures]
+        pool.shutdown()
+
+        self.assertEqual([w["inputs"]["T_sat"] for w in witnesses], [str(i) for i in range(8)])
+        self.assertEqual(len({w["workspace"] for w in witnesses}), 8)
+        self.assertTrue(all(os.path.dirname(w["workspace"]) == self.scratch for w in witnesses))
+        self.assertEqual(os.listdir(self.scratch), [])
+
+
+class TestSubmitTimeProof(unittest.TestCase):
+    def test_metadata_publishes_the_proven_inputs(self):
+        prover = ZKTimeProver(max_workers=2)
+        backend = prover._backend = RecordingBackend()
+        try:
+            with mock.patch.object(prover, "_prepare_circuit_inputs",
+                                   wraps=prover._prepare_circuit_inputs) as prepare:
+                futures = [prover.submit_time_proof(epoch) for epoch in current_epochs(4)]
+                proofs = [future.result(10) for future in futures]
+        finally:
+            prover.shutdown()
+        self.assertEqual(prepare.call_count, 4)
+        self.assertEqual(sorted(p.metadata["T_sat"] for p in proofs),
+                         sorted(i["T_sat"] for i in backend.inputs))
+
+    def test_each_thread_solves_with_its_own_solver(self):
+        prover = ZKTimeProver(max_workers=2)
+        solvers = []
+        threads = [threading.Thread(target=lambda: solvers.append(prover.clock_solver)) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+        self.assertIsNot(solvers[0], solvers[1])
+        self.assertIs(prover.clock_solver, prover.clock_solver)
+        self.assertNotIn(prover.clock_solver, solvers)
+
+
+if __name__ == "__main__":
+    unittest.main()
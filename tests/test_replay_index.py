@@ -0,0 +1,41 @@
+import unittest
+import hashlib
+from src.validation.replay_index import SeenFingerprintIndex
+
+
+def fingerprint(i: int) -> str:
+    return hashlib.sha256(str(i).encode()).hexdigest()
+
+
+class TestSeenFingerprintIndex(unittest.TestCase):
+    def test_duplicate_add_is_rejected(self):
+        """Adding the same fingerprint twice reports the duplicate."""
+        index = SeenFingerprintIndex(window=2.0, bucket_width=0.5)
+        self.assertTrue(index.add(fingerprint(1), now=100.0))
+        self.assertFalse(index.add(fingerprint(1), now=100.2))
+        self.assertTrue(index.contains(fingerprint(1), now=100.2))
+        self.assertFalse(index.contains(fingerprint(2), now=100.2))
+
+    def test_fingerprints_expire_with_their_bucket(self):
+        """Fingerprints older than the window are forgotten."""
+        index = SeenFingerprintIndex(window=2.0, bucket_width=0.5)
+        index.add(fingerprint(1), now=100.0)
+        self.assertTrue(index.contains(fingerprint(1), now=101.9))
+        self.assertFalse(index.contains(fingerprint(1), now=103.0))
+
+        index.expire(now=103.0)
+        self.assertEqual(len(index), 0)
+        self.assertTrue(index.add(fingerprint(1), now=103.0))
+
+    def test_memory_is_capped(self):
+        """The oldest fingerprints are evicted once max_entries is reached."""
+        index = SeenFingerprintIndex(window=60.0, bucket_width=1.0, max_entries=100)
+        for i in range(250):
+            index.add(fingerprint(i), now=100.0 + i / 10)
+        self.assertEqual(len(index), 100)
+        self.assertFalse(index.contains(fingerprint(0), now=125.0))
+        self.assertTrue(index.contains(fingerprint(249), now=125.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
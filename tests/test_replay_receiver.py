@@ -0,0 +1,95 @@
+import unittest
+import os
+import tempfile
+import time
+from src.gps_module.replay_receiver import Playback, ReplayReceiver
+from tests.test_nmea_stream import EPOCH
+from tests.test_ubx_parser import ubx_capture
+
+START_NS = 1_700_000_000_000_000_000
+
+
+class TestReplayReceiver(unittest.TestCase):
+    def write_log(self, data: bytes) -> str:
+        fd, path = tempfile.mkstemp()
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def nmea_log(self, epochs: int) -> str:
+        return self.write_log("".join(EPOCH * epochs).encode())
+
+    def test_replays_every_epoch_with_deterministic_timestamps(self):
+        """Two replays of the same log produce identical satellite data."""
+        runs = []
+        for _ in range(2):
+            receiver = ReplayReceiver(self.nmea_log(5), start_ns=START_NS)
+            runs.append(list(receiver.stream()))
+            receiver.close()
+        self.assertEqual(len(runs[0]), 5)
+        self.assertEqual([[s.atomic_timestamp for s in e] for e in runs[0]],
+                         [[s.atomic_timestamp for s in e] for e in runs[1]])
+        self.assertEqual([e[0].atomic_timestamp for e in runs[0]],
+                         [START_NS / 1e9 + k for k in range(5)])
+
+    def test_get_satellite_data_advances_through_the_log(self):
+        receiver = ReplayReceiver(self.nmea_log(2), start_ns=START_NS)
+        self.assertTrue(receiver.connect())
+        self.assertEqual(receiver.protocol, "nmea")
+        first = receiver.get_satellite_data()
+        second = receiver.get_satellite_data()
+        self.assertEqual(second[0].atomic_timestamp - first[0].atomic_timestamp, 1.0)
+        with self.assertRaises(ConnectionError):
+            receiver.get_satellite_data()
+        receiver.close()
+
+    def test_background_replay_stops_at_end_of_log(self):
+        receiver = ReplayReceiver(self.nmea_log(3), start_ns=START_NS)
+        self.assertTrue(receiver.start())
+        epochs = list(receiver.stream(timeout=5))
+        self.assertEqual(len(epochs), 3)
+        self.assertFalse(receiver.reader.running)
+        receiver.close()
+
+    def test_ubx_log_is_detected_and_rebased(self):
+        """Recorded GNSS times are shifted onto the playback clock."""
+        capture = ubx_capture(302460.0, 1e-4)
+        receiver = ReplayReceiver(self.write_log(capture), start_ns=START_NS)
+        epochs = list(receiver.stream())
+        self.assertEqual(receiver.protocol, "ubx")
+        self.assertEqual(len(epochs), 1)
+        self.assertAlmostEqual(epochs[0][0].atomic_timestamp, START_NS / 1e9, places=3)
+        receiver.close()
+
+    def test_close_unmaps_the_log_during_a_stream(self):
+        """Closing mid-stream releases the parser's views and ends the stream."""
+        capture = ubx_capture(302460.0, 1e-4)
+        receiver = ReplayReceiver(self.write_log(capture * 2), start_ns=START_NS)
+        epochs = receiver.stream()
+        next(epochs)
+        mapping = receiver.connection
+        receiver.close()
+        self.assertTrue(mapping.closed)
+        self.assertEqual(list(epochs), [])
+
+
+class TestPlayback(unittest.TestCase):
+    def test_speed_paces_epochs(self):
+        """At 20x an epoch every second of log time takes 50 ms."""
+        playback = Playback(speed=20.0, start_ns=0)
+        start = time.perf_counter()
+        stamps = [playback() for _ in range(4)]
+        self.assertGreaterEqual(time.perf_counter() - start, 0.14)
+        self.assertEqual(stamps, [0, 1_000_000_000, 2_000_000_000, 3_000_000_000])
+
+    def test_unpaced_playback_does_not_sleep(self):
+        playback = Playback(start_ns=0, interval=3600.0)
+        start = time.perf_counter()
+        for _ in range(100):
+            playback()
+        self.assertLess(time.perf_counter() - start, 0.1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import unittest
+import numpy as np
+from src.gps_module.clock_solver import SPEED_OF_LIGHT
+from src.gps_module.gps_receiver import SatelliteData
+from src.gps_module.satellite_batch import SatelliteBatch
+from src.secure_enclave.processor import SecureEnclaveProcessor
+from src.secure_enclave.proof_codec import SATELLITE_RECORD
+from src.secure_enclave.zk_prover import TimeProof, ZKTimeProver
+from src.validation.time_validator import TimeValidator
+from tests.test_clock_solver import RECEIVER, constellation
+
+BASE_TIME = 1677649200.0
+BIAS = 1e-4
+
+
+def visible_satellites(health=None):
+    """SatelliteData with consistent pseudoranges for RECEIVER."""
+    positions, visible = constellation(np.array([0.0]))
+    positions = positions[0][visible[0]]
+    travel = np.linalg.norm(positions - RECEIVER, axis=1) / SPEED_OF_LIGHT
+    return [
+        SatelliteData(
+            prn_code=f"G{i:02d}",
+            position=tuple(position),
+            atomic_timestamp=BASE_TIME + BIAS,
+            transmission_time=BASE_TIME - float(travel[i]),
+            ephemeris_data={"semi_major_axis": 26559.7, "eccentricity": 0.01},
+            almanac_data={
+                "clock_correction": 1e-6 * i,
+                "ionospheric_data": 0.5,
+                "atmospheric_corrections": 0.2,
+                "satellite_health": (health or {}).get(i, 0),
+                "doppler_shift": 1000.0 + i,
+            },
+            travel_time=BIAS + float(travel[i]),
+        )
+        for i, position in enumerate(positions)
+    ]
+
+
+class TestSatelliteBatch(unittest.TestCase):
+    def setUp(self):
+        self.satellites = visible_satellites()
+        self.batch = SatelliteBatch.from_satellites(self.satellites)
+
+    def test_round_trips_satellite_data(self):
+        restored = self.batch.to_satellites()
+        self.assertEqual([s.prn_code for s in restored], [s.prn_code for s in self.satellites])
+        self.assertEqual([s.almanac_data for s in restored], [s.almanac_data for s in self.satellites])
+        self.assertEqual(restored[0].position, self.satellites[0].position)
+        self.assertEqual(restored[0].ephemeris_data["semi_major_axis"], 26559.7)
+
+    def test_round_trips_metadata(self):
+        metadata = self.batch.to_metadata()
+        again = SatelliteBatch.from_metadata(metadata).to_metadata()
+        self.assertEqual(again, metadata)
+
+    def test_record_layout_matches_wire_format(self):
+        self.assertEqual(self.batch.to_records().dtype.itemsize, SATELLITE_RECORD.size)
+
+    def test_binary_proof_maps_records_without_copying(self):
+        proof = TimeProof(BASE_TIME, "ab" * 32, b"raw",
+                          {"T_sat": "1", "timestamp": 1, "satellite_data": self.batch.to_metadata()})
+        buffer = proof.to_bytes()
+        view = TimeProof.from_buffer(buffer)
+        batch = view.satellite_batch()
+        np.testing.assert_array_equal(batch.almanac, self.batch.almanac)
+        self.assertTrue(np.shares_memory(batch.positions, np.frombuffer(buffer, dtype=np.uint8)))
+
+
+class TestBatchConsumers(unittest.TestCase):
+    def test_prover_and_validator_agree_on_batch_fingerprint(self):
+        """Fingerprints of a batch and its list form match, and verify from the wire."""
+        satellites = visible_satellites()
+        batch = SatelliteBatch.from_satellites(satellites)
+        prover = ZKTimeProver()
+        fingerprint = prover._generate_satellite_fingerprint(batch)
+        self.assertEqual(fingerprint, prover._generate_satellite_fingerprint(
+            SatelliteBatch.coerce(satellites)))
+
+        metadata = prover._collect_verification_metadata(batch, prover._prepare_circuit_inputs(batch))
+        proof = TimeProof(BASE_TIME, fingerprint, b"raw", metadata)
+        validator = TimeValidator()
+        self.assertTrue(validator._verify_satellite_fingerprint(proof))
+        self.assertTrue(validator._verify_satellite_fingerprint(TimeProof.from_buffer(proof.to_bytes())))
+
+    def test_enclave_drops_unhealthy_satellites_and_solves_time(self):
+        satellites = visible_satellites(health={0: 1})
+        result = SecureEnclaveProcessor().process_gps_data(SatelliteBatch.from_satellites(satellites))
+        self.assertEqual(result["satellite_count"], len(satellites) - 1)
+        self.assertAlmostEqual(result["timestamp"], BASE_TIME, delta=1e-6)
+        self.assertEqual(len(result["proof"]), 64)
+
+    def test_enclave_rejects_too_few_usable_satellites(self):
+        satellites = visible_satellites(health={i: 1 for i in range(20)})
+        with self.assertRaises(ValueError):
+            SecureEnclaveProcessor().process_gps_data(satellites)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+import unittest
+import os
+import subprocess
+import tempfile
+import time
+import urllib.request
+from src.gps_module.gps_receiver import GPSReceiver
+from src.gps_module.nmea_stream import GSVSatellite, SatelliteEpoch
+from src.secure_enclave.witness_backends import NativeWitnessBackend
+from src.secure_enclave.zk_prover import TimeProof, ZKTimeProver
+from src.telemetry.metrics import REGISTRY, Registry
+from src.telemetry.tracing import CURRENT_TRACE, TRACER
+from src.validation.stages import STAGE_RESULTS, STAGE_SECONDS
+from src.validation.time_validator import TimeValidator
+from tests.test_batch_proofs import RecordingBackend, current_epochs
+from tests.test_verification_pipeline import CountingVerifier
+
+
+class TestRegistry(unittest.TestCase):
+    def setUp(self):
+        self.registry = Registry(enabled=True)
+        self.checks = self.registry.counter("checks_total", "Checks", ("stage", "result"))
+        self.latency = self.registry.histogram("latency_seconds", "Latency", ("stage",), buckets=(0.1, 1.0))
+
+    def test_renders_prometheus_text(self):
+        self.checks.inc("replay", "rejected")
+        self.checks.inc("replay", "rejected")
+        self.latency.observe(0.05, "zk")
+        self.latency.observe(0.5, "zk", count=2)
+        text = self.registry.render()
+        self.assertIn("# TYPE checks_total counter", text)
+        self.assertIn('checks_total{stage="replay",result="rejected"} 2', text)
+        self.assertIn('latency_seconds_bucket{stage="zk",le="0.1"} 1', text)
+        self.assertIn('latency_seconds_bucket{stage="zk",le="1"} 3', text)
+        self.assertIn('latency_seconds_bucket{stage="zk",le="+Inf"} 3', text)
+        self.assertIn('latency_seconds_count{stage="zk"} 3', text)
+        self.assertAlmostEqual(self.latency.sum("zk"), 1.05)
+
+    def test_disabled_registry_records_nothing(self):
+        self.registry.enable(False)
+        self.checks.inc("replay", "passed")
+        with self.latency.time("zk"):
+            pass
+        self.assertEqual(self.checks.value("replay", "passed"), 0)
+        self.assertEqual(self.latency.count("zk"), 0)
+
+    def test_exports_to_file_and_http(self):
+        self.checks.inc("zk", "passed")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "node.prom")
+            self.registry.write_textfile(path)
+            with open(path) as f:
+                self.assertEqual(f.read(), self.registry.render())
+
+        server = self.registry.serve(0, "127.0.0.1")
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+            with urllib.request.urlopen(url, timeout=5) as response:
+                self.assertIn('checks_total{stage="zk",result="passed"} 1', response.read().decode())
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        self.prover = ZKTimeProver()
+        self.prover._backend = RecordingBackend()
+        self.validator = TimeValidator(verifier=CountingVerifier())
+
+    def tearDown(self):
+        REGISTRY.enable(False)
+        REGISTRY.reset()
+        TRACER.enable(enabled=False)
+        TRACER.finished.clear()
+        CURRENT_TRACE.set(None)
+
+    def ingest_epoch(self):
+        satellites = [GSVSatellite("GP", f"{prn:02d}", 40.0, 83.0, 46.0) for prn in range(1, 5)]
+        GPSReceiver()._process_epoch(SatelliteEpoch(1, time.time_ns() - 1_000_000, satellites))
+
+    def test_trace_follows_an_epoch_from_ingest_to_acceptance(self):
+        REGISTRY.enable()
+        with tempfile.TemporaryDirectory() as tmp:
+            TRACER.enable(os.path.join(tmp, "traces.jsonl"))
+            self.ingest_epoch()
+            proof = self.prover.generate_time_proof(current_epochs(1)[0])
+            # The trace id travels with the proof over the wire
+            received = TimeProof.from_buffer(proof.to_bytes())
+            self.assertEqual(received.metadata["trace"], proof.metadata["trace"])
+            self.assertTrue(self.validator.verify_time_proof(received))
+
+            trace = TRACER.finished[-1]
+            self.assertEqual(trace.trace_id, proof.metadata["trace"])
+            self.assertEqual(trace.outcome, "accepted")
+            self.assertEqual([span[0] for span in trace.spans],
+                             ["ingest", "fingerprint", "circuit_inputs", "prove", "metadata",
+                              "time_solution", "verify"])
+            with open(TRACER.path) as f:
+                self.assertEqual(len(f.readlines()), 1)
+
+        self.assertEqual(STAGE_RESULTS.value("zk_proof", "passed"), 1)
+        self.assertEqual(STAGE_SECONDS.count("structure"), 1)
+
+    def test_rejects_are_counted_by_stage(self):
+        REGISTRY.enable()
+        proof = self.prover.generate_time_proof(current_epochs(1)[0])
+        self.assertTrue(self.validator.verify_time_proof(proof))
+        replay = TimeProof(proof.timestamp, proof.satellite_fingerprint, b"{}", proof.metadata)
+        self.assertFalse(self.validator.verify_time_proof(replay))
+        self.assertEqual(STAGE_RESULTS.value("replay", "rejected"), 1)
+        self.assertEqual(STAGE_RESULTS.value("zk_proof", "passed"), 1)
+
+    def test_disabled_instrumentation_leaves_no_trace(self):
+        self.ingest_epoch()
+        proof = self.prover.generate_time_proof(current_epochs(1)[0])
+        self.assertTrue(self.validator.verify_time_proof(proof))
+        self.assertNotIn("trace", proof.metadata)
+        self.assertEqual(STAGE_RESULTS.value("zk_proof", "passed"), 0)
+        self.assertEqual(len(TRACER.finished), 0)
+
+    def test_native_subprocess_time_is_measured(self):
+        REGISTRY.enable()
+        NativeWitnessBackend._run_measured(["sh", "-c", "true"])
+        with self.assertRaises(subprocess.CalledProcessError) as raised:
+            NativeWitnessBackend._run_measured(["sh", "-c", "echo broken; exit 3"])
+        self.assertEqual(raised.exception.output, b"broken\n")
+        text = REGISTRY.render()
+        self.assertIn('continuum_subprocess_cpu_seconds_count{worker="witness_native",op="witness"} 2', text)
+
+
+if __name__ == "__main__":
+    unittest.main()
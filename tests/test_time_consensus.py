@@ -1,79 +1,24 @@
 import unittest
 import os
-import subprocess
 from src.gps_module.gps_receiver import GPSReceiver, SatelliteData
+from src.gps_module.replay_receiver import ReplayReceiver
+from src.secure_enclave.artifacts import ArtifactManager
 from src.secure_enclave.zk_prover import ZKTimeProver
 from src.validation.time_validator import TimeValidator
 
 class TestTimeConsensus(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
-        """Set up the Circom circuit and trusted setup."""
-        # Get absolute paths
-        root_dir = os.path.dirname(os.path.dirname(__file__))
-        os.chdir(root_dir)
-        
-        circom_path = os.path.expanduser("~/.cargo/bin/circom")
-        circuit_path = os.path.join(root_dir, "src/secure_enclave/circuits/SatelliteTimeCheck.circom")
-        
-        # Compile the circuit
-        print("Compiling Circom circuit...")
-        subprocess.run([
-            circom_path,
-            "--r1cs",
-            "--wasm",
-            "--sym",
-            "--c",
-            circuit_path
-        ], check=True)
-        
-        # Generate trusted setup (for testing only)
-        print("Generating trusted setup...")
-        subprocess.run([
-            "snarkjs",
-            "powersoftau",
-            "new",
-            "bn128",
-            "12",
-            "pot12_0000.ptau",
-            "-v"
-        ], check=True)
-        
-        subprocess.run([
-            "snarkjs",
-            "powersoftau",
-            "contribute",
-            "pot12_0000.ptau",
-            "pot12_0001.ptau",
-            "--name='First contribution'",
-            "-v",
-            "-e='some random text'"
-        ], check=True)
-        
-        # Generate proving/verification keys
-        subprocess.run([
-            "snarkjs",
-            "groth16",
-            "setup",
-            "SatelliteTimeCheck.r1cs",
-            "pot12_0001.ptau",
-            "SatelliteTimeCheck.zkey"
-        ], check=True)
-        
-        subprocess.run([
-            "snarkjs",
-            "zkey",
-            "export",
-            "verificationkey",
-            "SatelliteTimeCheck.zkey",
-            "verification_key.json"
-        ], check=True)
+        """Build the circuit and trusted setup once into the artifact cache."""
+        cls.artifacts = ArtifactManager().ensure()
 
     def setUp(self):
         """Set up test components."""
-        self.gps = GPSReceiver()
-        self.prover = ZKTimeProver()
-        self.validator = TimeValidator()
+        # Replay a recorded capture when no live receiver is attached
+        replay_log = os.environ.get("GPS_REPLAY_LOG")
+        self.gps = ReplayReceiver(replay_log) if replay_log else GPSReceiver()
+        self.prover = ZKTimeProver(artifacts=self.artifacts)
+        self.validator = TimeValidator(artifacts=self.artifacts)
 
     def test_mock_satellite_data(self):
         """Test with mock satellite data."""
@@ -0,0 +1,177 @@
+import unittest
+import mmap
+import struct
+import tempfile
+import numpy as np
+from src.gps_module.clock_solver import ClockSolver, SPEED_OF_LIGHT
+from src.gps_module.ephemeris import EphemerisEngine, OMEGA_EARTH
+from src.gps_module.ubx_parser import (
+    NAV_SAT, NAV_SAT_HEADER, NAV_SAT_RECORD, RAWX_HEADER, RAWX_MEASUREMENT, RXM_RAWX,
+    RXM_SFRBX, SFRBX_HEADER, UBXDecoder, UBXParser, decode_lnav_ephemeris, decode_rawx,
+    encode_frame,
+)
+
+WEEK = 2300
+LEAP_S = 18
+RECEIVER = np.array([4027894.0, 307046.0, 4919475.0])
+
+
+def unsigned(value: float, scale: float, bits: int) -> int:
+    return int(round(value / scale)) & ((1 << bits) - 1)
+
+
+def lnav_words(data):
+    """30-bit LNAV words with zero parity, as UBX SFRBX carries them."""
+    return [(d & 0xFFFFFF) << 6 for d in data]
+
+
+def lnav_subframes(prn: int, sqrt_a: float, e: float, i0: float, omega0: float,
+                   omega: float, m0: float, toe: int, af0: float, iode: int = 7):
+    """GPS LNAV subframes 1-3 with angles in semicircles."""
+    m0_, e_, a_ = unsigned(m0, 2 ** -31, 32), unsigned(e, 2 ** -33, 32), unsigned(sqrt_a, 2 ** -19, 32)
+    o0_, i0_, w_ = unsigned(omega0, 2 ** -31, 32), unsigned(i0, 2 ** -31, 32), unsigned(omega, 2 ** -31, 32)
+    dn = unsigned(4.5e-9, 2 ** -43, 16)
+    sf1 = [0, 1 << 2, (WEEK % 1024) << 14, 0, 0, 0, 0,
+           (iode << 16) | (toe // 16), unsigned(1e-12, 2 ** -43, 16), unsigned(af0, 2 ** -31, 22) << 2]
+    sf2 = [0, 2 << 2, (iode << 16) | unsigned(40.0, 2 ** -5, 16),
+           (dn << 8) | (m0_ >> 24), m0_ & 0xFFFFFF,
+           (unsigned(1e-6, 2 ** -29, 16) << 8) | (e_ >> 24), e_ & 0xFFFFFF,
+           (unsigned(8e-6, 2 ** -29, 16) << 8) | (a_ >> 24), a_ & 0xFFFFFF,
+           (toe // 16) << 8]
+    sf3 = [0, 3 << 2,
+           (unsigned(-1e-7, 2 ** -29, 16) << 8) | (o0_ >> 24), o0_ & 0xFFFFFF,
+           (unsigned(2e-7, 2 ** -29, 16) << 8) | (i0_ >> 24), i0_ & 0xFFFFFF,
+           (unsigned(200.0, 2 ** -5, 16) << 8) | (w_ >> 24), w_ & 0xFFFFFF,
+           unsigned(-2.6e-9, 2 ** -43, 24), (iode << 16) | (unsigned(1e-10, 2 ** -43, 14) << 2)]
+    return [lnav_words(sf) for sf in (sf1, sf2, sf3)]
+
+
+def sfrbx_frame(sv_id: int, words) -> bytes:
+    payload = SFRBX_HEADER.pack(0, sv_id, 0, 0, len(words), 0, 2) + struct.pack(f"<{len(words)}I", *words)
+    return encode_frame(*RXM_SFRBX, payload)
+
+
+def rawx_frame(rcv_tow: float, measurements) -> bytes:
+    payload = RAWX_HEADER.pack(rcv_tow, WEEK, LEAP_S, len(measurements), 1, 1)
+    for sv_id, pseudorange, doppler in measurements:
+        payload += RAWX_MEASUREMENT.pack(pseudorange, 0.0, doppler, 0, sv_id, 0, 0, 1000, 45, 2, 2, 2, 0x07)
+    return encode_frame(*RXM_RAWX, payload)
+
+
+def nav_sat_frame(itow: int, satellites) -> bytes:
+    payload = NAV_SAT_HEADER.pack(itow, 1, len(satellites))
+    for sv_id, health in satellites:
+        payload += NAV_SAT_RECORD.pack(0, sv_id, 45, 50, 120, 0, health << 4)
+    return encode_frame(*NAV_SAT, payload)
+
+
+def constellation(toe: int = 302400):
+    """Subframes for six GPS satellites spread over three planes."""
+    return {
+        sv_id: lnav_subframes(sv_id, 5153.7, 0.01, 0.3056, (sv_id % 3) * 0.6667 - 0.6667,
+                              0.25, sv_id * 0.33 - 1.0, toe, af0=sv_id * 1e-5)
+        for sv_id in (2, 5, 9, 12, 17, 23)
+    }
+
+
+def ubx_capture(rcv_tow: float, bias: float) -> bytes:
+    """Subframes, NAV-SAT and a RAWX epoch for a receiver at RECEIVER."""
+    subframes = constellation()
+    stream = b"".join(sfrbx_frame(sv, words) for sv, sfs in subframes.items() for words in sfs)
+    stream += nav_sat_frame(int(rcv_tow * 1000), [(sv, 1) for sv in subframes])
+
+    engine = EphemerisEngine()
+    measurements = []
+    for sv, (sf1, sf2, sf3) in subframes.items():
+        eph, clock = decode_lnav_ephemeris(sf1, sf2, sf3)
+        travel = 0.07
+        for _ in range(5):
+            x, y, z = engine.positions_at([eph], [rcv_tow - travel])[0]
+            angle = OMEGA_EARTH * travel
+            sat = np.array([np.cos(angle) * x + np.sin(angle) * y,
+                            -np.sin(angle) * x + np.cos(angle) * y, z])
+            travel = np.linalg.norm(sat - RECEIVER) / SPEED_OF_LIGHT
+        sv_clock = clock["af0"] + clock["af1"] * (rcv_tow - travel - clock["toc"])
+        pseudorange = SPEED_OF_LIGHT * (travel + bias - sv_clock)
+        measurements.append((sv, pseudorange, -500.0 + sv))
+    return stream + rawx_frame(rcv_tow + bias, measurements)
+
+
+class TestUBXParser(unittest.TestCase):
+    def test_resyncs_over_garbage_and_bad_checksums(self):
+        """Garbage and corrupt frames are skipped; valid frames still decode."""
+        good = encode_frame(0x01, 0x35, b"\x01\x02\x03")
+        corrupt = bytearray(encode_frame(0x02, 0x15, b"\x00" * 16))
+        corrupt[-1] ^= 0xFF
+        parser = UBXParser()
+        frames = list(parser.iter_frames(b"\x00\xb5junk" + good + bytes(corrupt) + good))
+        self.assertEqual([(f.msg_class, f.msg_id, bytes(f.payload)) for f in frames],
+                         [(0x01, 0x35, b"\x01\x02\x03")] * 2)
+        self.assertEqual(parser.checksum_errors, 1)
+
+    def test_frames_split_across_reads(self):
+        """Feeding one byte at a time yields the same frames as one buffer."""
+        stream = encode_frame(0x01, 0x35, bytes(range(40))) + encode_frame(0x02, 0x13, b"\xb5\x62")
+        parser = UBXParser()
+        frames = [bytes(f.payload) for i in range(len(stream)) for f in parser.feed(stream[i:i + 1])]
+        self.assertEqual(frames, [bytes(range(40)), b"\xb5\x62"])
+
+    def test_decodes_rawx(self):
+        frame = rawx_frame(345600.5, [(5, 21_000_000.25, -1234.5), (9, 23_500_000.0, 800.0)])
+        rawx = decode_rawx(next(UBXParser().iter_frames(frame)).payload)
+        self.assertEqual((rawx.rcv_tow, rawx.week, rawx.leap_s), (345600.5, WEEK, LEAP_S))
+        self.assertEqual([(m.sv_id, m.pseudorange, m.doppler) for m in rawx.measurements],
+                         [(5, 21_000_000.25, -1234.5), (9, 23_500_000.0, 800.0)])
+
+
+class TestLNAVEphemeris(unittest.TestCase):
+    def test_round_trips_broadcast_parameters(self):
+        sf1, sf2, sf3 = lnav_subframes(3, 5153.7, 0.01, 0.3056, -0.4, 0.25, 0.9, 302400, af0=2e-5)
+        eph, clock = decode_lnav_ephemeris(sf1, sf2, sf3)
+        self.assertAlmostEqual(eph["semi_major_axis"], 5153.7 ** 2 / 1e3, places=4)
+        self.assertAlmostEqual(eph["eccentricity"], 0.01, places=9)
+        self.assertAlmostEqual(eph["inclination"], 0.3056 * 180, places=6)
+        self.assertAlmostEqual(eph["right_ascension"], -0.4 * 180, places=6)
+        self.assertAlmostEqual(eph["mean_anomaly"], 0.9 * 180, places=6)
+        self.assertEqual(eph["reference_time"], 302400)
+        self.assertAlmostEqual(eph["crs"], 40.0)
+        self.assertAlmostEqual(clock["af0"], 2e-5, places=9)
+
+    def test_mismatched_issue_of_data_is_rejected(self):
+        sf1, sf2, _ = lnav_subframes(3, 5153.7, 0.01, 0.3, 0.1, 0.2, 0.3, 302400, 0.0, iode=7)
+        _, _, sf3 = lnav_subframes(3, 5153.7, 0.01, 0.3, 0.1, 0.2, 0.3, 302400, 0.0, iode=8)
+        self.assertIsNone(decode_lnav_ephemeris(sf1, sf2, sf3))
+
+
+class TestUBXDecoder(unittest.TestCase):
+    def test_capture_decodes_to_solvable_satellite_data(self):
+        """A recorded capture yields SatelliteData the clock solver can use."""
+        rcv_tow, bias = 302460.0, 1e-4
+        with tempfile.NamedTemporaryFile() as f:
+            f.write(ubx_capture(rcv_tow, bias))
+            f.flush()
+            with open(f.name, "rb") as log, mmap.mmap(log.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                epochs = list(UBXDecoder(clock=lambda: 7).decode_capture(buf))
+
+        self.assertEqual(len(epochs), 1)
+        satellites = epochs[0].satellites
+        self.assertEqual([s.prn_code for s in satellites], ["G02", "G05", "G09", "G12", "G17", "G23"])
+        self.assertEqual(satellites[0].almanac_data["doppler_shift"], -498.0)
+        self.assertAlmostEqual(satellites[1].almanac_data["clock_correction"], 5e-5, places=8)
+
+        true_time = 315964800 + WEEK * 604800 + rcv_tow - LEAP_S
+        solved = ClockSolver().solve_time(satellites)
+        self.assertAlmostEqual(solved, true_time, delta=1e-6)
+        # Ranges come from the travel times, not the rounded Unix timestamps
+        np.testing.assert_allclose(ClockSolver().solve_epochs([satellites])[1].positions[0],
+                                   RECEIVER, atol=2.0)
+
+    def test_satellites_without_ephemeris_are_left_out(self):
+        decoder = UBXDecoder()
+        epochs = decoder.feed(rawx_frame(302460.0, [(5, 21_000_000.0, 0.0)]))
+        self.assertEqual(len(epochs), 1)
+        self.assertEqual(len(epochs[0].satellites), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
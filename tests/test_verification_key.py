@@ -0,0 +1,111 @@
+import unittest
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from src.validation.verification_key import VerificationKey
+from src.validation.verifier_service import Groth16VerifierService
+
+FIELD = 21888242871839275222246405745257275088696311157297823662689037894645226208583
+
+
+def g1(seed):
+    return [str(FIELD - seed), str(seed * 7919), "1"]
+
+
+def g2(seed):
+    return [[str(FIELD - seed), str(seed)], [str(seed * 31), str(FIELD - 2 * seed)], ["1", "0"]]
+
+
+VK = {
+    "protocol": "groth16",
+    "curve": "bn128",
+    "nPublic": 3,
+    "vk_alpha_1": g1(1),
+    "vk_beta_2": g2(2),
+    "vk_gamma_2": g2(3),
+    "vk_delta_2": g2(4),
+    "IC": [g1(5 + i) for i in range(4)],
+}
+
+
+def as_ints(value):
+    if isinstance(value, list):
+        return tuple(as_ints(v) for v in value)
+    return int(value)
+
+
+class TestVerificationKey(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.json_path = os.path.join(self.tmp.name, "verification_key.json")
+        self.cache_dir = os.path.join(self.tmp.name, "keys")
+        with open(self.json_path, "w") as f:
+            json.dump(VK, f)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_cached_key_round_trips(self):
+        key = VerificationKey.load(self.json_path, self.cache_dir)
+        try:
+            self.assertEqual(key.curve, "bn128")
+            self.assertEqual(key.n_public, 3)
+            self.assertEqual(key.alpha1, as_ints(VK["vk_alpha_1"]))
+            self.assertEqual(key.beta2, as_ints(VK["vk_beta_2"]))
+            self.assertEqual(key.gamma2, as_ints(VK["vk_gamma_2"]))
+            self.assertEqual(key.delta2, as_ints(VK["vk_delta_2"]))
+            self.assertEqual(key.ic, list(as_ints(VK["IC"])))
+        finally:
+            key.close()
+
+    def test_cache_is_reused_until_the_key_changes(self):
+        first = VerificationKey.load(self.json_path, self.cache_dir)
+        first.close()
+        modified = os.stat(first.path).st_mtime_ns
+        second = VerificationKey.load(self.json_path, self.cache_dir)
+        second.close()
+        self.assertEqual(second.path, first.path)
+        self.assertEqual(os.stat(second.path).st_mtime_ns, modified)
+
+        with open(self.json_path, "w") as f:
+            json.dump(dict(VK, IC=VK["IC"][:2], nPublic=1), f)
+        third = VerificationKey.load(self.json_path, self.cache_dir)
+        third.close()
+        self.assertNotEqual(third.path, first.path)
+        self.assertEqual(third.n_public, 1)
+
+    def test_rejects_unknown_curve_and_foreign_files(self):
+        with open(self.json_path, "w") as f:
+            json.dump(dict(VK, curve="secp256k1"), f)
+        with self.assertRaises(ValueError):
+            VerificationKey.load(self.json_path, self.cache_dir)
+        with self.assertRaises(ValueError):
+            VerificationKey(self.json_path)
+
+    def test_verifier_rejects_wrong_signal_count_without_a_round_trip(self):
+        verifier = Groth16VerifierService(self.json_path, self.cache_dir)
+        try:
+            self.assertEqual(verifier.args, [verifier.verification_key.path])
+            self.assertFalse(verifier.verify({}, ["1", "2"]))
+            self.assertEqual(verifier.verify_many([({}, ["1"]), ({}, ["1", "2", "3", "4"])]), [False, False])
+            self.assertIsNone(verifier.process)
+        finally:
+            verifier.close()
+
+
+class TestValidatorImports(unittest.TestCase):
+    def test_validator_skips_receiver_and_prover(self):
+        """A validator-only node never loads the serial port or prover stack."""
+        heavy = ("serial", "pynmea2", "src.gps_module.gps_receiver", "src.secure_enclave.zk_prover")
+        script = ("import sys, src.node.validator\n"
+                  f"print(','.join(m for m in {heavy!r} if m in sys.modules))")
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        output = subprocess.run([sys.executable, "-c", script], cwd=root, check=True,
+                                capture_output=True, text=True).stdout
+        self.assertEqual(output.strip(), "")
+
+
+if __name__ == "__main__":
+    unittest.main()
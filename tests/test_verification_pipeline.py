@@ -0,0 +1,199 @@
+import unittest
+import asyncio
+import contextlib
+import io
+import itertools
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import time
+from unittest import mock
+from src.secure_enclave.artifacts import DEFAULT_CIRCOM, DEFAULT_CIRCUIT, ROOT_DIR, ArtifactManager
+from src.secure_enclave.fingerprint import satellite_fingerprint
+from src.secure_enclave.witness_backends import create_witness_backend
+from src.secure_enclave.zk_prover import TimeProof
+from src.validation.time_validator import TimeValidator
+
+ALMANAC = {
+    "clock_correction": 0.000001,
+    "ionospheric_data": 0.5,
+    "atmospheric_corrections": 0.2,
+    "satellite_health": 0,
+    "doppler_shift": 1000.0
+}
+
+
+class CountingVerifier:
+    """Stand-in for the Groth16 service that records how it was called."""
+
+    def __init__(self):
+        self.calls = []
+
+    def verify(self, proof, public_signals):
+        self.calls.append(1)
+        return True
+
+    def verify_many(self, proofs, batch=True):
+        self.calls.append(len(proofs))
+        return [True] * len(proofs)
+
+
+def groth16_toolchain() -> bool:
+    """Whether circom, snarkjs and the Node modules the helpers load are installed."""
+    if not os.path.exists(DEFAULT_CIRCOM) or not shutil.which("snarkjs") or not shutil.which("node"):
+        return False
+    check = subprocess.run(["node", "-e", "require.resolve('snarkjs'); require.resolve('ffjavascript')"],
+                           cwd=ROOT_DIR, capture_output=True)
+    return check.returncode == 0
+
+
+class TestVerificationPipeline(unittest.TestCase):
+    def setUp(self):
+        """Set up a validator with a stubbed ZK backend."""
+        self.verifier = CountingVerifier()
+        self.validator = TimeValidator(verifier=self.verifier)
+        self.counter = itertools.count()
+
+    def _make_proof(self, data_timestamp=None, doppler_shift=None) -> TimeProof:
+        almanac = dict(ALMANAC)
+        # Distinct almanac data per proof keeps fingerprints unique
+        almanac["doppler_shift"] = doppler_shift or 1000.0 + next(self.counter)
+        satellite_data = [{"almanac": almanac} for _ in range(4)]
+        return TimeProof(
+            timestamp=time.time(),
+            satellite_fingerprint=satellite_fingerprint(satellite_data),
+            zk_proof=b'{"pi_a": []}',
+            metadata={
+                "T_sat": "1",
+                "timestamp": data_timestamp or time.time_ns(),
+                "satellite_data": satellite_data
+            }
+        )
+
+    def test_stale_proof_skips_zk_verification(self):
+        """Stale proofs are rejected before the ZK stage runs."""
+        self.assertFalse(self.validator.verify_time_proof(self._make_proof(data_timestamp=1)))
+        self.assertEqual(self.verifier.calls, [])
+
+        stats = self.validator.verification_stats()
+        self.assertEqual(stats["freshness"]["rejected"], 1)
+        self.assertEqual(stats["zk_proof"]["passed"] + stats["zk_proof"]["rejected"], 0)
+
+    def test_batch_only_verifies_survivors(self):
+        """The batched ZK check only receives proofs that passed cheap stages."""
+        proofs = [self._make_proof(), self._make_proof(data_timestamp=1), self._make_proof()]
+        self.assertEqual(self.validator.verify_time_proofs(proofs), [True, False, True])
+        self.assertEqual(self.verifier.calls, [2])
+
+    def test_async_checks_share_one_batch(self):
+        """Concurrent async verifications coalesce into one verifier call."""
+        async def verify_all():
+            return await asyncio.gather(*[
+                self.validator.verify_time_proof_async(self._make_proof()) for _ in range(5)
+            ])
+
+        self.assertEqual(asyncio.run(verify_all()), [True] * 5)
+        self.assertEqual(self.verifier.calls, [5])
+
+    def test_replayed_fingerprint_is_rejected(self):
+        """A second proof with an accepted fingerprint is a replay."""
+        self.assertTrue(self.validator.verify_time_proof(self._make_proof(doppler_shift=1500.0)))
+        self.assertFalse(self.validator.verify_time_proof(self._make_proof(doppler_shift=1500.0)))
+        self.assertEqual(self.validator.verification_stats()["replay"]["rejected"], 1)
+        self.assertEqual(self.verifier.calls, [1])
+
+    def test_future_dated_proof_cannot_be_replayed(self):
+        """Data timestamps ahead of the clock cannot outlast the replay window."""
+        now = time.time()
+        with mock.patch("time.time", return_value=now), \
+                mock.patch("time.time_ns", return_value=int(now * 1e9)):
+            self.assertFalse(self.validator.verify_time_proof(
+                self._make_proof(data_timestamp=int((now + 3600) * 1e9), doppler_shift=1600.0)))
+            proof = self._make_proof(data_timestamp=int((now + 0.9) * 1e9), doppler_shift=1700.0)
+            self.assertTrue(self.validator.verify_time_proof(proof))
+        self.assertEqual(self.validator.verification_stats()["freshness"]["rejected"], 1)
+
+        # Once the fingerprint has left the index, the data has gone stale
+        later = now + 2 * self.validator.accepted_time_range + 0.5
+        with mock.patch("time.time", return_value=later), \
+                mock.patch("time.time_ns", return_value=int(later * 1e9)):
+            self.assertNotIn(proof.satellite_fingerprint, self.validator.seen_fingerprints)
+            replay = TimeProof(later, proof.satellite_fingerprint, proof.zk_proof, proof.metadata)
+            self.assertFalse(self.validator.verify_time_proof(replay))
+        self.assertEqual(self.validator.verification_stats()["freshness"]["rejected"], 2)
+
+    def test_gossip_duplicates_hit_the_cache(self):
+        """Identical copies of an accepted proof are answered from the cache."""
+        proof = self._make_proof()
+        for _ in range(3):
+            self.assertTrue(self.validator.verify_time_proof(proof))
+        self.assertEqual(self.verifier.calls, [1])
+
+        stats = self.validator.verification_stats()
+        self.assertEqual(stats["result_cache"]["hits"], 2)
+        self.assertEqual(stats["structure"]["passed"], 1)
+
+    def test_verifier_failures_are_not_cached(self):
+        """A verifier timeout rejects the proof without caching the rejection."""
+        proof = self._make_proof()
+        timeout = RuntimeError("worker did not answer within 300.0s")
+        with mock.patch.object(self.verifier, "verify", side_effect=timeout), \
+                mock.patch.object(self.verifier, "verify_many", side_effect=timeout), \
+                contextlib.redirect_stdout(io.StringIO()):
+            self.assertFalse(self.validator.verify_time_proof(proof))
+            self.assertEqual(self.validator.verify_time_proofs([proof]), [False])
+        self.assertEqual(self.validator.verification_stats()["result_cache"]["size"], 0)
+
+        # Once the verifier is back, the same proof is checked again
+        self.assertTrue(self.validator.verify_time_proof(proof))
+        self.assertEqual(self.verifier.calls, [1])
+
+    def test_verifier_rejections_are_cached(self):
+        proof = self._make_proof()
+        with mock.patch.object(self.verifier, "verify", return_value=False):
+            self.assertFalse(self.validator.verify_time_proof(proof))
+        self.assertFalse(self.validator.verify_time_proof(proof))
+        self.assertEqual(self.validator.verification_stats()["result_cache"]["hits"], 1)
+
+
+
+class TestSingleEpochCircuit(unittest.TestCase):
+    def test_validator_sends_the_public_inputs_the_circuit_declares(self):
+        with open(DEFAULT_CIRCUIT) as f:
+            declared = re.search(r"component main \{public \[([^\]]*)\]\}", f.read())
+        self.assertIsNotNone(declared, "the circuit declares no public inputs")
+        public = [name.strip() for name in declared.group(1).split(",")]
+        self.assertEqual(public, ["T_sat", "c", "Delta"])
+        signals = TimeValidator(verifier=CountingVerifier())._public_signals({"T_sat": "17"})
+        self.assertEqual(signals, ["17", "299792458", "5000000"])
+
+
+@unittest.skipUnless(groth16_toolchain(), "needs circom, snarkjs and the Node dependencies")
+class TestGroth16EndToEnd(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.artifacts = ArtifactManager(cache_dir=cls.tmp.name).ensure()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def test_real_proof_verifies_against_its_public_inputs(self):
+        t_sat = str(time.time_ns())
+        backend = create_witness_backend("wasm", self.artifacts.wasm, self.artifacts.zkey, self.artifacts.cpp_dir)
+        validator = TimeValidator(artifacts=self.artifacts)
+        try:
+            proof = backend.prove({"T_sat": t_sat, "c": "299792458", "Delta": "5000000",
+                                   "T_local": t_sat, "D": "0"})
+            self.assertTrue(validator._verify_zk_proof(proof, {"T_sat": t_sat}))
+            self.assertFalse(validator._verify_zk_proof(proof, {"T_sat": str(int(t_sat) + 1)}))
+        finally:
+            backend.close()
+            validator.verifier.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
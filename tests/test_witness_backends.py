@@ -0,0 +1,124 @@
+import unittest
+import contextlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import threading
+from src.secure_enclave.witness_backends import (
+    NativeWitnessBackend,
+    WasmWitnessBackend,
+    create_witness_backend,
+)
+from src.telemetry.metrics import ERRORS, REGISTRY
+
+# Builds a "generator" that copies its input file to the witness path
+MAKEFILE = """\
+Circuit: main.cpp
+\tsleep {delay}
+\techo built >> {log}
+\tprintf '#!/bin/sh\\ncp "$$1" "$$2"\\n' > Circuit
+\tchmod +x Circuit
+\tcp main.cpp Circuit.dat
+"""
+
+
+@unittest.skipUnless(shutil.which("make"), "needs make")
+class TestNativeWitnessBackend(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cpp_dir = os.path.join(self.tmp.name, "Circuit_cpp")
+        self.cache_dir = os.path.join(self.tmp.name, "cache")
+        self.log = os.path.join(self.tmp.name, "builds.log")
+        os.makedirs(self.cpp_dir)
+        self.write_sources()
+
+    def tearDown(self):
+        REGISTRY.enable(False)
+        REGISTRY.reset()
+        self.tmp.cleanup()
+
+    def write_sources(self, makefile=MAKEFILE, source="int main() {}\n", delay=0):
+        with open(os.path.join(self.cpp_dir, "Makefile"), "w") as f:
+            f.write(makefile.format(delay=delay, log=self.log))
+        with open(os.path.join(self.cpp_dir, "main.cpp"), "w") as f:
+            f.write(source)
+
+    def builds(self):
+        if not os.path.exists(self.log):
+            return 0
+        with open(self.log) as f:
+            return len(f.readlines())
+
+    def backend(self):
+        return NativeWitnessBackend(self.cpp_dir, "circuit.wasm", "circuit.zkey", self.cache_dir)
+
+    def test_built_generator_computes_witness(self):
+        backend = self.backend()
+        try:
+            self.assertEqual(json.loads(backend.calculate_witness({"T_sat": "1"})), {"T_sat": "1"})
+        finally:
+            backend.close()
+        self.assertEqual(sorted(os.listdir(os.path.dirname(backend.binary_path))), ["Circuit", "Circuit.dat"])
+
+    def test_cached_build_is_reused_until_sources_change(self):
+        first = self.backend().build()
+        second = self.backend().build()
+        self.assertEqual(second, first)
+        self.assertEqual(self.builds(), 1)
+
+        self.write_sources(source="int main() { return 0; }\n")
+        third = self.backend().build()
+        self.assertNotEqual(third, first)
+        self.assertEqual(self.builds(), 2)
+
+    def test_concurrent_builds_share_one_result(self):
+        self.write_sources(delay=0.3)
+        backends = [self.backend() for _ in range(2)]
+        paths, errors = [], []
+
+        def build(backend):
+            try:
+                paths.append(backend.build())
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=build, args=(backend,)) for backend in backends]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+
+        # Both compiled; the slower one finds the winner's directory in place
+        self.assertEqual(errors, [])
+        self.assertEqual(self.builds(), 2)
+        self.assertEqual(len(set(paths)), 1)
+        self.assertEqual(sorted(os.listdir(self.cache_dir)), [os.path.basename(os.path.dirname(paths[0]))])
+
+    def test_failed_build_falls_back_to_wasm(self):
+        REGISTRY.enable()
+        self.write_sources(makefile="Circuit:\n\texit 1\n")
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            backend = create_witness_backend("native", "circuit.wasm", "circuit.zkey",
+                                             self.cpp_dir, self.cache_dir)
+        backend.close()
+        self.assertIsInstance(backend, WasmWitnessBackend)
+        self.assertIn("falling back to WASM", output.getvalue())
+        self.assertEqual(ERRORS.value("witness_backend", "native_build"), 1)
+
+    def test_missing_sources_fall_back_to_wasm(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            backend = create_witness_backend("native", "circuit.wasm", "circuit.zkey",
+                                             os.path.join(self.tmp.name, "Missing_cpp"), self.cache_dir)
+        backend.close()
+        self.assertIsInstance(backend, WasmWitnessBackend)
+
+    def test_unknown_backend_is_rejected(self):
+        with self.assertRaises(ValueError):
+            create_witness_backend("gpu", "circuit.wasm", "circuit.zkey", self.cpp_dir, self.cache_dir)
+
+
+if __name__ == "__main__":
+    unittest.main()
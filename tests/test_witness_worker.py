@@ -0,0 +1,82 @@
+import unittest
+from unittest import mock
+import json
+import os
+import shutil
+import tempfile
+import threading
+from src.secure_enclave.witness_worker import WitnessWorkerPool
+
+# Answers every request like a witness call, echoing what it was sent
+FAKE_WORKER = """
+const readline = require("readline");
+const rl = readline.createInterface({ input: process.stdin, terminal: false });
+rl.on("line", (line) => {
+    const msg = JSON.parse(line);
+    const body = { pid: process.pid, args: process.argv.slice(2), input: msg.input };
+    const result = Buffer.from(JSON.stringify(body)).toString("base64");
+    process.stdout.write(JSON.stringify({ id: msg.id, ok: true, result, cpu: 0 }) + "\\n");
+});
+"""
+
+
+@unittest.skipUnless(shutil.which("node"), "needs Node.js")
+class TestWitnessWorkerPool(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        script = os.path.join(self.tmp.name, "fake_worker.js")
+        with open(script, "w") as f:
+            f.write(FAKE_WORKER)
+        patcher = mock.patch("src.secure_enclave.witness_worker.WITNESS_WORKER_SCRIPT", script)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.pool = WitnessWorkerPool("circuit.wasm", "circuit.zkey", max_workers=2)
+
+    def tearDown(self):
+        self.pool.close()
+        self.tmp.cleanup()
+
+    def witness(self, worker, value=None):
+        return json.loads(worker.calculate_witness({"value": value}))
+
+    def test_workers_are_reused(self):
+        with self.pool.acquire() as worker:
+            first = self.witness(worker, 1)
+        with self.pool.acquire() as again:
+            self.assertIs(again, worker)
+            self.assertEqual(self.witness(again)["pid"], first["pid"])
+        self.assertEqual(first["input"], {"value": 1})
+        self.assertEqual(first["args"], [os.path.abspath("circuit.wasm"), os.path.abspath("circuit.zkey")])
+
+    def test_checkout_grows_to_max_then_waits(self):
+        with self.pool.acquire() as first, self.pool.acquire() as second:
+            self.assertIsNot(first, second)
+            self.assertNotEqual(self.witness(first)["pid"], self.witness(second)["pid"])
+            acquired = []
+            waiter = threading.Thread(target=lambda: acquired.append(self.pool._checkout()))
+            waiter.start()
+            waiter.join(0.1)
+            self.assertTrue(waiter.is_alive())
+        waiter.join(5)
+        self.assertIn(acquired[0], (first, second))
+        self.pool._checkin(acquired[0])
+
+    def test_close_stops_workers_and_drops_those_checked_out(self):
+        with self.pool.acquire() as busy:
+            with self.pool.acquire() as idle:
+                self.witness(idle)
+            self.witness(busy)
+            processes = [idle.process, busy.process]
+            self.pool.close()
+            self.assertEqual([p.wait(5) is not None for p in processes], [True, True])
+            self.assertIsNone(busy.process)
+
+        # The closed worker is not handed out again; the pool starts afresh
+        with self.pool.acquire() as worker:
+            self.assertNotIn(worker, (busy, idle))
+            self.witness(worker)
+        self.assertEqual(self.pool._workers, [worker])
+
+
+if __name__ == "__main__":
+    unittest.main()